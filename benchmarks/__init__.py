@@ -0,0 +1,3 @@
+"""
+Benchmarks for pydantic-shapely. See ``benchmarks/README.rst`` for instructions.
+"""
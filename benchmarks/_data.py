@@ -0,0 +1,141 @@
+"""
+Synthetic data generator for the benchmarks. The data is generated with a fixed seed,
+so the benchmarks are reproducible and can be run offline.
+"""
+
+import math
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    # This import is required in Python 3.8
+    from typing_extensions import Annotated  # type: ignore
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from pydantic_shapely import FeatureBaseModel, GeometryField
+
+GEOMETRY_TYPES = {
+    "Point": shapely.Point,
+    "LineString": shapely.LineString,
+    "Polygon": shapely.Polygon,
+    "MultiPolygon": shapely.MultiPolygon,
+}
+
+
+def _ring(
+    rng: np.random.Generator, vertices: int, center: typing.Tuple[float, float]
+) -> np.ndarray:
+    """Creates a star-shaped (and therefore valid) closed ring around the center."""
+    vertices = max(vertices, 3)
+    angles = np.linspace(0, 2 * math.pi, vertices, endpoint=False)
+    radius = rng.uniform(0.5, 1.0, vertices)
+    ring = np.column_stack(
+        [center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)]
+    )
+    return np.vstack([ring, ring[:1]])
+
+
+def make_geometry(
+    geom_type: str, vertices: int, rng: np.random.Generator, has_z: bool = False
+) -> BaseGeometry:
+    """Creates a random geometry of the given type with approximately the given
+    number of vertices."""
+    center = tuple(rng.uniform(-170, 170, 2))
+    if geom_type == "Point":
+        geometry = shapely.Point(center)
+    elif geom_type == "LineString":
+        steps = rng.normal(0, 0.01, (max(vertices, 2), 2))
+        geometry = shapely.LineString(np.cumsum(steps, axis=0) + center)
+    elif geom_type == "Polygon":
+        geometry = shapely.Polygon(_ring(rng, vertices - 1, center))
+    elif geom_type == "MultiPolygon":
+        geometry = shapely.MultiPolygon(
+            [
+                shapely.Polygon(_ring(rng, vertices // 2 - 1, center)),
+                shapely.Polygon(
+                    _ring(rng, vertices // 2 - 1, (center[0] + 3, center[1]))
+                ),
+            ]
+        )
+    else:
+        raise ValueError(f"Unsupported geometry type: {geom_type}")
+    if has_z:
+        geometry = shapely.force_3d(geometry, 1.0)
+    return geometry
+
+
+def make_geometries(
+    geom_type: str, vertices: int, count: int, seed: int = 42
+) -> typing.List[BaseGeometry]:
+    """Creates a list of random geometries."""
+    rng = np.random.default_rng(seed)
+    return [make_geometry(geom_type, vertices, rng) for _ in range(count)]
+
+
+def make_coordinates(geometry: BaseGeometry) -> typing.Any:
+    """Returns the coordinate input (as accepted by the Shapely constructors) of the
+    geometry."""
+    if geometry.geom_type == "Point":
+        return tuple(geometry.coords[0])
+    if geometry.geom_type == "LineString":
+        return [tuple(coord) for coord in geometry.coords]
+    if geometry.geom_type == "Polygon":
+        return [tuple(coord) for coord in geometry.exterior.coords]
+    if geometry.geom_type == "MultiPolygon":
+        return list(geometry.geoms)
+    raise ValueError(f"Unsupported geometry type: {geometry.geom_type}")
+
+
+_FEATURE_MODELS: typing.Dict[typing.Tuple[str, bool], typing.Type[FeatureBaseModel]] = (
+    {}
+)
+
+
+def feature_model(
+    geom_type: str, memoize: bool = False
+) -> typing.Type[FeatureBaseModel]:
+    """Returns a feature model, with a few typical properties, for the geometry type.
+    With ``memoize`` the GeoJSON representations of the instances are memoized."""
+    key = (geom_type, memoize)
+    if key not in _FEATURE_MODELS:
+        name = f"Benchmark{geom_type}{'Memoized' if memoize else ''}Feature"
+        _FEATURE_MODELS[key] = type(
+            name,
+            (FeatureBaseModel,),
+            {
+                "__annotations__": {
+                    "geometry": Annotated[GEOMETRY_TYPES[geom_type], GeometryField()],
+                    "name": str,
+                    "category": int,
+                    "value": float,
+                    "active": bool,
+                },
+                "__module__": __name__,
+            },
+            memoize_geojson=memoize,
+        )
+        # The model is stored in the module, so it can be pickled by its name.
+        globals()[name] = _FEATURE_MODELS[key]
+    return _FEATURE_MODELS[key]
+
+
+def make_features(
+    geom_type: str, vertices: int, count: int, seed: int = 42, memoize: bool = False
+) -> typing.List[FeatureBaseModel]:
+    """Creates a list of feature models with random geometries and properties."""
+    model = feature_model(geom_type, memoize)
+    rng = np.random.default_rng(seed)
+    return [
+        model(
+            geometry=make_geometry(geom_type, vertices, rng),
+            name=f"feature {index}",
+            category=int(rng.integers(0, 10)),
+            value=float(rng.uniform(0, 100)),
+            active=bool(index % 2),
+        )
+        for index in range(count)
+    ]
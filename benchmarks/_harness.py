@@ -0,0 +1,177 @@
+"""
+Minimal benchmark harness used by the benchmark suite.
+
+A benchmark case is a function which receives the parameters of the case and returns
+the callable to measure. The callable is measured in three steps:
+
+1. a warm-up run, so lazily built schemas and caches do not affect the results;
+2. a number of timed rounds, from which the throughput and latency percentiles are
+   calculated;
+3. a single run with ``tracemalloc`` enabled to determine the peak memory.
+
+The results are plain dictionaries, which can be dumped to JSON and compared between
+commits with ``compare.py``.
+"""
+
+import dataclasses
+import fnmatch
+import gc
+import itertools
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import typing
+
+BenchmarkFunction = typing.Callable[..., typing.Callable[[], typing.Any]]
+
+
+@dataclasses.dataclass
+class Case:
+    """A registered benchmark case, with the grid of parameters to run it for."""
+
+    name: str
+    function: BenchmarkFunction
+    parameters: typing.Dict[str, typing.Sequence[typing.Any]]
+    # The number of items processed by a single call, used to calculate the throughput.
+    # Either a fixed number or the name of the parameter which holds the number.
+    items: typing.Union[int, str] = 1
+
+    def expand(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        """Yields each combination of the parameters of this case."""
+        keys = list(self.parameters)
+        for values in itertools.product(*(self.parameters[key] for key in keys)):
+            yield dict(zip(keys, values))
+
+
+REGISTRY: typing.List[Case] = []
+
+
+def benchmark(
+    name: str,
+    items: typing.Union[int, str] = 1,
+    **parameters: typing.Sequence[typing.Any],
+) -> typing.Callable[[BenchmarkFunction], BenchmarkFunction]:
+    """Decorator to register a benchmark case."""
+
+    def decorator(function: BenchmarkFunction) -> BenchmarkFunction:
+        REGISTRY.append(Case(name, function, parameters, items))
+        return function
+
+    return decorator
+
+
+def percentile(values: typing.Sequence[float], fraction: float) -> float:
+    """Returns the percentile of the (sorted) values, using linear interpolation."""
+    if len(values) == 1:
+        return values[0]
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def measure(
+    func: typing.Callable[[], typing.Any],
+    items: int = 1,
+    min_time: float = 0.2,
+    max_rounds: int = 1000,
+) -> typing.Dict[str, float]:
+    """Measures the callable and returns the statistics of the measurement.
+
+    Args:
+        func: The callable to measure.
+        items: The number of items processed by a single call.
+        min_time: The minimum total time (in seconds) to spend on the timed rounds.
+        max_rounds: The maximum number of timed rounds.
+    """
+    # Warm-up
+    func()
+    # Timed rounds, garbage collection is disabled to reduce the noise.
+    timings: typing.List[float] = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        while len(timings) < max_rounds and (
+            len(timings) < 5 or time.perf_counter() - start < min_time
+        ):
+            round_start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - round_start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    timings.sort()
+    # Memory
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mean = statistics.fmean(timings)
+    return {
+        "rounds": len(timings),
+        "mean_us": mean * 1e6,
+        "p50_us": percentile(timings, 0.50) * 1e6,
+        "p90_us": percentile(timings, 0.90) * 1e6,
+        "p99_us": percentile(timings, 0.99) * 1e6,
+        "min_us": timings[0] * 1e6,
+        "ops_per_s": 1 / mean,
+        "items_per_s": items / mean,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def environment() -> typing.Dict[str, str]:
+    """Returns information on the environment the benchmarks are run in."""
+    # pylint: disable=import-outside-toplevel
+    import pydantic
+    import shapely
+
+    import pydantic_shapely
+
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+        "shapely": shapely.__version__,
+        "geos": shapely.geos_version_string,
+        "pydantic_shapely": pydantic_shapely.__version__,
+    }
+
+
+def run(
+    cases: typing.Iterable[Case],
+    pattern: str = "*",
+    min_time: float = 0.2,
+    report: typing.Optional[
+        typing.Callable[[typing.Dict[str, typing.Any]], None]
+    ] = None,
+) -> typing.List[typing.Dict[str, typing.Any]]:
+    """Runs the cases which name matches the (glob) pattern."""
+    results = []
+    for case in cases:
+        if not fnmatch.fnmatch(case.name, pattern):
+            continue
+        for parameters in case.expand():
+            func = case.function(**parameters)
+            items = (
+                case.items
+                if isinstance(case.items, int)
+                else int(parameters[case.items])
+            )
+            result = {
+                "name": case.name,
+                "parameters": parameters,
+                **measure(func, items=items, min_time=min_time),
+            }
+            if report is not None:
+                report(result)
+            results.append(result)
+    return results
@@ -0,0 +1,140 @@
+"""
+Benchmark for the validation of geometry fields by concurrent threads.
+
+A single model is shared by 1, 2, 4, ... threads (up to the number of CPUs, or the
+given maximum). Each thread validates the same number of feature models from WKT, so
+the throughput scales with the number of threads when validation runs in parallel. On
+the free-threaded builds of Python (3.13t and later) the validation of the fields runs
+without the GIL; on the default builds only the parts done by GEOS run in parallel.
+
+Usage:
+
+.. code-block:: bash
+
+    python benchmarks/bench_concurrent_validation.py --features 2000 --vertices 20
+
+The results are written as JSON to stdout (or the given output file), so they can be
+compared between commits and builds of Python.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    # This import is required in Python 3.8
+    from typing_extensions import Annotated  # type: ignore
+
+import numpy as np
+import shapely
+from pydantic import BaseModel
+
+from pydantic_shapely import GeometryField
+
+# A single field instance, shared by all fields of the models.
+FIELD = GeometryField()
+
+
+class BenchmarkModel(BaseModel):
+    """Model with two geometry fields sharing the same annotation."""
+
+    line: Annotated[shapely.LineString, FIELD]
+    area: Annotated[typing.Union[shapely.Polygon, shapely.MultiPolygon], FIELD]
+    name: str
+
+
+def make_payloads(count: int, vertices: int, seed: int = 42) -> typing.List[dict]:
+    """Creates the input of the models, with the geometries as WKT."""
+    rng = np.random.default_rng(seed)
+    lines = shapely.linestrings(
+        np.cumsum(rng.normal(0, 0.01, (count, vertices, 2)), axis=1)
+    )
+    areas = shapely.buffer(
+        shapely.points(rng.uniform(-170, 170, (count, 2))), 1.0, quad_segs=4
+    )
+    return [
+        {"line": line, "area": area, "name": f"feature {index}"}
+        for index, (line, area) in enumerate(
+            zip(shapely.to_wkt(lines), shapely.to_wkt(areas))
+        )
+    ]
+
+
+def run(threads: int, payloads: typing.List[dict], repeat: int) -> float:
+    """Returns the median duration (in ms) of validating the payloads in each of the
+    threads."""
+    barrier = threading.Barrier(threads)
+
+    def work() -> None:
+        barrier.wait()
+        for payload in payloads:
+            BenchmarkModel.model_validate(payload)
+
+    timings = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(repeat + 1):
+            start = time.perf_counter()
+            futures = [executor.submit(work) for _ in range(threads)]
+            for future in futures:
+                future.result()
+            timings.append(time.perf_counter() - start)
+    # The first round is a warm-up.
+    return statistics.median(timings[1:]) * 1000
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Runs the benchmark and prints the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--features", type=int, default=2000)
+    parser.add_argument("--vertices", type=int, default=20)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args(argv)
+
+    threads = [1]
+    while threads[-1] * 2 <= args.max_threads:
+        threads.append(threads[-1] * 2)
+    if threads[-1] != args.max_threads:
+        threads.append(args.max_threads)
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    payloads = make_payloads(args.features, args.vertices)
+    result: typing.Dict[str, typing.Any] = {
+        "benchmark": "concurrent_validation",
+        "python": sys.version.split()[0],
+        "gil_enabled": is_gil_enabled(),
+        "cpus": os.cpu_count(),
+        "features": args.features,
+        "vertices": args.vertices,
+        "threads": {},
+    }
+    baseline = None
+    for count in threads:
+        duration = run(count, payloads, args.repeat)
+        throughput = count * args.features / (duration / 1000)
+        if baseline is None:
+            baseline = throughput
+        result["threads"][str(count)] = {
+            "median_ms": duration,
+            "features_per_s": throughput,
+            "scaling": throughput / baseline,
+        }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark for the import time of the package and the cost of defining feature models.
+
+The benchmark measures:
+- the time it takes to import ``pydantic_shapely`` in a fresh interpreter;
+- the time and memory it takes to define a number of ``FeatureBaseModel`` sub-classes;
+- the time and memory it takes to create the ``GeoJsonDataModel`` of these classes.
+
+Usage:
+
+.. code-block:: bash
+
+    python benchmarks/bench_model_creation.py --models 200 --output result.json
+
+The results are written as JSON to stdout (or the given output file), so they can be
+compared between commits.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    # This import is required in Python 3.8
+    from typing_extensions import Annotated  # type: ignore
+
+
+def measure_import_time(repeat: int) -> typing.Dict[str, float]:
+    """Measures the time to import the package in a fresh interpreter (in ms)."""
+    code = (
+        "import time; t = time.perf_counter(); import pydantic_shapely; "
+        "print(time.perf_counter() - t)"
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        )
+        timings.append(float(output.stdout.strip()) * 1000)
+    return {
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "max_ms": max(timings),
+    }
+
+
+def define_models(count: int) -> typing.List[type]:
+    """Defines `count` feature models, all with a different set of properties."""
+    # pylint: disable=import-outside-toplevel
+    from shapely import LineString, Point, Polygon
+
+    from pydantic_shapely import FeatureBaseModel, GeometryField
+
+    geometry_types = [Point, LineString, Polygon, typing.Union[Point, LineString]]
+    models = []
+    for index in range(count):
+        annotations = {
+            "geometry": Annotated[
+                geometry_types[index % len(geometry_types)], GeometryField()
+            ],
+            f"name_{index}": str,
+            f"value_{index}": int,
+        }
+        models.append(
+            type(
+                f"BenchmarkModel{index}",
+                (FeatureBaseModel,),
+                {"__annotations__": annotations, "__module__": __name__},
+            )
+        )
+    return models
+
+
+def measure(func: typing.Callable[[], typing.Any]) -> typing.Dict[str, float]:
+    """Measures the duration and the peak memory of the function."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"total_ms": duration * 1000, "peak_memory_kb": peak / 1024}
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Runs the benchmark and prints the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--models", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args(argv)
+
+    result: typing.Dict[str, typing.Any] = {
+        "benchmark": "model_creation",
+        "python": sys.version.split()[0],
+        "models": args.models,
+        "import": measure_import_time(args.repeat),
+    }
+    # Warm-up: import the package and its sub-modules.
+    define_models(1)[0].GeoJsonDataModel  # pylint: disable=expression-not-assigned
+    models: typing.List[type] = []
+    result["define_models"] = measure(lambda: models.extend(define_models(args.models)))
+    result["create_datamodels"] = measure(
+        lambda: [model.GeoJsonDataModel for model in models]
+    )
+    for key in ("define_models", "create_datamodels"):
+        result[key]["per_model_ms"] = result[key]["total_ms"] / args.models
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Scaling benchmark for the bulk conversions on a thread pool (``pydantic_shapely.parallel``).
+
+For each operation the benchmark measures the duration with 1, 2, 4, ... threads (up to
+the number of CPUs, or the given maximum) and reports the speed-up relative to the
+vectorized Shapely function called in a single thread. The JSON serialization of a
+feature collection (``model_dump_json_parallel``) is measured with 1, 2, 4, ... worker
+processes to which the features are pickled, and with forked processes (``"fork"``),
+relative to ``model_dump_json``.
+
+Usage:
+
+.. code-block:: bash
+
+    python benchmarks/bench_parallel.py --geometries 20000 --vertices 100
+
+The results are written as JSON to stdout (or the given output file), so they can be
+compared between commits and machines.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import statistics
+import sys
+import time
+import typing
+
+import numpy as np
+import shapely
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, parallel
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+
+class Track(FeatureBaseModel):
+    """A feature model for the serialization of feature collections."""
+
+    geometry: Annotated[shapely.LineString, GeometryField()]
+    index: int
+    name: str
+
+
+def make_linestrings(count: int, vertices: int, seed: int = 42) -> np.ndarray:
+    """Creates an array of random walks."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, (count, vertices, 2))
+    return shapely.linestrings(np.cumsum(steps, axis=1))
+
+
+def operations(
+    geometries: np.ndarray,
+) -> typing.Dict[str, typing.Tuple[typing.Callable[..., np.ndarray], typing.Any]]:
+    """Returns the operations to benchmark, with the function and its input."""
+    return {
+        "from_wkt": (parallel.from_wkt, shapely.to_wkt(geometries)),
+        "to_wkt": (parallel.to_wkt, geometries),
+        "from_wkb": (parallel.from_wkb, shapely.to_wkb(geometries)),
+        "to_wkb": (parallel.to_wkb, geometries),
+        "from_geojson": (parallel.from_geojson, shapely.to_geojson(geometries)),
+        "to_geojson": (parallel.to_geojson, geometries),
+        "simplify": (
+            lambda values, **kwargs: parallel.simplify(values, 0.01, **kwargs),
+            geometries,
+        ),
+    }
+
+
+def timed(func: typing.Callable[[], typing.Any], repeat: int) -> float:
+    """Returns the median duration (in ms) of the function."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Runs the benchmark and prints the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--geometries", type=int, default=20000)
+    parser.add_argument("--vertices", type=int, default=100)
+    parser.add_argument("--chunk-size", type=int, default=parallel.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args(argv)
+
+    workers = [1]
+    while workers[-1] * 2 <= args.max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != args.max_workers:
+        workers.append(args.max_workers)
+
+    geometries = make_linestrings(args.geometries, args.vertices)
+    result: typing.Dict[str, typing.Any] = {
+        "benchmark": "parallel",
+        "python": sys.version.split()[0],
+        "shapely": shapely.__version__,
+        "cpus": os.cpu_count(),
+        "geometries": args.geometries,
+        "vertices": args.vertices,
+        "chunk_size": args.chunk_size,
+        "operations": {},
+    }
+    # pylint: disable=cell-var-from-loop
+    for name, (func, values) in operations(geometries).items():
+        # Baseline: the vectorized function on the whole array in a single call.
+        baseline = timed(lambda: func(values, chunk_size=len(values)), args.repeat)
+        scaling = {}
+        for count in workers:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=count) as executor:
+                duration = timed(
+                    lambda: func(values, executor=executor, chunk_size=args.chunk_size),
+                    args.repeat,
+                )
+            scaling[str(count)] = {
+                "median_ms": duration,
+                "speedup": baseline / duration,
+            }
+        result["operations"][name] = {"baseline_ms": baseline, "workers": scaling}
+
+    collection = GeoJsonFeatureCollectionBaseModel[
+        Track.GeoJsonDataModel
+    ].from_feature_models(
+        [
+            Track(geometry=geometry, index=index, name=f"Track {index}")
+            for index, geometry in enumerate(geometries)
+        ],
+        trusted=True,
+    )
+    baseline = timed(collection.model_dump_json, args.repeat)
+    scaling = {}
+    for count in workers:
+        chunk_size = -(-len(collection.features) // (count * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=count) as executor:
+            duration = timed(
+                lambda: collection.model_dump_json_parallel(executor, chunk_size),
+                args.repeat,
+            )
+        scaling[str(count)] = {"median_ms": duration, "speedup": baseline / duration}
+    result["operations"]["model_dump_json"] = {
+        "baseline_ms": baseline,
+        "workers": scaling,
+    }
+    # Forked worker processes (one per CPU), which inherit the collection.
+    chunk_size = -(-len(collection.features) // (parallel.default_workers() * 4))
+    duration = timed(
+        lambda: collection.model_dump_json_parallel("fork", chunk_size), args.repeat
+    )
+    result["operations"]["model_dump_json.fork"] = {
+        "baseline_ms": baseline,
+        "workers": {
+            str(parallel.default_workers()): {
+                "median_ms": duration,
+                "speedup": baseline / duration,
+            }
+        },
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
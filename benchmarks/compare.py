@@ -0,0 +1,80 @@
+"""
+Compares two result files of the benchmark suite.
+
+Usage (from the root of the repository):
+
+.. code-block:: bash
+
+    python -m benchmarks.compare before.json after.json --threshold 1.10
+
+For each case which is present in both files, the ratio of the median latency
+(after / before) is printed. With ``--threshold`` the script exits with a non-zero
+status when any case got slower than the threshold.
+"""
+
+import argparse
+import json
+import sys
+import typing
+
+
+def _key(result: typing.Dict[str, typing.Any]) -> str:
+    parameters = ", ".join(
+        f"{key}={value}" for key, value in result["parameters"].items()
+    )
+    return f"{result['name']} [{parameters}]"
+
+
+def compare(
+    before: typing.Dict[str, typing.Any], after: typing.Dict[str, typing.Any]
+) -> typing.List[typing.Tuple[str, float, float]]:
+    """Returns the key, the latency ratio and the peak memory ratio for each case
+    present in both result sets."""
+    previous = {_key(result): result for result in before["results"]}
+    ratios = []
+    for result in after["results"]:
+        key = _key(result)
+        if key not in previous:
+            continue
+        old = previous[key]
+        ratios.append(
+            (
+                key,
+                result["p50_us"] / old["p50_us"],
+                result["peak_memory_kb"] / max(old["peak_memory_kb"], 1e-9),
+            )
+        )
+    return ratios
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Compares the result files and prints a table."""
+    parser = argparse.ArgumentParser(description="Compares two benchmark results.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="Exit with status 1 when a latency ratio exceeds this value.",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding="utf-8") as file:
+        before = json.load(file)
+    with open(args.after, encoding="utf-8") as file:
+        after = json.load(file)
+
+    regressions = 0
+    for key, latency, memory in compare(before, after):
+        flag = ""
+        if args.threshold is not None and latency > args.threshold:
+            flag = "  <-- slower"
+            regressions += 1
+        print(f"{key:<90} time x{latency:6.2f}  memory x{memory:6.2f}{flag}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
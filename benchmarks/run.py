@@ -0,0 +1,81 @@
+"""
+Runs the benchmark suite and writes the results as JSON.
+
+Usage (from the root of the repository):
+
+.. code-block:: bash
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --filter "collection.*" --quick
+"""
+
+import argparse
+import json
+import sys
+import typing
+
+from . import suite
+from ._harness import REGISTRY, environment, run
+
+
+def _report(result: typing.Dict[str, typing.Any]) -> None:
+    parameters = ", ".join(
+        f"{key}={value}" for key, value in result["parameters"].items()
+    )
+    print(
+        f"{result['name']:<32} {parameters:<48} "
+        f"p50 {result['p50_us']:>12.1f} us  "
+        f"{result['items_per_s']:>12.1f} items/s  "
+        f"{result['peak_memory_kb']:>10.1f} KiB",
+        file=sys.stderr,
+    )
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Runs the benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description="Runs the pydantic-shapely benchmarks."
+    )
+    parser.add_argument(
+        "--filter", default="*", help="Glob pattern for the names of the cases to run."
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum time (in seconds) to spend on the timed rounds of each case.",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Only run the smallest vertex counts and collection sizes.",
+    )
+    parser.add_argument("--output", default=None, help="File to write the JSON to.")
+    args = parser.parse_args(argv)
+
+    cases = REGISTRY
+    if args.quick:
+        for case in cases:
+            for key in ("vertices", "size"):
+                if key in case.parameters:
+                    case.parameters[key] = case.parameters[key][:2]
+
+    output = json.dumps(
+        {
+            "environment": environment(),
+            "results": run(cases, args.filter, args.min_time, report=_report),
+        },
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+# The suite module registers the cases on import.
+assert suite
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""
+The benchmark cases for the hot paths of the package. Each case is run for a grid of
+geometry types, vertex counts and (where applicable) collection sizes. Use ``run.py``
+to run the suite.
+"""
+
+import pickle
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    # This import is required in Python 3.8
+    from typing_extensions import Annotated  # type: ignore
+
+import shapely
+from pydantic import TypeAdapter
+
+from pydantic_shapely import (
+    GeometryField,
+    fragment_cache,
+    json_backend,
+    mvt,
+    transport,
+)
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel, PointCollection
+from pydantic_shapely.geojson.geometry import convert_shapely_to_geojson_object
+from pydantic_shapely.tiles import TilePyramid
+
+from ._data import (
+    GEOMETRY_TYPES,
+    feature_model,
+    make_coordinates,
+    make_features,
+    make_geometries,
+)
+from ._harness import benchmark
+
+GEOMETRY_TYPE_NAMES = list(GEOMETRY_TYPES)
+JSON_BACKENDS = json_backend.available_backends()
+VERTICES = [10, 100, 1000]
+COLLECTION_SIZES = [10, 100, 1000]
+# The number of geometries used in a single call of the single-item benchmarks.
+BATCH = 100
+
+
+def _geometry_adapter(geom_type: str, **options: typing.Any) -> TypeAdapter:
+    return TypeAdapter(Annotated[GEOMETRY_TYPES[geom_type], GeometryField(**options)])
+
+
+def _backend(name: str) -> json_backend.JsonBackend:
+    """Returns the JSON backend, without selecting it for the process."""
+    previous = json_backend.get_backend()
+    try:
+        return json_backend.set_backend(name)
+    finally:
+        json_backend.set_backend(previous)
+
+
+def _collection_model(geom_type: str) -> typing.Type[GeoJsonFeatureCollectionBaseModel]:
+    return GeoJsonFeatureCollectionBaseModel[feature_model(geom_type).GeoJsonDataModel]
+
+
+@benchmark(
+    "validate.wkt", items=BATCH, geom_type=GEOMETRY_TYPE_NAMES, vertices=VERTICES
+)
+def validate_wkt(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type)
+    values = [geom.wkt for geom in make_geometries(geom_type, vertices, BATCH)]
+    return lambda: [adapter.validate_python(value) for value in values]
+
+
+@benchmark(
+    "validate.object", items=BATCH, geom_type=GEOMETRY_TYPE_NAMES, vertices=VERTICES
+)
+def validate_object(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type)
+    values = make_geometries(geom_type, vertices, BATCH)
+    return lambda: [adapter.validate_python(value) for value in values]
+
+
+@benchmark(
+    "validate.coordinates",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def validate_coordinates(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type)
+    values = [
+        make_coordinates(geom) for geom in make_geometries(geom_type, vertices, BATCH)
+    ]
+    return lambda: [adapter.validate_python(value) for value in values]
+
+
+@benchmark(
+    "validate.geo_interface",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def validate_geo_interface(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type)
+    values = [
+        geom.__geo_interface__ for geom in make_geometries(geom_type, vertices, BATCH)
+    ]
+    return lambda: [adapter.validate_python(value) for value in values]
+
+
+@benchmark(
+    "validate.array",
+    items=BATCH,
+    geom_type=["Point", "LineString"],
+    vertices=VERTICES,
+)
+def validate_array(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type)
+    # An array of shape (N, 2) for a linestring, and of shape (2,) for a point.
+    values = [
+        shapely.get_coordinates(geom)
+        for geom in make_geometries(geom_type, vertices, BATCH)
+    ]
+    if geom_type == "Point":
+        values = [value[0] for value in values]
+    return lambda: [adapter.validate_python(value) for value in values]
+
+
+@benchmark("serialize", items=BATCH, geom_type=GEOMETRY_TYPE_NAMES, vertices=VERTICES)
+def serialize(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type)
+    values = make_geometries(geom_type, vertices, BATCH)
+    return lambda: [adapter.dump_python(value) for value in values]
+
+
+@benchmark(
+    "serialize.polyline", items=BATCH, geom_type=GEOMETRY_TYPE_NAMES, vertices=VERTICES
+)
+def serialize_polyline(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type, serialization="polyline")
+    values = make_geometries(geom_type, vertices, BATCH)
+    return lambda: [adapter.dump_python(value) for value in values]
+
+
+@benchmark(
+    "validate.polyline", items=BATCH, geom_type=GEOMETRY_TYPE_NAMES, vertices=VERTICES
+)
+def validate_polyline(geom_type: str, vertices: int):
+    adapter = _geometry_adapter(geom_type, serialization="polyline")
+    values = [
+        adapter.dump_python(geom)
+        for geom in make_geometries(geom_type, vertices, BATCH)
+    ]
+    return lambda: [adapter.validate_python(value) for value in values]
+
+
+@benchmark(
+    "feature.to_geojson_model",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def to_geojson_model(geom_type: str, vertices: int):
+    features = make_features(geom_type, vertices, BATCH)
+    return lambda: [feature.to_geojson_model() for feature in features]
+
+
+@benchmark(
+    "feature.to_geojson_model.backend",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    backend=JSON_BACKENDS,
+)
+def to_geojson_model_backend(geom_type: str, vertices: int, backend: str):
+    features = make_features(geom_type, vertices, BATCH)
+    selected = _backend(backend)
+
+    def func():
+        previous = json_backend.get_backend()
+        json_backend.set_backend(selected)
+        try:
+            return [feature.to_geojson_model() for feature in features]
+        finally:
+            json_backend.set_backend(previous)
+
+    return func
+
+
+@benchmark(
+    "feature.model_dump_geojson",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def model_dump_geojson(geom_type: str, vertices: int):
+    features = make_features(geom_type, vertices, BATCH)
+    return lambda: [feature.model_dump_geojson() for feature in features]
+
+
+@benchmark(
+    "feature.memoized",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def memoized(geom_type: str, vertices: int):
+    features = make_features(geom_type, vertices, BATCH, memoize=True)
+    return lambda: [
+        (feature.to_geojson_model(), feature.model_dump_geojson())
+        for feature in features
+    ]
+
+
+@benchmark(
+    "json_backend.dumps",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    backend=JSON_BACKENDS,
+)
+def backend_dumps(geom_type: str, vertices: int, backend: str):
+    dumps = _backend(backend).dumps
+    values = [
+        feature.to_geojson_model().model_dump()
+        for feature in make_features(geom_type, vertices, BATCH)
+    ]
+    return lambda: [dumps(value) for value in values]
+
+
+@benchmark(
+    "json_backend.loads",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    backend=JSON_BACKENDS,
+)
+def backend_loads(geom_type: str, vertices: int, backend: str):
+    loads = _backend(backend).loads
+    values = [
+        feature.model_dump_geojson()
+        for feature in make_features(geom_type, vertices, BATCH)
+    ]
+    return lambda: [loads(value) for value in values]
+
+
+@benchmark(
+    "feature.to_feature_model",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def to_feature_model(geom_type: str, vertices: int):
+    features = [
+        feature.to_geojson_model()
+        for feature in make_features(geom_type, vertices, BATCH)
+    ]
+    return lambda: [feature.to_feature_model() for feature in features]
+
+
+@benchmark(
+    "feature.model_validate_geojson",
+    items=BATCH,
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+)
+def model_validate_geojson(geom_type: str, vertices: int):
+    features = make_features(geom_type, vertices, BATCH)
+    model = type(features[0])
+    values = [feature.model_dump_geojson() for feature in features]
+    return lambda: [model.model_validate_geojson(value) for value in values]
+
+
+@benchmark(
+    "feature.model_validate_geojson_many",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def model_validate_geojson_many(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    features = make_features(geom_type, vertices, size)
+    data = model.dump_feature_models(features)
+    return lambda: type(features[0]).model_validate_geojson_many(data)
+
+
+@benchmark(
+    "feature.to_columns",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def to_columns(geom_type: str, vertices: int, size: int):
+    features = make_features(geom_type, vertices, size)
+    return lambda: type(features[0]).to_columns(features)
+
+
+@benchmark(
+    "feature.from_columns",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def from_columns(geom_type: str, vertices: int, size: int):
+    model = feature_model(geom_type)
+    columns = model.to_columns(make_features(geom_type, vertices, size))
+    return lambda: model.from_columns(columns)
+
+
+@benchmark(
+    "collection.from_feature_models",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def from_feature_models(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    features = make_features(geom_type, vertices, size)
+    return lambda: model.from_feature_models(features)
+
+
+@benchmark(
+    "collection.to_feature_models",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def to_feature_models(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    collection = model.from_feature_models(make_features(geom_type, vertices, size))
+    return collection.to_feature_models
+
+
+@benchmark(
+    "collection.from_feature_models.trusted",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def from_feature_models_trusted(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    features = make_features(geom_type, vertices, size)
+    return lambda: model.from_feature_models(features, trusted=True)
+
+
+@benchmark(
+    "collection.to_feature_models.trusted",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def to_feature_models_trusted(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    collection = model.from_feature_models(make_features(geom_type, vertices, size))
+    return lambda: collection.to_feature_models(trusted=True)
+
+
+@benchmark(
+    "collection.dump_json",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def dump_json(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    collection = model.from_feature_models(make_features(geom_type, vertices, size))
+    return collection.model_dump_json
+
+
+@benchmark(
+    "collection.dump_topojson",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def dump_topojson(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    collection = model.from_feature_models(make_features(geom_type, vertices, size))
+    return collection.model_dump_topojson
+
+
+@benchmark(
+    "collection.load_topojson",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def load_topojson(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    collection = model.from_feature_models(make_features(geom_type, vertices, size))
+    data = collection.model_dump_topojson()
+    return lambda: model.model_validate_topojson(data)
+
+
+@benchmark(
+    "collection.dump_feature_models",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def dump_feature_models(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    features = make_features(geom_type, vertices, size)
+    return lambda: model.dump_feature_models(features)
+
+
+@benchmark("points.from_feature_models", items="size", size=COLLECTION_SIZES)
+def points_from_feature_models(size: int):
+    model = feature_model("Point")
+    features = make_features("Point", 1, size)
+    return lambda: PointCollection.from_feature_models(model, features)
+
+
+@benchmark("points.dump_geojson", items="size", size=COLLECTION_SIZES)
+def points_dump_geojson(size: int):
+    features = make_features("Point", 1, size)
+    points = PointCollection.from_feature_models(feature_model("Point"), features)
+    return points.model_dump_geojson
+
+
+@benchmark(
+    "fragment_cache.dump_feature_models",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+    cached=[False, True],
+)
+def dump_feature_models_cached(geom_type: str, vertices: int, size: int, cached: bool):
+    # Every geometry occurs in the collection ten times, e.g. shared boundaries.
+    model = _collection_model(geom_type)
+    features = make_features(geom_type, vertices, max(size // 10, 1)) * 10
+    cache = fragment_cache.FragmentCache() if cached else None
+
+    def func():
+        fragment_cache.set_cache(cache)
+        try:
+            return model.dump_feature_models(features)
+        finally:
+            fragment_cache.set_cache(None)
+
+    return func
+
+
+@benchmark(
+    "mvt.encode_tile",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def encode_tile(geom_type: str, vertices: int, size: int):
+    features = make_features(geom_type, vertices, size)
+    # The tile of zoom level 0 covers the world, so all features are encoded.
+    return lambda: mvt.encode_tile(features, 0, 0, 0)
+
+
+@benchmark(
+    "tiles.generate",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def generate_tiles(geom_type: str, vertices: int, size: int):
+    pyramid = TilePyramid(make_features(geom_type, vertices, size))
+    return lambda: list(pyramid.generate(0, 4))
+
+
+@benchmark(
+    "collection.load_json",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def load_json(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    data = model.from_feature_models(
+        make_features(geom_type, vertices, size)
+    ).model_dump_json()
+    return lambda: model.model_validate_json(data)
+
+
+@benchmark(
+    "transport.pickle",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def pickle_features(geom_type: str, vertices: int, size: int):
+    features = make_features(geom_type, vertices, size)
+    return lambda: pickle.loads(pickle.dumps(features, transport.PROTOCOL))
+
+
+@benchmark(
+    "transport.pickle_collection",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def pickle_collection(geom_type: str, vertices: int, size: int):
+    model = _collection_model(geom_type)
+    collection = model.from_feature_models(make_features(geom_type, vertices, size))
+    return lambda: pickle.loads(pickle.dumps(collection, transport.PROTOCOL))
+
+
+@benchmark(
+    "transport.shared_features",
+    items="size",
+    geom_type=GEOMETRY_TYPE_NAMES,
+    vertices=VERTICES,
+    size=COLLECTION_SIZES,
+)
+def shared_features(geom_type: str, vertices: int, size: int):
+    features = make_features(geom_type, vertices, size)
+
+    def func():
+        with transport.SharedFeatures.create(features) as shared:
+            return pickle.loads(pickle.dumps(shared)).to_feature_models()
+
+    return func
+
+
+@benchmark(
+    "geometry_collection.to_geojson",
+    items="members",
+    members=[10, 100, 1000],
+)
+def geometry_collection_to_geojson(members: int):
+    geometries = make_geometries("Point", 1, members // 2) + make_geometries(
+        "LineString", 10, members - members // 2
+    )
+    collection = shapely.GeometryCollection(geometries)
+    return lambda: convert_shapely_to_geojson_object(collection)
+
+
+@benchmark(
+    "geometry_collection.to_shapely",
+    items="members",
+    members=[10, 100, 1000],
+)
+def geometry_collection_to_shapely(members: int):
+    geometries = make_geometries("Point", 1, members // 2) + make_geometries(
+        "LineString", 10, members - members // 2
+    )
+    collection = convert_shapely_to_geojson_object(
+        shapely.GeometryCollection(geometries)
+    )
+    return collection.to_shapely
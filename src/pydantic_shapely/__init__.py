@@ -88,10 +88,28 @@ For more information on GeoJSON, see: https://geojson.org/
 For more information on Pydantic, see: https://pydantic-docs.helpmanual.io/
 """
 
+import importlib
+import typing
+
 from .__version__ import __version__
 from .annotations import GeometryField
 from .base import FeatureBaseModel
 
+if typing.TYPE_CHECKING:
+    from . import geojson
+
+# Sub-packages which are imported on first access (PEP 562). Importing these
+# sub-packages defines many Pydantic models, which is not required when only
+# the annotations are used.
+_LAZY_SUBMODULES = ("geojson",)
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Annotations
     "GeometryField",
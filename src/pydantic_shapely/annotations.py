@@ -1,12 +1,19 @@
 import dataclasses
+import functools
+import re
 import typing
+from collections.abc import Mapping
 from inspect import isclass
 
+import numpy as np
 import shapely
 from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
 from pydantic_core import core_schema
+from shapely.geometry import shape
 from shapely.geometry.base import BaseGeometry
 
+from . import fragment_cache, instrumentation, polyline
+
 # Example WKT strings for different geometry types.
 # Source: https://www.ibm.com/docs/en/i/7.4?topic=formats-well-known-text-wkt-format
 EXAMPLES = {
@@ -50,109 +57,698 @@ EXAMPLES3D = {
 #   2-dimensional in all cases.
 # - allow: both 2- and 3-dimensional values are allowed. During the validation
 #   process the data is not altered. This is the default behavior.
-# - required: the geometry must be strictly 2-dimensional. A ValueError will
-#   raised when a shape without z-values is provided.
-ZValues = typing.Literal["required", "allow", "strip", "forbidden"]
+# - required: the geometry must be strictly 3-dimensional. A ValueError will
+#   raised when a shape without z-values is provided, unless a default z-value
+#   is given. In that case the default z-value is added to the shape.
+# The value "forbid" is an alias for "forbidden".
+ZValues = typing.Literal["required", "allow", "strip", "forbid", "forbidden"]
+
+# The Validity describes how the geometry handles invalid geometries (see
+# `shapely.is_valid`), e.g. self-intersecting polygons:
+# - allow: invalid geometries are accepted unmodified. This is the default behavior.
+# - require: a ValueError will be raised when an invalid geometry is provided.
+# - make_valid: invalid geometries are repaired with `shapely.make_valid`. The repaired
+#   geometry may be of another type, e.g. a MultiPolygon for a self-intersecting
+#   Polygon, which must be one of the annotated types.
+Validity = typing.Literal["allow", "require", "make_valid"]
+
+# The Serialization describes the format in which the geometry is serialized:
+# - wkt: a Well-Known Text string. This is the default behavior.
+# - polyline: an encoded polyline (see ``pydantic_shapely.polyline``), with the
+#   multi-part extension for Polygons and the Multi* geometries. GeometryCollections
+#   cannot be serialized as polylines. The z-values are only included when they are
+#   required by the field. The field accepts both polylines and WKT-strings as input.
+Serialization = typing.Literal["wkt", "polyline"]
+
+# Type ids of Shapely (see `shapely.get_type_id`) for each of the geometry classes.
+# A LinearRing is a sub-class of a LineString and therefore also accepted as such.
+TYPE_IDS: typing.Dict[type, typing.Tuple[int, ...]] = {
+    shapely.Point: (0,),
+    shapely.LineString: (1, 2),
+    shapely.LinearRing: (2,),
+    shapely.Polygon: (3,),
+    shapely.MultiPoint: (4,),
+    shapely.MultiLineString: (5,),
+    shapely.MultiPolygon: (6,),
+    shapely.GeometryCollection: (7,),
+    BaseGeometry: (0, 1, 2, 3, 4, 5, 6, 7),
+}
+
+# Candidate geometry classes for (nested) sequences of coordinates, by the nesting
+# depth of the sequence: 1 for a single coordinate, 2 for a sequence of coordinates,
+# etc. The candidates are tried in the order of the supported types of the field.
+CANDIDATES_BY_DEPTH: typing.Dict[int, typing.Tuple[type, ...]] = {
+    1: (shapely.Point,),
+    2: (shapely.LineString, shapely.LinearRing, shapely.Polygon, shapely.MultiPoint),
+    3: (shapely.MultiLineString, shapely.Polygon, shapely.MultiPolygon),
+    4: (shapely.MultiPolygon,),
+}
+# Candidate geometry classes for sequences of geometries, by the class of the parts.
+# The vertices of a LineString (or LinearRing) may be given as Points as well.
+CANDIDATES_BY_PART: typing.Dict[type, typing.Tuple[type, ...]] = {
+    shapely.Point: (
+        shapely.MultiPoint,
+        shapely.LineString,
+        shapely.LinearRing,
+        shapely.GeometryCollection,
+    ),
+    shapely.LineString: (shapely.MultiLineString, shapely.GeometryCollection),
+    shapely.Polygon: (shapely.MultiPolygon, shapely.GeometryCollection),
+}
+# Vectorized constructors for numpy arrays of coordinates, by the geometry class.
+ARRAY_CONSTRUCTORS: typing.Dict[type, typing.Callable[[np.ndarray], BaseGeometry]] = {
+    shapely.Point: shapely.points,
+    shapely.LineString: shapely.linestrings,
+    shapely.LinearRing: shapely.linearrings,
+    shapely.Polygon: shapely.polygons,
+    shapely.MultiPoint: shapely.multipoints,
+}
+
+
+def _candidates(value: typing.Any) -> typing.Optional[typing.Tuple[type, ...]]:
+    """Returns the candidate geometry classes for a (nested) sequence of coordinates
+    or of geometries, or None if the value is not such a sequence."""
+    depth = 0
+    while isinstance(value, (list, tuple)):
+        if not value:
+            return None
+        value = value[0]
+        depth += 1
+    if isinstance(value, BaseGeometry) and depth == 1:
+        return CANDIDATES_BY_PART.get(type(value), (shapely.GeometryCollection,))
+    if isinstance(value, (int, float, np.number)):
+        return CANDIDATES_BY_DEPTH.get(depth)
+    return None
+
+
+# A comma which separates two coordinates in a WKT-string, i.e. which follows a number.
+# Commas between parts follow a closing parenthesis or the keyword EMPTY.
+_WKT_COORDINATE_SEPARATOR = re.compile(r"[0-9.]\s*,")
+
+
+def _min_wkt_vertices(value: str) -> int:
+    """Returns a lower bound of the number of vertices of a WKT-string, without
+    parsing it. Within each part the vertices are separated by commas, so a part with
+    N separators has N + 1 vertices."""
+    separators = len(_WKT_COORDINATE_SEPARATOR.findall(value))
+    return separators + 1 if separators else 0
+
+
+def _count_coordinates(value: typing.Any) -> int:
+    """Returns the number of coordinates of the (nested) sequences of coordinates of a
+    GeoJSON geometry, without constructing the geometry."""
+    if isinstance(value, Mapping):
+        if value.get("type") == "Feature":
+            return _count_coordinates(value.get("geometry"))
+        if "geometries" in value:
+            return sum(_count_coordinates(part) for part in value["geometries"] or ())
+        return _count_coordinates(value.get("coordinates"))
+    if not isinstance(value, (list, tuple)) or not value:
+        return 0
+    if isinstance(value[0], (int, float, np.number)):
+        return 1
+    return sum(_count_coordinates(part) for part in value)
+
+
+# The key of the geometry type in the metadata of the core schema of a geometry field.
+METADATA_KEY = "pydantic_shapely_geometry_type"
+
+# The maximum number of offending indices listed in an error message.
+MAX_REPORTED_INDICES = 10
+
+
+def _format_indices(indices: np.ndarray) -> str:
+    """Formats the offending indices for an error message."""
+    listed = ", ".join(str(index) for index in indices[:MAX_REPORTED_INDICES])
+    if len(indices) > MAX_REPORTED_INDICES:
+        listed += f", ... ({len(indices)} in total)"
+    return listed
+
+
+@dataclasses.dataclass(frozen=True)
+class _Validated:
+    """A geometry which has been validated in bulk already, e.g. by
+    ``GeometryField.validate_many``. The validator of the field only checks the type of
+    the geometry, instead of applying the behaviour and the constraints again."""
+
+    geometry: BaseGeometry
+
+
+def enforce_z_values(
+    geometries: typing.Any,
+    z_values: ZValues = "allow",
+    z_default: typing.Optional[float] = None,
+    indices: typing.Optional[typing.Sequence[int]] = None,
+) -> np.ndarray:
+    """
+    Enforces the z-value behaviour on an array of geometries with the vectorized
+    functions of Shapely. This is the batch equivalent of the z-value validation of
+    the ``GeometryField``.
+
+    Args:
+        geometries: A sequence (or numpy array) of Shapely geometries.
+        z_values: The z-value behaviour, see ``ZValues``.
+        z_default: The z-value which is added to geometries without z-values when
+            z-values are required. When omitted, geometries without z-values are
+            rejected.
+        indices: The indices reported in the error message for each of the
+            geometries, e.g. the positions in the original batch when only a part of
+            the batch is passed. Defaults to the positions in ``geometries``.
+
+    Returns:
+        A numpy array with the (possibly modified) geometries. Geometries which are
+        not modified are returned as is.
+
+    Raises:
+        ValueError: If one or more geometries do not comply with the z-value behaviour.
+            The message lists the indices of the offending geometries.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    if z_values == "allow" or geometries.size == 0:
+        return geometries
+    reported = np.arange(geometries.size) if indices is None else np.asarray(indices)
+    has_z = shapely.has_z(geometries)
+    if z_values in ("forbid", "forbidden"):
+        offending = np.flatnonzero(has_z)
+        if offending.size:
+            raise ValueError(
+                "The supplied geometries at indices "
+                f"{_format_indices(reported[offending])} have z-values. The field "
+                "does not allow this."
+            )
+    elif z_values == "required":
+        offending = np.flatnonzero(~has_z)
+        if offending.size:
+            if z_default is None:
+                raise ValueError(
+                    "The supplied geometries at indices "
+                    f"{_format_indices(reported[offending])} have no z-values. The "
+                    "field does require this."
+                )
+            geometries = geometries.copy()
+            geometries[offending] = shapely.force_3d(geometries[offending], z_default)
+    elif z_values == "strip":
+        if has_z.any():
+            geometries = geometries.copy()
+            geometries[has_z] = shapely.force_2d(geometries[has_z])
+    return geometries
+
 
+@functools.lru_cache(maxsize=None)
+def supported_types(geometry_type: typing.Any) -> typing.Tuple[type, ...]:
+    """Returns the geometry classes of a geometry annotation, i.e. the class itself or
+    the classes of a Union."""
+    if isclass(geometry_type):
+        return (geometry_type,)
+    return typing.get_args(geometry_type)
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(frozen=True)
 class GeometryField:
     """
     Annotation for geometry fields in Pydantic models. Provides methods for
     validating and serializing geometry values.
 
-    Attributes:
-        __geometry_type__: Returns the geometry type associated with the field.
+    The field is immutable and does not store the annotated geometry type, so a
+    single instance can be shared between fields and models, and schemas can be
+    built concurrently. The annotated type is captured by the validator, which is
+    generated for each field in ``__get_pydantic_core_schema__``.
 
     Methods:
         validate: Validates the geometry value.
-        serialize: Serializes the geometry value.
+        serialize: Serializes the geometry value as WKT.
+        serialize_polyline: Serializes the geometry value as an encoded polyline.
         __get_pydantic_core_schema__: Generates the core schema for the field.
         __get_pydantic_json_schema__: Generates the JSON schema for the field.
     """
 
-    if typing.TYPE_CHECKING:
-        # Type variable representing the geometry type.
-        __geometry_type__: typing.Type[BaseGeometry]  # pragma: no cover
-
     z_values: ZValues = "allow"
+    # The z-value added to geometries without z-values when z-values are required.
+    z_default: typing.Optional[float] = None
+    # The region which must cover the geometries. The region is prepared once, when
+    # the field is created, which speeds up the check for all validated geometries.
+    region: typing.Optional[BaseGeometry] = None
+    # The maximum number of vertices of the geometries. The number of vertices of
+    # WKT-strings, GeoJSON mappings and (arrays of) coordinates is checked before the
+    # geometry is constructed, so oversized payloads are rejected cheaply.
+    max_vertices: typing.Optional[int] = None
+    # The maximum width and height of the bounding box of the geometries.
+    max_bbox_size: typing.Optional[float] = None
+    validity: Validity = "allow"
+    serialization: Serialization = "wkt"
+    # The number of decimals of the coordinates of polylines.
+    polyline_precision: int = polyline.DEFAULT_PRECISION
+
+    def __post_init__(self) -> None:
+        if self.region is not None:
+            if not isinstance(self.region, BaseGeometry):
+                raise TypeError("The region must be a Shapely geometry.")
+            shapely.prepare(self.region)
+        if self.max_vertices is not None and self.max_vertices < 1:
+            raise ValueError("The maximum number of vertices must be at least 1.")
+        if self.max_bbox_size is not None and self.max_bbox_size < 0:
+            raise ValueError("The maximum size of the bounding box cannot be negative.")
+        if not 0 <= self.polyline_precision <= polyline.MAX_PRECISION:
+            raise ValueError(
+                "The precision of polylines must be between 0 and "
+                f"{polyline.MAX_PRECISION}."
+            )
+
+    def _is_polyline(self, value: str) -> bool:
+        """Returns whether a string is parsed as a polyline instead of as WKT. An empty
+        string is not a polyline, so it is rejected like any other invalid WKT."""
+        return (
+            self.serialization == "polyline"
+            and value != ""
+            and polyline.is_polyline(value)
+        )
 
     def _validate_z_values(self, value: BaseGeometry) -> BaseGeometry:
 
-        if self.z_values == "forbid" and value.has_z:
+        if self.z_values in ("forbid", "forbidden") and value.has_z:
             raise ValueError(
                 "The supplied geometry has z-values. The field does not allow this."
             )
         if self.z_values == "required" and not value.has_z:
-            raise ValueError(
-                "The supplied geometry has no z-values. The field does require this."
-            )
-        if self.z_values == "strip":
+            if self.z_default is None:
+                raise ValueError(
+                    "The supplied geometry has no z-values. The field does require this."
+                )
+            return shapely.force_3d(value, self.z_default)
+        if self.z_values == "strip" and value.has_z:
             return shapely.force_2d(value)
         # Default behavior: return the data unmodified
         return value
 
-    def validate(self, value) -> BaseGeometry:
+    def enforce_z_values(
+        self,
+        geometries: typing.Any,
+        indices: typing.Optional[typing.Sequence[int]] = None,
+    ) -> np.ndarray:
         """
-        Validates the input value and returns a validated geometry object.
+        Enforces the z-value behaviour of the field on an array of geometries, see
+        the module-level function ``enforce_z_values``.
+        """
+        return enforce_z_values(geometries, self.z_values, self.z_default, indices)
+
+    def _min_vertices(self, value: typing.Any) -> int:
+        """Returns a lower bound of the number of vertices of the input value, without
+        constructing the geometry. Returns 0 if the bound cannot be determined
+        cheaply, e.g. for WKB-values."""
+        if isinstance(value, str) and self._is_polyline(value):
+            # The last character of each value of a polyline is below "_", as are the
+            # separators of the parts and the type id.
+            data = np.frombuffer(value.encode("ascii"), dtype=np.uint8)
+            separators = (
+                value.count(polyline.PART_SEPARATOR)
+                + value.count(polyline.GROUP_SEPARATOR)
+                + value[:1].isdigit()
+            )
+            values = np.count_nonzero(data < ord("_")) - separators
+            return values // (3 if self.z_values == "required" else 2)
+        if isinstance(value, str):
+            # A WKT-string has at most one vertex more than it has commas, so it only
+            # has to be scanned when this exceeds the maximum.
+            if value.count(",") < typing.cast(int, self.max_vertices):
+                return 0
+            return _min_wkt_vertices(value)
+        if isinstance(value, np.ndarray) and value.dtype.kind in "fiu":
+            return value.shape[0] if value.ndim == 2 else int(value.ndim == 1)
+        if isinstance(value, (Mapping, list, tuple)):
+            return _count_coordinates(value)
+        return 0
+
+    def _check_vertices(self, value: typing.Any) -> None:
+        """Rejects an input value with more vertices than allowed, before the geometry
+        is constructed."""
+        if self.max_vertices is None:
+            return
+        count = self._min_vertices(value)
+        if count > self.max_vertices:
+            raise ValueError(
+                f"The supplied geometry has at least {count} vertices. The field "
+                f"allows at most {self.max_vertices} vertices."
+            )
+
+    def _validate_validity(self, value: BaseGeometry) -> BaseGeometry:
+        if self.validity == "allow" or shapely.is_valid(value):
+            return value
+        if self.validity == "require":
+            raise ValueError(
+                "The supplied geometry is not valid "
+                f"({shapely.is_valid_reason(value)}). The field does require this."
+            )
+        return shapely.make_valid(value)
+
+    def enforce_validity(
+        self,
+        geometries: typing.Any,
+        indices: typing.Optional[typing.Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Enforces the validity behaviour of the field on an array of geometries.
 
         Args:
-            value: The input value to be validated.
+            geometries: The geometries, a sequence or a numpy array.
+            indices: The indices of the geometries reported in error messages, e.g. the
+                positions in the original input. Defaults to the positions in the
+                array.
 
         Returns:
-            A validated geometry object.
+            A numpy array with the geometries, of which the invalid geometries are
+            repaired when the validity is "make_valid".
+
+        Raises:
+            ValueError: If the validity is "require" and one or more geometries are
+            not valid. The message lists the indices of the offending geometries.
+        """
+        geometries = np.asarray(geometries, dtype=object)
+        if self.validity == "allow" or not geometries.size:
+            return geometries
+        invalid = ~shapely.is_valid(geometries)
+        if not invalid.any():
+            return geometries
+        if self.validity == "require":
+            offending = np.flatnonzero(invalid)
+            reported = np.arange(len(geometries)) if indices is None else indices
+            raise ValueError(
+                "The supplied geometries at indices "
+                f"{_format_indices(np.asarray(reported)[offending])} are not valid "
+                f"({shapely.is_valid_reason(geometries[offending[0]])}). The field "
+                "does require this."
+            )
+        geometries = geometries.copy()
+        geometries[invalid] = shapely.make_valid(geometries[invalid])
+        return geometries
+
+    def _constraint_violations(
+        self, geometries: np.ndarray
+    ) -> typing.Iterator[typing.Tuple[np.ndarray, str, str]]:
+        """Yields the mask of the offending geometries for each of the constraints of
+        the field, with the description of the violation in singular and plural."""
+        if self.max_vertices is not None:
+            yield (
+                shapely.get_num_coordinates(geometries) > self.max_vertices,
+                f"has more than {self.max_vertices} vertices",
+                f"have more than {self.max_vertices} vertices",
+            )
+        if self.max_bbox_size is not None:
+            bounds = shapely.bounds(geometries)
+            size = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+            yield (
+                size > self.max_bbox_size,
+                f"has a bounding box larger than {self.max_bbox_size}",
+                f"have a bounding box larger than {self.max_bbox_size}",
+            )
+        if self.region is not None:
+            # Empty geometries are not covered by any region, but are not outside of
+            # it either.
+            outside = ~shapely.covers(self.region, geometries)
+            yield (
+                outside & ~shapely.is_empty(geometries),
+                "is not within the allowed region",
+                "are not within the allowed region",
+            )
+
+    def _validate_constraints(self, value: BaseGeometry) -> BaseGeometry:
+        constraints = (self.max_vertices, self.max_bbox_size, self.region)
+        if all(constraint is None for constraint in constraints):
+            return value
+        geometries = np.empty(1, dtype=object)
+        geometries[0] = value
+        for mask, singular, _ in self._constraint_violations(geometries):
+            if mask[0]:
+                raise ValueError(
+                    f"The supplied geometry {singular}. The field does not allow this."
+                )
+        return value
+
+    def check_constraints(
+        self,
+        geometries: typing.Any,
+        indices: typing.Optional[typing.Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Checks the region, the maximum number of vertices and the maximum size of the
+        bounding box of the field on an array of geometries at once.
+
+        Args:
+            geometries: The geometries, a sequence or a numpy array.
+            indices: The indices of the geometries reported in error messages, e.g. the
+                positions in the original input. Defaults to the positions in the
+                array.
+
+        Returns:
+            A numpy array with the (unmodified) geometries.
 
         Raises:
-            ValueError: If the input value is not a valid WKT-string or if the
-            supplied geometry is not of the expected type.
+            ValueError: If one or more geometries violate a constraint. The message
+            lists the indices of the offending geometries.
         """
+        geometries = np.asarray(geometries, dtype=object)
+        if not geometries.size:
+            return geometries
+        reported = np.arange(len(geometries)) if indices is None else indices
+        for mask, _, plural in self._constraint_violations(geometries):
+            offending = np.flatnonzero(mask)
+            if offending.size:
+                raise ValueError(
+                    "The supplied geometries at indices "
+                    f"{_format_indices(np.asarray(reported)[offending])} {plural}. The "
+                    "field does not allow this."
+                )
+        return geometries
+
+    def _parse(self, value, supported: typing.Tuple[type, ...]) -> BaseGeometry:
+        """Converts the input value to a geometry object, without checking its type.
+        The supported geometry classes are used to select the constructor."""
         # - Test whether user supplied the geometry directly
         if isinstance(value, BaseGeometry):
-            geometry = value
+            return value
+        # - convert a polyline to a object
+        if isinstance(value, str) and self._is_polyline(value):
+            return self._parse_polyline(value, supported)
         # - convert a (WKT-) string to a object
-        elif isinstance(value, str):
+        if isinstance(value, str):
+            started = instrumentation.start()
             try:
                 geometry: BaseGeometry = shapely.from_wkt(value)
             except Exception as ex:
                 raise ValueError("Supplied string is not a valid WKT-string") from ex
-        # - last resort, pass the value to the constructor of shapely
+            instrumentation.stop(started, "geometry_field.parse_wkt", geometry)
+            return geometry
+        # - convert (WKB-) bytes to a object
+        if isinstance(value, (bytes, bytearray)):
+            started = instrumentation.start()
+            try:
+                geometry = shapely.from_wkb(bytes(value))
+            except Exception as ex:
+                raise ValueError("Supplied bytes are not a valid WKB-value") from ex
+            instrumentation.stop(started, "geometry_field.parse_wkb", geometry)
+            return geometry
+        # - convert a GeoJSON mapping or an object with a __geo_interface__ (e.g. a
+        #   fiona or geopandas object) to a object
+        if isinstance(value, Mapping) or hasattr(value, "__geo_interface__"):
+            return self._parse_geo_interface(value)
+        # - convert a numpy array of coordinates with the vectorized constructors
+        if isinstance(value, np.ndarray) and value.dtype.kind in "fiu":
+            return self._parse_array(value, supported)
+        # - pass (nested) sequences to the constructor of the geometry types which
+        #   match the nesting depth of the sequence.
+        candidates = _candidates(value)
+        if candidates is not None:
+            if BaseGeometry not in supported:
+                candidates = tuple(t for t in supported if t in candidates)
         else:
-            # - get the types that are supported by the field
-            if isclass(self.__geometry_type__):
-                supported_types = [self.__geometry_type__]
-            else:
-                supported_types = typing.get_args(self.__geometry_type__)
-            # - for each type, check we can instantiate the geometry with the value
-            #   from the field
-            for t in supported_types:
-                try:
-                    geometry = t(value)
-                    break
-                except Exception:
-                    pass
-            else:
-                raise ValueError(
-                    f"Supplied value ({value}) cannot be converted to a valid geometry."
-                )
+            # - last resort, pass the value to the constructor of each of the
+            #   supported types, e.g. for coordinate sequences of Shapely.
+            candidates = supported
+        for t in candidates:
+            try:
+                return t(value)
+            except Exception:
+                pass
+        raise ValueError(
+            f"Supplied value ({value}) cannot be converted to a valid geometry."
+        )
 
-        if isclass(self.__geometry_type__):
-            # The geometry type is a class, check if the geometry is an instance of the class
-            if isinstance(geometry, self.__geometry_type__):
-                return self._validate_z_values(geometry)
+    def _parse_polyline(
+        self, value: str, supported: typing.Tuple[type, ...]
+    ) -> BaseGeometry:
+        """Converts an encoded polyline to a geometry object. The nesting of the parts
+        of the polyline and the supported geometry classes select the geometry type."""
+        started = instrumentation.start()
+        coordinates, offsets = polyline.decode(
+            value, self.polyline_precision, self.z_values == "required"
+        )
+        candidates = polyline.candidates(value)
+        if BaseGeometry not in supported:
+            candidates = tuple(t for t in supported if t in candidates)
+        for t in candidates:
+            try:
+                geometry = polyline.to_geometry(coordinates, offsets, t)
+            except ValueError:
+                continue
+            instrumentation.stop(started, "geometry_field.parse_polyline", geometry)
+            return geometry
+        raise ValueError(
+            f"Supplied polyline ({value}) cannot be converted to a valid geometry."
+        )
+
+    @staticmethod
+    def _parse_geo_interface(value: typing.Any) -> BaseGeometry:
+        """Converts a GeoJSON mapping or an object with a __geo_interface__ to a
+        geometry object. For a GeoJSON feature the geometry of the feature is used."""
+        mapping = getattr(value, "__geo_interface__", value)
+        if isinstance(mapping, Mapping) and mapping.get("type") == "Feature":
+            mapping = mapping.get("geometry")
+        try:
+            return shape(mapping)
+        except Exception as ex:
             raise ValueError(
+                "Supplied mapping is not a valid GeoJSON geometry or feature"
+            ) from ex
+
+    @staticmethod
+    def _parse_array(
+        value: np.ndarray, supported_types: typing.Tuple[type, ...]
+    ) -> BaseGeometry:
+        """Converts a numpy array of coordinates, with shape (2|3,) for a point or
+        (N, 2|3) for the other geometry types, with the vectorized constructors."""
+        if value.ndim not in (1, 2) or value.shape[-1] not in (2, 3):
+            raise ValueError(
+                f"Supplied array of shape {value.shape} is not an array of coordinates."
+            )
+        candidates = CANDIDATES_BY_DEPTH[value.ndim]
+        if BaseGeometry not in supported_types:
+            candidates = tuple(t for t in supported_types if t in candidates)
+        for t in candidates:
+            try:
+                return ARRAY_CONSTRUCTORS[t](value)
+            except Exception:
+                pass
+        raise ValueError(
+            f"Supplied array of shape {value.shape} cannot be converted to a valid "
+            "geometry."
+        )
+
+    @staticmethod
+    def _type_error(geometry: BaseGeometry, supported: typing.Tuple[type, ...]) -> str:
+        """Returns the error message for a geometry of an unexpected type."""
+        if len(supported) == 1:
+            return (
                 f"Supplied geometry ({geometry.geom_type}) is not a "
-                f"{self.__geometry_type__.__name__}."
+                f"{supported[0].__name__}."
             )
-        else:
-            # The geometry type is a Union, check if the geometry is an instance of any of the
-            # classes
-            supported_types = typing.get_args(self.__geometry_type__)
-            if any(isinstance(geometry, t) for t in supported_types):
-                return self._validate_z_values(geometry)
+        return (
+            f"Supplied geometry ({geometry.geom_type}) is not one of the expected "
+            f"types: {', '.join([t.__name__ for t in supported])}."
+        )
+
+    def _validate(self, value, supported: typing.Tuple[type, ...]) -> BaseGeometry:
+        self._check_vertices(value)
+        geometry = self._validate_validity(self._parse(value, supported))
+        if isinstance(geometry, supported):
+            return self._validate_constraints(self._validate_z_values(geometry))
+        raise ValueError(self._type_error(geometry, supported))
+
+    def validate(self, value, geometry_type: typing.Any = BaseGeometry) -> BaseGeometry:
+        """
+        Validates the input value and returns a validated geometry object.
+
+        Args:
+            value: The input value to be validated.
+            geometry_type: The annotated geometry type, a Shapely geometry class or a
+                Union of these. Defaults to any geometry.
+
+        Returns:
+            A validated geometry object.
+
+        Raises:
+            ValueError: If the input value is not a valid WKT-string (or WKB-value),
+            if the supplied geometry is not of the expected type or if it violates one
+            of the constraints of the field.
+        """
+        return self._validate(value, supported_types(geometry_type))
+
+    def validate_many(
+        self,
+        values: typing.Iterable[typing.Any],
+        geometry_type: typing.Any = BaseGeometry,
+    ) -> np.ndarray:
+        """
+        Validates a batch of input values and returns an array of validated geometry
+        objects. WKT-strings and WKB-values are parsed in bulk, the type check, the
+        z-value and validity behaviour and the constraints are applied to the whole
+        array at once.
+
+        Args:
+            values: The input values to be validated. The values may be of mixed kinds,
+                e.g. geometries and WKT-strings.
+            geometry_type: The annotated geometry type, a Shapely geometry class or a
+                Union of these. Defaults to any geometry.
+
+        Returns:
+            A numpy array with the validated geometry objects.
+
+        Raises:
+            ValueError: If one or more of the input values are invalid. The message
+            lists the indices of the offending values.
+        """
+        supported = supported_types(geometry_type)
+        values = [
+            bytes(value) if isinstance(value, bytearray) else value for value in values
+        ]
+        geometries = np.empty(len(values), dtype=object)
+        # - group the values by kind, so strings and bytes can be parsed in bulk
+        wkt = [
+            i
+            for i, value in enumerate(values)
+            if isinstance(value, str) and not self._is_polyline(value)
+        ]
+        wkb = [i for i, value in enumerate(values) if isinstance(value, bytes)]
+        # - reject values with too many vertices before parsing them
+        if self.max_vertices is not None:
+            for index, value in enumerate(values):
+                try:
+                    self._check_vertices(value)
+                except ValueError as ex:
+                    raise ValueError(f"Supplied value at index {index}: {ex}") from ex
+        for indices, parse, kind, name in (
+            (wkt, shapely.from_wkt, "WKT-strings", "geometry_field.parse_wkt"),
+            (wkb, shapely.from_wkb, "WKB-values", "geometry_field.parse_wkb"),
+        ):
+            if not indices:
+                continue
+            started = instrumentation.start()
+            parsed = parse([values[i] for i in indices], on_invalid="ignore")
+            instrumentation.stop(started, name, parsed, items=len(indices))
+            invalid = np.asarray(indices)[shapely.is_missing(parsed)]
+            if invalid.size:
+                raise ValueError(
+                    f"Supplied values at indices {_format_indices(invalid)} are not "
+                    f"valid {kind}."
+                )
+            geometries[indices] = parsed
+        parsed_in_bulk = set(wkt) | set(wkb)
+        for index, value in enumerate(values):
+            if index in parsed_in_bulk:
+                continue
+            try:
+                geometries[index] = self._parse(value, supported)
+            except ValueError as ex:
+                raise ValueError(f"Supplied value at index {index}: {ex}") from ex
+        geometries = self.enforce_validity(geometries)
+        # - check the geometry types with the type ids of Shapely
+        allowed = [type_id for t in supported for type_id in TYPE_IDS.get(t, ())]
+        offending = np.flatnonzero(~np.isin(shapely.get_type_id(geometries), allowed))
+        if offending.size:
             raise ValueError(
-                f"Supplied geometry ({geometry.geom_type}) is not one of the expected "
-                f"types: {', '.join([t.__name__ for t in supported_types])}."
+                f"Supplied geometries at indices {_format_indices(offending)} are of "
+                f"an unexpected type. "
+                f"{self._type_error(geometries[offending[0]], supported)}"
             )
+        return self.check_constraints(self.enforce_z_values(geometries))
 
     @staticmethod
     def serialize(value) -> str:
@@ -166,7 +762,34 @@ class GeometryField:
             A string representing the serialized Well-Known Text (WKT) representation
             of the geometry object.
         """
-        return shapely.to_wkt(value)
+        started = instrumentation.start()
+        cache = fragment_cache.get_cache()
+        result = shapely.to_wkt(value) if cache is None else cache.wkt(value)
+        instrumentation.stop(started, "geometry_field.write_wkt", value)
+        return result
+
+    def serialize_polyline(self, value) -> str:
+        """
+        Serialize a Shapely geometry object to an encoded polyline, with the precision
+        of the field. The z-values are included when the field requires them.
+
+        Args:
+            value: The Shapely geometry object to be serialized.
+
+        Returns:
+            The encoded polyline, see ``pydantic_shapely.polyline``. An empty Point,
+            LineString or LinearRing is serialized as WKT, as its polyline would be
+            an empty string.
+
+        Raises:
+            ValueError: If the geometry is a GeometryCollection.
+        """
+        started = instrumentation.start()
+        result = polyline.encode(
+            value, self.polyline_precision, self.z_values == "required"
+        )
+        instrumentation.stop(started, "geometry_field.write_polyline", value)
+        return result or self.serialize(value)
 
     def __get_pydantic_core_schema__(
         self, source: typing.Type[typing.Any], _: GetCoreSchemaHandler
@@ -183,12 +806,27 @@ class GeometryField:
                     "GeometryField annotation can only be applied to Shapely geometries. All types "
                     "in the Union must be a Shapely geometry."
                 )
-        self.__geometry_type__ = source
+        # The geometry type is captured by the validator (and stored in the metadata of
+        # the schema for the JSON schema), instead of being stored on the field.
+        supported = supported_types(source)
+
+        def validate(value: typing.Any) -> BaseGeometry:
+            if type(value) is _Validated:
+                if isinstance(value.geometry, supported):
+                    return value.geometry
+                raise ValueError(self._type_error(value.geometry, supported))
+            return self._validate(value, supported)
+
         return core_schema.no_info_after_validator_function(
-            self.validate,
+            validate,
             core_schema.any_schema(),
+            metadata={METADATA_KEY: source},
             serialization=core_schema.plain_serializer_function_ser_schema(
-                self.serialize,
+                (
+                    self.serialize_polyline
+                    if self.serialization == "polyline"
+                    else self.serialize
+                ),
                 info_arg=False,
                 return_schema=core_schema.any_schema(),
             ),
@@ -198,18 +836,27 @@ class GeometryField:
         self, _core_schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
     ) -> typing.Dict[str, typing.Any]:
         # Determine the example WKT string for the geometry type.
+        geometry_type = (_core_schema.get("metadata") or {}).get(
+            METADATA_KEY, BaseGeometry
+        )
         examples = [""]
-        if isclass(self.__geometry_type__):
+        if isclass(geometry_type):
             if self.z_values == "required":
-                examples = [EXAMPLES3D.get(self.__geometry_type__, "POINT Z (0 0 0)")]
+                examples = [EXAMPLES3D.get(geometry_type, "POINT Z (0 0 0)")]
             else:
-                examples = [EXAMPLES.get(self.__geometry_type__, "POINT (0 0)")]
+                examples = [EXAMPLES.get(geometry_type, "POINT (0 0)")]
         else:
-            requested_types = typing.get_args(self.__geometry_type__)
+            requested_types = typing.get_args(geometry_type)
             if self.z_values == "required":
                 examples = [EXAMPLES3D[t] for t in requested_types if t in EXAMPLES3D]
             else:
                 examples = [EXAMPLES[t] for t in requested_types if t in EXAMPLES]
+        if self.serialization == "polyline":
+            examples = [
+                self.serialize_polyline(shapely.from_wkt(example))
+                for example in examples
+                if not example.startswith("GEOMETRYCOLLECTION")
+            ]
         # Create the JSON schema for the geometry field.
         json_schema = handler(_core_schema)
         json_schema = handler.resolve_ref_schema(json_schema)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 import typing
 from inspect import isclass
 
@@ -10,15 +11,64 @@ except ImportError:
     # This import is required in Python 3.8
     from typing_extensions import Annotated  # type: ignore
 
+import numpy as np
 from pydantic import BaseModel, Field
-from shapely import to_geojson
+from pydantic_core import from_json
+from shapely import from_geojson, is_missing, to_geojson, to_wkb
 from shapely.geometry.base import BaseGeometry
 
+from . import columns, fragment_cache, instrumentation, json_backend, transport
+from .annotations import GeometryField, _format_indices, _Validated
+from .trusted import verify as verify_sample
+
 # For static type checking, whilst preventing circular import
 if typing.TYPE_CHECKING:
     from pydantic_shapely.geojson.feature import GeoJsonFeatureBaseModel
 
 
+# Lock guarding the creation of the GeoJSON data models. The models are created on
+# first access, which might happen concurrently from multiple threads.
+_GEOJSON_DATAMODEL_LOCK = threading.RLock()
+
+F = typing.TypeVar("F", bound="FeatureBaseModel")
+
+
+class _GeoJsonDataModelDescriptor:
+    """
+    Descriptor which creates the GeoJSON data model of a FeatureBaseModel on first
+    access. Creating the data model involves the creation of two Pydantic models and
+    the parametrization of a generic model, which is relatively expensive. Because
+    many feature models are never converted to GeoJSON, the creation is deferred
+    until the model is actually needed. The created model is cached on the class
+    itself, so each sub-class gets its own GeoJSON data model.
+    """
+
+    def __get__(
+        self, instance: typing.Any, owner: typing.Type["FeatureBaseModel"]
+    ) -> typing.Type["GeoJsonFeatureBaseModel"]:
+        # NOTE: the model is looked up in the __dict__ of the owner, and not with
+        # getattr, to prevent sub-classes from picking up the model of their parent.
+        model = owner.__dict__.get("__geojson_datamodel__")
+        if model is not None:
+            instrumentation.count("cache.geojson_datamodel.hit", model=owner)
+            return model
+        if owner.__geometry_field__ not in owner.model_fields:
+            raise AttributeError(
+                f"Class '{owner.__name__}' has no geometry field and therefore no "
+                "GeoJSON data model."
+            )
+        with _GEOJSON_DATAMODEL_LOCK:
+            model = owner.__dict__.get("__geojson_datamodel__")
+            if model is None:
+                # Deferred import to prevent circular import
+                from pydantic_shapely.geojson import create_geojson_datamodel
+
+                model = create_geojson_datamodel(owner, owner.__geometry_field__)
+                setattr(owner, "__geojson_datamodel__", model)
+                instrumentation.count("cache.geojson_datamodel.miss", model=owner)
+        return model
+
+
 class FeatureBaseModel(BaseModel):
     """
     Represents a Pydantic model for a GeoJSON feature.
@@ -28,15 +78,39 @@ class FeatureBaseModel(BaseModel):
 
     Class Attributes:
         GeoJsonDataModel: The Pydantic model for the GeoJSON feature, used in FastApi.
+            The model is created on first access and cached on the class.
 
     Methods:
         from_geojson_feature: Generates a model from a GeoJSON data model representation.
         as_geojson_feature: Generates a GeoJSON data model representation of the model.
         model_dump_geojson: Generates a GeoJSON representation of the model.
-        model_validate_geojson: Validate the given JSON data against the Pydantic model.
+        model_validate_geojson: Validates a GeoJSON feature (JSON) against the model.
+        model_validate_geojson_many: Validates the features of a GeoJSON feature
+            collection (JSON) against the model.
+        to_columns: Converts feature models to a mapping of numpy arrays per field.
+        from_columns: Converts a mapping of arrays per field to feature models.
+
+    Memoization:
+        When the class is defined with ``memoize_geojson=True``, the results of
+        ``to_geojson_model`` and ``model_dump_geojson`` are stored on the instance and
+        reused until a field is assigned or deleted. The memoized GeoJSON model is
+        shared between the callers and should be treated as read-only. In-place changes
+        of mutable field values (e.g. appending to a list) are not detected, call
+        ``clear_geojson_memo`` after such a change.
+
+        .. code-block:: python
+
+            class ReferenceLayer(FeatureBaseModel, memoize_geojson=True):
+                geometry: Annotated[Polygon, GeometryField()]
+                name: str
     """
 
+    # The memoized GeoJSON representations, see ``_geojson_memo``. The memo is kept in
+    # a slot, so it is not part of the fields, the equality check or the pickled state.
+    __slots__ = ("__geojson_memo__",)
+
     __geometry_field__: typing.ClassVar[str] = "geometry"
+    __memoize_geojson__: typing.ClassVar[bool] = False
 
     if typing.TYPE_CHECKING:
         # Here we provide annotations for the attributes of FeatureModel.
@@ -51,20 +125,26 @@ class FeatureBaseModel(BaseModel):
                 ),
             ]
         ]
+    else:
+        # The GeoJsonDataModel is created on first access, see the docstring of
+        # the descriptor for the rationale.
+        GeoJsonDataModel: typing.ClassVar[_GeoJsonDataModelDescriptor] = (
+            _GeoJsonDataModelDescriptor()
+        )
 
     @classmethod
     def __init_subclass__(cls, **kwargs):
         # Update the geometry field if it is defined in kwargs
         if "geometry_field" in kwargs:
             cls.__geometry_field__ = kwargs.pop("geometry_field")
+        # Update the memoization of the GeoJSON representation
+        if "memoize_geojson" in kwargs:
+            cls.__memoize_geojson__ = bool(kwargs.pop("memoize_geojson"))
         # Run init subclass from parent classes
         super().__init_subclass__(**kwargs)
 
     @classmethod
     def __pydantic_init_subclass__(cls, **kwargs):
-        # Deferred import to prevent circular import
-        from pydantic_shapely.geojson import create_geojson_datamodel
-
         # Run init subclass from parent classes
         super().__pydantic_init_subclass__(**kwargs)
         # Check whether the geometry field exists in the class
@@ -86,23 +166,410 @@ class FeatureBaseModel(BaseModel):
                     "GeometryField annotation can only be applied to Shapely geometries. All types "
                     "in the Union must be a Shapely geometry."
                 )
-        # Create the GeoJsonDataModel
-        cls.GeoJsonDataModel = create_geojson_datamodel(cls, cls.__geometry_field__)
+        # NOTE: The GeoJsonDataModel is not created here, but on first access of
+        # the class attribute. See _GeoJsonDataModelDescriptor.
+
+    @classmethod
+    def _get_geometry_field(cls) -> typing.Optional[GeometryField]:
+        """Returns the GeometryField annotation of the geometry field, or None if the
+        geometry field is not annotated with a GeometryField."""
+        for meta in cls.model_fields[cls.__geometry_field__].metadata:
+            if isinstance(meta, GeometryField):
+                return meta
+        return None
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        super().__setattr__(name, value)
+        if self.__memoize_geojson__:
+            self.clear_geojson_memo()
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        if self.__memoize_geojson__:
+            self.clear_geojson_memo()
+
+    def _geojson_memo(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """Returns the memo of the GeoJSON representations of this instance, or None
+        if memoization is disabled for the class."""
+        if not self.__memoize_geojson__:
+            return None
+        try:
+            return self.__geojson_memo__  # type: ignore[attr-defined]
+        except AttributeError:
+            memo: typing.Dict[str, typing.Any] = {}
+            object.__setattr__(self, "__geojson_memo__", memo)
+            return memo
 
-    def to_geojson_model(self) -> "GeoJsonFeatureBaseModel":
+    def clear_geojson_memo(self) -> None:
+        """Removes the memoized GeoJSON representations of this instance. This is done
+        automatically when a field is assigned or deleted."""
+        try:
+            object.__delattr__(self, "__geojson_memo__")
+        except AttributeError:
+            pass
+
+    def __reduce_ex__(self, protocol: typing.SupportsIndex) -> typing.Any:
+        # Compact pickling: the geometry as WKB and the other fields as a tuple, see
+        # ``pydantic_shapely.transport``.
+        state = transport.model_state(self, self.__geometry_field__)
+        if state is None:
+            return super().__reduce_ex__(protocol)
+        return (
+            transport.restore_feature,
+            (
+                transport.class_reference(type(self)),
+                to_wkb(getattr(self, self.__geometry_field__), include_srid=True),
+                *state,
+            ),
+        )
+
+    def to_geojson_model(self, trusted: bool = False) -> "GeoJsonFeatureBaseModel":
         """
         Converts the GeoJSON feature to the FeatureModel this class has been
         based off.
+
+        Args:
+            trusted: Whether to create the GeoJSON model without validation, see
+                ``construct_geojson_models`` and ``pydantic_shapely.trusted``.
         """
+        memo = self._geojson_memo()
+        if memo is not None:
+            if "model" in memo:
+                instrumentation.count("cache.feature_geojson.hit", model=type(self))
+                return memo["model"]
+            instrumentation.count("cache.feature_geojson.miss", model=type(self))
+        if trusted:
+            result = type(self).construct_geojson_models([self])[0]
+            if memo is not None:
+                memo["model"] = result
+            return result
+        started = instrumentation.start()
+        geometry = getattr(self, self.__geometry_field__)
         # Cast the model to the GeoJsonDataModel
-        return self.GeoJsonDataModel(
+        result = self.GeoJsonDataModel(
             type="Feature",
-            geometry=json.loads(to_geojson(getattr(self, self.__geometry_field__))),
-            properties=self.model_dump(exclude={"geometry"}),
+            geometry=json_backend.get_backend().loads(to_geojson(geometry)),
+            properties=self.model_dump(exclude={self.__geometry_field__}),
+        )
+        instrumentation.stop(
+            started, "feature.to_geojson_model", geometry, model=type(self)
+        )
+        if memo is not None:
+            memo["model"] = result
+        return result
+
+    @classmethod
+    def construct_geojson_models(
+        cls, features: typing.Sequence["FeatureBaseModel"]
+    ) -> typing.List["GeoJsonFeatureBaseModel"]:
+        """
+        Converts trusted feature models of this class to their GeoJSON models, without
+        validation. The geometries are converted at once with the vectorized functions
+        of Shapely and the models are created like ``model_construct``. The GeoJSON
+        models share the values of the properties with the feature models.
+
+        Args:
+            features: The feature models, instances of this class.
+
+        Returns:
+            The GeoJSON models, equal to the results of ``to_geojson_model``.
+
+        Raises:
+            ValueError: If a sample rate is set (see ``pydantic_shapely.trusted``) and
+            one of the sampled GeoJSON models is not valid.
+        """
+        # Deferred import to prevent circular import
+        from pydantic_shapely.geojson.geometry import (
+            construct_geojson_geometries,
+            geometry_mapping,
+        )
+
+        started = instrumentation.start()
+        geojson_model = cls.GeoJsonDataModel
+        properties_model = geojson_model.model_fields["properties"].annotation
+        names = tuple(properties_model.model_fields)
+        # The properties are created from all fields, like ``model_dump``.
+        mask = (1 << len(names)) - 1
+        geometry_field = cls._get_geometry_field()
+        geometries = construct_geojson_geometries(
+            [getattr(feature, cls.__geometry_field__) for feature in features],
+            geometry_mapping(
+                "allow" if geometry_field is None else geometry_field.z_values
+            ),
+        )
+        result = [
+            transport.construct(
+                geojson_model,
+                (
+                    "Feature",
+                    geometry,
+                    transport.construct(
+                        properties_model,
+                        tuple(feature.__dict__[name] for name in names),
+                        mask,
+                    ),
+                ),
+                0b111,
+            )
+            for feature, geometry in zip(features, geometries)
+        ]
+        verify_sample(result)
+        instrumentation.stop(
+            started, "feature.construct_geojson_models", model=cls, items=len(result)
+        )
+        return result
+
+    def _geojson_bytes(self, geometry_fragment: typing.Optional[bytes] = None) -> bytes:
+        """Returns the GeoJSON feature as UTF-8 encoded bytes. The geometry is written
+        by Shapely (or taken from the fragment cache, see ``fragment_cache``) and the
+        properties by Pydantic, the fragments are spliced without being parsed again.
+
+        Args:
+            geometry_fragment: The GeoJSON of the geometry, when already written.
+        """
+        memo = self._geojson_memo()
+        if memo is not None:
+            if "bytes" in memo:
+                instrumentation.count("cache.feature_geojson.hit", model=type(self))
+                return memo["bytes"]
+            instrumentation.count("cache.feature_geojson.miss", model=type(self))
+        if geometry_fragment is None:
+            geometry = getattr(self, self.__geometry_field__)
+            cache = fragment_cache.get_cache()
+            geometry_fragment = (
+                to_geojson(geometry).encode("utf-8")
+                if cache is None
+                else cache.geojson(geometry)
+            )
+        result = json_backend.splice_feature(
+            geometry_fragment,
+            self.__pydantic_serializer__.to_json(
+                self, exclude={self.__geometry_field__}
+            ),
+        )
+        if memo is not None:
+            memo["bytes"] = result
+        return result
+
+    @classmethod
+    def model_validate_geojson(
+        cls: typing.Type[F],
+        json_data: typing.Union[str, bytes, bytearray],
+        *,
+        strict: typing.Optional[bool] = None,
+        context: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> F:
+        """
+        Validates a GeoJSON feature against the model. The result is equal to
+        ``cls.GeoJsonDataModel.model_validate_json(json_data).to_feature_model()``,
+        but the GeoJSON data model is not created: the JSON is parsed by pydantic-core,
+        the geometry is read by Shapely and the properties are validated by the model.
+
+        Args:
+            json_data: The GeoJSON feature, a string or UTF-8 encoded bytes.
+            strict: Whether to validate the properties in strict mode.
+            context: The context passed to the validators of the model.
+
+        Returns:
+            The validated model.
+
+        Raises:
+            ValueError: If the data is not a GeoJSON feature, or if the geometry is not
+            valid GeoJSON.
+            ValidationError: If the geometry or the properties are not valid for the
+            model.
+        """
+        started = instrumentation.start()
+        geometry_json, properties = _split_feature(from_json(json_data))
+        try:
+            geometry = from_geojson(geometry_json)
+        except Exception as ex:
+            raise ValueError(
+                "Supplied geometry is not a valid GeoJSON geometry"
+            ) from ex
+        result = cls._from_geometry(geometry, properties, strict, context)
+        instrumentation.stop(
+            started, "feature.model_validate_geojson", geometry, model=cls
+        )
+        return result
+
+    @classmethod
+    def model_validate_geojson_many(
+        cls: typing.Type[F],
+        json_data: typing.Union[str, bytes, bytearray],
+        *,
+        strict: typing.Optional[bool] = None,
+        context: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> typing.List[F]:
+        """
+        Validates the features of a GeoJSON feature collection (or a JSON array of
+        GeoJSON features) against the model. The geometries are read by Shapely in
+        bulk and validated by the geometry field at once, see ``model_validate_geojson``
+        and ``GeometryField.validate_many``.
+
+        Args:
+            json_data: The GeoJSON feature collection or array of features, a string
+                or UTF-8 encoded bytes.
+            strict: Whether to validate the properties in strict mode.
+            context: The context passed to the validators of the model.
+
+        Returns:
+            A list with the validated models, in the order of the features.
+
+        Raises:
+            ValueError: If the data is not a feature collection or an array of features,
+            or if one or more geometries are not valid. The message lists the indices
+            of the offending features.
+            ValidationError: If the properties of a feature are not valid for the
+            model.
+        """
+        started = instrumentation.start()
+        data = from_json(json_data)
+        if isinstance(data, dict) and data.get("type") == "FeatureCollection":
+            data = data.get("features")
+        if not isinstance(data, list):
+            raise ValueError(
+                "Supplied data is not a GeoJSON feature collection or an array of "
+                "GeoJSON features"
+            )
+        geometries_json: typing.List[bytes] = []
+        properties: typing.List[typing.Dict[str, typing.Any]] = []
+        for index, feature in enumerate(data):
+            try:
+                geometry_json, feature_properties = _split_feature(feature)
+            except ValueError as ex:
+                raise ValueError(f"Supplied value at index {index}: {ex}") from ex
+            geometries_json.append(geometry_json)
+            properties.append(feature_properties)
+        geometries = from_geojson(geometries_json, on_invalid="ignore")
+        invalid = np.flatnonzero(is_missing(geometries))
+        if invalid.size:
+            raise ValueError(
+                f"Supplied geometries at indices {_format_indices(invalid)} are not "
+                "valid GeoJSON geometries."
+            )
+        geometry_field = cls._get_geometry_field()
+        if geometry_field is not None:
+            geometries = [
+                _Validated(geometry)
+                for geometry in geometry_field.validate_many(
+                    geometries, cls.model_fields[cls.__geometry_field__].annotation
+                )
+            ]
+        result = [
+            cls._from_geometry(geometry, feature_properties, strict, context)
+            for geometry, feature_properties in zip(geometries, properties)
+        ]
+        instrumentation.stop(
+            started, "feature.model_validate_geojson_many", model=cls, items=len(result)
+        )
+        return result
+
+    @classmethod
+    def to_columns(
+        cls, features: typing.Sequence["FeatureBaseModel"]
+    ) -> typing.Dict[str, np.ndarray]:
+        """
+        Converts feature models of this class to columns: a mapping of the name of
+        each field to a numpy array with the values of the field. The geometries are
+        stored in an object array, the dtypes of the other columns follow from the
+        annotations of the fields, see ``pydantic_shapely.columns``.
+
+        Args:
+            features: The feature models, instances of this class.
+
+        Returns:
+            The columns, in the order of the fields.
+        """
+        return columns.to_columns(cls, features)
+
+    @classmethod
+    def from_columns(
+        cls: typing.Type[F],
+        data: typing.Mapping[str, typing.Any],
+        *,
+        trusted: bool = False,
+        strict: typing.Optional[bool] = None,
+        context: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> typing.List[F]:
+        """
+        Converts columns, as returned by ``to_columns``, to feature models. The values
+        of the columns are converted to Python objects for each column at once and the
+        geometries are validated at once by the geometry field, see
+        ``GeometryField.validate_many``.
+
+        Args:
+            data: The columns, a mapping of field names to numpy arrays or sequences
+                of equal length. Columns of fields with a default may be left out.
+            trusted: Whether to create the models without validation, see
+                ``pydantic_shapely.trusted``.
+            strict: Whether to validate the fields in strict mode.
+            context: The context passed to the validators of the model.
+
+        Returns:
+            A list with the models, in the order of the rows.
+
+        Raises:
+            ValueError: If a column is not a field of the model, if the geometry column
+            is missing or if the columns differ in length, or if one or more geometries
+            are not valid.
+            ValidationError: If the values of a row are not valid for the model.
+        """
+        return columns.from_columns(cls, data, trusted, strict, context)
+
+    @classmethod
+    def _from_geometry(
+        cls: typing.Type[F],
+        geometry: typing.Any,
+        properties: typing.Dict[str, typing.Any],
+        strict: typing.Optional[bool],
+        context: typing.Optional[typing.Dict[str, typing.Any]],
+    ) -> F:
+        """Validates the model from the (already converted) Shapely geometry, or a
+        geometry which has been validated in bulk, and the properties of a GeoJSON
+        feature."""
+        return cls.model_validate(
+            {**properties, cls.__geometry_field__: geometry},
+            strict=strict,
+            context=context,
         )
 
     def model_dump_geojson(self) -> str:
         """
-        Dumps the model to a GeoJson string.
+        Dumps the model to a GeoJson string. The result is equal to
+        ``self.to_geojson_model().model_dump_json()``, but the GeoJSON data model is
+        not created.
         """
-        return self.to_geojson_model().model_dump_json()
+        started = instrumentation.start()
+        result = self._geojson_bytes().decode("utf-8")
+        instrumentation.stop(
+            started,
+            "feature.model_dump_geojson",
+            getattr(self, self.__geometry_field__),
+            model=type(self),
+        )
+        return result
+
+
+def _split_feature(
+    feature: typing.Any,
+) -> typing.Tuple[bytes, typing.Dict[str, typing.Any]]:
+    """Splits a parsed GeoJSON feature in the GeoJSON of its geometry, written again as
+    bytes for the GeoJSON reader of Shapely, and its properties."""
+    if not isinstance(feature, dict) or feature.get("type") != "Feature":
+        raise ValueError("Supplied value is not a GeoJSON feature")
+    geometry = feature.get("geometry")
+    if not isinstance(geometry, dict):
+        raise ValueError("Supplied feature has no geometry")
+    properties = feature.get("properties")
+    if properties is None:
+        properties = {}
+    elif not isinstance(properties, dict):
+        raise ValueError("Supplied properties of the feature are not an object")
+    try:
+        geometry_json = json_backend.get_backend().dumps(geometry)
+    except (TypeError, ValueError, OverflowError):
+        # The faster backends do not encode all valid JSON, e.g. orjson rejects
+        # integers beyond 64 bits.
+        geometry_json = json.dumps(geometry).encode("utf-8")
+    return geometry_json, properties
@@ -0,0 +1,189 @@
+"""
+Conversion between feature models and columns, i.e. a mapping of the field names to
+numpy arrays, for handing large collections to numpy or pandas code:
+
+.. code-block:: python
+
+    columns = MyFeature.to_columns(features)
+    columns["geometry"]  # an object array with the Shapely geometries
+    frame = pandas.DataFrame(columns)
+    features = MyFeature.from_columns(columns)
+
+The dtype of each column follows from the annotation of the field: ``bool``, ``int``
+and ``float`` fields are stored in ``bool``, ``int64`` and ``float64`` arrays. An
+optional ``float`` field is stored in a ``float64`` array as well, with NaN for None,
+which is converted back to None by ``from_columns``. All other fields, including the
+geometry field and optional ``bool`` and ``int`` fields, are stored in object arrays.
+When the values of a field do not fit in the dtype of its annotation (e.g. an integer
+which exceeds 64 bits, or a value of a model created without validation), the column
+falls back to an object array.
+"""
+
+import types
+import typing
+
+import numpy as np
+
+from . import instrumentation, transport
+from .annotations import _Validated
+from .trusted import verify as verify_sample
+
+if typing.TYPE_CHECKING:
+    from .base import FeatureBaseModel
+
+F = typing.TypeVar("F", bound="FeatureBaseModel")
+
+# The dtypes of the columns of fields annotated with a scalar type.
+_DTYPES: typing.Dict[typing.Any, np.dtype] = {
+    bool: np.dtype(np.bool_),
+    int: np.dtype(np.int64),
+    float: np.dtype(np.float64),
+}
+# The classes of the unions, ``typing.Optional[float]`` and ``float | None``.
+_UNIONS = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+
+def _is_optional_float(annotation: typing.Any) -> bool:
+    if typing.get_origin(annotation) not in _UNIONS:
+        return False
+    return set(typing.get_args(annotation)) == {float, type(None)}
+
+
+def column_dtype(annotation: typing.Any) -> np.dtype:
+    """Returns the dtype of the column of a field with the annotation."""
+    if _is_optional_float(annotation):
+        return _DTYPES[float]
+    return _DTYPES.get(annotation, np.dtype(object))
+
+
+def _object_array(values: typing.Sequence[typing.Any]) -> np.ndarray:
+    """Returns an object array with the values. The values are assigned one by one, so
+    sequences (e.g. the values of list fields) are not turned into a dimension."""
+    result = np.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        result[index] = value
+    return result
+
+
+def _column(values: typing.List[typing.Any], dtype: np.dtype) -> np.ndarray:
+    if dtype.kind == "O":
+        return _object_array(values)
+    if dtype.kind == "f":
+        values = [np.nan if value is None else value for value in values]
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError, OverflowError):
+        return _object_array(values)
+
+
+def to_columns(
+    cls: typing.Type["FeatureBaseModel"], features: typing.Sequence["FeatureBaseModel"]
+) -> typing.Dict[str, np.ndarray]:
+    """
+    Converts feature models to columns, see ``FeatureBaseModel.to_columns``.
+    """
+    started = instrumentation.start()
+    result = {}
+    for name, field in cls.model_fields.items():
+        values = [feature.__dict__[name] for feature in features]
+        if name == cls.__geometry_field__:
+            result[name] = _object_array(values)
+        else:
+            result[name] = _column(values, column_dtype(field.annotation))
+    instrumentation.stop(started, "feature.to_columns", model=cls, items=len(features))
+    return result
+
+
+def _values(column: typing.Any, annotation: typing.Any) -> typing.List[typing.Any]:
+    """Returns the values of a column as Python objects."""
+    if not isinstance(column, np.ndarray):
+        return list(column)
+    if column.dtype.kind == "f" and _is_optional_float(annotation):
+        missing = np.isnan(column)
+        if missing.any():
+            column = column.astype(object)
+            column[missing] = None
+    return column.tolist()
+
+
+def from_columns(
+    cls: typing.Type[F],
+    columns: typing.Mapping[str, typing.Any],
+    trusted: bool = False,
+    strict: typing.Optional[bool] = None,
+    context: typing.Optional[typing.Dict[str, typing.Any]] = None,
+) -> typing.List[F]:
+    """
+    Converts columns to feature models, see ``FeatureBaseModel.from_columns``.
+    """
+    started = instrumentation.start()
+    unknown = [name for name in columns if name not in cls.model_fields]
+    if unknown:
+        raise ValueError(
+            f"Supplied columns {', '.join(unknown)} are not fields of the model "
+            f"'{cls.__name__}'."
+        )
+    if cls.__geometry_field__ not in columns:
+        raise ValueError(
+            f"Supplied columns have no geometry column '{cls.__geometry_field__}'."
+        )
+    lengths = {name: len(column) for name, column in columns.items()}
+    count = lengths[cls.__geometry_field__]
+    if any(length != count for length in lengths.values()):
+        raise ValueError(
+            "Supplied columns differ in length: "
+            + ", ".join(f"{name} ({length})" for name, length in lengths.items())
+            + "."
+        )
+    geometries = columns[cls.__geometry_field__]
+    if not trusted:
+        geometry_field = cls._get_geometry_field()
+        if geometry_field is not None:
+            # Marked as validated, so the models do not validate them again.
+            geometries = [
+                _Validated(geometry)
+                for geometry in geometry_field.validate_many(
+                    geometries, cls.model_fields[cls.__geometry_field__].annotation
+                )
+            ]
+    values = {
+        name: _values(column, cls.model_fields[name].annotation)
+        for name, column in columns.items()
+        if name != cls.__geometry_field__
+    }
+    values[cls.__geometry_field__] = list(geometries)
+    if trusted:
+        result = _construct(cls, values, count)
+    else:
+        names = list(values)
+        result = [
+            cls.model_validate(dict(zip(names, row)), strict=strict, context=context)
+            for row in zip(*values.values())
+        ]
+    instrumentation.stop(started, "feature.from_columns", model=cls, items=count)
+    return result
+
+
+def _construct(
+    cls: typing.Type[F], values: typing.Dict[str, typing.List[typing.Any]], count: int
+) -> typing.List[F]:
+    """Creates the models from the values of the columns without validation. The fields
+    without a column get their default value and are not part of the fields set."""
+    rows = []
+    mask = 0
+    for bit, (name, field) in enumerate(cls.model_fields.items()):
+        if name in values:
+            rows.append(values[name])
+            mask |= 1 << bit
+        elif field.is_required():
+            raise ValueError(f"Supplied columns have no column '{name}'.")
+        else:
+            rows.append(
+                [field.get_default(call_default_factory=True) for _ in range(count)]
+            )
+    result = [transport.construct(cls, row, mask) for row in zip(*rows)]
+    verify_sample(result)
+    return result
+
+
+__all__ = ["column_dtype", "from_columns", "to_columns"]
@@ -0,0 +1,264 @@
+"""
+Process-wide, content-addressed cache of serialized geometry fragments.
+
+Different feature models often carry identical geometries, e.g. shared parcels or
+boundaries. The cache maps the digest of the WKB of a geometry to its serialized
+GeoJSON or WKT fragment, so the fragment is written only once. The WKB of a geometry is
+much cheaper to write than its GeoJSON or WKT representation, as no floats have to be
+formatted.
+
+The cache is disabled by default. When enabled, it is used by
+``FeatureBaseModel.model_dump_geojson``, by
+``GeoJsonFeatureCollectionBaseModel.dump_feature_models`` and by the WKT serializer of
+the ``GeometryField``:
+
+.. code-block:: python
+
+    from pydantic_shapely import fragment_cache
+
+    fragment_cache.enable(max_bytes=128 * 1024 * 1024, normalize=True)
+    ...
+    print(fragment_cache.get_cache().statistics())
+
+With ``normalize=True`` the key is calculated from the normalized geometry (see
+``shapely.normalize``), so geometries which only differ in the order of their vertices
+or parts share a fragment. The fragment is written from the first geometry which is
+cached, so the output may differ in vertex order from the serialized geometry.
+
+Geometries with fewer than ``min_coordinates`` coordinates are not cached, as writing
+them is cheaper than calculating their key.
+"""
+
+import collections
+import dataclasses
+import hashlib
+import threading
+import typing
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from . import instrumentation
+
+Fragment = typing.Union[bytes, str]
+
+# Writers of the supported fragment formats, both for a single geometry and in bulk.
+_WRITERS: typing.Dict[str, typing.Callable[[typing.Any], typing.Any]] = {
+    "geojson": lambda geometries: [
+        fragment.encode("utf-8") for fragment in shapely.to_geojson(geometries)
+    ],
+    "wkt": shapely.to_wkt,
+}
+
+# Estimated number of bytes used per entry, besides the fragment itself (the key, the
+# entry in the ordered dictionary and the object headers).
+ENTRY_OVERHEAD = 150
+
+
+@dataclasses.dataclass
+class CacheStatistics:
+    """The statistics of a fragment cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # Fragments which were not stored, as they are larger than ``max_entry_bytes``.
+    rejected: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The ratio of lookups which were served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class FragmentCache:
+    """
+    A bounded, thread-safe LRU cache of serialized geometry fragments, keyed on the
+    digest of the WKB of the geometry.
+
+    Args:
+        max_bytes: The maximum size of the cache in bytes. The least recently used
+            fragments are evicted when the size is exceeded.
+        max_entry_bytes: The maximum size of a single fragment. Larger fragments are
+            not stored. Defaults to a quarter of ``max_bytes``.
+        normalize: Whether to normalize the geometries before calculating the key.
+        min_coordinates: The minimum number of coordinates of a geometry to be cached.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: typing.Optional[int] = None,
+        normalize: bool = False,
+        min_coordinates: int = 32,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("The maximum size of the cache must be at least 1 byte.")
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = (
+            max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        )
+        self.normalize = normalize
+        self.min_coordinates = min_coordinates
+        self._lock = threading.Lock()
+        self._entries: "collections.OrderedDict[bytes, Fragment]" = (
+            collections.OrderedDict()
+        )
+        self._stats = CacheStatistics(max_bytes=max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _keys(self, geometries: np.ndarray, fmt: str) -> typing.List[bytes]:
+        """Returns the keys of the geometries for the format."""
+        if self.normalize:
+            geometries = shapely.normalize(geometries)
+        suffix = fmt.encode("ascii")
+        return [
+            hashlib.blake2b(wkb, digest_size=16).digest() + suffix
+            for wkb in shapely.to_wkb(geometries, output_dimension=3)
+        ]
+
+    def _store(self, key: bytes, fragment: Fragment) -> None:
+        """Stores the fragment, the lock must be held by the caller."""
+        size = len(fragment) + ENTRY_OVERHEAD
+        if size > self.max_entry_bytes:
+            self._stats.rejected += 1
+            return
+        if key in self._entries:
+            return
+        self._entries[key] = fragment
+        self._stats.bytes += size
+        while self._stats.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.bytes -= len(evicted) + ENTRY_OVERHEAD
+            self._stats.evictions += 1
+
+    def get_many(
+        self, geometries: typing.Sequence[BaseGeometry], fmt: str = "geojson"
+    ) -> typing.List[Fragment]:
+        """
+        Returns the fragments of the geometries. The fragments of the geometries which
+        are not cached are written in bulk and stored.
+
+        Args:
+            geometries: The geometries.
+            fmt: The format of the fragments, ``geojson`` (UTF-8 encoded bytes) or
+                ``wkt`` (strings).
+
+        Returns:
+            The fragments, in the order of the geometries.
+        """
+        if fmt not in _WRITERS:
+            raise ValueError(
+                f"Unsupported fragment format '{fmt}'. Supported formats are: "
+                f"{', '.join(_WRITERS)}."
+            )
+        writer = _WRITERS[fmt]
+        geometries = np.asarray(geometries, dtype=object)
+        result: typing.List[typing.Optional[Fragment]] = [None] * len(geometries)
+        # Small geometries are written directly, without calculating their key.
+        cacheable = shapely.get_num_coordinates(geometries) >= self.min_coordinates
+        small = np.flatnonzero(~cacheable)
+        if small.size:
+            for index, fragment in zip(small, writer(geometries[small])):
+                result[index] = fragment
+        candidates = np.flatnonzero(cacheable)
+        if not candidates.size:
+            return typing.cast(typing.List[Fragment], result)
+
+        keys = self._keys(geometries[candidates], fmt)
+        # The indices of the geometries which are not cached, per key. Geometries
+        # which occur more than once in the batch are written only once.
+        missing: typing.Dict[bytes, typing.List[int]] = {}
+        with self._lock:
+            for index, key in zip(candidates, keys):
+                if key in missing:
+                    missing[key].append(index)
+                    continue
+                fragment = self._entries.get(key)
+                if fragment is None:
+                    missing[key] = [index]
+                else:
+                    self._entries.move_to_end(key)
+                    result[index] = fragment
+            self._stats.hits += len(candidates) - len(missing)
+            self._stats.misses += len(missing)
+        if len(missing) < len(candidates):
+            instrumentation.count(
+                "cache.fragments.hit", items=len(candidates) - len(missing)
+            )
+        if missing:
+            instrumentation.count("cache.fragments.miss", items=len(missing))
+            written = writer(geometries[[indices[0] for indices in missing.values()]])
+            with self._lock:
+                for (key, indices), fragment in zip(missing.items(), written):
+                    for index in indices:
+                        result[index] = fragment
+                    self._store(key, fragment)
+        return typing.cast(typing.List[Fragment], result)
+
+    def get(self, geometry: BaseGeometry, fmt: str = "geojson") -> Fragment:
+        """Returns the fragment of a single geometry, see ``get_many``."""
+        return self.get_many([geometry], fmt)[0]
+
+    def geojson(self, geometry: BaseGeometry) -> bytes:
+        """Returns the GeoJSON of the geometry as UTF-8 encoded bytes."""
+        return typing.cast(bytes, self.get(geometry, "geojson"))
+
+    def wkt(self, geometry: BaseGeometry) -> str:
+        """Returns the WKT of the geometry."""
+        return typing.cast(str, self.get(geometry, "wkt"))
+
+    def clear(self) -> None:
+        """Removes all fragments from the cache and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStatistics(max_bytes=self.max_bytes)
+
+    def statistics(self) -> CacheStatistics:
+        """Returns a copy of the statistics of the cache."""
+        with self._lock:
+            return dataclasses.replace(self._stats, entries=len(self._entries))
+
+
+_CACHE: typing.Optional[FragmentCache] = None
+
+
+def get_cache() -> typing.Optional[FragmentCache]:
+    """Returns the process-wide cache, or None if the cache is disabled."""
+    return _CACHE
+
+
+def set_cache(cache: typing.Optional[FragmentCache]) -> None:
+    """Sets the process-wide cache. Pass None to disable the cache."""
+    global _CACHE  # pylint: disable=global-statement
+    _CACHE = cache
+
+
+def enable(**kwargs: typing.Any) -> FragmentCache:
+    """Creates a new process-wide cache, the keyword arguments are passed to
+    ``FragmentCache``. Returns the new cache."""
+    cache = FragmentCache(**kwargs)
+    set_cache(cache)
+    return cache
+
+
+def disable() -> None:
+    """Disables the process-wide cache."""
+    set_cache(None)
+
+
+__all__ = [
+    "CacheStatistics",
+    "FragmentCache",
+    "disable",
+    "enable",
+    "get_cache",
+    "set_cache",
+]
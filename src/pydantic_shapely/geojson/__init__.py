@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import typing
 from inspect import isclass
 
@@ -10,7 +11,34 @@ from pydantic_shapely import FeatureBaseModel, GeometryField
 
 from .feature import GeoJsonFeatureBaseModel
 from .feature_collection import GeoJsonFeatureCollectionBaseModel
-from .geometry import MAPPING, MAPPING_2D, MAPPING_3D
+from .geometry import geometry_mapping
+from .limits import PayloadLimits, PayloadTooLargeError
+from .point_collection import PointCollection
+
+
+@functools.lru_cache(maxsize=None)
+def _geojson_feature_base(
+    annotation: typing.Any, z_values: str
+) -> typing.Type[GeoJsonFeatureBaseModel[typing.Any]]:
+    """Returns the parametrized GeoJsonFeatureBaseModel for the given annotation of
+    the geometry field and the behaviour for z-values.
+
+    The result is cached, so all feature models with the same geometry signature
+    share the same parametrized generic model (and its core schema).
+    """
+    mapping = geometry_mapping(z_values)
+    # Select the correct field_type
+    field_type: object
+    if isclass(annotation):
+        # NOTE: the field_type is always an Union. In case the annotation is a
+        # class, the Union will be collapsed to the sole field type. At least
+        # mypy is happy now.
+        field_type = typing.Union[mapping[annotation]]
+    else:
+        field_type = typing.Union[
+            tuple(mapping[arg] for arg in typing.get_args(annotation))
+        ]
+    return GeoJsonFeatureBaseModel[field_type]  # type: ignore
 
 
 def create_geojson_datamodel(
@@ -30,26 +58,6 @@ def create_geojson_datamodel(
         if isinstance(meta, GeometryField):
             z_values = meta.z_values
             break
-    # Select the correct mapping
-    if z_values in ["strip", "forbidden"]:
-        mapping = MAPPING_2D
-    elif z_values == "required":
-        mapping = MAPPING_3D
-    else:
-        mapping = MAPPING
-    # Select the correct field_type
-    field_type: object
-    if isclass(geometry_field_info.annotation):
-        # NOTE: the field_type is always an Union. In case the annotation is a
-        # class, the Union will be collapsed to the sole field type. At least
-        # mypy is happy now.
-        field_type = typing.Union[mapping[geometry_field_info.annotation]]
-    else:
-        field_type = typing.Union[
-            tuple(
-                mapping[arg] for arg in typing.get_args(geometry_field_info.annotation)
-            )
-        ]
     # Create the fields and the property model
     fields: typing.Dict[str, typing.Any] = {
         key: (value.annotation, value)
@@ -66,7 +74,7 @@ def create_geojson_datamodel(
     # class, so it is not possible to infer the base class at runtime.
     geo_json = create_model(
         feature_cls.__name__ + "GeoJsonFeature",  # type: ignore[attr-defined]
-        __base__=GeoJsonFeatureBaseModel[field_type],  # type: ignore
+        __base__=_geojson_feature_base(geometry_field_info.annotation, z_values),
         __doc__=feature_cls.__doc__,
         properties=(property_model, ...),
     )
@@ -78,4 +86,7 @@ __all__ = [
     "create_geojson_datamodel",
     "GeoJsonFeatureBaseModel",
     "GeoJsonFeatureCollectionBaseModel",
+    "PayloadLimits",
+    "PayloadTooLargeError",
+    "PointCollection",
 ]
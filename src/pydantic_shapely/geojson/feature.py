@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import typing
 
 try:
@@ -8,60 +9,93 @@ except ImportError:
     # This import is required in Python 3.8
     from typing_extensions import Annotated  # type: ignore
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+    TypeAdapter,
+)
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import CoreSchema, core_schema
 from shapely import from_geojson
 
+from pydantic_shapely import instrumentation, transport
 from pydantic_shapely.base import FeatureBaseModel
-from pydantic_shapely.geojson.geometry import (  # GeometryCollection2D,; GeometryCollection3D,; GeometryCollection,
-    LineString,
-    LineString2D,
-    LineString3D,
-    MultiLineString,
-    MultiLineString2D,
-    MultiLineString3D,
-    MultiPoint,
-    MultiPoint2D,
-    MultiPoint3D,
-    MultiPolygon,
-    MultiPolygon2D,
-    MultiPolygon3D,
-    Point,
-    Point2D,
-    Point3D,
-    Polygon,
-    Polygon2D,
-    Polygon3D,
-)
+from pydantic_shapely.geojson.geometry._base import GeometryBase
 
-S = typing.TypeVar(
-    "S",
-    Point2D,
-    Point3D,
-    Point,
-    MultiPoint2D,
-    MultiPoint3D,
-    MultiPoint,
-    LineString2D,
-    LineString3D,
-    LineString,
-    MultiLineString2D,
-    MultiLineString3D,
-    MultiLineString,
-    Polygon2D,
-    Polygon3D,
-    Polygon,
-    MultiPolygon2D,
-    MultiPolygon3D,
-    MultiPolygon,
-    # GeometryCollection2D,
-    # GeometryCollection3D,
-    # GeometryCollection,
-)
+# The geometry models of the geometry of an unparametrized feature model, in the order in
+# which they were the constraints of the type variable of the feature model.
+_GEOMETRY_MODELS = [
+    f"{geometry_type}{suffix}"
+    for geometry_type in (
+        "Point",
+        "MultiPoint",
+        "LineString",
+        "MultiLineString",
+        "Polygon",
+        "MultiPolygon",
+    )
+    for suffix in ("2D", "3D", "")
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _geometry_models_adapter() -> TypeAdapter:
+    """Returns the adapter of the union of the geometry models of the geometry of an
+    unparametrized feature model."""
+    from pydantic_shapely.geojson import geometry
+
+    models = tuple(getattr(geometry, name) for name in _GEOMETRY_MODELS)
+    return TypeAdapter(typing.Union[models])  # type: ignore[valid-type]
+
+
+def _serialize_geometry_model(
+    value: typing.Any, info: core_schema.SerializationInfo
+) -> typing.Any:
+    return _geometry_models_adapter().dump_python(
+        value,
+        mode="json" if info.mode_is_json() else "python",
+        by_alias=bool(info.by_alias),
+        exclude_none=info.exclude_none,
+    )
+
+
+class _GeometryModels:
+    """Annotation of the base class of the GeoJSON geometries, which validates the union
+    of the geometry models. Pydantic builds the schema of an unparametrized model when
+    the model is parametrized, so the union is only imported and built on the first
+    validation."""
+
+    def __get_pydantic_core_schema__(
+        self, source: typing.Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            lambda value: _geometry_models_adapter().validate_python(value),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                _serialize_geometry_model, info_arg=True
+            ),
+        )
+
+    def __get_pydantic_json_schema__(
+        self, schema: CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return handler(_geometry_models_adapter().core_schema)
+
+
+# NOTE: The type variable is bound to the base class of the GeoJSON geometries instead
+# of being constrained to each of the geometry models. This way, the geometry models
+# do not have to be imported (and built) when this module is imported. The annotation
+# of the bound validates the union of the geometry models for unparametrized models.
+S = typing.TypeVar("S", bound=Annotated[GeometryBase, _GeometryModels()])
 
 
 class GeoJsonFeatureBaseModel(BaseModel, typing.Generic[S]):
     """Base class for GeoJSON point features."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: typing.Literal["Feature"]
     geometry: S
     properties: BaseModel
@@ -80,15 +114,38 @@ class GeoJsonFeatureBaseModel(BaseModel, typing.Generic[S]):
             ]
         ]
 
+    def __reduce_ex__(self, protocol: typing.SupportsIndex) -> typing.Any:
+        # Compact pickling, the properties are stored as a tuple as well. The model of
+        # the properties is looked up through the class of the feature, as it cannot be
+        # looked up by its name. See ``pydantic_shapely.transport``.
+        state = transport.model_state(self, "properties")
+        properties = transport.model_state(self.properties)
+        if state is None or properties is None:
+            return super().__reduce_ex__(protocol)
+        return (
+            transport.restore_geojson_feature,
+            (transport.class_reference(type(self)), *state, *properties),
+        )
+
     def to_feature_model(self) -> FeatureBaseModel:
         """
         Converts the GeoJSON feature to the FeatureModel this class has been
         based off.
         """
+        started = instrumentation.start()
+        geometry = from_geojson(self.geometry.model_dump_json())
+        result = self._to_feature_model(geometry)
+        instrumentation.stop(
+            started, "feature.to_feature_model", geometry, model=self.ParentDataModel
+        )
+        return result
+
+    def _to_feature_model(self, geometry: typing.Any) -> FeatureBaseModel:
+        """Creates the FeatureModel from the (already converted) Shapely geometry, or
+        a geometry which has been validated in bulk, and the properties of this
+        feature."""
         property_dict = {
-            self.ParentDataModel.__geometry_field__: from_geojson(
-                self.geometry.model_dump_json()
-            ),
+            self.ParentDataModel.__geometry_field__: geometry,
             **self.properties.model_dump(),
         }
         return self.ParentDataModel.model_validate(property_dict)
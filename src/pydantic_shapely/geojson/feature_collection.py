@@ -1,16 +1,44 @@
 from __future__ import annotations
 
+import concurrent.futures
+import contextvars
+import itertools
 import typing
 from inspect import isclass
 
-from pydantic import BaseModel
+import shapely
+from pydantic import BaseModel, ConfigDict, ValidationInfo, model_validator
 
+from pydantic_shapely import (
+    fragment_cache,
+    instrumentation,
+    json_backend,
+    parallel,
+    transport,
+)
+from pydantic_shapely.annotations import _Validated
 from pydantic_shapely.base import FeatureBaseModel
+from pydantic_shapely.trusted import verify as verify_sample
 
+from . import topojson
 from .feature import GeoJsonFeatureBaseModel
+from .geometry import geojson_geometries_to_shapely
+from .limits import PayloadLimits
 
 S = typing.TypeVar("S", bound=GeoJsonFeatureBaseModel)
 
+# The default number of features per chunk of ``model_dump_json_parallel``.
+DEFAULT_FEATURES_PER_CHUNK = 5_000
+
+# The serialized array of features of a collection without features.
+_EMPTY_FEATURES = b'"features":[]'
+
+# Set while the JSON document passed to ``model_validate_json`` is validated, when the
+# payload limits have already been checked on the raw bytes.
+_SCANNED: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "pydantic_shapely_payload_scanned", default=False
+)
+
 
 class GeoJsonFeatureCollectionBaseModel(BaseModel, typing.Generic[S]):
     """Base class for GeoJSON Feature Collection. This class should not be used directly,
@@ -78,38 +106,429 @@ class GeoJsonFeatureCollectionBaseModel(BaseModel, typing.Generic[S]):
         #     }
         #   ]
         # }
+
+    The size of the payloads can be limited with the class keyword argument
+    ``payload_limits``, see ``pydantic_shapely.geojson.limits``. The limits are checked
+    before the features are validated and raise a ``PayloadTooLargeError``:
+
+    .. code-block:: python
+
+        class Upload(
+            GeoJsonFeatureCollectionBaseModel[TestModel.GeoJsonDataModel],
+            payload_limits=PayloadLimits(max_features=1000, max_vertices=10_000),
+        ):
+            pass
     """
 
+    model_config = ConfigDict(defer_build=True)
+
+    __payload_limits__: typing.ClassVar[typing.Optional[PayloadLimits]] = None
+
     type: typing.Literal["FeatureCollection"] = "FeatureCollection"
     features: typing.List[S]
 
-    def to_feature_models(self) -> typing.List[FeatureBaseModel]:
-        """Convert the GeoJSON Feature Collection to a list of FeatureBaseModel
-        (or better: its sub-classes) objects."""
-        return [feature.to_feature_model() for feature in self.features]
+    def __init_subclass__(cls, **kwargs):
+        # Update the payload limits if they are defined in kwargs
+        if "payload_limits" in kwargs:
+            cls.__payload_limits__ = kwargs.pop("payload_limits")
+        # Run init subclass from parent classes
+        super().__init_subclass__(**kwargs)
+
+    def __reduce_ex__(self, protocol: typing.SupportsIndex) -> typing.Any:
+        # Compact pickling, also for the parametrized collections which cannot be
+        # looked up by their name. See ``pydantic_shapely.transport``.
+        return transport.reduce_model(self) or super().__reduce_ex__(protocol)
 
+    @model_validator(mode="before")
     @classmethod
-    def from_feature_models(
-        cls, features: typing.List[FeatureBaseModel]
+    def _check_payload_limits(
+        cls, data: typing.Any, info: ValidationInfo
+    ) -> typing.Any:
+        """Checks the payload limits on the input, before the features are validated."""
+        limits = cls.__payload_limits__
+        if limits is not None and not (info.mode == "json" and _SCANNED.get()):
+            limits.check_object(data)
+        return data
+
+    @classmethod
+    def model_validate_json(
+        cls,
+        json_data: typing.Union[str, bytes, bytearray],
+        **kwargs: typing.Any,
     ) -> GeoJsonFeatureCollectionBaseModel:
-        """Convert a list of FeatureBaseModel objects to a GeoJSON Feature Collection."""
+        """Validates a JSON document. When payload limits are set, the limits are
+        checked on the raw document before it is parsed."""
+        limits = cls.__payload_limits__
+        if limits is None:
+            return super().model_validate_json(json_data, **kwargs)
+        limits.check_json(json_data)
+        token = _SCANNED.set(True)
+        try:
+            return super().model_validate_json(json_data, **kwargs)
+        finally:
+            _SCANNED.reset(token)
+
+    def to_feature_models(self, trusted: bool = False) -> typing.List[FeatureBaseModel]:
+        """Convert the GeoJSON Feature Collection to a list of FeatureBaseModel
+        (or better: its sub-classes) objects.
+
+        Args:
+            trusted: Whether to create the feature models without validation, see
+                ``pydantic_shapely.trusted``. The geometries are converted in bulk, the
+                behaviour and the constraints of the geometry fields are not applied.
+        """
+        if trusted:
+            return self._construct_feature_models()
+        started = instrumentation.start()
+        # Convert the geometries in bulk and apply the validity and z-value behaviour
+        # and the constraints of each of the feature models to its geometries at once.
+        geometries = shapely.from_geojson(
+            [feature.geometry.model_dump_json() for feature in self.features]
+        )
+        groups: typing.Dict[type, typing.List[int]] = {}
+        for index, feature in enumerate(self.features):
+            groups.setdefault(feature.ParentDataModel, []).append(index)
+        for model, indices in groups.items():
+            geometry_field = model._get_geometry_field()
+            if geometry_field is not None:
+                group = geometry_field.enforce_validity(geometries[indices], indices)
+                group = geometry_field.enforce_z_values(group, indices)
+                group = geometry_field.check_constraints(group, indices)
+                # Marked as validated, so the models do not validate them again.
+                geometries[indices] = [_Validated(geometry) for geometry in group]
+        result = [
+            feature._to_feature_model(geometry)
+            for feature, geometry in zip(self.features, geometries)
+        ]
+        instrumentation.stop(
+            started, "collection.to_feature_models", model=type(self), items=len(result)
+        )
+        return result
+
+    def _construct_feature_models(self) -> typing.List[FeatureBaseModel]:
+        """Converts the features to feature models without validation, see
+        ``to_feature_models``."""
+        started = instrumentation.start()
+        geometries = geojson_geometries_to_shapely(
+            [feature.geometry for feature in self.features]
+        )
+        # The names of the properties of each feature model, in the order of the fields.
+        names: typing.Dict[type, typing.Tuple[str, ...]] = {}
+        result: typing.List[FeatureBaseModel] = []
+        for feature, geometry in zip(self.features, geometries):
+            model = feature.ParentDataModel
+            if model not in names:
+                names[model] = tuple(
+                    name
+                    for name in model.model_fields
+                    if name != model.__geometry_field__
+                )
+            properties = feature.properties.__dict__
+            result.append(
+                transport.construct(
+                    model,
+                    tuple(properties[name] for name in names[model]),
+                    (1 << len(model.model_fields)) - 1,
+                    model.__geometry_field__,
+                    geometry,
+                )
+            )
+        verify_sample(result)
+        instrumentation.stop(
+            started, "collection.to_feature_models", model=type(self), items=len(result)
+        )
+        return result
+
+    @classmethod
+    def _check_feature_models(cls, features: typing.List[FeatureBaseModel]) -> None:
+        """Checks whether the features are instances of the feature models of this
+        collection."""
         # Get the annotation from the features field
         features_field = cls.model_fields["features"]
         if isclass(features_field.annotation):
-            if not all(
-                isinstance(f, features_field.annotation.ParentDataModel)
-                for f in features
-            ):
-                raise ValueError(
-                    f"All features must be of type {features_field.annotation}"
-                )
+            allowed: typing.Tuple[type, ...] = (
+                features_field.annotation.ParentDataModel,
+            )
+            expected = str(features_field.annotation)
         else:
             requested_types = typing.get_args(features_field.annotation)
-            if not all(
-                isinstance(f, tuple(t.ParentDataModel for t in requested_types))
-                for f in features
-            ):
-                raise ValueError(
-                    f"All features must be of type {','.join([str(t) for t in requested_types])}"
+            # NOTE: the tuple of allowed types is created once, not for each feature.
+            allowed = tuple(t.ParentDataModel for t in requested_types)
+            expected = ",".join([str(t) for t in requested_types])
+        if not all(isinstance(f, allowed) for f in features):
+            raise ValueError(f"All features must be of type {expected}")
+
+    @classmethod
+    def from_feature_models(
+        cls, features: typing.List[FeatureBaseModel], trusted: bool = False
+    ) -> GeoJsonFeatureCollectionBaseModel:
+        """Convert a list of FeatureBaseModel objects to a GeoJSON Feature Collection.
+
+        Args:
+            features: The feature models.
+            trusted: Whether to create the collection without validation, see
+                ``pydantic_shapely.trusted``. The features are not checked against the
+                feature models of the collection and the geometries of each feature
+                model are converted at once.
+        """
+        started = instrumentation.start()
+        if trusted:
+            result = cls._construct_from_feature_models(features)
+        else:
+            cls._check_feature_models(features)
+            result = cls(
+                features=[typing.cast(S, f.to_geojson_model()) for f in features]
+            )
+        instrumentation.stop(
+            started, "collection.from_feature_models", model=cls, items=len(features)
+        )
+        return result
+
+    @classmethod
+    def _construct_from_feature_models(
+        cls, features: typing.List[FeatureBaseModel]
+    ) -> GeoJsonFeatureCollectionBaseModel:
+        """Converts the features to a collection without validation, see
+        ``from_feature_models``."""
+        groups: typing.Dict[type, typing.List[int]] = {}
+        for index, feature in enumerate(features):
+            groups.setdefault(type(feature), []).append(index)
+        models: typing.List[typing.Any] = [None] * len(features)
+        for model, indices in groups.items():
+            group = model.construct_geojson_models([features[i] for i in indices])
+            for index, geojson_model in zip(indices, group):
+                models[index] = geojson_model
+        # Only the features are set explicitly, like ``cls(features=...)``.
+        return transport.construct(cls, ("FeatureCollection", models), 0b10)
+
+    @classmethod
+    def dump_feature_models(cls, features: typing.List[FeatureBaseModel]) -> bytes:
+        """Dumps a list of FeatureBaseModel objects directly to a GeoJSON Feature
+        Collection, without creating the GeoJSON models. The geometries are written
+        by Shapely and spliced into the output, see ``pydantic_shapely.json_backend``. When
+        the fragment cache is enabled, the geometries are looked up in the cache, see
+        ``pydantic_shapely.fragment_cache``.
+        The result is equal to ``cls.from_feature_models(features).model_dump_json()``
+        encoded as UTF-8.
+        """
+        started = instrumentation.start()
+        cls._check_feature_models(features)
+        cache = fragment_cache.get_cache()
+        if cache is None:
+            result = json_backend.splice_feature_collection(
+                feature._geojson_bytes() for feature in features
+            )
+        else:
+            # Look up (and write) the geometries of all features at once.
+            fragments = cache.get_many(
+                [getattr(f, f.__geometry_field__) for f in features], "geojson"
+            )
+            result = json_backend.splice_feature_collection(
+                feature._geojson_bytes(typing.cast(bytes, fragment))
+                for feature, fragment in zip(features, fragments)
+            )
+        instrumentation.stop(
+            started, "collection.dump_feature_models", model=cls, items=len(features)
+        )
+        return result
+
+    def model_dump_topojson(
+        self,
+        object_name: str = "features",
+        quantization: int = topojson.DEFAULT_QUANTIZATION,
+    ) -> bytes:
+        """
+        Serializes the collection to TopoJSON, see ``pydantic_shapely.geojson.topojson``.
+        Boundaries which are shared by the geometries are stored once, and the
+        coordinates are quantized and delta-encoded.
+
+        Args:
+            object_name: The name of the object in the topology, which holds the
+                features as a geometry collection.
+            quantization: The number of grid positions along each axis of the bounding
+                box of the collection.
+
+        Returns:
+            The TopoJSON document as UTF-8 encoded bytes.
+        """
+        started = instrumentation.start()
+        geometries = geojson_geometries_to_shapely(
+            [feature.geometry for feature in self.features]
+        )
+        topology = topojson.to_topology(
+            geometries,
+            [feature.properties.model_dump(mode="json") for feature in self.features],
+            object_name,
+            quantization,
+        )
+        result = json_backend.get_backend().dumps(topology)
+        instrumentation.stop(
+            started,
+            "collection.model_dump_topojson",
+            model=type(self),
+            items=len(self.features),
+        )
+        return result
+
+    @classmethod
+    def model_validate_topojson(
+        cls,
+        json_data: typing.Union[str, bytes],
+        object_name: typing.Optional[str] = None,
+        *,
+        strict: typing.Optional[bool] = None,
+        context: typing.Optional[typing.Any] = None,
+    ) -> GeoJsonFeatureCollectionBaseModel:
+        """
+        Validates a TopoJSON document, e.g. written by ``model_dump_topojson``. The
+        geometries of the object are converted to GeoJSON and validated with the
+        properties as the features of the collection. Use ``to_feature_models`` to
+        convert the result to feature models.
+
+        Args:
+            json_data: The TopoJSON document.
+            object_name: The name of the object with the features. May be omitted if
+                the topology has a single object.
+            strict: Whether to validate the features in strict mode.
+            context: Extra variables to pass to the validators.
+
+        Raises:
+            ValueError: If the document is not a valid TopoJSON topology.
+            ValidationError: If the features are not valid.
+        """
+        started = instrumentation.start()
+        features = topojson.from_topology(
+            json_backend.get_backend().loads(json_data), object_name
+        )
+        result = cls.model_validate(
+            {"type": "FeatureCollection", "features": features},
+            strict=strict,
+            context=context,
+        )
+        instrumentation.stop(
+            started,
+            "collection.model_validate_topojson",
+            model=cls,
+            items=len(features),
+        )
+        return result
+
+    def model_dump_json_parallel(
+        self,
+        executor: typing.Union[
+            concurrent.futures.Executor, typing.Literal["fork"], None
+        ] = None,
+        chunk_size: int = DEFAULT_FEATURES_PER_CHUNK,
+    ) -> bytes:
+        """
+        Serializes the collection to JSON, with the features split in chunks which are
+        serialized concurrently. The result is equal to ``model_dump_json()`` encoded
+        as UTF-8, only the default (compact) output is supported.
+
+        Pydantic holds the GIL while it serializes a model. On a free-threaded build of
+        Python the chunks are serialized on the shared thread pool by default, see
+        ``pydantic_shapely.parallel``, otherwise in the calling thread. With ``"fork"``,
+        worker processes are forked for the call, which inherit the collection, so the
+        features do not have to be pickled, see
+        ``pydantic_shapely.parallel.forked_executor``. Forking is only safe when no
+        other threads are running, so it has to be requested explicitly. When ``fork``
+        is not the start method of ``multiprocessing``, the chunks are pickled
+        (compactly, see ``pydantic_shapely.transport``) to the shared process pool
+        instead. The start method is not set by this method. With a single CPU the
+        collection is serialized in the calling thread.
+
+        Args:
+            executor: The executor to serialize the chunks on, e.g. a process pool, or
+                ``"fork"`` for worker processes forked for the call. The chunks are
+                pickled when the executor is a process pool. Defaults to the shared
+                thread pool on free-threaded Python, and to the calling thread
+                otherwise.
+            chunk_size: The maximum number of features per chunk. A collection with at
+                most one chunk is serialized in the calling thread.
+
+        Returns:
+            The JSON document as UTF-8 encoded bytes.
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1.")
+        if isinstance(executor, str) and executor != "fork":
+            raise ValueError(
+                f"Supplied executor '{executor}' is not an executor or 'fork'."
+            )
+        serializer = self.__pydantic_serializer__
+        features = self.features
+        # Without an executor the chunks are only serialized concurrently on threads
+        # of a free-threaded build, never on processes forked without being asked.
+        if (
+            len(features) <= chunk_size
+            or (executor is None and parallel.gil_enabled())
+            or (
+                not isinstance(executor, concurrent.futures.Executor)
+                and parallel.default_workers() == 1
+            )
+        ):
+            return serializer.to_json(self)
+        started = instrumentation.start()
+        # The collection is serialized without features, the serialized chunks are
+        # spliced into the (empty) array of features. When the array cannot be found
+        # unambiguously, e.g. because another field contains an empty array of
+        # features, the collection is serialized at once.
+        envelope = serializer.to_json(self.model_copy(update={"features": []}))
+        if envelope.count(_EMPTY_FEATURES) != 1:
+            return serializer.to_json(self)
+        position = envelope.index(_EMPTY_FEATURES) + len(_EMPTY_FEATURES) - 1
+        head, tail = envelope[:position], envelope[position:]
+        chunks = [
+            self.model_copy(update={"features": features[start : start + chunk_size]})
+            for start in range(0, len(features), chunk_size)
+        ]
+        if executor == "fork":
+            bodies = _dump_forked(chunks, len(head), len(tail))
+        else:
+            bodies = list(
+                (executor or parallel.get_executor()).map(
+                    _dump_features,
+                    chunks,
+                    itertools.repeat(len(head)),
+                    itertools.repeat(len(tail)),
                 )
-        return cls(features=[typing.cast(S, f.to_geojson_model()) for f in features])
+            )
+        result = b"".join((head, b",".join(bodies), tail))
+        instrumentation.stop(
+            started,
+            "collection.model_dump_json_parallel",
+            model=type(self),
+            items=len(features),
+        )
+        return result
+
+
+def _dump_forked(
+    chunks: typing.List[GeoJsonFeatureCollectionBaseModel], head: int, tail: int
+) -> typing.List[bytes]:
+    """Serializes the chunks on worker processes which are forked for the call and
+    inherit the chunks, see ``model_dump_json_parallel``."""
+    workers = min(parallel.default_workers(), len(chunks))
+    with parallel.forked_executor((chunks, head, tail), workers) as executor:
+        if executor is not None:
+            return list(executor.map(_dump_forked_chunk, range(len(chunks))))
+    return list(
+        parallel.get_process_executor().map(
+            _dump_features, chunks, itertools.repeat(head), itertools.repeat(tail)
+        )
+    )
+
+
+def _dump_forked_chunk(index: int) -> bytes:
+    """Serializes a chunk inherited from the parent process, see ``_dump_forked``."""
+    chunks, head, tail = parallel.forked_state()
+    return _dump_features(chunks[index], head, tail)
+
+
+def _dump_features(
+    chunk: GeoJsonFeatureCollectionBaseModel, head: int, tail: int
+) -> bytes:
+    """Serializes a chunk of a collection and returns the serialized features, i.e. the
+    output without the first ``head`` and the last ``tail`` bytes."""
+    output = chunk.__pydantic_serializer__.to_json(chunk)
+    return output[head : len(output) - tail]
@@ -16,55 +16,159 @@ their own respective module. The models are:
 All Pydantic models have a method `to_shapely` that converts the GeoJSON
 geometry to a Shapely geometry. To convert a Shapely geometry to a GeoJSON
 geometry, one can use the `to_geojson` function from this sub-module.
+
+The geometry models are imported lazily, i.e. the module defining a geometry
+model is only imported when the model is accessed for the first time. The
+Pydantic core schema of the models is built on first use.
 """
 
+from __future__ import annotations
+
+import importlib
+import itertools
 import typing
 
+import numpy as np
 import shapely
 
 from . import _base
-from .geometry_collection import (
-    GeometryCollection,
-    GeometryCollection2D,
-    GeometryCollection3D,
-)
-from .linestring import CoordinatesLineString, LineString, LineString2D, LineString3D
-from .multilinestring import MultiLineString, MultiLineString2D, MultiLineString3D
-from .multipoint import MultiPoint, MultiPoint2D, MultiPoint3D
-from .multipolygon import MultiPolygon, MultiPolygon2D, MultiPolygon3D
-from .point import CoordinatesPoint, Point, Point2D, Point3D
-from .polygon import CoordinatesPolygon, Polygon, Polygon2D, Polygon3D
-
-MAPPING_2D = {
-    shapely.Point: Point2D,
-    shapely.MultiPoint: MultiPoint2D,
-    shapely.LineString: LineString2D,
-    shapely.MultiLineString: MultiLineString2D,
-    shapely.Polygon: Polygon2D,
-    shapely.MultiPolygon: MultiPolygon2D,
-    shapely.GeometryCollection: GeometryCollection2D,
-}
 
-MAPPING_3D = {
-    shapely.Point: Point3D,
-    shapely.MultiPoint: MultiPoint3D,
-    shapely.LineString: LineString3D,
-    shapely.MultiLineString: MultiLineString3D,
-    shapely.Polygon: Polygon3D,
-    shapely.MultiPolygon: MultiPolygon3D,
-    shapely.GeometryCollection: GeometryCollection3D,
-}
+if typing.TYPE_CHECKING:
+    from .geometry_collection import (
+        GeometryCollection,
+        GeometryCollection2D,
+        GeometryCollection3D,
+    )
+    from .linestring import (
+        CoordinatesLineString,
+        LineString,
+        LineString2D,
+        LineString3D,
+    )
+    from .multilinestring import MultiLineString, MultiLineString2D, MultiLineString3D
+    from .multipoint import MultiPoint, MultiPoint2D, MultiPoint3D
+    from .multipolygon import MultiPolygon, MultiPolygon2D, MultiPolygon3D
+    from .point import CoordinatesPoint, Point, Point2D, Point3D
+    from .polygon import CoordinatesPolygon, Polygon, Polygon2D, Polygon3D
 
-MAPPING = {
-    shapely.Point: Point,
-    shapely.MultiPoint: MultiPoint,
-    shapely.LineString: LineString,
-    shapely.MultiLineString: MultiLineString,
-    shapely.Polygon: Polygon,
-    shapely.MultiPolygon: MultiPolygon,
-    shapely.GeometryCollection: GeometryCollection,
+# The geometry models are imported on first use. Each geometry module defines three
+# Pydantic models, and most programs only use a few of the geometry types. The
+# mapping below lists for each attribute of this module in which sub-module it is
+# defined.
+_LAZY_IMPORTS = {
+    "Point": ".point",
+    "Point2D": ".point",
+    "Point3D": ".point",
+    "CoordinatesPoint": ".point",
+    "MultiPoint": ".multipoint",
+    "MultiPoint2D": ".multipoint",
+    "MultiPoint3D": ".multipoint",
+    "LineString": ".linestring",
+    "LineString2D": ".linestring",
+    "LineString3D": ".linestring",
+    "CoordinatesLineString": ".linestring",
+    "MultiLineString": ".multilinestring",
+    "MultiLineString2D": ".multilinestring",
+    "MultiLineString3D": ".multilinestring",
+    "Polygon": ".polygon",
+    "Polygon2D": ".polygon",
+    "Polygon3D": ".polygon",
+    "CoordinatesPolygon": ".polygon",
+    "MultiPolygon": ".multipolygon",
+    "MultiPolygon2D": ".multipolygon",
+    "MultiPolygon3D": ".multipolygon",
+    "GeometryCollection": ".geometry_collection",
+    "GeometryCollection2D": ".geometry_collection",
+    "GeometryCollection3D": ".geometry_collection",
 }
 
+
+def __getattr__(name: str) -> typing.Any:
+    """Imports the geometry models on first access (PEP 562)."""
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Store the value in the module namespace, so __getattr__ is only called once.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+class _LazyModelMapping(typing.Mapping[type, typing.Type[_base.GeometryBase]]):
+    """Mapping between the Shapely geometry types and the GeoJSON geometry models.
+    The GeoJSON geometry model is only imported when it is looked up.
+    """
+
+    def __init__(self, names: typing.Dict[type, str]) -> None:
+        self._names = names
+
+    def __getitem__(self, key: type) -> typing.Type[_base.GeometryBase]:
+        return __getattr__(self._names[key])
+
+    def __iter__(self) -> typing.Iterator[type]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._names!r})"
+
+
+MAPPING_2D = _LazyModelMapping(
+    {
+        shapely.Point: "Point2D",
+        shapely.MultiPoint: "MultiPoint2D",
+        shapely.LineString: "LineString2D",
+        shapely.MultiLineString: "MultiLineString2D",
+        shapely.Polygon: "Polygon2D",
+        shapely.MultiPolygon: "MultiPolygon2D",
+        shapely.GeometryCollection: "GeometryCollection2D",
+    }
+)
+
+MAPPING_3D = _LazyModelMapping(
+    {
+        shapely.Point: "Point3D",
+        shapely.MultiPoint: "MultiPoint3D",
+        shapely.LineString: "LineString3D",
+        shapely.MultiLineString: "MultiLineString3D",
+        shapely.Polygon: "Polygon3D",
+        shapely.MultiPolygon: "MultiPolygon3D",
+        shapely.GeometryCollection: "GeometryCollection3D",
+    }
+)
+
+MAPPING = _LazyModelMapping(
+    {
+        shapely.Point: "Point",
+        shapely.MultiPoint: "MultiPoint",
+        shapely.LineString: "LineString",
+        shapely.MultiLineString: "MultiLineString",
+        shapely.Polygon: "Polygon",
+        shapely.MultiPolygon: "MultiPolygon",
+        shapely.GeometryCollection: "GeometryCollection",
+    }
+)
+
+
+def geometry_mapping(
+    z_values: str,
+) -> typing.Mapping[type, typing.Type[_base.GeometryBase]]:
+    """Returns the mapping between the Shapely geometry types and the GeoJSON geometry
+    models for the given behaviour for z-values of a ``GeometryField``."""
+    if z_values in ["strip", "forbid", "forbidden"]:
+        return MAPPING_2D
+    if z_values == "required":
+        return MAPPING_3D
+    return MAPPING
+
+
 # NOTE:
 # In both CONVERTERS_2D and CONVERTERS_3D, the `mypy` type checker is ignoring
 # the Point and Multipoint cases. This is because the `shape.coords` attribute
@@ -75,76 +179,133 @@ MAPPING = {
 # `mypy` happy.
 
 
-def convert_shapely_geometry_collection_to_geojson_coordinates(
-        geom_collection: shapely.geometry.GeometryCollection,
-    ) -> typing.List[
-        typing.Union[CoordinatesPoint, CoordinatesLineString, CoordinatesPolygon]
-    ]:
-    
-
-    coordinates: typing.List[typing.Tuple[typing.Any, ...]] = []
-    for geom in geom_collection.geoms:
-        if geom.geom_type == "Point":
-            coordinates.append(tuple(geom.coords[0]))
-        elif geom.geom_type == "LineString":
-            coordinates.append(tuple(geom.coords))
-        elif geom.geom_type == "Polygon":
-            coordinates.append(
-                (geom.exterior.coords, *[hole.coords for hole in geom.interiors])
-            )
-        else:
-            raise ValueError(f"Unsupported Shapely geometry type: {geom.geom_type}")
-    return typing.cast(
-        typing.List[
-            typing.Union[CoordinatesPoint, CoordinatesLineString, CoordinatesPolygon]
-        ],
-        coordinates,
-    )
+# Mapping between the type ids of Shapely (see `shapely.get_type_id`) and the names of
+# the GeoJSON geometry types. A LinearRing is converted to a LineString.
+GEOMETRY_TYPE_IDS = {
+    0: "Point",
+    1: "LineString",
+    2: "LineString",
+    3: "Polygon",
+    4: "MultiPoint",
+    5: "MultiLineString",
+    6: "MultiPolygon",
+    7: "GeometryCollection",
+}
+
+
+def _has_mixed_z(geom_collection: shapely.geometry.GeometryCollection) -> bool:
+    """Returns whether some, but not all, members of a (nested) geometry collection
+    have z-values."""
+    parts = shapely.get_parts(geom_collection)
+    has_z = shapely.has_z(parts)
+    if has_z.any() and not has_z.all():
+        return True
+    return any(_has_mixed_z(part) for part in parts[shapely.get_type_id(parts) == 7])
+
+
+def convert_shapely_geometry_collection_to_geojson_geometries(
+    geom_collection: shapely.geometry.GeometryCollection,
+    has_z: bool = False,
+) -> typing.List[_base.GeometryBase]:
+    """
+    Converts the members of a Shapely geometry collection to GeoJSON geometry objects.
+
+    The collection is decomposed with the vectorized `shapely.get_parts` and
+    `shapely.get_type_id` functions. The coordinates of all point members are
+    extracted in bulk, the other members are dispatched on their type id. When only
+    some of the members have z-values, the members are converted to the GeoJSON
+    geometries which allow both, each with or without z-values.
+
+    Parameters
+    ----------
+    geom_collection : shapely.geometry.GeometryCollection
+        The Shapely geometry collection to convert.
+    has_z : bool
+        Whether to convert the members to 3D (True) or 2D (False) GeoJSON geometries.
+
+    Returns
+    -------
+    list
+        The GeoJSON geometry objects of the members of the collection.
+    """
+    parts = shapely.get_parts(geom_collection)
+    if has_z and _has_mixed_z(geom_collection):
+        return construct_geojson_geometries(parts, MAPPING)
+    converters = CONVERTERS_3D if has_z else CONVERTERS_2D
+    type_ids = shapely.get_type_id(parts)
+    members: typing.List[typing.Optional[_base.GeometryBase]] = [None] * len(parts)
+    # Convert the (non-empty) points in bulk
+    points = np.flatnonzero((type_ids == 0) & ~shapely.is_empty(parts))
+    if len(points):
+        point_model = (MAPPING_3D if has_z else MAPPING_2D)[shapely.Point]
+        coordinates = shapely.get_coordinates(parts[points], include_z=has_z)
+        for index, coordinate in zip(points, coordinates.tolist()):
+            members[index] = point_model(coordinates=tuple(coordinate))
+    # Dispatch the other members on their type id
+    for index, (part, type_id) in enumerate(zip(parts, type_ids)):
+        if members[index] is not None:
+            continue
+        try:
+            converter = converters[GEOMETRY_TYPE_IDS[type_id]]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported Shapely geometry type: {part.geom_type}"
+            ) from None
+        members[index] = converter(part)
+    return typing.cast(typing.List[_base.GeometryBase], members)
 
 
 CONVERTERS_2D = {
-    "Point": lambda shape: Point2D(coordinates=tuple(shape.coords[0])),  # type: ignore
-    "MultiPoint": lambda shape: MultiPoint2D(
+    "Point": lambda shape: MAPPING_2D[shapely.Point](coordinates=tuple(shape.coords[0])),  # type: ignore
+    "MultiPoint": lambda shape: MAPPING_2D[shapely.MultiPoint](
         coordinates=[tuple(geom.coords[0]) for geom in shape.geoms]  # type: ignore
     ),
-    "LineString": lambda shape: LineString2D(coordinates=shape.coords),
-    "MultiLineString": lambda shape: MultiLineString2D(
+    "LineString": lambda shape: MAPPING_2D[shapely.LineString](
+        coordinates=shape.coords
+    ),
+    "MultiLineString": lambda shape: MAPPING_2D[shapely.MultiLineString](
         coordinates=[geom.coords for geom in shape.geoms]
     ),
-    "Polygon": lambda shape: Polygon2D(
+    "Polygon": lambda shape: MAPPING_2D[shapely.Polygon](
         coordinates=[shape.exterior.coords, *[hole.coords for hole in shape.interiors]]
     ),
-    "MultiPolygon": lambda shape: MultiPolygon2D(
+    "MultiPolygon": lambda shape: MAPPING_2D[shapely.MultiPolygon](
         coordinates=[
             [geom.exterior.coords, *[hole.coords for hole in geom.interiors]]
             for geom in shape.geoms
         ]
     ),
-    "GeometryCollection": lambda shape: GeometryCollection2D(
-        coordinates=convert_shapely_geometry_collection_to_geojson_coordinates(shape)
+    "GeometryCollection": lambda shape: MAPPING_2D[shapely.GeometryCollection](
+        geometries=convert_shapely_geometry_collection_to_geojson_geometries(shape)
     ),
 }
 
 CONVERTERS_3D = {
-    "Point": lambda shape: Point3D(coordinates=tuple(shape.coords[0])),  # type: ignore
-    "MultiPoint": lambda shape: MultiPoint3D(
+    "Point": lambda shape: MAPPING_3D[shapely.Point](coordinates=tuple(shape.coords[0])),  # type: ignore
+    "MultiPoint": lambda shape: MAPPING_3D[shapely.MultiPoint](
         coordinates=[tuple(geom.coords[0]) for geom in shape.geoms]  # type: ignore
     ),
-    "LineString": lambda shape: LineString3D(coordinates=shape.coords),
-    "MultiLineString": lambda shape: MultiLineString3D(
+    "LineString": lambda shape: MAPPING_3D[shapely.LineString](
+        coordinates=shape.coords
+    ),
+    "MultiLineString": lambda shape: MAPPING_3D[shapely.MultiLineString](
         coordinates=[geom.coords for geom in shape.geoms]
     ),
-    "Polygon": lambda shape: Polygon3D(
+    "Polygon": lambda shape: MAPPING_3D[shapely.Polygon](
         coordinates=[shape.exterior.coords, *[hole.coords for hole in shape.interiors]]
     ),
-    "MultiPolygon": lambda shape: MultiPolygon3D(
+    "MultiPolygon": lambda shape: MAPPING_3D[shapely.MultiPolygon](
         coordinates=[
             [geom.exterior.coords, *[hole.coords for hole in geom.interiors]]
             for geom in shape.geoms
         ]
     ),
-    "GeometryCollection": lambda shape: GeometryCollection3D(
-        coordinates=convert_shapely_geometry_collection_to_geojson_coordinates(shape)
+    "GeometryCollection": lambda shape: (
+        MAPPING if _has_mixed_z(shape) else MAPPING_3D
+    )[shapely.GeometryCollection](
+        geometries=convert_shapely_geometry_collection_to_geojson_geometries(
+            shape, has_z=True
+        )
     ),
 }
 
@@ -175,6 +336,133 @@ def convert_shapely_to_geojson_object(
         raise ValueError(f"Unsupported Shapely geometry type: {shape.geom_type}")
 
 
+def construct_geojson_geometries(
+    geometries: typing.Any,
+    mapping: typing.Mapping[type, typing.Type[_base.GeometryBase]] = MAPPING,
+) -> typing.List[_base.GeometryBase]:
+    """
+    Converts an array of trusted Shapely geometries to GeoJSON geometry objects, without
+    validation.
+
+    The geometries are grouped by their type and the coordinates of each group are
+    extracted at once with ``shapely.to_ragged_array``. The GeoJSON geometry objects are
+    created like ``model_construct``, the result is equal to the validated objects.
+    Geometry collections, linear rings and empty geometries are converted with
+    validation.
+
+    Parameters
+    ----------
+    geometries : array_like
+        The Shapely geometries to convert.
+    mapping : Mapping
+        The mapping between the Shapely geometry types and the GeoJSON geometry models,
+        ``MAPPING``, ``MAPPING_2D`` or ``MAPPING_3D``. For ``MAPPING`` the z-values of
+        each geometry are kept, the others strip or include the z-values.
+
+    Returns
+    -------
+    list
+        The GeoJSON geometry objects, in the order of the geometries.
+    """
+    # Deferred import to prevent circular import
+    from pydantic_shapely import json_backend, transport
+
+    geometries = np.asarray(geometries, dtype=object)
+    result: typing.List[typing.Any] = [None] * len(geometries)
+    type_ids = shapely.get_type_id(geometries)
+    if mapping is MAPPING:
+        has_z = shapely.has_z(geometries)
+    else:
+        has_z = np.full(len(geometries), mapping is MAPPING_3D)
+    supported = np.isin(type_ids, (0, 1, 3, 4, 5, 6)) & ~shapely.is_empty(geometries)
+    for type_id in np.unique(type_ids[supported]).tolist():
+        name = GEOMETRY_TYPE_IDS[type_id]
+        model = mapping[getattr(shapely, name)]
+        for include_z in (False, True):
+            indices = np.flatnonzero(
+                supported & (type_ids == type_id) & (has_z == include_z)
+            )
+            if not indices.size:
+                continue
+            _, coordinates, offsets = shapely.to_ragged_array(
+                geometries[indices], include_z=include_z
+            )
+            # The coordinates are tuples, like the coordinates of validated objects,
+            # and are nested with the offsets of each level (parts, rings).
+            nested: typing.List[typing.Any] = list(zip(*coordinates.T.tolist()))
+            for level in offsets:
+                bounds = level.tolist()
+                nested = [nested[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+            for index, value in zip(indices.tolist(), nested):
+                result[index] = transport.construct(model, (name, value), 0b10)
+    loads = json_backend.get_backend().loads
+    for index in np.flatnonzero(~supported).tolist():
+        model = mapping[getattr(shapely, GEOMETRY_TYPE_IDS[type_ids[index]])]
+        result[index] = model.model_validate(
+            loads(shapely.to_geojson(geometries[index]))
+        )
+    return result
+
+
+# The number of levels of nesting of the coordinates of the GeoJSON geometry types
+# above the level of the coordinates themselves, e.g. the rings of a Polygon.
+_COORDINATE_LEVELS = {
+    "Point": 0,
+    "LineString": 1,
+    "MultiPoint": 1,
+    "Polygon": 2,
+    "MultiLineString": 2,
+    "MultiPolygon": 3,
+}
+
+
+def geojson_geometries_to_shapely(
+    geometries: typing.Sequence[_base.GeometryBase],
+) -> np.ndarray:
+    """
+    Converts GeoJSON geometry objects to Shapely geometries in bulk.
+
+    The geometries are grouped by their type and dimension. The coordinates of each
+    group are collected in a single array and the geometries are created at once with
+    ``shapely.from_ragged_array``. Geometry collections and geometries without
+    coordinates are converted one by one with ``to_shapely``.
+
+    Parameters
+    ----------
+    geometries : sequence
+        The GeoJSON geometry objects to convert.
+
+    Returns
+    -------
+    numpy.ndarray
+        The Shapely geometries, in the order of the GeoJSON geometry objects.
+    """
+    result = np.empty(len(geometries), dtype=object)
+    groups: typing.Dict[typing.Tuple[str, int], typing.List[int]] = {}
+    for index, geometry in enumerate(geometries):
+        levels = _COORDINATE_LEVELS.get(geometry.type)
+        first = getattr(geometry, "coordinates", None)
+        for _ in range(levels or 0):
+            first = first[0] if first else None
+        if levels is None or not first:
+            result[index] = geometry.to_shapely()
+            continue
+        groups.setdefault((geometry.type, len(first)), []).append(index)
+    for (name, dimension), indices in groups.items():
+        parts: typing.List[typing.Any] = [geometries[i].coordinates for i in indices]
+        offsets = []
+        for _ in range(_COORDINATE_LEVELS[name]):
+            offsets.append(np.cumsum([0, *map(len, parts)]))
+            parts = list(itertools.chain.from_iterable(parts))
+        result[indices] = shapely.from_ragged_array(
+            getattr(shapely.GeometryType, name.upper()),
+            np.array(parts, dtype=float).reshape(-1, dimension),
+            # The offsets are passed from the innermost level outwards.
+            tuple(reversed(offsets)) or None,
+        )
+    return result
+
+
 __all__ = [
     "Point2D",
     "Point3D",
@@ -200,5 +488,9 @@ __all__ = [
     "MAPPING_2D",
     "MAPPING_3D",
     "MAPPING",
+    "convert_shapely_geometry_collection_to_geojson_geometries",
+    "construct_geojson_geometries",
     "convert_shapely_to_geojson_object",
+    "geojson_geometries_to_shapely",
+    "geometry_mapping",
 ]
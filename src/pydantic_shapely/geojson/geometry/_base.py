@@ -1,9 +1,11 @@
 import abc
 import typing
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from shapely.geometry.base import BaseGeometry
 
+from pydantic_shapely import transport
+
 
 class GeometryBase(BaseModel, abc.ABC):
     """Base-class for GeoJSON geometries. This class should not be used directly,
@@ -11,8 +13,17 @@ class GeometryBase(BaseModel, abc.ABC):
     a common interface for all GeoJSON geometries.
     """
 
+    # The core schema of the geometry models is only built when the model is used
+    # for the first time. Most programs only use a few of the 21 geometry models.
+    model_config = ConfigDict(defer_build=True)
+
+    # NOTE: The sub-classes define the `coordinates` member, except for the
+    # GeometryCollection which defines the `geometries` member (RFC 7946, 3.1.8).
     type: str = ""
-    coordinates: typing.Any
+
+    def __reduce_ex__(self, protocol: typing.SupportsIndex) -> typing.Any:
+        # Compact pickling, see ``pydantic_shapely.transport``.
+        return transport.reduce_model(self) or super().__reduce_ex__(protocol)
 
     @abc.abstractmethod
     def to_shapely(self) -> BaseGeometry:
@@ -1,75 +1,133 @@
-"""_summary_
 """
+The GeometryCollection geometry, as defined in
+`rfc7946, section 3.1.8 <https://tools.ietf.org/html/rfc7946#section-3.1.8>`_.
 
+A GeometryCollection has a member ``geometries``, which holds the GeoJSON geometry
+objects in the collection. The members are discriminated by their ``type`` member, so
+each member is validated against a single geometry model only. Multi-part geometries
+and (nested) geometry collections are supported as members.
+"""
+
+import collections
 import typing
-from numbers import Number
 
+try:
+    from typing import Annotated
+except ImportError:
+    # This import is required in Python 3.8
+    from typing_extensions import Annotated  # type: ignore
+
+import numpy as np
 import shapely
+from pydantic import Field
 
 from ._base import GeometryBase
-from .point import CoordinatesPoint2D, CoordinatesPoint3D
-from .linestring import CoordinatesLineString2D, CoordinatesLineString3D
-from .polygon import CoordinatesPolygon2D, CoordinatesPolygon3D
-
-CoordinatesCollection2D= typing.List[typing.Union[CoordinatesPoint2D, CoordinatesLineString2D, CoordinatesPolygon2D]]
-CoordinatesCollection3D = typing.List[typing.Union[CoordinatesPoint3D, CoordinatesLineString3D, CoordinatesPolygon3D]]
-CoordinatesCollection = typing.Union[
-    CoordinatesCollection2D, CoordinatesCollection3D
+from .linestring import LineString, LineString2D, LineString3D
+from .multilinestring import MultiLineString, MultiLineString2D, MultiLineString3D
+from .multipoint import MultiPoint, MultiPoint2D, MultiPoint3D
+from .multipolygon import MultiPolygon, MultiPolygon2D, MultiPolygon3D
+from .point import Point, Point2D, Point3D
+from .polygon import Polygon, Polygon2D, Polygon3D
+
+GeometryCollectionMember2D = Annotated[
+    typing.Union[
+        Point2D,
+        MultiPoint2D,
+        LineString2D,
+        MultiLineString2D,
+        Polygon2D,
+        MultiPolygon2D,
+        "GeometryCollection2D",
+    ],
+    Field(discriminator="type"),
 ]
-GeometryCollecationTypeVar = typing.TypeVar(
-    "GeometryCollecationTypeVar",
-    CoordinatesCollection2D,
-    CoordinatesCollection3D,
-    CoordinatesCollection,
-)
-
-class GeometryCollectionBase(GeometryBase, typing.Generic[GeometryCollecationTypeVar]):
+GeometryCollectionMember3D = Annotated[
+    typing.Union[
+        Point3D,
+        MultiPoint3D,
+        LineString3D,
+        MultiLineString3D,
+        Polygon3D,
+        MultiPolygon3D,
+        "GeometryCollection3D",
+    ],
+    Field(discriminator="type"),
+]
+GeometryCollectionMember = Annotated[
+    typing.Union[
+        Point,
+        MultiPoint,
+        LineString,
+        MultiLineString,
+        Polygon,
+        MultiPolygon,
+        "GeometryCollection",
+    ],
+    Field(discriminator="type"),
+]
+
+
+def _members_to_shapely(members: typing.Sequence[GeometryBase]) -> np.ndarray:
+    """Converts the members of a geometry collection to Shapely geometries. Points and
+    line strings are created in bulk with the vectorized constructors of Shapely, the
+    other members are converted one by one."""
+    geometries = np.empty(len(members), dtype=object)
+    indices: typing.Dict[str, typing.List[int]] = collections.defaultdict(list)
+    for index, member in enumerate(members):
+        indices[member.type].append(index)
+    try:
+        if indices["Point"]:
+            points = indices["Point"]
+            geometries[points] = shapely.points(
+                [members[index].coordinates for index in points]
+            )
+            del indices["Point"]
+        if indices["LineString"]:
+            lines = indices["LineString"]
+            coordinates = [members[index].coordinates for index in lines]
+            geometries[lines] = shapely.linestrings(
+                [coordinate for line in coordinates for coordinate in line],
+                indices=np.repeat(
+                    np.arange(len(lines)), [len(line) for line in coordinates]
+                ),
+            )
+            del indices["LineString"]
+    except ValueError:
+        # Mixed 2D and 3D coordinates cannot be converted in bulk, the remaining
+        # members are converted one by one below.
+        pass
+    for group in indices.values():
+        for index in group:
+            geometries[index] = members[index].to_shapely()
+    return geometries
+
+
+class GeometryCollectionBase(GeometryBase):
     """A geometry collection."""
 
-    type: str = "LineString"
-    coordinates: GeometryCollecationTypeVar
+    type: typing.Literal["GeometryCollection"] = "GeometryCollection"
+    geometries: typing.List[GeometryBase]
 
-    def to_shapely(self) -> shapely.LineString:
-        """Convert the line string to a Shapely line string."""
-        # Handle empty geometry
-        if not self.coordinates:
+    def to_shapely(self) -> shapely.GeometryCollection:
+        """Convert the geometry collection to a Shapely geometry collection."""
+        if not self.geometries:
             return shapely.GeometryCollection()
-        # Handle the geometries in the collection
-        geometries = []
-        for sequence in self.coordinates:
-            # If the sequence is empty, add an POINT EMPTY geometry
-            if not sequence:
-                geometries.append(shapely.Point())
-            elif isinstance(sequence[0], Number):
-                geometries.append(shapely.Point(*sequence))
-            elif not sequence[0]:
-                # Empty line string
-                geometries.append(shapely.LineString())
-            elif not sequence[0][0]:
-                # Empty line string
-                geometries.append(shapely.LineString(sequence))
-            elif isinstance(sequence[0][0], Number):
-                geometries.append(shapely.LineString(sequence))
-            elif not sequence[0][0][0]:
-                # Empty polygon
-                geometries.append(shapely.Polygon())
-            elif isinstance(sequence[0][0][0], Number):
-                holes = []
-                if len(sequence) > 1:
-                    holes = sequence[1:]
-                geometries.append(shapely.Polygon(sequence[0], holes))
-            else:
-                raise ValueError("Invalid geometry in the collection")
-        return shapely.GeometryCollection(geometries)
-
-
-class GeometryCollection2D(GeometryCollectionBase[CoordinatesCollection2D]):
+        return shapely.GeometryCollection(list(_members_to_shapely(self.geometries)))
+
+
+class GeometryCollection2D(GeometryCollectionBase):
     """A 2D geometry collection."""
 
+    geometries: typing.List[GeometryCollectionMember2D]
 
-class GeometryCollection3D(GeometryCollectionBase[CoordinatesCollection3D]):
+
+class GeometryCollection3D(GeometryCollectionBase):
     """A 3D geometry collection."""
 
+    geometries: typing.List[GeometryCollectionMember3D]
+
 
-class GeometryCollection(GeometryCollectionBase[CoordinatesCollection]):
+class GeometryCollection(GeometryCollectionBase):
     """A geometry collection, both 2D and 3D geometries are allowed."""
+
+    geometries: typing.List[GeometryCollectionMember]
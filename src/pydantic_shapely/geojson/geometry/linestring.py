@@ -33,7 +33,7 @@ LinesStringTypeVar = typing.TypeVar(
 class LineStringBase(GeometryBase, typing.Generic[LinesStringTypeVar]):
     """A line string geometry."""
 
-    type: str = "LineString"
+    type: typing.Literal["LineString"] = "LineString"
     coordinates: LinesStringTypeVar
 
     def to_shapely(self) -> shapely.LineString:
@@ -24,7 +24,7 @@ MultiLineStringTypeVar = typing.TypeVar(
 class MultiLineStringBase(GeometryBase, typing.Generic[MultiLineStringTypeVar]):
     """A multi-line string geometry."""
 
-    type: str = "MultiLineString"
+    type: typing.Literal["MultiLineString"] = "MultiLineString"
     coordinates: MultiLineStringTypeVar
 
     def to_shapely(self) -> shapely.MultiLineString:
@@ -22,7 +22,7 @@ MultiPointTypeVar = typing.TypeVar(
 class MultiPointBase(GeometryBase, typing.Generic[MultiPointTypeVar]):
     """A multi-point geometry."""
 
-    type: str = "MultiPoint"
+    type: typing.Literal["MultiPoint"] = "MultiPoint"
     coordinates: MultiPointTypeVar
 
     def to_shapely(self) -> shapely.MultiPoint:
@@ -24,7 +24,7 @@ MultiPolygonTypeVar = typing.TypeVar(
 class MultiPolygonBase(GeometryBase, typing.Generic[MultiPolygonTypeVar]):
     """A multi-polygon geometry."""
 
-    type: str = "MultiPolygon"
+    type: typing.Literal["MultiPolygon"] = "MultiPolygon"
     coordinates: MultiPolygonTypeVar
 
     def to_shapely(self) -> shapely.MultiPolygon:
@@ -19,7 +19,7 @@ PointTypeVar = typing.TypeVar(
 class PointBase(GeometryBase, typing.Generic[PointTypeVar]):
     """A point geometry."""
 
-    type: str = "Point"
+    type: typing.Literal["Point"] = "Point"
     coordinates: PointTypeVar
 
     def to_shapely(self) -> shapely.Point:
@@ -55,7 +55,7 @@ PolygonTypeVar = typing.TypeVar(
 class PolygonBase(GeometryBase, typing.Generic[PolygonTypeVar]):
     """A polygon geometry."""
 
-    type: str = "Polygon"
+    type: typing.Literal["Polygon"] = "Polygon"
     coordinates: PolygonTypeVar
 
     def to_shapely(self) -> shapely.Polygon:
@@ -0,0 +1,238 @@
+"""
+Limits on the size of GeoJSON payloads, e.g. uploads to an API.
+
+A GeoJSON feature collection with millions of vertices is converted to millions of
+Python lists and floats when it is validated, which may exhaust the memory of the
+process. The limits of a ``PayloadLimits`` object are checked before the payload is
+validated:
+
+- for JSON input (``model_validate_json``) the raw bytes are scanned with numpy, so
+  no Python objects are created for the payload;
+- for Python input (``model_validate``) the dictionaries and lists are traversed,
+  until the first limit is exceeded.
+
+In both cases the time needed to reject a payload is bounded by the size of the
+payload, and the memory by a small multiple of it.
+
+.. code-block:: python
+
+    from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+    from pydantic_shapely.geojson.limits import PayloadLimits
+
+    class Upload(
+        GeoJsonFeatureCollectionBaseModel[Parcel.GeoJsonDataModel],
+        payload_limits=PayloadLimits(max_features=10_000, max_coordinates=1_000_000),
+    ):
+        pass
+
+    Upload.model_validate_json(request_body)  # raises a PayloadTooLargeError
+
+The scan of the raw bytes counts the arrays of numbers which are the value of a
+``coordinates`` member, so arrays of numbers in the properties are not counted as
+coordinates. The vertices are counted for each ``coordinates`` member, i.e. for each
+part of a GeometryCollection separately.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+import typing
+from collections.abc import Mapping
+
+import numpy as np
+
+# The bytes of the JSON structure.
+_QUOTE, _BACKSLASH, _COLON = ord('"'), ord("\\"), ord(":")
+_OPENING = np.array([ord("["), ord("{")], dtype=np.uint8)
+_CLOSING = np.array([ord("]"), ord("}")], dtype=np.uint8)
+_STRUCTURAL = (*_OPENING.tolist(), *_CLOSING.tolist(), _COLON)
+_FEATURE = re.compile(rb'"type"\s*:\s*"Feature"')
+_COORDINATES = re.compile(rb'"coordinates"\s*:')
+
+
+class PayloadTooLargeError(Exception):
+    """
+    Raised when a payload exceeds one of its limits.
+
+    NOTE: The error deliberately does not derive from ValueError, so it is not turned
+    into a ValidationError when it is raised by a validator. An API can map it to the
+    status code 413 (Content Too Large).
+    """
+
+    def __init__(self, limit: str, maximum: int, actual: int) -> None:
+        self.limit = limit
+        self.maximum = maximum
+        self.actual = actual
+        super().__init__(
+            f"The payload exceeds the maximum {limit} of {maximum} (at least {actual})."
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class PayloadLimits:
+    """
+    Limits on the size of a GeoJSON payload. A limit of None is not checked.
+
+    Attributes:
+        max_features: The maximum number of features of a feature collection.
+        max_coordinates: The maximum number of coordinates of the whole payload.
+        max_depth: The maximum nesting depth of the JSON objects and arrays. A
+            MultiPolygon in a feature collection has a depth of 8.
+        max_vertices: The maximum number of coordinates of a single geometry.
+    """
+
+    max_features: typing.Optional[int] = None
+    max_coordinates: typing.Optional[int] = None
+    max_depth: typing.Optional[int] = None
+    max_vertices: typing.Optional[int] = None
+
+    @property
+    def _counts_coordinates(self) -> bool:
+        return self.max_coordinates is not None or self.max_vertices is not None
+
+    def _check(self, limit: str, actual: int) -> None:
+        maximum = getattr(self, f"max_{limit}")
+        if maximum is not None and actual > maximum:
+            raise PayloadTooLargeError(limit.replace("_", " "), maximum, actual)
+
+    def check_json(self, data: typing.Union[str, bytes, bytearray]) -> None:
+        """
+        Checks the limits on a JSON document, without parsing it.
+
+        Args:
+            data: The JSON document, a string or UTF-8 encoded bytes.
+
+        Raises:
+            PayloadTooLargeError: If the document exceeds one of the limits.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        quotes = _unescaped_quotes(buffer)
+
+        def outside_strings(positions: np.ndarray) -> np.ndarray:
+            # A position is outside of the strings, if it is preceded by an even
+            # number of quotes.
+            return np.searchsorted(quotes, positions) % 2 == 0
+
+        if self.max_features is not None:
+            starts = np.fromiter(
+                (match.start() for match in _FEATURE.finditer(data)), dtype=np.int64
+            )
+            self._check("features", int(np.count_nonzero(outside_strings(starts))))
+
+        if self.max_depth is None and not self._counts_coordinates:
+            return
+        # NOTE: comparing the bytes one by one is faster than ``np.isin`` or a lookup
+        # table for large documents.
+        mask = buffer == _STRUCTURAL[0]
+        for byte in _STRUCTURAL[1:]:
+            mask |= buffer == byte
+        structural = np.flatnonzero(mask)
+        del mask
+        structural = structural[outside_strings(structural)]
+        kinds = buffer[structural]
+        is_opening = np.isin(kinds, _OPENING)
+        brackets = np.flatnonzero(is_opening | np.isin(kinds, _CLOSING))
+        if self.max_depth is not None and brackets.size:
+            depth = np.cumsum(np.where(is_opening[brackets], 1, -1), dtype=np.int64)
+            self._check("depth", int(depth.max()))
+        if not self._counts_coordinates:
+            return
+        # A coordinate is an array which does not contain other arrays or objects,
+        # i.e. an opening bracket which is followed by a closing bracket. Empty
+        # arrays ("[]") are not counted.
+        bracket_positions = structural[brackets]
+        innermost = np.flatnonzero(
+            (kinds[brackets[:-1]] == ord("["))
+            & (kinds[brackets[1:]] == ord("]"))
+            & (np.diff(bracket_positions) > 1)
+        )
+        # Each coordinate belongs to the member of the nearest colon before it, only
+        # the members named "coordinates" are counted.
+        colons = structural[kinds == _COLON]
+        members = np.fromiter(
+            (match.end() - 1 for match in _COORDINATES.finditer(data)), dtype=np.int64
+        )
+        members = members[outside_strings(members)]
+        owner = np.searchsorted(colons, bracket_positions[innermost]) - 1
+        owner = owner[owner >= 0]
+        owner = owner[np.isin(colons[owner], members)]
+        self._check("coordinates", int(owner.size))
+        if self.max_vertices is not None and owner.size:
+            self._check("vertices", int(np.bincount(owner).max()))
+
+    def check_object(self, value: typing.Any) -> None:
+        """
+        Checks the limits on a GeoJSON object of dictionaries and lists, e.g. the
+        result of ``json.loads``. The traversal stops at the first limit exceeded.
+
+        Args:
+            value: The GeoJSON object.
+
+        Raises:
+            PayloadTooLargeError: If the object exceeds one of the limits.
+        """
+        if isinstance(value, Mapping) and isinstance(value.get("features"), list):
+            self._check("features", len(value["features"]))
+        if self.max_depth is None and not self._counts_coordinates:
+            return
+        _Traversal(self).visit(value, 1)
+
+
+class _Traversal:
+    """Traverses a GeoJSON object and counts its depth and coordinates."""
+
+    def __init__(self, limits: PayloadLimits) -> None:
+        self.limits = limits
+        self.coordinates = 0
+
+    def visit(self, value: typing.Any, depth: int) -> None:
+        """Visits the value at the given nesting depth."""
+        if isinstance(value, Mapping):
+            items: typing.Iterable[typing.Any] = value.values()
+        elif isinstance(value, (list, tuple)):
+            items = value
+        else:
+            return
+        self.limits._check("depth", depth)
+        if isinstance(value, Mapping) and "coordinates" in value:
+            vertices = self.count(value["coordinates"], depth + 1)
+            self.limits._check("vertices", vertices)
+            items = (v for k, v in value.items() if k != "coordinates")
+        for item in items:
+            self.visit(item, depth + 1)
+
+    def count(self, value: typing.Any, depth: int) -> int:
+        """Counts the coordinates of the (nested) arrays of a coordinates member."""
+        if not isinstance(value, (list, tuple)) or not value:
+            return 0
+        self.limits._check("depth", depth)
+        if not isinstance(value[0], (list, tuple)):
+            self.coordinates += 1
+            self.limits._check("coordinates", self.coordinates)
+            return 1
+        return sum(self.count(part, depth + 1) for part in value)
+
+
+def _unescaped_quotes(buffer: np.ndarray) -> np.ndarray:
+    """Returns the positions of the quotes which delimit the strings of a JSON document,
+    i.e. the quotes which are not preceded by an odd number of backslashes."""
+    quotes = np.flatnonzero(buffer == _QUOTE)
+    candidates = quotes[
+        (quotes > 0) & (buffer[np.maximum(quotes - 1, 0)] == _BACKSLASH)
+    ]
+    if not candidates.size:
+        return quotes
+    escaped = []
+    for position in candidates.tolist():
+        start = position - 1
+        while start > 0 and buffer[start - 1] == _BACKSLASH:
+            start -= 1
+        if (position - start) % 2:
+            escaped.append(position)
+    return np.setdiff1d(quotes, np.asarray(escaped, dtype=quotes.dtype))
+
+
+__all__ = ["PayloadLimits", "PayloadTooLargeError"]
@@ -0,0 +1,411 @@
+"""
+A compact collection of point features.
+
+A GeoJSON feature collection of points holds a GeoJSON model, a geometry model and a
+properties model for each of the points. ``PointCollection`` stores the coordinates of
+all points in a single float64 array of shape (N, 2) or (N, 3), and the properties in
+columns, see ``pydantic_shapely.columns``:
+
+.. code-block:: python
+
+    from pydantic_shapely.geojson import PointCollection
+
+    class Address(FeatureBaseModel):
+        geometry: Annotated[Point, GeometryField()]
+        street: str
+        number: int
+
+    points = PointCollection.from_feature_models(Address, addresses)
+    points.coordinates  # array of shape (N, 2)
+    points.properties["number"]  # int64 array
+    data = points.model_dump_geojson()
+    points = PointCollection.model_validate_geojson(Address, data)
+
+The geometries are converted with ``shapely.get_coordinates`` and ``shapely.points`` for
+all points at once. The GeoJSON is written directly from the arrays, without creating a
+model or a geometry for each of the points. The properties are serialized for each
+column at once, with the annotations of the fields, so serializers which are defined as
+methods of the feature model are not applied.
+"""
+
+import functools
+import itertools
+import typing
+
+import numpy as np
+import shapely
+from pydantic import TypeAdapter
+from pydantic_core import from_json
+
+from pydantic_shapely import FeatureBaseModel, instrumentation, json_backend
+from pydantic_shapely.annotations import _format_indices, supported_types
+from pydantic_shapely.columns import _column, _values, column_dtype
+
+try:
+    from typing import Annotated
+except ImportError:
+    # This import is required in Python 3.8
+    from typing_extensions import Annotated  # type: ignore
+
+F = typing.TypeVar("F", bound=FeatureBaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _properties_adapter(model: typing.Type[FeatureBaseModel]) -> TypeAdapter:
+    """Returns the adapter which validates a list of properties with the properties
+    model of the GeoJSON data model of the feature model."""
+    properties = model.GeoJsonDataModel.model_fields["properties"].annotation
+    return TypeAdapter(typing.List[properties])  # type: ignore[valid-type]
+
+
+@functools.lru_cache(maxsize=None)
+def _column_adapter(model: typing.Type[FeatureBaseModel], name: str) -> TypeAdapter:
+    """Returns the adapter which serializes the values of a field."""
+    field = model.model_fields[name]
+    annotation = field.annotation
+    if field.metadata:
+        annotation = Annotated[(annotation, *field.metadata)]  # type: ignore
+    return TypeAdapter(typing.List[annotation])  # type: ignore[valid-type]
+
+
+def _coordinates(geometries: typing.Any) -> np.ndarray:
+    """Returns the coordinates of an array of points as an array of shape (N, 2), or
+    (N, 3) when the points have z-values."""
+    geometries = np.asarray(geometries, dtype=object)
+    if not geometries.size:
+        return np.empty((0, 2), dtype=np.float64)
+    offending = np.flatnonzero(
+        shapely.is_missing(geometries) | shapely.is_empty(geometries)
+    )
+    if offending.size:
+        raise ValueError(
+            f"Supplied points at indices {_format_indices(offending)} are empty."
+        )
+    has_z = shapely.has_z(geometries)
+    if has_z.any() and not has_z.all():
+        raise ValueError(
+            f"Supplied points at indices {_format_indices(np.flatnonzero(~has_z))} "
+            "have no z-values, while the other points have."
+        )
+    return shapely.get_coordinates(geometries, include_z=bool(has_z[0]))
+
+
+def _validate_properties(
+    model: typing.Type[FeatureBaseModel], rows: typing.List[typing.Any]
+) -> typing.Dict[str, np.ndarray]:
+    """Validates the properties of the features with the properties model and returns
+    them as columns."""
+    validated = _properties_adapter(model).validate_python(rows)
+    return {
+        name: _column(
+            [properties.__dict__[name] for properties in validated],
+            column_dtype(field.annotation),
+        )
+        for name, field in model.model_fields.items()
+        if name != model.__geometry_field__
+    }
+
+
+class PointCollection(typing.Generic[F]):
+    """
+    Point features of a feature model, stored as an array of coordinates and columns of
+    properties. The geometry field of the feature model must be annotated with
+    ``shapely.Point``.
+
+    Attributes:
+        model: The feature model.
+        coordinates: The coordinates of the points, a float64 array of shape (N, 2) or
+            (N, 3).
+        properties: The columns of the other fields of the feature model, in the order
+            of the fields. See ``pydantic_shapely.columns`` for the dtypes.
+    """
+
+    def __init__(
+        self,
+        model: typing.Type[F],
+        coordinates: typing.Any,
+        properties: typing.Mapping[str, typing.Any],
+    ) -> None:
+        """
+        Creates the collection from the coordinates and the columns of the properties,
+        without validation. The columns of fields with a default may be left out.
+
+        Raises:
+            TypeError: If the geometry field of the model is not annotated with
+            ``shapely.Point``.
+            ValueError: If the coordinates are not an array of shape (N, 2) or (N, 3),
+            or if the columns do not match the fields of the model or the number of
+            points.
+        """
+        annotation = model.model_fields[model.__geometry_field__].annotation
+        if supported_types(annotation) != (shapely.Point,):
+            raise TypeError(
+                f"The geometry field of the model '{model.__name__}' is not annotated "
+                "with Point."
+            )
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        if coordinates.ndim != 2 or coordinates.shape[1] not in (2, 3):
+            raise ValueError(
+                f"Supplied coordinates of shape {coordinates.shape} are not an array "
+                "of shape (N, 2) or (N, 3)."
+            )
+        unknown = [
+            name
+            for name in properties
+            if name not in model.model_fields or name == model.__geometry_field__
+        ]
+        if unknown:
+            raise ValueError(
+                f"Supplied columns {', '.join(unknown)} are not properties of the "
+                f"model '{model.__name__}'."
+            )
+        count = len(coordinates)
+        columns: typing.Dict[str, np.ndarray] = {}
+        for name, field in model.model_fields.items():
+            if name == model.__geometry_field__:
+                continue
+            if name in properties:
+                values = properties[name]
+            elif field.is_required():
+                raise ValueError(f"Supplied columns have no column '{name}'.")
+            else:
+                values = [field.get_default(call_default_factory=True)] * count
+            if not isinstance(values, np.ndarray):
+                values = _column(list(values), column_dtype(field.annotation))
+            if len(values) != count:
+                raise ValueError(
+                    f"Supplied column '{name}' has {len(values)} values for {count} "
+                    "points."
+                )
+            columns[name] = values
+        self.model = model
+        self.coordinates = coordinates
+        self.properties = columns
+
+    def __len__(self) -> int:
+        return len(self.coordinates)
+
+    @property
+    def geometries(self) -> np.ndarray:
+        """The points as an object array of Shapely geometries."""
+        return shapely.points(self.coordinates)
+
+    @classmethod
+    def from_feature_models(
+        cls,
+        model: typing.Type[F],
+        features: typing.Sequence[F],
+    ) -> "PointCollection[F]":
+        """
+        Creates the collection from feature models, without validation.
+
+        Args:
+            model: The feature model.
+            features: The feature models, instances of the model.
+
+        Raises:
+            ValueError: If one or more points are empty, or if some points have
+            z-values and others not.
+        """
+        started = instrumentation.start()
+        columns = model.to_columns(features)
+        geometries = columns.pop(model.__geometry_field__)
+        result = cls(model, _coordinates(geometries), columns)
+        instrumentation.stop(
+            started, "points.from_feature_models", model=model, items=len(result)
+        )
+        return result
+
+    @classmethod
+    def from_columns(
+        cls,
+        model: typing.Type[F],
+        columns: typing.Mapping[str, typing.Any],
+        *,
+        trusted: bool = False,
+    ) -> "PointCollection[F]":
+        """
+        Creates the collection from columns, e.g. as returned by
+        ``FeatureBaseModel.to_columns``.
+
+        Args:
+            model: The feature model.
+            columns: A mapping of the field names to arrays or sequences. The columns
+                of fields with a default may be left out.
+            trusted: Whether to skip the validation. Otherwise the geometries are
+                validated by the geometry field at once, and the properties by the
+                properties model of the GeoJSON data model of the feature model.
+
+        Raises:
+            ValueError: If the geometry column is missing, or if the geometries or
+            the columns are invalid.
+            ValidationError: If the properties are invalid.
+        """
+        if model.__geometry_field__ not in columns:
+            raise ValueError(
+                "Supplied columns have no geometry column "
+                f"'{model.__geometry_field__}'."
+            )
+        geometries = columns[model.__geometry_field__]
+        properties = {
+            name: column
+            for name, column in columns.items()
+            if name != model.__geometry_field__
+        }
+        if not trusted:
+            geometry_field = model._get_geometry_field()
+            if geometry_field is not None:
+                geometries = geometry_field.validate_many(geometries, shapely.Point)
+        result = cls(model, _coordinates(geometries), properties)
+        if not trusted:
+            names = list(result.properties)
+            values = [
+                _values(column, model.model_fields[name].annotation)
+                for name, column in result.properties.items()
+            ]
+            rows = zip(*values) if values else itertools.repeat((), len(result))
+            result.properties = _validate_properties(
+                model, [dict(zip(names, row)) for row in rows]
+            )
+        return result
+
+    def to_columns(self) -> typing.Dict[str, np.ndarray]:
+        """Returns the columns of all fields of the feature model, like
+        ``FeatureBaseModel.to_columns``, with the points in an object array."""
+        return {
+            name: (
+                self.geometries
+                if name == self.model.__geometry_field__
+                else self.properties[name]
+            )
+            for name in self.model.model_fields
+        }
+
+    def to_feature_models(self, trusted: bool = False) -> typing.List[F]:
+        """
+        Converts the collection to feature models, see
+        ``FeatureBaseModel.from_columns``.
+
+        Args:
+            trusted: Whether to create the models without validation.
+        """
+        return self.model.from_columns(self.to_columns(), trusted=trusted)
+
+    def _json_columns(self) -> typing.List[typing.List[typing.Any]]:
+        """Returns the values of the properties as JSON-compatible Python objects,
+        serialized for each column at once."""
+        result = []
+        for name, column in self.properties.items():
+            if (
+                self.model.model_fields[name].metadata
+                or column.dtype.kind not in "biuf"
+            ):
+                values = _column_adapter(self.model, name).dump_python(
+                    column.tolist(), mode="json"
+                )
+            elif column.dtype.kind == "f" and np.isnan(column).any():
+                # Like Pydantic, NaN is written as null.
+                values = column.tolist()
+                for index in np.flatnonzero(np.isnan(column)).tolist():
+                    values[index] = None
+            else:
+                values = column.tolist()
+            result.append(values)
+        return result
+
+    def model_dump_geojson(self) -> bytes:
+        """
+        Dumps the collection to a GeoJSON feature collection as UTF-8 encoded bytes,
+        the equivalent of ``GeoJsonFeatureCollectionBaseModel.dump_feature_models``.
+        The features are written directly from the coordinates and the columns.
+        """
+        started = instrumentation.start()
+        names = list(self.properties)
+        columns = self._json_columns()
+        rows = zip(*columns) if columns else itertools.repeat(())
+        result = json_backend.get_backend().dumps(
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    {
+                        "type": "Feature",
+                        "geometry": {"type": "Point", "coordinates": coordinates},
+                        "properties": dict(zip(names, row)),
+                    }
+                    for coordinates, row in zip(self.coordinates.tolist(), rows)
+                ],
+            }
+        )
+        instrumentation.stop(
+            started, "points.model_dump_geojson", model=self.model, items=len(self)
+        )
+        return result
+
+    @classmethod
+    def model_validate_geojson(
+        cls,
+        model: typing.Type[F],
+        json_data: typing.Union[str, bytes, bytearray],
+    ) -> "PointCollection[F]":
+        """
+        Validates a GeoJSON feature collection of points. The coordinates are read
+        into a single array, and the properties are validated by the properties model
+        of the GeoJSON data model and stored in columns, without creating the feature
+        models.
+
+        Args:
+            model: The feature model.
+            json_data: The GeoJSON feature collection.
+
+        Raises:
+            ValueError: If the data is not a feature collection of points, or if the
+            points do not comply with the geometry field. The message lists the
+            indices of the offending features.
+            ValidationError: If the properties are invalid.
+        """
+        started = instrumentation.start()
+        data = from_json(json_data)
+        if not isinstance(data, dict) or data.get("type") != "FeatureCollection":
+            raise ValueError("Supplied data is not a GeoJSON feature collection.")
+        features = data.get("features") or []
+        offending = [
+            index
+            for index, feature in enumerate(features)
+            if not isinstance(feature, dict)
+            or not isinstance(feature.get("geometry"), dict)
+            or feature["geometry"].get("type") != "Point"
+        ]
+        if offending:
+            raise ValueError(
+                f"Supplied features at indices {_format_indices(offending)} are not "
+                "GeoJSON features with a point."
+            )
+        try:
+            coordinates = np.array(
+                [feature["geometry"].get("coordinates") for feature in features],
+                dtype=np.float64,
+            ).reshape(len(features), -1)
+        except (TypeError, ValueError) as ex:
+            raise ValueError(
+                "Supplied points have no coordinates, or points with and without "
+                "z-values are mixed."
+            ) from ex
+        if not features:
+            coordinates = np.empty((0, 2), dtype=np.float64)
+        properties = _validate_properties(
+            model, [feature.get("properties") or {} for feature in features]
+        )
+        geometry_field = model._get_geometry_field()
+        if geometry_field is not None and len(features):
+            geometries = geometry_field.check_constraints(
+                geometry_field.enforce_z_values(shapely.points(coordinates))
+            )
+            coordinates = _coordinates(geometries)
+        result = cls(model, coordinates, properties)
+        instrumentation.stop(
+            started, "points.model_validate_geojson", model=model, items=len(result)
+        )
+        return result
+
+
+__all__ = ["PointCollection"]
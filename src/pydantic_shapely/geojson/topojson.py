@@ -0,0 +1,367 @@
+"""
+Conversion of feature collections to and from TopoJSON.
+
+`TopoJSON <https://github.com/topojson/topojson-specification>`_ stores the lines and
+rings of the geometries as arcs, which are shared between the geometries. A boundary
+between two adjacent polygons is stored once, instead of once for each polygon. The
+coordinates are quantized to an integer grid and the positions of each arc are
+delta-encoded, which makes the output much smaller than GeoJSON:
+
+.. code-block:: python
+
+    data = collection.model_dump_topojson()
+    restored = Collection.model_validate_topojson(data)
+    features = restored.to_feature_models()
+
+The topology is built like the reference implementation: after quantization, the
+vertices which are shared by several lines or rings with different neighbours, and the
+end points of lines, are junctions. The lines and rings are cut at the junctions and
+equal arcs (also in reverse) are stored once. The junctions are determined for all
+vertices at once with numpy.
+
+Quantization moves the coordinates to the grid, so the geometries read from TopoJSON
+differ from the original geometries by at most half a grid cell. Z-values are dropped.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+# The default number of grid positions along each axis of the bounding box.
+DEFAULT_QUANTIZATION = 100_000
+
+
+def to_topology(
+    geometries: typing.Sequence[BaseGeometry],
+    properties: typing.Sequence[typing.Dict[str, typing.Any]],
+    object_name: str = "features",
+    quantization: int = DEFAULT_QUANTIZATION,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Returns the TopoJSON topology of the geometries, with a single object: a geometry
+    collection of the geometries with their properties.
+
+    Args:
+        geometries: The geometries of the features.
+        properties: The properties of each of the features.
+        object_name: The name of the object in the topology.
+        quantization: The number of grid positions along each axis of the bounding box
+            of the geometries, at least 2.
+
+    Raises:
+        ValueError: If the quantization is smaller than 2.
+    """
+    if quantization < 2:
+        raise ValueError("The quantization must be at least 2.")
+    builder = _TopologyBuilder(shapely.total_bounds(geometries), quantization)
+    objects = [builder.add(geometry) for geometry in geometries]
+    arcs = builder.build_arcs()
+    for geometry, values in zip(objects, properties):
+        builder.replace_paths(geometry, arcs)
+        geometry["properties"] = values
+    return {
+        "type": "Topology",
+        "bbox": builder.bbox,
+        "transform": builder.transform,
+        "objects": {object_name: {"type": "GeometryCollection", "geometries": objects}},
+        "arcs": builder.arcs,
+    }
+
+
+def from_topology(
+    topology: typing.Any, object_name: typing.Optional[str] = None
+) -> typing.List[typing.Dict[str, typing.Any]]:
+    """
+    Returns the geometries of an object of a TopoJSON topology as GeoJSON features.
+
+    Args:
+        topology: The decoded TopoJSON document.
+        object_name: The name of the object. May be omitted if the topology has a
+            single object.
+
+    Raises:
+        ValueError: If the document is not a TopoJSON topology or the object is not
+            found or invalid.
+    """
+    if not isinstance(topology, dict) or topology.get("type") != "Topology":
+        raise ValueError("Supplied value is not a TopoJSON topology.")
+    objects = topology.get("objects")
+    if not isinstance(objects, dict):
+        raise ValueError("The TopoJSON topology has no objects.")
+    if object_name is None:
+        if len(objects) != 1:
+            raise ValueError(
+                f"The TopoJSON topology has {len(objects)} objects, supply the name "
+                f"of the object to read."
+            )
+        (topology_object,) = objects.values()
+    elif object_name in objects:
+        topology_object = objects[object_name]
+    else:
+        raise ValueError(f"The TopoJSON topology has no object '{object_name}'.")
+    reader = _TopologyReader(topology)
+    if topology_object.get("type") == "GeometryCollection":
+        members = topology_object.get("geometries", [])
+    else:
+        members = [topology_object]
+    features = []
+    for index, member in enumerate(members):
+        if member.get("type") is None:
+            raise ValueError(f"The geometry at index {index} has no type.")
+        feature = {
+            "type": "Feature",
+            "geometry": reader.geometry(member),
+            "properties": member.get("properties") or {},
+        }
+        if "id" in member:
+            feature["id"] = member["id"]
+        features.append(feature)
+    return features
+
+
+class _TopologyBuilder:
+    """Quantizes the geometries and collects their lines and rings (the paths), which
+    are cut in arcs when all geometries have been added."""
+
+    def __init__(self, bounds: np.ndarray, quantization: int):
+        minx, miny, maxx, maxy = (float(v) for v in bounds)
+        if not np.isfinite(minx):
+            # None of the geometries has coordinates.
+            minx = miny = maxx = maxy = 0.0
+        self.bbox = [minx, miny, maxx, maxy]
+        self.origin = np.array([minx, miny])
+        extent = np.array([maxx - minx, maxy - miny])
+        # The number of grid cells per unit along each axis.
+        self.factor = np.ones(2)
+        np.divide(quantization - 1, extent, out=self.factor, where=extent > 0)
+        self.transform = {
+            "scale": (1 / self.factor).tolist(),
+            "translate": self.origin.tolist(),
+        }
+        # The vertices are numbered on the grid, see ``_keys``.
+        self.quantization = quantization
+        self.paths: typing.List[typing.Tuple[np.ndarray, bool]] = []
+        self.arcs: typing.List[typing.List[typing.List[int]]] = []
+
+    def _quantize(self, geometry: BaseGeometry) -> np.ndarray:
+        coordinates = shapely.get_coordinates(geometry)
+        return np.rint((coordinates - self.origin) * self.factor).astype(np.int64)
+
+    def _path(self, geometry: BaseGeometry, ring: bool) -> int:
+        """Adds a line or ring and returns its index. Repeated vertices are removed,
+        unless the path would collapse."""
+        coordinates = self._quantize(geometry)
+        if len(coordinates) > 1:
+            keep = np.ones(len(coordinates), dtype=bool)
+            keep[1:] = np.any(coordinates[1:] != coordinates[:-1], axis=1)
+            if keep.sum() >= (4 if ring else 2):
+                coordinates = coordinates[keep]
+        self.paths.append((coordinates, ring))
+        return len(self.paths) - 1
+
+    def add(self, geometry: BaseGeometry) -> typing.Dict[str, typing.Any]:
+        """Returns the TopoJSON geometry object, with the indices of the paths instead
+        of the indices of the arcs."""
+        if geometry is None or geometry.is_empty:
+            return {"type": None}
+        geom_type = geometry.geom_type
+        if geom_type == "GeometryCollection":
+            return {
+                "type": geom_type,
+                "geometries": [self.add(part) for part in geometry.geoms],
+            }
+        if geom_type in ("Point", "MultiPoint"):
+            coordinates = self._quantize(geometry).tolist()
+            return {
+                "type": geom_type,
+                "coordinates": coordinates[0] if geom_type == "Point" else coordinates,
+            }
+        if geom_type in ("LineString", "LinearRing"):
+            return {"type": "LineString", "arcs": self._path(geometry, False)}
+        if geom_type == "Polygon":
+            return {"type": geom_type, "arcs": self._rings(geometry)}
+        if geom_type == "MultiLineString":
+            paths = [self._path(line, False) for line in geometry.geoms]
+            return {"type": geom_type, "arcs": paths}
+        # MultiPolygon
+        return {
+            "type": geom_type,
+            "arcs": [self._rings(polygon) for polygon in geometry.geoms],
+        }
+
+    def _rings(self, polygon: BaseGeometry) -> typing.List[int]:
+        return [
+            self._path(ring, True) for ring in (polygon.exterior, *polygon.interiors)
+        ]
+
+    def _keys(self, coordinates: np.ndarray) -> np.ndarray:
+        return coordinates[:, 0] * self.quantization + coordinates[:, 1]
+
+    def _junctions(self, keys: typing.List[np.ndarray]) -> np.ndarray:
+        """Returns the keys of the vertices at which the paths are cut: the vertices
+        with different neighbours in different places, and the end points of lines."""
+        points, lows, highs, ends = [], [], [], []
+        for path_keys, (_, ring) in zip(keys, self.paths):
+            if ring:
+                path_keys = path_keys[:-1]
+                previous, following = np.roll(path_keys, 1), np.roll(path_keys, -1)
+            else:
+                ends.append(path_keys[[0, -1]])
+                previous = np.concatenate(([-1], path_keys[:-1]))
+                following = np.concatenate((path_keys[1:], [-1]))
+            points.append(path_keys)
+            lows.append(np.minimum(previous, following))
+            highs.append(np.maximum(previous, following))
+        if not points:
+            return np.zeros(0, np.int64)
+        neighbours = np.unique(
+            np.column_stack(
+                (np.concatenate(points), np.concatenate(lows), np.concatenate(highs))
+            ),
+            axis=0,
+        )
+        keys, counts = np.unique(neighbours[:, 0], return_counts=True)
+        if ends:
+            return np.union1d(keys[counts > 1], np.concatenate(ends))
+        return keys[counts > 1]
+
+    def build_arcs(self) -> typing.List[typing.List[int]]:
+        """Cuts the paths in arcs and returns the indices of the arcs of each path."""
+        keys = [self._keys(coordinates) for coordinates, _ in self.paths]
+        if not keys:
+            return []
+        # Whether each of the vertices of each of the paths is a junction.
+        is_junction = np.split(
+            np.isin(np.concatenate(keys), self._junctions(keys)),
+            np.cumsum([len(k) for k in keys])[:-1],
+        )
+        index: typing.Dict[bytes, int] = {}
+        result = []
+        for (coordinates, ring), path_keys, junctions in zip(
+            self.paths, keys, is_junction
+        ):
+            cuts = np.flatnonzero(junctions)
+            if ring:
+                if len(cuts) == 0:
+                    # A ring without junctions is rotated to start at its smallest
+                    # vertex, so equal rings are stored as a single arc.
+                    start = int(np.argmin(path_keys[:-1]))
+                else:
+                    start = int(cuts[0])
+                coordinates = np.concatenate(
+                    (coordinates[start:-1], coordinates[: start + 1])
+                )
+                junctions = np.concatenate(
+                    (junctions[start:-1], junctions[: start + 1])
+                )
+                junctions[[0, -1]] = True
+                cuts = np.flatnonzero(junctions)
+            elif len(cuts) == 0:
+                cuts = np.array([0, len(coordinates) - 1])
+            arcs = []
+            for start, stop in zip(cuts[:-1], cuts[1:]):
+                arcs.append(self._arc(coordinates[start : stop + 1], index))
+            if not arcs:
+                # A line which collapsed to a single vertex.
+                arcs.append(self._arc(coordinates, index))
+            result.append(arcs)
+        return result
+
+    def _arc(self, coordinates: np.ndarray, index: typing.Dict[bytes, int]) -> int:
+        """Returns the index of the arc, or the complement of the index of the reversed
+        arc, adding the arc if it is new."""
+        key = coordinates.tobytes()
+        if key in index:
+            return index[key]
+        reversed_key = coordinates[::-1].tobytes()
+        if reversed_key in index:
+            return ~index[reversed_key]
+        index[key] = len(self.arcs)
+        deltas = np.diff(coordinates, axis=0, prepend=np.zeros((1, 2), np.int64))
+        self.arcs.append(deltas.tolist())
+        return len(self.arcs) - 1
+
+    def replace_paths(
+        self,
+        geometry: typing.Dict[str, typing.Any],
+        arcs: typing.List[typing.List[int]],
+    ) -> None:
+        """Replaces the indices of the paths of the geometry by their arcs."""
+        geom_type = geometry["type"]
+        if geom_type == "GeometryCollection":
+            for member in geometry["geometries"]:
+                self.replace_paths(member, arcs)
+        elif geom_type in ("LineString", "Polygon", "MultiLineString"):
+            paths = geometry["arcs"]
+            if geom_type == "LineString":
+                geometry["arcs"] = arcs[paths]
+            else:
+                geometry["arcs"] = [arcs[path] for path in paths]
+        elif geom_type == "MultiPolygon":
+            geometry["arcs"] = [
+                [arcs[path] for path in polygon] for polygon in geometry["arcs"]
+            ]
+
+
+class _TopologyReader:
+    """Decodes the arcs of a topology and converts its geometry objects to GeoJSON."""
+
+    def __init__(self, topology: typing.Dict[str, typing.Any]):
+        transform = topology.get("transform")
+        if transform is None:
+            self.scale, self.translate = np.ones(2), np.zeros(2)
+        else:
+            self.scale = np.asarray(transform["scale"], dtype=float)
+            self.translate = np.asarray(transform["translate"], dtype=float)
+        self.arcs = []
+        for arc in topology.get("arcs", []):
+            positions = np.asarray(arc, dtype=float)[:, :2]
+            if transform is not None:
+                positions = np.cumsum(positions, axis=0)
+            self.arcs.append(positions * self.scale + self.translate)
+
+    def _positions(self, positions: typing.Any) -> typing.Any:
+        positions = np.asarray(positions, dtype=float)[..., :2]
+        return (positions * self.scale + self.translate).tolist()
+
+    def _line(self, indices: typing.List[int]) -> typing.List[typing.List[float]]:
+        parts = []
+        for number, index in enumerate(indices):
+            try:
+                arc = self.arcs[index] if index >= 0 else self.arcs[~index][::-1]
+            except (IndexError, TypeError) as ex:
+                raise ValueError(f"The arc {index!r} does not exist.") from ex
+            # The first position of an arc is the last position of the previous arc.
+            parts.append(arc if number == 0 else arc[1:])
+        return np.concatenate(parts).tolist()
+
+    def geometry(
+        self, value: typing.Dict[str, typing.Any]
+    ) -> typing.Dict[str, typing.Any]:
+        """Returns the GeoJSON geometry of a TopoJSON geometry object."""
+        geom_type = value.get("type")
+        if geom_type == "GeometryCollection":
+            return {
+                "type": geom_type,
+                "geometries": [self.geometry(member) for member in value["geometries"]],
+            }
+        if geom_type in ("Point", "MultiPoint"):
+            coordinates = self._positions(value["coordinates"])
+        elif geom_type == "LineString":
+            coordinates = self._line(value["arcs"])
+        elif geom_type in ("Polygon", "MultiLineString"):
+            coordinates = [self._line(arcs) for arcs in value["arcs"]]
+        elif geom_type == "MultiPolygon":
+            coordinates = [
+                [self._line(arcs) for arcs in polygon] for polygon in value["arcs"]
+            ]
+        else:
+            raise ValueError(f"The geometry type {geom_type!r} is not supported.")
+        return {"type": geom_type, "coordinates": coordinates}
+
+
+__all__ = ["DEFAULT_QUANTIZATION", "from_topology", "to_topology"]
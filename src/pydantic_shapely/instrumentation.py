@@ -0,0 +1,299 @@
+"""
+Opt-in instrumentation of the conversion hot paths of this package.
+
+The package emits a ``Measurement`` for each of the instrumented operations:
+
+- ``geometry_field.parse_wkt`` and ``geometry_field.parse_wkb``: parsing of WKT/WKB input
+  by the ``GeometryField``;
+- ``geometry_field.write_wkt``: serialization of a geometry by the ``GeometryField``;
+- ``geometry_field.parse_polyline`` and ``geometry_field.write_polyline``: parsing and
+  serialization of encoded polylines by the ``GeometryField``;
+- ``feature.to_geojson_model`` and ``feature.to_feature_model``: conversion between a
+  feature model and its GeoJSON data model;
+- ``feature.model_validate_geojson`` and ``feature.model_validate_geojson_many``:
+  validation of GeoJSON directly to feature models;
+- ``feature.to_columns`` and ``feature.from_columns``: conversion between feature models
+  and columns of numpy arrays;
+- ``feature.model_dump_geojson`` and ``collection.dump_feature_models``: writing GeoJSON
+  directly from feature models;
+- ``collection.model_dump_json_parallel``: the JSON serialization of a feature collection
+  in chunks;
+- ``collection.model_dump_topojson`` and ``collection.model_validate_topojson``:
+  conversion between a feature collection and TopoJSON;
+- ``collection.from_feature_models`` and ``collection.to_feature_models``: conversion
+  between a list of feature models and a GeoJSON feature collection;
+- ``feature.construct_geojson_models``: conversion of trusted feature models to GeoJSON
+  models, without validation;
+- ``points.from_feature_models``, ``points.model_dump_geojson`` and
+  ``points.model_validate_geojson``: conversions of a ``PointCollection``;
+- ``mvt.encode_tile``: encoding of features as a Mapbox Vector Tile;
+- ``tiles.generate``: encoding of the vector tiles of a zoom level of a ``TilePyramid``;
+- ``cache.<name>.hit`` and ``cache.<name>.miss``: counters for the caches of the package.
+
+Instrumentation is disabled by default. When neither a hook is registered nor a
+measurement scope is active, the instrumented code paths only check a module-level flag.
+
+Measurements can be consumed in two ways:
+
+.. code-block:: python
+
+    from pydantic_shapely import instrumentation
+
+    # 1. Register a hook, which is called for every measurement in the process. Use
+    #    this to feed the measurements into your own metrics stack.
+    def hook(measurement: instrumentation.Measurement) -> None:
+        statsd.timing(measurement.name, measurement.duration)
+
+    instrumentation.add_hook(hook)
+
+    # 2. Collect the measurements of a block of code (e.g. a single request) with the
+    #    built-in aggregator. Scopes are bound to the current context, so concurrent
+    #    requests (threads or asyncio tasks) do not see each others measurements.
+    with instrumentation.collect() as aggregator:
+        collection.to_feature_models()
+    print(aggregator.summary())
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import threading
+import time
+import typing
+
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+# Flag which is checked by the instrumented code paths. It is True when at least one
+# hook is registered or one measurement scope is active.
+ENABLED = False
+
+Hook = typing.Callable[["Measurement"], None]
+
+_HOOKS: typing.List[Hook] = []
+_ACTIVE_SCOPES = 0
+_LOCK = threading.Lock()
+_SCOPES: "contextvars.ContextVar[typing.Tuple[Aggregator, ...]]" = (
+    contextvars.ContextVar("pydantic_shapely_instrumentation_scopes", default=())
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Measurement:
+    """A single measurement of an instrumented operation.
+
+    Attributes:
+        name: The name of the operation, e.g. ``feature.to_geojson_model``.
+        duration: The duration of the operation in seconds, or None for counters.
+        geometry_type: The geometry type of the processed geometry, if known.
+        vertex_count: The number of vertices processed by the operation, if known.
+        model: The Pydantic model class involved in the operation, if any.
+        items: The number of items processed by the operation.
+    """
+
+    name: str
+    duration: typing.Optional[float] = None
+    geometry_type: typing.Optional[str] = None
+    vertex_count: typing.Optional[int] = None
+    model: typing.Optional[type] = None
+    items: int = 1
+
+
+@dataclasses.dataclass
+class Statistics:
+    """Aggregated statistics of the measurements of a single operation."""
+
+    count: int = 0
+    items: int = 0
+    vertices: int = 0
+    total_duration: float = 0.0
+    min_duration: float = float("inf")
+    max_duration: float = 0.0
+
+    @property
+    def mean_duration(self) -> float:
+        """The mean duration of the timed measurements in seconds."""
+        return self.total_duration / self.count if self.count else 0.0
+
+    def add(self, measurement: Measurement) -> None:
+        """Adds the measurement to the statistics."""
+        self.count += 1
+        self.items += measurement.items
+        if measurement.vertex_count:
+            self.vertices += measurement.vertex_count
+        if measurement.duration is not None:
+            self.total_duration += measurement.duration
+            self.min_duration = min(self.min_duration, measurement.duration)
+            self.max_duration = max(self.max_duration, measurement.duration)
+
+
+class Aggregator:
+    """In-process aggregator of measurements. The aggregator keeps statistics per
+    operation and per operation/model combination. It can be used as a hook or as
+    the target of a measurement scope, see ``collect``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.operations: typing.Dict[str, Statistics] = {}
+        self.models: typing.Dict[typing.Tuple[str, str], Statistics] = {}
+
+    def __call__(self, measurement: Measurement) -> None:
+        with self._lock:
+            self.operations.setdefault(measurement.name, Statistics()).add(measurement)
+            if measurement.model is not None:
+                key = (measurement.name, measurement.model.__name__)
+                self.models.setdefault(key, Statistics()).add(measurement)
+
+    def reset(self) -> None:
+        """Removes all collected statistics."""
+        with self._lock:
+            self.operations.clear()
+            self.models.clear()
+
+    def summary(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Returns the statistics per operation as a dictionary of plain values."""
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "items": stats.items,
+                    "vertices": stats.vertices,
+                    "total_duration": stats.total_duration,
+                    "mean_duration": stats.mean_duration,
+                    "max_duration": stats.max_duration,
+                }
+                for name, stats in self.operations.items()
+            }
+
+
+def _update_enabled() -> None:
+    global ENABLED  # pylint: disable=global-statement
+    ENABLED = bool(_HOOKS) or _ACTIVE_SCOPES > 0
+
+
+def add_hook(hook: Hook) -> None:
+    """Registers a hook, which is called with every measurement in the process."""
+    with _LOCK:
+        _HOOKS.append(hook)
+        _update_enabled()
+
+
+def remove_hook(hook: Hook) -> None:
+    """Removes a previously registered hook."""
+    with _LOCK:
+        _HOOKS.remove(hook)
+        _update_enabled()
+
+
+@contextlib.contextmanager
+def collect(
+    aggregator: typing.Optional[Aggregator] = None,
+) -> typing.Iterator[Aggregator]:
+    """Context manager which collects the measurements of the enclosed block in an
+    aggregator. The scope is bound to the current context (thread or asyncio task),
+    scopes can be nested.
+
+    Args:
+        aggregator: The aggregator to add the measurements to. A new aggregator is
+            created when omitted.
+    """
+    global _ACTIVE_SCOPES  # pylint: disable=global-statement
+    if aggregator is None:
+        aggregator = Aggregator()
+    token = _SCOPES.set(_SCOPES.get() + (aggregator,))
+    with _LOCK:
+        _ACTIVE_SCOPES += 1
+        _update_enabled()
+    try:
+        yield aggregator
+    finally:
+        _SCOPES.reset(token)
+        with _LOCK:
+            _ACTIVE_SCOPES -= 1
+            _update_enabled()
+
+
+def emit(measurement: Measurement) -> None:
+    """Sends the measurement to the registered hooks and the active scopes."""
+    for hook in list(_HOOKS):
+        hook(measurement)
+    for aggregator in _SCOPES.get():
+        aggregator(measurement)
+
+
+def start() -> typing.Optional[float]:
+    """Returns the start time of a measurement, or None if instrumentation is disabled.
+    The result should be passed to ``stop``."""
+    if not ENABLED:
+        return None
+    return time.perf_counter()
+
+
+def stop(
+    started: typing.Optional[float],
+    name: str,
+    geometry: typing.Any = None,
+    model: typing.Optional[type] = None,
+    items: int = 1,
+) -> None:
+    """Emits the measurement of an operation started with ``start``.
+
+    Args:
+        started: The result of ``start``. Nothing is emitted when this is None.
+        name: The name of the operation.
+        geometry: The geometry, or a sequence of geometries, processed by the operation.
+        model: The model class involved in the operation.
+        items: The number of items processed by the operation.
+    """
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+    geometry_type, vertex_count = _describe(geometry)
+    emit(Measurement(name, duration, geometry_type, vertex_count, model, items))
+
+
+def count(
+    name: str,
+    geometry: typing.Any = None,
+    model: typing.Optional[type] = None,
+    items: int = 1,
+) -> None:
+    """Emits a counter (a measurement without duration), e.g. for cache hits."""
+    if not ENABLED:
+        return
+    geometry_type, vertex_count = _describe(geometry)
+    emit(Measurement(name, None, geometry_type, vertex_count, model, items))
+
+
+def _describe(
+    geometry: typing.Any,
+) -> typing.Tuple[typing.Optional[str], typing.Optional[int]]:
+    """Returns the geometry type and the number of vertices of a geometry or of a
+    sequence of geometries. For a sequence the geometry type is only returned when all
+    geometries have the same type."""
+    if geometry is None:
+        return None, None
+    if isinstance(geometry, BaseGeometry):
+        return geometry.geom_type, int(shapely.get_num_coordinates(geometry))
+    geometries = [geom for geom in geometry if geom is not None]
+    if not geometries:
+        return None, 0
+    geometry_types = {geom.geom_type for geom in geometries}
+    return (
+        geometry_types.pop() if len(geometry_types) == 1 else None,
+        int(shapely.get_num_coordinates(geometries).sum()),
+    )
+
+
+__all__ = [
+    "Aggregator",
+    "Measurement",
+    "Statistics",
+    "add_hook",
+    "collect",
+    "count",
+    "remove_hook",
+    "start",
+    "stop",
+]
@@ -0,0 +1,189 @@
+"""
+Pluggable JSON backend for the GeoJSON input and output of this package.
+
+The backend is used to decode the GeoJSON geometries produced by Shapely and to encode
+plain Python objects. The following backends are supported:
+
+- ``orjson``: uses `orjson <https://github.com/ijl/orjson>`_, when installed;
+- ``msgspec``: uses `msgspec <https://jcristharif.com/msgspec/>`_, when installed;
+- ``json``: uses the ``json`` module of the standard library, always available.
+
+By default the fastest installed backend is used, in the order given above. Another
+backend can be selected for the process with ``set_backend``:
+
+.. code-block:: python
+
+    from pydantic_shapely import json_backend
+
+    json_backend.set_backend("json")
+    print(json_backend.get_backend().name)
+
+The GeoJSON output of the feature models is assembled from JSON fragments: the geometry
+is written by ``shapely.to_geojson`` and the properties by the serializer of Pydantic.
+The fragments are spliced into the output bytes with ``splice_feature`` and
+``splice_feature_collection``, without being parsed again.
+"""
+
+import dataclasses
+import json
+import threading
+import typing
+
+Dumps = typing.Callable[[typing.Any], bytes]
+Loads = typing.Callable[[typing.Union[str, bytes]], typing.Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonBackend:
+    """A JSON backend.
+
+    Attributes:
+        name: The name of the backend.
+        dumps: Encodes a Python object to compact JSON (UTF-8 encoded bytes).
+        loads: Decodes JSON (a string or UTF-8 encoded bytes) to a Python object.
+    """
+
+    name: str
+    dumps: Dumps
+    loads: Loads
+
+
+def _stdlib_backend() -> JsonBackend:
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    return JsonBackend(
+        "json", lambda obj: encoder.encode(obj).encode("utf-8"), json.loads
+    )
+
+
+def _orjson_backend() -> JsonBackend:
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    return JsonBackend("orjson", orjson.dumps, orjson.loads)
+
+
+def _msgspec_backend() -> JsonBackend:
+    import msgspec  # pylint: disable=import-outside-toplevel
+
+    return JsonBackend("msgspec", msgspec.json.encode, msgspec.json.decode)
+
+
+# The factories of the supported backends, in order of preference.
+_FACTORIES: typing.Dict[str, typing.Callable[[], JsonBackend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+_LOCK = threading.Lock()
+_BACKENDS: typing.Dict[str, JsonBackend] = {}
+_CURRENT: typing.Optional[JsonBackend] = None
+
+
+def _load(name: str) -> typing.Optional[JsonBackend]:
+    """Returns the backend with the given name, or None if it is not installed."""
+    if name not in _FACTORIES:
+        raise ValueError(
+            f"Unknown JSON backend '{name}'. Supported backends are: "
+            f"{', '.join(_FACTORIES)}."
+        )
+    if name not in _BACKENDS:
+        try:
+            _BACKENDS[name] = _FACTORIES[name]()
+        except ImportError:
+            return None
+    return _BACKENDS[name]
+
+
+def available_backends() -> typing.List[str]:
+    """Returns the names of the installed backends, in order of preference."""
+    return [name for name in _FACTORIES if _load(name) is not None]
+
+
+def get_backend() -> JsonBackend:
+    """Returns the current backend. On first use the fastest installed backend is
+    selected."""
+    global _CURRENT  # pylint: disable=global-statement
+    backend = _CURRENT
+    if backend is None:
+        with _LOCK:
+            if _CURRENT is None:
+                _CURRENT = _load(available_backends()[0])
+            backend = _CURRENT
+    return typing.cast(JsonBackend, backend)
+
+
+def set_backend(backend: typing.Union[str, JsonBackend, None]) -> JsonBackend:
+    """
+    Selects the backend for the process.
+
+    Args:
+        backend: The name of a supported backend, a custom ``JsonBackend`` or None to
+            select the fastest installed backend.
+
+    Returns:
+        The selected backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+    """
+    global _CURRENT  # pylint: disable=global-statement
+    if isinstance(backend, str):
+        name = backend
+        backend = _load(name)
+        if backend is None:
+            raise ImportError(f"The JSON backend '{name}' is not installed.")
+    with _LOCK:
+        _CURRENT = backend
+    return get_backend()
+
+
+def splice_feature(geometry: bytes, properties: bytes) -> bytes:
+    """
+    Assembles a GeoJSON feature from the JSON fragments of its geometry and properties.
+
+    Args:
+        geometry: The GeoJSON geometry, e.g. the result of ``shapely.to_geojson``.
+        properties: The JSON object with the properties of the feature.
+
+    Returns:
+        The GeoJSON feature as UTF-8 encoded bytes.
+    """
+    return b"".join(
+        (
+            b'{"type":"Feature","geometry":',
+            geometry,
+            b',"properties":',
+            properties,
+            b"}",
+        )
+    )
+
+
+def splice_feature_collection(features: typing.Iterable[bytes]) -> bytes:
+    """
+    Assembles a GeoJSON feature collection from the JSON fragments of its features.
+
+    Args:
+        features: The GeoJSON features, e.g. the results of ``splice_feature``.
+
+    Returns:
+        The GeoJSON feature collection as UTF-8 encoded bytes.
+    """
+    return b"".join(
+        (
+            b'{"type":"FeatureCollection","features":[',
+            b",".join(features),
+            b"]}",
+        )
+    )
+
+
+__all__ = [
+    "JsonBackend",
+    "available_backends",
+    "get_backend",
+    "set_backend",
+    "splice_feature",
+    "splice_feature_collection",
+]
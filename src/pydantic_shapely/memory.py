@@ -0,0 +1,268 @@
+"""
+Utilities to determine the memory footprint of feature models and feature collections.
+
+``memory_usage`` reports the (deep) memory usage of a model, broken down by component:
+
+- geometries: the Shapely geometries, including an estimate of the memory allocated by
+  GEOS for the coordinates (GEOS memory is not visible to Python);
+- coordinates: the nested lists and tuples of floats of the GeoJSON geometry models (and
+  the members of GeoJSON geometry collections), and the coordinate array of a
+  ``PointCollection``;
+- properties: the values of the (property) fields of the models, and the property
+  columns of a ``PointCollection``;
+- pydantic: the model instances themselves, their ``__dict__`` and the other bookkeeping
+  of Pydantic, and the containers holding the models.
+
+``trace_peak`` measures the peak of the memory allocated by Python during a block of
+code with ``tracemalloc``, e.g. to determine the peak during a conversion:
+
+.. code-block:: python
+
+    from pydantic_shapely.memory import memory_usage, trace_peak
+
+    print(memory_usage(collection).as_dict())
+
+    with trace_peak() as trace:
+        collection.to_feature_models()
+    print(trace.peak)
+
+All sizes are in bytes. The numbers are estimates: objects shared between models (e.g.
+interned strings) are only counted once per report, and the GEOS memory is estimated
+from the number of coordinates and parts.
+"""
+
+import contextlib
+import dataclasses
+import sys
+import tracemalloc
+import typing
+
+import numpy as np
+import shapely
+from pydantic import BaseModel
+from shapely.geometry.base import BaseGeometry
+
+from .base import FeatureBaseModel
+
+# Estimated number of bytes GEOS allocates per geometry part (geometry object,
+# envelope and coordinate sequence header).
+GEOS_BYTES_PER_PART = 96
+
+
+@dataclasses.dataclass
+class MemoryReport:
+    """The memory usage of one or more models, broken down by component. All sizes
+    are in bytes."""
+
+    geometries: int = 0
+    coordinates: int = 0
+    properties: int = 0
+    pydantic: int = 0
+    # The number of features included in the report.
+    features: int = 0
+
+    @property
+    def total(self) -> int:
+        """The total memory usage in bytes."""
+        return self.geometries + self.coordinates + self.properties + self.pydantic
+
+    @property
+    def per_feature(self) -> float:
+        """The average memory usage per feature in bytes."""
+        return self.total / self.features if self.features else 0.0
+
+    def as_dict(self) -> typing.Dict[str, typing.Union[int, float]]:
+        """Returns the report as a dictionary."""
+        return {
+            **dataclasses.asdict(self),
+            "total": self.total,
+            "per_feature": self.per_feature,
+        }
+
+
+class _Profiler:
+    """Walks the object graph of the models and attributes the size of each object
+    to one of the components of the report."""
+
+    def __init__(self) -> None:
+        self.report = MemoryReport()
+        self._seen: typing.Set[int] = set()
+
+    def _size(self, obj: typing.Any) -> int:
+        """Returns the shallow size of the object, or 0 when it was already counted."""
+        if obj is None or obj is True or obj is False or id(obj) in self._seen:
+            return 0
+        self._seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    def deep_size(self, obj: typing.Any) -> int:
+        """Returns the deep size of the object, not counting objects twice."""
+        size = self._size(obj)
+        if not size:
+            return 0
+        if isinstance(obj, BaseGeometry):
+            return size + self.geos_size(obj)
+        if isinstance(obj, np.ndarray):
+            # The size of an array includes its data, unless it is a view.
+            if obj.dtype != object:
+                return size
+            return size + sum(self.deep_size(item) for item in obj.ravel().tolist())
+        if isinstance(obj, BaseModel):
+            return size + self.deep_size(obj.__dict__)
+        if isinstance(obj, dict):
+            return size + sum(
+                self.deep_size(key) + self.deep_size(value)
+                for key, value in obj.items()
+            )
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return size + sum(self.deep_size(item) for item in obj)
+        return size
+
+    @staticmethod
+    def geos_size(geometry: BaseGeometry) -> int:
+        """Estimates the memory allocated by GEOS for the geometry."""
+        dimensions = 3 if geometry.has_z else 2
+        coordinates = int(shapely.get_num_coordinates(geometry))
+        parts = int(shapely.get_num_geometries(geometry))
+        if geometry.geom_type in ("Polygon", "MultiPolygon"):
+            parts += int(
+                shapely.get_num_interior_rings(shapely.get_parts(geometry)).sum()
+            ) + int(shapely.get_num_geometries(geometry))
+        return coordinates * dimensions * 8 + parts * GEOS_BYTES_PER_PART
+
+    def _model_overhead(self, model: BaseModel) -> int:
+        """Returns the size of the bookkeeping of a Pydantic model, i.e. the instance
+        and its __dict__, but not the values of the fields."""
+        return (
+            self._size(model)
+            + self._size(model.__dict__)
+            + self._size(model.__pydantic_fields_set__)
+            + self.deep_size(model.__pydantic_private__)
+            + self.deep_size(model.__pydantic_extra__)
+        )
+
+    def add(self, obj: typing.Any) -> None:
+        """Adds the object to the report."""
+        # pylint: disable=import-outside-toplevel
+        from .geojson.feature import GeoJsonFeatureBaseModel
+        from .geojson.feature_collection import GeoJsonFeatureCollectionBaseModel
+        from .geojson.point_collection import PointCollection
+
+        if isinstance(obj, FeatureBaseModel):
+            self.report.features += 1
+            self.report.pydantic += self._model_overhead(obj)
+            # The memoized GeoJSON representations, see FeatureBaseModel.
+            self.report.pydantic += self.deep_size(
+                getattr(obj, "__geojson_memo__", None)
+            )
+            for name, value in obj.__dict__.items():
+                if name == obj.__geometry_field__:
+                    self.report.geometries += self.deep_size(value)
+                else:
+                    self.report.properties += self.deep_size(value)
+        elif isinstance(obj, GeoJsonFeatureBaseModel):
+            self.report.features += 1
+            self.report.pydantic += self._model_overhead(obj)
+            self.report.pydantic += self._model_overhead(obj.geometry)
+            for name, value in obj.geometry.__dict__.items():
+                if name in ("coordinates", "geometries"):
+                    self.report.coordinates += self.deep_size(value)
+                else:
+                    self.report.pydantic += self.deep_size(value)
+            self.report.pydantic += self._model_overhead(obj.properties)
+            self.report.properties += sum(
+                self.deep_size(value) for value in obj.properties.__dict__.values()
+            )
+            self.report.pydantic += self.deep_size(obj.type)
+        elif isinstance(obj, GeoJsonFeatureCollectionBaseModel):
+            self.report.pydantic += self._model_overhead(obj)
+            for name, value in obj.__dict__.items():
+                if name == "features":
+                    self.add(value)
+                else:
+                    self.report.pydantic += self.deep_size(value)
+        elif isinstance(obj, PointCollection):
+            self.report.features += len(obj)
+            self.report.pydantic += self._size(obj) + self._size(obj.__dict__)
+            self.report.coordinates += self.deep_size(obj.coordinates)
+            self.report.pydantic += self._size(obj.properties)
+            self.report.properties += sum(
+                self.deep_size(name) + self.deep_size(column)
+                for name, column in obj.properties.items()
+            )
+        elif isinstance(obj, (list, tuple)):
+            self.report.pydantic += self._size(obj)
+            for item in obj:
+                self.add(item)
+        else:
+            raise TypeError(
+                f"Cannot determine the memory usage of {type(obj).__name__}. Supported "
+                "are feature models, GeoJSON feature models, feature collections, "
+                "point collections and lists of these."
+            )
+
+
+def memory_usage(obj: typing.Any) -> MemoryReport:
+    """
+    Returns the deep memory usage of a feature model, a GeoJSON feature model, a feature
+    collection, a point collection or a list of these, broken down by component.
+
+    Args:
+        obj: The model(s) to determine the memory usage of.
+
+    Returns:
+        The memory report, see ``MemoryReport``.
+
+    Raises:
+        TypeError: If the object is not a (list of) supported model(s).
+    """
+    profiler = _Profiler()
+    profiler.add(obj)
+    return profiler.report
+
+
+@dataclasses.dataclass
+class PeakMemory:
+    """The result of ``trace_peak``. The values are set when the block is exited and
+    are in bytes.
+
+    Attributes:
+        peak: The peak of the memory allocated during the block, relative to the memory
+            allocated at the start of the block.
+        retained: The memory which is still allocated at the end of the block, relative
+            to the memory allocated at the start of the block.
+    """
+
+    peak: int = 0
+    retained: int = 0
+
+
+@contextlib.contextmanager
+def trace_peak() -> typing.Iterator[PeakMemory]:
+    """
+    Context manager which measures the peak of the memory allocated by Python during
+    the block with ``tracemalloc``. Memory allocated by GEOS is not traced.
+
+    When ``tracemalloc`` is already tracing, the trace is reused and not stopped
+    afterwards. Note that on Python 3.8 the peak can not be reset, in that case the
+    peak of the running trace is reported when it is higher than the peak of the
+    block.
+    """
+    result = PeakMemory()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        yield result
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+        result.peak = max(peak - start, 0)
+        result.retained = current - start
+
+
+__all__ = ["MemoryReport", "PeakMemory", "memory_usage", "trace_peak"]
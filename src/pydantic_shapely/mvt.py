@@ -0,0 +1,523 @@
+"""
+Encoding of feature models as Mapbox Vector Tiles (MVT).
+
+``encode_tile`` encodes a GeoJSON feature collection, or an iterable of feature models,
+as a layer of the vector tile ``z/x/y`` of the Web Mercator (EPSG:3857) tiling scheme:
+
+.. code-block:: python
+
+    from pydantic_shapely.mvt import encode_tile
+
+    tile = encode_tile(collection, 12, 2103, 1346, layer="roads")
+
+The geometries are transformed to Web Mercator (unless they already are), clipped to the
+(buffered) tile with ``shapely.clip_by_rect`` and snapped to the integer grid of the tile
+extent with ``shapely.set_precision``, all for the whole array of geometries at once.
+The geometry commands and the key/value tables of the properties are then written in the
+protobuf wire format of the `vector tile specification
+<https://github.com/mapbox/vector-tile-spec/tree/master/2.1>`_ by a small encoder in this
+module, no protobuf library is required.
+
+The properties of a feature are the fields of the feature model other than the geometry,
+serialized like ``model_dump(mode="json")``. Values which are None are left out; lists
+and objects are encoded as JSON strings, as vector tiles only support scalar values.
+
+A tile is a sequence of layers, so the tile of several layers is the concatenation of
+the results of ``encode_tile`` (or ``encode_layer``) for each of the layers.
+"""
+
+import math
+import struct
+import typing
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from . import instrumentation, json_backend
+from .base import FeatureBaseModel
+
+if typing.TYPE_CHECKING:
+    from .geojson.feature_collection import GeoJsonFeatureCollectionBaseModel
+
+    Features = typing.Union[
+        GeoJsonFeatureCollectionBaseModel, typing.Iterable[FeatureBaseModel]
+    ]
+
+# The default number of units of a tile along each side and the default width of the
+# buffer around the tile in the same units.
+DEFAULT_EXTENT = 4096
+DEFAULT_BUFFER = 64
+
+# Half of the circumference of the earth in Web Mercator (EPSG:3857), in meters.
+_EARTH_RADIUS = 6378137.0
+_ORIGIN = math.pi * _EARTH_RADIUS
+# The latitudes beyond which Web Mercator is not defined.
+_MAX_LATITUDE = 85.0511287798066
+
+# The coordinate reference systems of the geometries supported by ``encode_tile``.
+_CRS = ("EPSG:4326", "EPSG:3857")
+
+# The geometry types and commands of the vector tile specification.
+_POINT, _LINESTRING, _POLYGON = 1, 2, 3
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+# The vector tile geometry types by the type id of Shapely.
+_GEOMETRY_TYPES = {
+    int(shapely.GeometryType.POINT): _POINT,
+    int(shapely.GeometryType.MULTIPOINT): _POINT,
+    int(shapely.GeometryType.LINESTRING): _LINESTRING,
+    int(shapely.GeometryType.LINEARRING): _LINESTRING,
+    int(shapely.GeometryType.MULTILINESTRING): _LINESTRING,
+    int(shapely.GeometryType.POLYGON): _POLYGON,
+    int(shapely.GeometryType.MULTIPOLYGON): _POLYGON,
+}
+_GEOMETRY_COLLECTION = int(shapely.GeometryType.GEOMETRYCOLLECTION)
+
+# The wire types of the protobuf encoding.
+_VARINT, _FIXED64, _LENGTH_DELIMITED = 0, 1, 2
+# Up to this number of values, packed varints are encoded one by one, which is faster
+# than encoding them with numpy.
+_SMALL_PACKED = 32
+
+
+def tile_bounds(z: int, x: int, y: int) -> typing.Tuple[float, float, float, float]:
+    """
+    Returns the bounds (minx, miny, maxx, maxy) of a tile in Web Mercator (EPSG:3857).
+
+    Args:
+        z: The zoom level of the tile.
+        x: The column of the tile, from west to east.
+        y: The row of the tile, from north to south.
+
+    Raises:
+        ValueError: If the tile does not exist at the zoom level.
+    """
+    count = 1 << z if z >= 0 else 0
+    if not (0 <= x < count and 0 <= y < count):
+        raise ValueError(f"The tile {z}/{x}/{y} does not exist.")
+    size = 2 * _ORIGIN / count
+    minx = -_ORIGIN + x * size
+    maxy = _ORIGIN - y * size
+    return (minx, maxy - size, minx + size, maxy)
+
+
+def to_web_mercator(geometries: typing.Any) -> np.ndarray:
+    """Transforms an array of geometries from longitude and latitude (EPSG:4326) to Web
+    Mercator (EPSG:3857). Latitudes beyond 85.05 degrees are clamped. Z-values are
+    dropped."""
+
+    def transform(coordinates: np.ndarray) -> np.ndarray:
+        latitudes = np.radians(
+            np.clip(coordinates[:, 1], -_MAX_LATITUDE, _MAX_LATITUDE)
+        )
+        return np.column_stack(
+            (
+                np.radians(coordinates[:, 0]) * _EARTH_RADIUS,
+                np.log(np.tan(np.pi / 4 + latitudes / 2)) * _EARTH_RADIUS,
+            )
+        )
+
+    return shapely.transform(np.asarray(geometries, dtype=object), transform)
+
+
+def encode_tile(
+    features: "Features",
+    z: int,
+    x: int,
+    y: int,
+    *,
+    layer: str = "features",
+    extent: int = DEFAULT_EXTENT,
+    buffer: int = DEFAULT_BUFFER,
+    crs: str = "EPSG:4326",
+    id_field: typing.Optional[str] = None,
+) -> bytes:
+    """
+    Encodes features as a layer of a Mapbox Vector Tile.
+
+    Args:
+        features: A GeoJSON feature collection, or an iterable of feature models.
+        z: The zoom level of the tile.
+        x: The column of the tile.
+        y: The row of the tile.
+        layer: The name of the layer.
+        extent: The number of units of the tile along each side.
+        buffer: The width of the buffer around the tile, in units of the extent.
+            Geometries are clipped to the buffered tile.
+        crs: The coordinate reference system of the geometries, either ``EPSG:4326``
+            (longitude and latitude, as in GeoJSON) or ``EPSG:3857`` (Web Mercator).
+        id_field: The name of the property holding the id of the features, which must
+            be a non-negative integer. The property is not included in the tags.
+
+    Returns:
+        The encoded tile, which is empty if none of the features intersects the tile.
+
+    Raises:
+        ValueError: If the tile does not exist, the coordinate reference system is not
+            supported or an id is not a non-negative integer.
+    """
+    started = instrumentation.start()
+    geometries, properties = _prepare_features(features, crs)
+    ids = None
+    if id_field is not None:
+        ids = [p.pop(id_field, None) for p in properties]
+    result = encode_layer(
+        geometries,
+        properties,
+        z,
+        x,
+        y,
+        name=layer,
+        extent=extent,
+        buffer=buffer,
+        ids=ids,
+    )
+    instrumentation.stop(started, "mvt.encode_tile", items=len(geometries))
+    return result
+
+
+def encode_layer(
+    geometries: typing.Any,
+    properties: typing.Sequence[typing.Mapping[str, typing.Any]],
+    z: int,
+    x: int,
+    y: int,
+    *,
+    name: str,
+    extent: int = DEFAULT_EXTENT,
+    buffer: int = DEFAULT_BUFFER,
+    ids: typing.Optional[typing.Sequence[typing.Optional[int]]] = None,
+) -> bytes:
+    """
+    Encodes an array of geometries in Web Mercator (EPSG:3857) and their properties as a
+    layer of a Mapbox Vector Tile, see ``encode_tile``.
+
+    Args:
+        geometries: The geometries in Web Mercator, see ``to_web_mercator``.
+        properties: The properties of each of the geometries. Values which are None are
+            left out.
+        z: The zoom level of the tile.
+        x: The column of the tile.
+        y: The row of the tile.
+        name: The name of the layer.
+        extent: The number of units of the tile along each side.
+        buffer: The width of the buffer around the tile, in units of the extent.
+        ids: The id of each of the geometries, or None.
+
+    Returns:
+        The encoded tile, which is empty if none of the geometries intersects the tile.
+    """
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    scale = extent / (maxx - minx)
+    margin = buffer / scale
+    clipped = _clip(
+        np.asarray(geometries, dtype=object),
+        (minx - margin, miny - margin, maxx + margin, maxy + margin),
+    )
+
+    # The y-axis of the tile points down.
+    def to_tile(coordinates: np.ndarray) -> np.ndarray:
+        return np.column_stack(
+            ((coordinates[:, 0] - minx) * scale, (maxy - coordinates[:, 1]) * scale)
+        )
+
+    # The coordinates are rounded one by one, which also works for invalid geometries.
+    # Repeated vertices and collapsed rings are removed when the commands are written.
+    quantized = shapely.set_precision(
+        shapely.transform(clipped, to_tile), 1.0, mode="pointwise"
+    )
+    layer = _LayerEncoder()
+    for index in np.flatnonzero(
+        ~shapely.is_empty(quantized) & ~shapely.is_missing(quantized)
+    ):
+        feature_id = None if ids is None else ids[index]
+        if feature_id is not None and not (
+            isinstance(feature_id, int)
+            and not isinstance(feature_id, bool)
+            and 0 <= feature_id < 1 << 64
+        ):
+            raise ValueError(
+                f"The id of the feature at index {index} must be a non-negative "
+                f"integer, not {feature_id!r}."
+            )
+        layer.add(quantized[index], properties[index], feature_id)
+    return layer.encode(name, extent)
+
+
+def _clip(
+    geometries: np.ndarray, bounds: typing.Tuple[float, float, float, float]
+) -> np.ndarray:
+    """Clips the geometries to the bounds with ``shapely.clip_by_rect``. GEOS cannot
+    clip some invalid geometries, e.g. polygons which collapsed to a line near the poles
+    of Web Mercator; these are made valid and intersected with the bounds instead."""
+    try:
+        return shapely.clip_by_rect(geometries, *bounds)
+    except shapely.errors.GEOSException:
+        pass
+    result = np.empty(len(geometries), dtype=object)
+    for index, geometry in enumerate(geometries):
+        try:
+            result[index] = shapely.clip_by_rect(geometry, *bounds)
+        except shapely.errors.GEOSException:
+            parts = shapely.get_parts(shapely.make_valid(geometry))
+            # Parts which collapsed to lines or points are left out.
+            parts = parts[
+                shapely.get_dimensions(parts) == shapely.get_dimensions(geometry)
+            ]
+            result[index] = shapely.intersection(
+                shapely.GeometryCollection(list(parts)), shapely.box(*bounds)
+            )
+    return result
+
+
+def _prepare_features(
+    features: "Features", crs: str
+) -> typing.Tuple[np.ndarray, typing.List[typing.Dict[str, typing.Any]]]:
+    """Returns the geometries of the features in Web Mercator and their properties."""
+    # pylint: disable=import-outside-toplevel
+    from .geojson.feature_collection import GeoJsonFeatureCollectionBaseModel
+    from .geojson.geometry import geojson_geometries_to_shapely
+
+    if crs not in _CRS:
+        raise ValueError(
+            f"The coordinate reference system {crs!r} is not supported, use one of "
+            f"{', '.join(_CRS)}."
+        )
+    if isinstance(features, GeoJsonFeatureCollectionBaseModel):
+        geometries = geojson_geometries_to_shapely(
+            [feature.geometry for feature in features.features]
+        )
+        properties = [
+            feature.properties.model_dump(mode="json") for feature in features.features
+        ]
+    else:
+        shapes, properties = [], []
+        for feature in features:
+            shapes.append(getattr(feature, feature.__geometry_field__))
+            properties.append(
+                feature.model_dump(mode="json", exclude={feature.__geometry_field__})
+            )
+        geometries = np.asarray(shapes, dtype=object)
+    if crs == "EPSG:4326":
+        geometries = to_web_mercator(geometries)
+    return geometries, properties
+
+
+class _LayerEncoder:
+    """Collects the features of a layer with the shared tables of keys and values."""
+
+    def __init__(self):
+        self.features: typing.List[bytes] = []
+        self.keys: typing.Dict[str, int] = {}
+        self.values: typing.Dict[typing.Tuple[type, typing.Any], int] = {}
+
+    def add(
+        self,
+        geometry: BaseGeometry,
+        properties: typing.Mapping[str, typing.Any],
+        feature_id: typing.Optional[int],
+    ) -> None:
+        """Adds a feature. Geometry collections are added as a feature for each of the
+        geometry types in the collection, with the same properties and id."""
+        tags = _packed(self._tags(properties))
+        if shapely.get_type_id(geometry) == _GEOMETRY_COLLECTION:
+            parts = shapely.get_parts(geometry)
+            # Nested geometry collections are flattened.
+            while np.any(shapely.get_type_id(parts) == _GEOMETRY_COLLECTION):
+                parts = shapely.get_parts(parts)
+            types = np.array([_GEOMETRY_TYPES[t] for t in shapely.get_type_id(parts)])
+            groups = [(t, parts[types == t]) for t in (_POINT, _LINESTRING, _POLYGON)]
+        else:
+            groups = [
+                (_GEOMETRY_TYPES[shapely.get_type_id(geometry)], np.array([geometry]))
+            ]
+        for geometry_type, parts in groups:
+            commands = _COMMANDS[geometry_type](parts) if len(parts) else []
+            if not len(commands):
+                continue
+            message = (
+                b"" if feature_id is None else _key(1, _VARINT) + _varint(feature_id)
+            )
+            if tags:
+                message += _length_delimited(2, tags)
+            message += _key(3, _VARINT) + _varint(geometry_type)
+            message += _length_delimited(4, _packed(commands))
+            self.features.append(message)
+
+    def _tags(self, properties: typing.Mapping[str, typing.Any]) -> typing.List[int]:
+        """Returns the indices of the keys and values of the properties."""
+        tags: typing.List[int] = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            if isinstance(value, (dict, list)):
+                value = json_backend.get_backend().dumps(value).decode("utf-8")
+            tags.append(self.keys.setdefault(key, len(self.keys)))
+            tags.append(self.values.setdefault((type(value), value), len(self.values)))
+        return tags
+
+    def encode(self, name: str, extent: int) -> bytes:
+        """Returns the layer as a tile (a message with a single layer), or an empty tile
+        if the layer has no features."""
+        if not self.features:
+            return b""
+        message = _length_delimited(1, name.encode("utf-8"))
+        message += b"".join(_length_delimited(2, f) for f in self.features)
+        message += b"".join(_length_delimited(3, k.encode("utf-8")) for k in self.keys)
+        message += b"".join(
+            _length_delimited(4, _encode_value(value)) for _, value in self.values
+        )
+        message += _key(5, _VARINT) + _varint(extent)
+        message += _key(15, _VARINT) + _varint(2)
+        return _length_delimited(3, message)
+
+
+def _encode_value(value: typing.Any) -> bytes:
+    """Encodes a property value as a ``Value`` message."""
+    if isinstance(value, bool):
+        return _key(7, _VARINT) + _varint(int(value))
+    if isinstance(value, int):
+        if 0 <= value < 1 << 64:
+            return _key(5, _VARINT) + _varint(value)
+        if -(1 << 63) <= value < 0:
+            return _key(6, _VARINT) + _varint(-2 * value - 1)
+        value = str(value)
+    if isinstance(value, float):
+        return _key(3, _FIXED64) + struct.pack("<d", value)
+    return _length_delimited(1, str(value).encode("utf-8"))
+
+
+def _point_commands(parts: np.ndarray) -> np.ndarray:
+    """Returns the commands of the points: a single MoveTo with all points."""
+    coordinates = shapely.get_coordinates(parts).astype(np.int64)
+    deltas = np.diff(coordinates, axis=0, prepend=np.zeros((1, 2), np.int64))
+    return np.concatenate(
+        ([_command(_MOVE_TO, len(coordinates))], _zigzag(deltas).ravel())
+    )
+
+
+def _line_commands(parts: np.ndarray) -> np.ndarray:
+    """Returns the commands of the line strings: a MoveTo and LineTo for each line."""
+    paths = []
+    for line in shapely.get_parts(parts):
+        coordinates = _unique_vertices(shapely.get_coordinates(line))
+        if len(coordinates) >= 2:
+            paths.append(coordinates)
+    return _path_commands(paths, closed=False)
+
+
+def _polygon_commands(parts: np.ndarray) -> np.ndarray:
+    """Returns the commands of the polygons. The exterior rings are clockwise and the
+    interior rings counter-clockwise, in tile coordinates (y-axis down)."""
+    paths = []
+    for polygon in shapely.get_parts(parts):
+        rings = [shapely.get_exterior_ring(polygon), *polygon.interiors]
+        for number, ring in enumerate(rings):
+            closed = _unique_vertices(shapely.get_coordinates(ring))
+            area = _signed_area(closed) if len(closed) >= 4 else 0
+            coordinates = closed[:-1]
+            if area == 0:
+                if number == 0:
+                    break
+                continue
+            if (area > 0) != (number == 0):
+                coordinates = coordinates[::-1]
+            paths.append(coordinates)
+    return _path_commands(paths, closed=True)
+
+
+_COMMANDS: typing.Dict[int, typing.Callable[[np.ndarray], np.ndarray]] = {
+    _POINT: _point_commands,
+    _LINESTRING: _line_commands,
+    _POLYGON: _polygon_commands,
+}
+
+
+def _path_commands(paths: typing.List[np.ndarray], closed: bool) -> np.ndarray:
+    """Returns the commands of lines or rings. The cursor is not reset between paths, so
+    the first point of a path is relative to the last point of the previous path."""
+    if not paths:
+        return np.zeros(0, np.int64)
+    deltas = _zigzag(
+        np.diff(np.concatenate(paths), axis=0, prepend=np.zeros((1, 2), np.int64))
+    )
+    commands = []
+    start = 0
+    for path in paths:
+        commands.append([_command(_MOVE_TO, 1)])
+        commands.append(deltas[start])
+        commands.append([_command(_LINE_TO, len(path) - 1)])
+        commands.append(deltas[start + 1 : start + len(path)].ravel())
+        if closed:
+            commands.append([_command(_CLOSE_PATH, 1)])
+        start += len(path)
+    return np.concatenate(commands)
+
+
+def _unique_vertices(coordinates: np.ndarray) -> np.ndarray:
+    """Returns the integer coordinates without repeated consecutive vertices."""
+    coordinates = coordinates.astype(np.int64)
+    if len(coordinates) < 2:
+        return coordinates
+    keep = np.ones(len(coordinates), dtype=bool)
+    keep[1:] = np.any(coordinates[1:] != coordinates[:-1], axis=1)
+    return coordinates[keep]
+
+
+def _signed_area(coordinates: np.ndarray) -> int:
+    """Returns twice the signed area of a closed ring."""
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    return int(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]))
+
+
+def _command(command: int, count: int) -> int:
+    return (count << 3) | command
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    return (values << 1) ^ (values >> 63)
+
+
+def _packed(values: typing.Union[np.ndarray, typing.List[int]]) -> bytes:
+    """Encodes non-negative integers as packed varints, for all values at once."""
+    if len(values) <= _SMALL_PACKED:
+        return b"".join([_varint(int(value)) for value in values])
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        lengths += rest > 0
+        rest >>= np.uint64(7)
+    width = int(lengths.max())
+    shifts = np.arange(width, dtype=np.uint64) * np.uint64(7)
+    groups = (values[:, None] >> shifts) & np.uint64(0x7F)
+    positions = np.arange(width)
+    groups |= np.where(positions < lengths[:, None] - 1, 0x80, 0).astype(np.uint64)
+    return groups.astype(np.uint8)[positions < lengths[:, None]].tobytes()
+
+
+def _varint(value: int) -> bytes:
+    result = bytearray()
+    while value > 0x7F:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return _key(field, _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+__all__ = [
+    "DEFAULT_BUFFER",
+    "DEFAULT_EXTENT",
+    "encode_layer",
+    "encode_tile",
+    "tile_bounds",
+    "to_web_mercator",
+]
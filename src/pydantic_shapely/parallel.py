@@ -0,0 +1,314 @@
+"""
+Bulk conversions of arrays of geometries on a pool of threads.
+
+The vectorized functions of Shapely release the GIL while GEOS does the work. The
+functions in this module split an array of geometries (or of WKT-strings, WKB-values
+or GeoJSON-strings) into chunks and process the chunks concurrently on a thread pool.
+As the work is done in a single process, the inputs and results do not have to be
+pickled, which is the main cost of a process pool.
+
+.. code-block:: python
+
+    from pydantic_shapely import parallel
+
+    geometries = parallel.from_wkt(wkt_strings)
+    simplified = parallel.simplify(geometries, tolerance=0.01)
+    output = parallel.to_geojson(simplified)
+
+By default a shared thread pool with one worker per CPU is used. Another executor can
+be passed with the ``executor`` argument, e.g. to limit the number of threads. Small
+arrays (up to a single chunk) are processed in the calling thread.
+
+Work which holds the GIL, like the serialization of Pydantic models, does not run
+concurrently on threads. For such work a shared process pool is available, see
+``get_process_executor`` and ``GeoJsonFeatureCollectionBaseModel.model_dump_json_parallel``.
+When ``fork`` is the start method of ``multiprocessing``, a process pool can be forked for
+a single call instead, of which the workers inherit the data from the parent process, see
+``forked_executor``. Serializers only fork when asked to, e.g. with
+``model_dump_json_parallel("fork")``. The start method is never set by this module.
+"""
+
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import sys
+import threading
+import typing
+
+import numpy as np
+import shapely
+
+# The default number of items per chunk. Chunks should be large enough that the
+# overhead of scheduling the chunk is small compared to the work done by GEOS.
+DEFAULT_CHUNK_SIZE = 512
+
+_LOCK = threading.Lock()
+_EXECUTOR: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+_PROCESS_EXECUTOR: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+# The state inherited by the workers of a forked process pool, see ``forked_executor``.
+_FORKED_STATE: typing.Any = None
+
+
+def default_workers() -> int:
+    """Returns the number of workers of the shared thread and process pools."""
+    return os.cpu_count() or 1
+
+
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the shared thread pool, which is created on first use."""
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=default_workers(),
+                    thread_name_prefix="pydantic_shapely",
+                )
+    return _EXECUTOR
+
+
+def get_process_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """Returns the shared process pool, which is created on first use. The process
+    pool is used for work which holds the GIL, e.g. the serialization of models."""
+    global _PROCESS_EXECUTOR  # pylint: disable=global-statement
+    if _PROCESS_EXECUTOR is None:
+        with _LOCK:
+            if _PROCESS_EXECUTOR is None:
+                _PROCESS_EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=default_workers(),
+                    mp_context=multiprocessing.get_context(start_method()),
+                )
+    return _PROCESS_EXECUTOR
+
+
+def start_method() -> str:
+    """Returns the start method of ``multiprocessing``: the method set by the
+    application, or the default of the platform. Unlike
+    ``multiprocessing.get_start_method()``, this does not fix the start method, so the
+    application can still set it afterwards."""
+    method = multiprocessing.get_start_method(allow_none=True)
+    return method or multiprocessing.get_all_start_methods()[0]
+
+
+def _set_forked_state(state: typing.Any) -> None:
+    global _FORKED_STATE  # pylint: disable=global-statement
+    _FORKED_STATE = state
+
+
+def forked_state() -> typing.Any:
+    """Returns the state inherited by a worker of a forked process pool, see
+    ``forked_executor``."""
+    return _FORKED_STATE
+
+
+@contextlib.contextmanager
+def forked_executor(
+    state: typing.Any, max_workers: int
+) -> typing.Iterator[typing.Optional[concurrent.futures.ProcessPoolExecutor]]:
+    """
+    Creates a process pool of which the worker processes are forked from this process
+    and inherit the state, so the state does not have to be pickled. The tasks read the
+    state with ``forked_state``. The state is passed to the workers when they are
+    forked, so several forked pools can be used at the same time.
+
+    The workers inherit the state as it is when they are forked, so the pool is created
+    for a single call, i.e. for a single collection or tile pyramid, and shut down
+    afterwards. Only the calling thread is copied into a forked process. When another
+    thread holds a lock while the workers are forked (e.g. a lock of a logging handler),
+    the worker may deadlock on it. Applications which run such threads should set
+    another start method, or pass their own executor to the functions of this package.
+
+    Args:
+        state: The state inherited by the workers.
+        max_workers: The maximum number of worker processes.
+
+    Yields:
+        The process pool, or None when ``fork`` is not the start method of
+        ``multiprocessing``, see ``start_method``.
+    """
+    if start_method() != "fork":
+        yield None
+        return
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_set_forked_state,
+        initargs=(state,),
+    ) as executor:
+        yield executor
+
+
+def gil_enabled() -> bool:
+    """Returns whether the GIL is enabled. On a free-threaded build of Python (3.13 and
+    later) Python code runs concurrently on the threads of the shared thread pool."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else bool(is_gil_enabled())
+
+
+def shutdown() -> None:
+    """Shuts down the shared thread and process pools. New pools are created on the
+    next use."""
+    global _EXECUTOR, _PROCESS_EXECUTOR  # pylint: disable=global-statement
+    with _LOCK:
+        executors = (_EXECUTOR, _PROCESS_EXECUTOR)
+        _EXECUTOR, _PROCESS_EXECUTOR = None, None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def map_chunks(
+    func: typing.Callable[..., np.ndarray],
+    values: typing.Any,
+    *args: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """
+    Applies a vectorized function to an array in chunks on a thread pool.
+
+    Args:
+        func: The vectorized function, which is called with a chunk of the values and
+            the additional (keyword) arguments. It must return an array with one item
+            per value, e.g. ``shapely.to_wkt``.
+        values: The values, a sequence or a one-dimensional numpy array.
+        *args: Additional arguments passed to the function.
+        executor: The executor to run the chunks on. Defaults to the shared pool.
+        chunk_size: The maximum number of values per chunk.
+        **kwargs: Additional keyword arguments passed to the function.
+
+    Returns:
+        A numpy array with the results, in the order of the values.
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1.")
+    values = np.asarray(values, dtype=object)
+    if values.ndim != 1:
+        raise ValueError("Only one-dimensional arrays are supported.")
+    if values.size <= chunk_size:
+        return np.asarray(func(values, *args, **kwargs))
+    if executor is None:
+        executor = get_executor()
+    chunks = np.array_split(values, -(-values.size // chunk_size))
+    results = list(executor.map(lambda chunk: func(chunk, *args, **kwargs), chunks))
+    return np.concatenate(results)
+
+
+def from_wkt(
+    values: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Parses WKT-strings to geometries, see ``shapely.from_wkt`` and ``map_chunks``."""
+    return map_chunks(
+        shapely.from_wkt, values, executor=executor, chunk_size=chunk_size, **kwargs
+    )
+
+
+def to_wkt(
+    geometries: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Writes geometries to WKT-strings, see ``shapely.to_wkt`` and ``map_chunks``."""
+    return map_chunks(
+        shapely.to_wkt, geometries, executor=executor, chunk_size=chunk_size, **kwargs
+    )
+
+
+def from_wkb(
+    values: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Parses WKB-values to geometries, see ``shapely.from_wkb`` and ``map_chunks``."""
+    return map_chunks(
+        shapely.from_wkb, values, executor=executor, chunk_size=chunk_size, **kwargs
+    )
+
+
+def to_wkb(
+    geometries: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Writes geometries to WKB-values, see ``shapely.to_wkb`` and ``map_chunks``."""
+    return map_chunks(
+        shapely.to_wkb, geometries, executor=executor, chunk_size=chunk_size, **kwargs
+    )
+
+
+def from_geojson(
+    values: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Parses GeoJSON-strings to geometries, see ``shapely.from_geojson`` and
+    ``map_chunks``."""
+    return map_chunks(
+        shapely.from_geojson, values, executor=executor, chunk_size=chunk_size, **kwargs
+    )
+
+
+def to_geojson(
+    geometries: typing.Any,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Writes geometries to GeoJSON-strings, see ``shapely.to_geojson`` and
+    ``map_chunks``."""
+    return map_chunks(
+        shapely.to_geojson,
+        geometries,
+        executor=executor,
+        chunk_size=chunk_size,
+        **kwargs,
+    )
+
+
+def simplify(
+    geometries: typing.Any,
+    tolerance: float,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: typing.Any,
+) -> np.ndarray:
+    """Simplifies geometries, see ``shapely.simplify`` and ``map_chunks``."""
+    return map_chunks(
+        shapely.simplify,
+        geometries,
+        tolerance,
+        executor=executor,
+        chunk_size=chunk_size,
+        **kwargs,
+    )
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "default_workers",
+    "forked_executor",
+    "forked_state",
+    "from_geojson",
+    "from_wkb",
+    "from_wkt",
+    "get_executor",
+    "get_process_executor",
+    "gil_enabled",
+    "map_chunks",
+    "shutdown",
+    "simplify",
+    "start_method",
+    "to_geojson",
+    "to_wkb",
+    "to_wkt",
+]
@@ -0,0 +1,410 @@
+"""
+Encoding of geometries in the `encoded polyline format
+<https://developers.google.com/maps/documentation/utilities/polylinealgorithm>`_.
+
+A polyline stores the coordinates of a line as the differences with the previous
+vertex, rounded to a number of decimals (the precision, 5 by default), in a compact
+string of printable ASCII characters. The coordinates are written in the order of the
+format, latitude (y) first, then longitude (x), and optionally the z-value.
+
+The format only describes a single line. This module extends it to the other geometry
+types, with the nesting of the coordinates of GeoJSON:
+
+- a Point, LineString, LinearRing or MultiPoint is a single polyline;
+- the rings of a Polygon and the lines of a MultiLineString are polylines separated by a
+  comma (``,``);
+- the polygons of a MultiPolygon are separated by a semicolon (``;``), their rings by a
+  comma.
+
+The value of a LinearRing, Polygon or Multi* geometry starts with the type id of the
+geometry in Shapely (``shapely.GeometryType``), a digit from 2 to 6, so the geometry
+type and the number of levels of parts are known when decoding, also for a geometry
+with a single part. Neither the separators nor the digits occur in the encoded
+coordinates, so a Point or a LineString is a plain polyline, which can be decoded by
+any client. The differences restart at the first vertex of each part.
+
+Both ``encode`` and ``decode`` work on the whole coordinate array of a geometry at once,
+with numpy, instead of on each of the coordinates.
+"""
+
+import re
+import typing
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+# The default number of decimals of the coordinates, as used by Google.
+DEFAULT_PRECISION = 5
+# The maximum number of decimals, which keeps the scaled coordinates of all common
+# coordinate reference systems within 64-bit integers.
+MAX_PRECISION = 10
+
+# The separators between the parts and between the groups of parts of a geometry.
+PART_SEPARATOR = ","
+GROUP_SEPARATOR = ";"
+
+# The characters of an encoded value are the ASCII characters from ``?`` (63) to ``~``
+# (126). The last character of each value is below ``_`` (95), i.e. it does not have the
+# continuation bit (32) set.
+_OFFSET = 63
+_CONTINUATION = 32
+_PATTERN = re.compile(r"[2-6]?[?-~,;]*")
+
+# Up to this number of values, the values are encoded one by one, which is faster than
+# encoding them with numpy.
+_SMALL_ENCODED = 16
+
+# Up to this number of characters, polylines are decoded one value at a time.
+_SMALL_DECODED = 256
+
+# Each character holds 5 bits, so 13 characters hold any 64-bit value. A value needs
+# one more character than the number of these thresholds it reaches.
+_MAX_CHARACTERS = 13
+_THRESHOLDS = np.array([1 << (5 * count) for count in range(1, _MAX_CHARACTERS)])
+
+# The order of the coordinates in a polyline: y, x and z.
+_ORDER = [1, 0, 2]
+
+# The geometry types of the polylines with a type id, and the number of levels of parts
+# of each geometry type. Polylines without a type id are a Point or a LineString, and
+# are also accepted as a LinearRing.
+_GEOMETRY_TYPES: typing.Dict[str, type] = {
+    str(int(shapely.GeometryType.LINEARRING)): shapely.LinearRing,
+    str(int(shapely.GeometryType.POLYGON)): shapely.Polygon,
+    str(int(shapely.GeometryType.MULTIPOINT)): shapely.MultiPoint,
+    str(int(shapely.GeometryType.MULTILINESTRING)): shapely.MultiLineString,
+    str(int(shapely.GeometryType.MULTIPOLYGON)): shapely.MultiPolygon,
+}
+_TYPE_IDS = {geometry_type: key for key, geometry_type in _GEOMETRY_TYPES.items()}
+_PLAIN_TYPES = (shapely.Point, shapely.LineString, shapely.LinearRing)
+_DEPTHS: typing.Dict[type, int] = {
+    shapely.Point: 0,
+    shapely.LineString: 0,
+    shapely.LinearRing: 0,
+    shapely.MultiPoint: 0,
+    shapely.Polygon: 1,
+    shapely.MultiLineString: 1,
+    shapely.MultiPolygon: 2,
+}
+
+
+def _split_type(value: str) -> typing.Tuple[typing.Optional[type], str]:
+    """Returns the geometry type of the type id of a polyline, if any, and the polyline
+    without the type id."""
+    if value[:1] in _GEOMETRY_TYPES:
+        return _GEOMETRY_TYPES[value[0]], value[1:]
+    return None, value
+
+
+def candidates(value: str) -> typing.Tuple[type, ...]:
+    """Returns the geometry types which a polyline can be converted to: the geometry
+    type of its type id, or a Point, LineString or LinearRing for a plain polyline."""
+    geometry_type, _ = _split_type(value)
+    return _PLAIN_TYPES if geometry_type is None else (geometry_type,)
+
+
+def is_polyline(value: str) -> bool:
+    """Returns whether a string only consists of an optional type id, the characters of
+    encoded polylines and the separators of their parts. A WKT-string never does, as it
+    contains spaces or parentheses."""
+    return _PATTERN.fullmatch(value) is not None
+
+
+def _check_precision(precision: int) -> float:
+    """Returns the scale of the coordinates for a number of decimals."""
+    if not 0 <= precision <= MAX_PRECISION:
+        raise ValueError(
+            f"The precision of a polyline must be between 0 and {MAX_PRECISION}."
+        )
+    return 10.0**precision
+
+
+def _encode_values(values: np.ndarray) -> typing.Tuple[str, np.ndarray]:
+    """Encodes a 1-dimensional array of signed integers, for all values at once. Returns
+    the characters and the number of characters of each of the values."""
+    zigzag = (values << 1) ^ (values >> 63)
+    chunks = np.searchsorted(_THRESHOLDS, zigzag, side="right") + 1
+    width = int(chunks.max(initial=1))
+    characters = ((zigzag[:, None] >> np.arange(0, 5 * width, 5)) & 31).astype(np.uint8)
+    # All characters but the last of each value have the continuation bit set.
+    characters |= _CONTINUATION
+    characters[np.arange(len(chunks)), chunks - 1] &= _CONTINUATION - 1
+    characters += _OFFSET
+    kept = np.arange(width) < chunks[:, None]
+    return characters[kept].tobytes().decode("ascii"), chunks
+
+
+def _encode_value(value: int) -> str:
+    """Encodes a single signed integer."""
+    value = (value << 1) ^ (value >> 63)
+    characters = []
+    while value >= _CONTINUATION:
+        characters.append(chr(((value & 31) | _CONTINUATION) + _OFFSET))
+        value >>= 5
+    characters.append(chr(value + _OFFSET))
+    return "".join(characters)
+
+
+def _encode_parts(deltas: np.ndarray, parts: np.ndarray) -> typing.List[str]:
+    """Encodes the differences of the coordinates of each of the parts."""
+    if deltas.size <= _SMALL_ENCODED:
+        values = deltas.tolist()
+        return [
+            "".join([_encode_value(v) for vertex in values[a:b] for v in vertex])
+            for a, b in zip(parts[:-1], parts[1:])
+        ]
+    characters, chunks = _encode_values(deltas.ravel())
+    if len(parts) == 2:
+        return [characters]
+    # The position of the last character of each of the vertices.
+    ends = np.cumsum(chunks)[deltas.shape[1] - 1 :: deltas.shape[1]]
+    bounds = [0] + ends[parts[1:] - 1].tolist()
+    return [characters[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _offsets(
+    geometry: BaseGeometry,
+) -> typing.Tuple[np.ndarray, typing.Optional[np.ndarray]]:
+    """Returns the offsets of the parts of a geometry in its coordinates and, for a
+    MultiPolygon, the offsets of the polygons in the parts. The rings of a Polygon and
+    the lines of a MultiLineString are parts, the others are a single part."""
+    if isinstance(geometry, shapely.Polygon):
+        parts = shapely.get_rings(geometry)
+    elif isinstance(geometry, shapely.MultiLineString):
+        parts = shapely.get_parts(geometry)
+    elif isinstance(geometry, shapely.MultiPolygon):
+        parts, index = shapely.get_rings(shapely.get_parts(geometry), return_index=True)
+        groups = np.concatenate(([0], np.cumsum(np.bincount(index))))
+        offsets = np.concatenate(([0], np.cumsum(shapely.get_num_coordinates(parts))))
+        return offsets, groups
+    else:
+        return np.array([0, shapely.get_num_coordinates(geometry)]), None
+    return np.concatenate(([0], np.cumsum(shapely.get_num_coordinates(parts)))), None
+
+
+def encode(
+    geometry: BaseGeometry,
+    precision: int = DEFAULT_PRECISION,
+    include_z: bool = False,
+) -> str:
+    """
+    Encodes a geometry as a polyline, with the multi-part extension of this module for
+    Polygons, MultiLineStrings and MultiPolygons.
+
+    Args:
+        geometry: The geometry. GeometryCollections are not supported.
+        precision: The number of decimals of the coordinates.
+        include_z: Whether the z-values are encoded, as third value of each vertex.
+            Otherwise the z-values are dropped. Geometries without z-values get a
+            z-value of 0.
+
+    Returns:
+        The encoded geometry. An empty geometry is encoded as its type id only, or as an
+        empty string for a Point or a LineString.
+
+    Raises:
+        ValueError: If the geometry is a GeometryCollection or if the coordinates do not
+        fit in 64-bit integers with the precision.
+    """
+    scale = _check_precision(precision)
+    if isinstance(geometry, shapely.GeometryCollection) and not isinstance(
+        geometry, (shapely.MultiPoint, shapely.MultiLineString, shapely.MultiPolygon)
+    ):
+        raise ValueError("A GeometryCollection cannot be encoded as a polyline.")
+    type_id = _TYPE_IDS.get(type(geometry), "")
+    if geometry.is_empty:
+        return type_id
+    if isinstance(geometry, shapely.LinearRing):
+        geometry = shapely.linestrings(
+            shapely.get_coordinates(geometry, include_z=geometry.has_z)
+        )
+    if include_z and not geometry.has_z:
+        geometry = shapely.force_3d(geometry, 0.0)
+    coordinates = shapely.get_coordinates(geometry, include_z=include_z)
+    parts, groups = _offsets(geometry)
+    # Swap x and y to the latitude, longitude order of the format.
+    scaled = np.round(coordinates[:, _ORDER[: coordinates.shape[1]]] * scale)
+    if np.abs(scaled).max() >= 2.0**62:
+        raise ValueError(
+            "The coordinates of the geometry are too large for a polyline with a "
+            f"precision of {precision}."
+        )
+    scaled = scaled.astype(np.int64)
+    # The differences restart at the first vertex of each part.
+    deltas = scaled.copy()
+    deltas[1:] -= scaled[:-1]
+    starts = parts[:-1]
+    deltas[starts] = scaled[starts]
+    encoded = _encode_parts(deltas, parts)
+    if groups is None:
+        return type_id + PART_SEPARATOR.join(encoded)
+    return type_id + GROUP_SEPARATOR.join(
+        PART_SEPARATOR.join(encoded[a:b]) for a, b in zip(groups[:-1], groups[1:])
+    )
+
+
+def decode(
+    value: str,
+    precision: int = DEFAULT_PRECISION,
+    include_z: bool = False,
+) -> typing.Tuple[np.ndarray, typing.Tuple[np.ndarray, ...]]:
+    """
+    Decodes a polyline, with the multi-part extension of this module, to coordinates.
+
+    Args:
+        value: The encoded polyline.
+        precision: The number of decimals of the coordinates.
+        include_z: Whether each vertex has a z-value as third value.
+
+    Returns:
+        The coordinates, an array of shape (N, 2|3) in x, y(, z) order, and the offsets
+        of the parts in the coordinates, as for ``shapely.from_ragged_array``. The
+        number of offsets is the number of levels of parts of the geometry type of the
+        polyline (see ``candidates``): no offsets for a single polyline, the offsets of
+        the parts for a Polygon or a MultiLineString, or the offsets of the parts and
+        the offsets of the groups in the parts for a MultiPolygon.
+
+    Raises:
+        ValueError: If the value is not a valid polyline.
+    """
+    scale = _check_precision(precision)
+    dimensions = 3 if include_z else 2
+    if not is_polyline(value):
+        raise ValueError("Supplied string is not a valid polyline.")
+    geometry_type, value = _split_type(value)
+    depth = 0 if geometry_type is None else _DEPTHS[geometry_type]
+    if not value:
+        return np.empty((0, dimensions)), (np.zeros(1, dtype=np.int64),) * depth
+    if (depth < 2 and GROUP_SEPARATOR in value) or (
+        depth < 1 and PART_SEPARATOR in value
+    ):
+        raise ValueError(
+            "Supplied polyline has more levels of parts than its geometry type."
+        )
+    groups = [group.split(PART_SEPARATOR) for group in value.split(GROUP_SEPARATOR)]
+    parts = [part for group in groups for part in group]
+    if not all(parts):
+        raise ValueError("Supplied polyline has an empty or incomplete part.")
+    if len(value) <= _SMALL_DECODED:
+        decoded = [_decode_value_list(part) for part in parts]
+        counts = np.array([len(values) for values in decoded])
+        values = np.array([v for values in decoded for v in values], dtype=np.int64)
+    else:
+        values, counts = _decode_values(parts)
+    if np.any(counts % dimensions):
+        raise ValueError(
+            f"Supplied polyline has a part with an incomplete vertex, each vertex has "
+            f"{dimensions} values."
+        )
+    deltas = values.reshape(-1, dimensions)
+    offsets = np.concatenate(([0], np.cumsum(counts // dimensions)))
+    scaled = np.cumsum(deltas, axis=0)
+    if len(parts) > 1:
+        # The differences restart at the first vertex of each part.
+        starts = offsets[1:-1]
+        base = np.zeros((len(parts), dimensions), dtype=np.int64)
+        base[1:] = scaled[starts - 1]
+        scaled -= np.repeat(base, np.diff(offsets), axis=0)
+    coordinates = np.ascontiguousarray(scaled[:, _ORDER[:dimensions]] / scale)
+    if depth == 0:
+        return coordinates, ()
+    if depth == 1:
+        return coordinates, (offsets,)
+    sizes = [len(group) for group in groups]
+    return coordinates, (offsets, np.concatenate(([0], np.cumsum(sizes))))
+
+
+def _decode_value_list(part: str) -> typing.List[int]:
+    """Decodes the values of a part one by one."""
+    values = []
+    value = shift = 0
+    for character in part.encode("ascii"):
+        character -= _OFFSET
+        value |= (character & 31) << shift
+        if character < _CONTINUATION:
+            values.append((value >> 1) ^ -(value & 1))
+            value = shift = 0
+        elif shift == 5 * (_MAX_CHARACTERS - 1):
+            raise ValueError("Supplied polyline has a value which is too large.")
+        else:
+            shift += 5
+    if shift:
+        raise ValueError("Supplied polyline has an empty or incomplete part.")
+    return values
+
+
+def _decode_values(parts: typing.List[str]) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Decodes the values of all parts at once. Returns the values and the number of
+    values of each of the parts."""
+    data = "".join(parts).encode("ascii")
+    characters = np.frombuffer(data, dtype=np.uint8).astype(np.int64) - _OFFSET
+    is_last = characters < _CONTINUATION
+    ends = np.cumsum([len(part) for part in parts])
+    if not is_last[ends - 1].all():
+        raise ValueError("Supplied polyline has an empty or incomplete part.")
+    first = np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+    lengths = np.diff(first, append=len(characters))
+    if lengths.max() > _MAX_CHARACTERS:
+        raise ValueError("Supplied polyline has a value which is too large.")
+    position = np.arange(len(characters)) - np.repeat(first, lengths)
+    zigzag = np.add.reduceat((characters & 31) << (5 * position), first)
+    counts = np.diff(np.cumsum(is_last)[ends - 1], prepend=0)
+    return (zigzag >> 1) ^ -(zigzag & 1), counts
+
+
+def to_geometry(
+    coordinates: np.ndarray,
+    offsets: typing.Tuple[np.ndarray, ...],
+    geometry_type: type,
+) -> BaseGeometry:
+    """
+    Constructs a geometry of a type from decoded coordinates and offsets, see
+    ``decode``.
+
+    Raises:
+        ValueError: If the coordinates cannot be converted to the geometry type, e.g.
+        a Point with several vertices, or a LineString with a single vertex.
+    """
+    if _DEPTHS.get(geometry_type) != len(offsets):
+        raise ValueError(
+            f"A polyline with {len(offsets)} levels of parts is not a "
+            f"{geometry_type.__name__}."
+        )
+    if not len(coordinates):
+        return geometry_type()
+    if not offsets:
+        if geometry_type is shapely.Point:
+            if len(coordinates) != 1:
+                raise ValueError("A Point has a single vertex.")
+            return shapely.points(coordinates[0])
+        constructor = {
+            shapely.LineString: shapely.linestrings,
+            shapely.LinearRing: shapely.linearrings,
+            shapely.MultiPoint: shapely.multipoints,
+        }[geometry_type]
+        try:
+            return constructor(coordinates)
+        except Exception as ex:
+            raise ValueError(
+                f"Supplied polyline is not a valid {geometry_type.__name__}."
+            ) from ex
+    parts = offsets[0]
+    if geometry_type is shapely.MultiPolygon:
+        groups = offsets[1]
+        ragged = (parts, groups, np.array([0, len(groups) - 1]))
+        kind = shapely.GeometryType.MULTIPOLYGON
+    else:
+        ragged = (parts, np.array([0, len(parts) - 1]))
+        kind = (
+            shapely.GeometryType.POLYGON
+            if geometry_type is shapely.Polygon
+            else shapely.GeometryType.MULTILINESTRING
+        )
+    try:
+        (geometry,) = shapely.from_ragged_array(kind, coordinates, ragged)
+    except Exception as ex:
+        raise ValueError(
+            f"Supplied polyline is not a valid {geometry_type.__name__}."
+        ) from ex
+    return geometry
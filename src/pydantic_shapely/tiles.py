@@ -0,0 +1,482 @@
+"""
+Generation of a pyramid of vector tiles for a range of zoom levels.
+
+Encoding every tile of a zoom level with ``pydantic_shapely.mvt.encode_tile`` would clip
+every feature for every tile. ``TilePyramid`` prepares the features once: the
+geometries are transformed to Web Mercator and their bounds are determined with
+``shapely.bounds``. For each zoom level the features are then assigned to the tiles
+their (buffered) bounds overlap, for all features at once, and only these features are
+encoded in each tile:
+
+.. code-block:: python
+
+    from pydantic_shapely.tiles import TilePyramid
+
+    pyramid = TilePyramid(collection, layer="roads")
+    pyramid.write_mbtiles("roads.mbtiles", min_zoom=0, max_zoom=12)
+    # or, one file per tile in {z}/{x}/{y}.mvt
+    pyramid.write_directory("tiles", min_zoom=0, max_zoom=12)
+
+The geometries are simplified once per zoom level, with a tolerance in units of the
+tile extent (1 by default), so the lower zoom levels do not encode details which are
+smaller than a pixel.
+
+The tiles of a zoom level are encoded in batches. The encoding holds the GIL, so by
+default worker processes are forked once for all zoom levels, which inherit the prepared
+features from the parent process and simplify the features of their batches, see
+``pydantic_shapely.parallel.forked_executor``. When ``fork`` is not the start method of
+``multiprocessing``, the batches are pickled to the shared process pool. On a
+free-threaded build of Python, the shared thread pool of ``pydantic_shapely.parallel``
+is used, and with a single CPU the tiles are encoded in the calling thread. Another
+executor can be passed to each of the methods.
+"""
+
+import concurrent.futures
+import contextlib
+import gzip
+import itertools
+import json
+import math
+import os
+import sqlite3
+import typing
+
+import numpy as np
+import shapely
+
+from . import instrumentation, parallel
+from .mvt import (
+    _EARTH_RADIUS,
+    _ORIGIN,
+    DEFAULT_BUFFER,
+    DEFAULT_EXTENT,
+    _prepare_features,
+    encode_layer,
+)
+
+if typing.TYPE_CHECKING:
+    from .mvt import Features
+
+# The default number of tiles encoded by a single task of the executor.
+DEFAULT_TILES_PER_BATCH = 64
+
+# A tile which is assigned to the features at the given indices.
+Bucket = typing.Tuple[int, int, np.ndarray]
+# An encoded tile: zoom level, column, row and the encoded data.
+Tile = typing.Tuple[int, int, int, bytes]
+
+
+def bucket_features(
+    bounds: np.ndarray, z: int, margin: float = 0.0
+) -> typing.List[Bucket]:
+    """
+    Assigns features to the tiles of a zoom level which their bounds overlap.
+
+    Args:
+        bounds: The bounds (minx, miny, maxx, maxy) of the features in Web Mercator,
+            see ``shapely.bounds``. Features with missing or empty geometries (bounds
+            which are NaN) are not assigned to any tile.
+        z: The zoom level.
+        margin: The width of the buffer around the tiles, as fraction of the size of a
+            tile.
+
+    Returns:
+        A list with the column, the row and the indices of the features of each tile
+        with at least one feature, ordered by column and row. The indices of the
+        features are in ascending order.
+    """
+    count = 1 << z
+    size = 2 * _ORIGIN / count
+    indices = np.flatnonzero(np.all(np.isfinite(bounds), axis=1))
+    bounds = bounds[indices]
+    # The range of columns and rows overlapped by the buffered bounds of each feature.
+    # Rows are counted from the north.
+    ranges = np.floor(
+        np.column_stack(
+            (
+                bounds[:, 0] + _ORIGIN,
+                _ORIGIN - bounds[:, 3],
+                bounds[:, 2] + _ORIGIN,
+                _ORIGIN - bounds[:, 1],
+            )
+        )
+        / size
+        + np.array([-margin, -margin, margin, margin])
+    )
+    x0, y0, x1, y1 = np.clip(ranges, 0, count - 1).astype(np.int64).T
+    columns, rows = x1 - x0 + 1, y1 - y0 + 1
+    tiles = columns * rows
+    # One entry for each combination of a feature and a tile.
+    feature = np.repeat(np.arange(len(indices)), tiles)
+    offset = np.arange(len(feature)) - np.repeat(np.cumsum(tiles) - tiles, tiles)
+    x = x0[feature] + offset // rows[feature]
+    y = y0[feature] + offset % rows[feature]
+    keys = x * count + y
+    order = np.argsort(keys, kind="stable")
+    keys, feature = keys[order], indices[feature[order]]
+    starts = np.flatnonzero(np.diff(keys, prepend=-1))
+    return [
+        (int(key // count), int(key % count), group)
+        for key, group in zip(keys[starts], np.split(feature, starts[1:]))
+    ]
+
+
+class TilePyramid:
+    """
+    The vector tiles of a layer of features, for a range of zoom levels.
+
+    Args:
+        features: A GeoJSON feature collection, or an iterable of feature models.
+        layer: The name of the layer.
+        extent: The number of units of the tiles along each side.
+        buffer: The width of the buffer around the tiles, in units of the extent.
+        crs: The coordinate reference system of the geometries, either ``EPSG:4326``
+            or ``EPSG:3857``, see ``pydantic_shapely.mvt.encode_tile``.
+        id_field: The name of the property holding the id of the features.
+        tolerance: The tolerance of the simplification of the geometries, in units of
+            the extent. The geometries are not simplified when the tolerance is 0.
+    """
+
+    def __init__(
+        self,
+        features: "Features",
+        *,
+        layer: str = "features",
+        extent: int = DEFAULT_EXTENT,
+        buffer: int = DEFAULT_BUFFER,
+        crs: str = "EPSG:4326",
+        id_field: typing.Optional[str] = None,
+        tolerance: float = 1.0,
+    ):
+        if tolerance < 0:
+            raise ValueError("The tolerance must not be negative.")
+        self.layer = layer
+        self.extent = extent
+        self.buffer = buffer
+        self.tolerance = tolerance
+        self.geometries, self.properties = _prepare_features(features, crs)
+        self.ids: typing.Optional[typing.List[typing.Any]] = None
+        if id_field is not None:
+            self.ids = [p.pop(id_field, None) for p in self.properties]
+        self.bounds = shapely.bounds(self.geometries)
+
+    def buckets(self, z: int) -> typing.List[Bucket]:
+        """Returns the tiles of a zoom level with the indices of their features, see
+        ``bucket_features``."""
+        return bucket_features(self.bounds, z, self.buffer / self.extent)
+
+    def generate(
+        self,
+        min_zoom: int,
+        max_zoom: int,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        batch_size: int = DEFAULT_TILES_PER_BATCH,
+    ) -> typing.Iterator[Tile]:
+        """
+        Encodes the tiles of the zoom levels, see ``pydantic_shapely.mvt.encode_tile``.
+        Tiles without features are left out.
+
+        Args:
+            min_zoom: The lowest zoom level.
+            max_zoom: The highest zoom level (inclusive).
+            executor: The executor to encode the batches of tiles on. The features of
+                each batch are pickled when the executor is a process pool. Defaults to
+                the pools described in the module.
+            batch_size: The maximum number of tiles encoded by a single task.
+
+        Yields:
+            The zoom level, column, row and encoded data of each tile, by zoom level,
+            column and row.
+        """
+        if not 0 <= min_zoom <= max_zoom:
+            raise ValueError(
+                f"Invalid range of zoom levels {min_zoom} to {max_zoom}, the zoom "
+                f"levels must be non-negative and in ascending order."
+            )
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+        with contextlib.ExitStack() as stack:
+            forked = None
+            if (
+                executor is None
+                and parallel.default_workers() > 1
+                and parallel.gil_enabled()
+            ):
+                # The workers are only forked when the first batch is submitted.
+                forked = stack.enter_context(
+                    parallel.forked_executor(
+                        (self.geometries, self.properties, self.ids),
+                        parallel.default_workers(),
+                    )
+                )
+            for z in range(min_zoom, max_zoom + 1):
+                yield from self._generate_zoom(z, batch_size, executor, forked)
+
+    def _generate_zoom(
+        self,
+        z: int,
+        batch_size: int,
+        executor: typing.Optional[concurrent.futures.Executor],
+        forked: typing.Optional[concurrent.futures.Executor],
+    ) -> typing.Iterator[Tile]:
+        """Encodes the tiles of a zoom level, see ``generate``. The batches are encoded
+        on the forked process pool, if any, when no executor is passed."""
+        started = instrumentation.start()
+        tolerance = 0.0
+        if self.tolerance:
+            tolerance = self.tolerance * 2 * _ORIGIN / (1 << z) / self.extent
+        buckets = self.buckets(z)
+        batches = [
+            buckets[start : start + batch_size]
+            for start in range(0, len(buckets), batch_size)
+        ]
+        options = (z, self.layer, self.extent, self.buffer)
+        if executor is None and forked is not None and len(batches) > 1:
+            # The workers simplify the features of their batches.
+            results: typing.Iterable[typing.List[Tile]] = forked.map(
+                _encode_forked_batch,
+                batches,
+                itertools.repeat(tolerance),
+                itertools.repeat(options),
+            )
+        else:
+            geometries = self.geometries
+            if tolerance:
+                geometries = parallel.simplify(geometries, tolerance)
+            if executor is None and (
+                len(batches) <= 1 or parallel.default_workers() == 1
+            ):
+                results = (
+                    _encode_tiles(batch, geometries, self.properties, self.ids, options)
+                    for batch in batches
+                )
+            else:
+                results = _encode_pickled(
+                    executor
+                    or (
+                        parallel.get_process_executor()
+                        if parallel.gil_enabled()
+                        else parallel.get_executor()
+                    ),
+                    batches,
+                    geometries,
+                    self.properties,
+                    self.ids,
+                    options,
+                )
+        count = 0
+        for tiles in results:
+            count += len(tiles)
+            yield from tiles
+        instrumentation.stop(started, "tiles.generate", items=count)
+
+    def write_directory(
+        self,
+        path: typing.Union[str, "os.PathLike[str]"],
+        min_zoom: int,
+        max_zoom: int,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        extension: str = "mvt",
+    ) -> int:
+        """
+        Writes the tiles of the zoom levels to ``{path}/{z}/{x}/{y}.{extension}``, see
+        ``generate``. Existing tiles are overwritten.
+
+        Returns:
+            The number of tiles written.
+        """
+        count = 0
+        for z, x, y, data in self.generate(min_zoom, max_zoom, executor):
+            directory = os.path.join(path, str(z), str(x))
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"{y}.{extension}"), "wb") as file:
+                file.write(data)
+            count += 1
+        return count
+
+    def write_mbtiles(
+        self,
+        path: typing.Union[str, "os.PathLike[str]"],
+        min_zoom: int,
+        max_zoom: int,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        metadata: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> int:
+        """
+        Writes the tiles of the zoom levels to a new SQLite database in the MBTiles
+        format, see ``generate``. The tiles are compressed with gzip and the rows are
+        numbered from the south, as the MBTiles specification requires.
+
+        Args:
+            path: The path of the database, which must not exist yet.
+            min_zoom: The lowest zoom level.
+            max_zoom: The highest zoom level (inclusive).
+            executor: The executor to encode the tiles on, see ``generate``.
+            metadata: Additional entries of the metadata table, which take precedence
+                over the entries written by default (``name``, ``format``, ``minzoom``,
+                ``maxzoom``, ``bounds`` and ``json`` with the fields of the layer).
+
+        Returns:
+            The number of tiles written.
+
+        Raises:
+            FileExistsError: If the database exists.
+        """
+        if os.path.exists(path):
+            raise FileExistsError(f"The file {os.fspath(path)!r} already exists.")
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                connection.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+                connection.execute(
+                    "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, "
+                    "tile_row INTEGER, tile_data BLOB)"
+                )
+                connection.execute(
+                    "CREATE UNIQUE INDEX tile_index ON tiles "
+                    "(zoom_level, tile_column, tile_row)"
+                )
+                connection.executemany(
+                    "INSERT INTO metadata VALUES (?, ?)",
+                    {
+                        **self._metadata(min_zoom, max_zoom),
+                        **(metadata or {}),
+                    }.items(),
+                )
+                count = 0
+                for z, x, y, data in self.generate(min_zoom, max_zoom, executor):
+                    connection.execute(
+                        "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                        (z, x, (1 << z) - 1 - y, gzip.compress(data)),
+                    )
+                    count += 1
+        finally:
+            connection.close()
+        return count
+
+    def _metadata(self, min_zoom: int, max_zoom: int) -> typing.Dict[str, str]:
+        """Returns the default metadata of an MBTiles database."""
+        fields: typing.Dict[str, str] = {}
+        for properties in self.properties:
+            for key, value in properties.items():
+                if value is not None and key not in fields:
+                    fields[key] = (
+                        "Boolean"
+                        if isinstance(value, bool)
+                        else "Number" if isinstance(value, (int, float)) else "String"
+                    )
+        result = {
+            "name": self.layer,
+            "format": "pbf",
+            "minzoom": str(min_zoom),
+            "maxzoom": str(max_zoom),
+            "json": json.dumps(
+                {"vector_layers": [{"id": self.layer, "fields": fields}]}
+            ),
+        }
+        bounds = self.bounds[np.all(np.isfinite(self.bounds), axis=1)]
+        if len(bounds):
+            minx, miny = bounds[:, :2].min(axis=0)
+            maxx, maxy = bounds[:, 2:].max(axis=0)
+            west, south = _to_lonlat(minx, miny)
+            east, north = _to_lonlat(maxx, maxy)
+            result["bounds"] = f"{west:.6f},{south:.6f},{east:.6f},{north:.6f}"
+        return result
+
+
+def _to_lonlat(x: float, y: float) -> typing.Tuple[float, float]:
+    """Transforms a point from Web Mercator to longitude and latitude."""
+    x = min(max(x, -_ORIGIN), _ORIGIN)
+    y = min(max(y, -_ORIGIN), _ORIGIN)
+    return (
+        math.degrees(x / _EARTH_RADIUS),
+        math.degrees(2 * math.atan(math.exp(y / _EARTH_RADIUS)) - math.pi / 2),
+    )
+
+
+def _encode_tiles(
+    batch: typing.List[Bucket],
+    geometries: np.ndarray,
+    properties: typing.Sequence[typing.Mapping[str, typing.Any]],
+    ids: typing.Optional[typing.Sequence[typing.Any]],
+    options: typing.Tuple[int, str, int, int],
+) -> typing.List[Tile]:
+    """Encodes a batch of tiles, see ``TilePyramid.generate``."""
+    z, layer, extent, buffer = options
+    result = []
+    for x, y, indices in batch:
+        data = encode_layer(
+            geometries[indices],
+            [properties[i] for i in indices],
+            z,
+            x,
+            y,
+            name=layer,
+            extent=extent,
+            buffer=buffer,
+            ids=None if ids is None else [ids[i] for i in indices],
+        )
+        if data:
+            result.append((z, x, y, data))
+    return result
+
+
+def _batch_arguments(
+    batch: typing.List[Bucket],
+    geometries: np.ndarray,
+    properties: typing.Sequence[typing.Mapping[str, typing.Any]],
+    ids: typing.Optional[typing.Sequence[typing.Any]],
+) -> typing.Tuple[typing.Any, ...]:
+    """Returns the batch with only the features of its tiles, so the other features are
+    not pickled when the batch is sent to a worker process."""
+    used = np.unique(np.concatenate([indices for _, _, indices in batch]))
+    return (
+        [(x, y, np.searchsorted(used, indices)) for x, y, indices in batch],
+        geometries[used],
+        [properties[i] for i in used],
+        None if ids is None else [ids[i] for i in used],
+    )
+
+
+def _encode_pickled(
+    executor: concurrent.futures.Executor,
+    batches: typing.List[typing.List[Bucket]],
+    geometries: np.ndarray,
+    properties: typing.Sequence[typing.Mapping[str, typing.Any]],
+    ids: typing.Optional[typing.Sequence[typing.Any]],
+    options: typing.Tuple[int, str, int, int],
+) -> typing.Iterator[typing.List[Tile]]:
+    """Encodes the batches on an executor, which receives only the features of the
+    tiles of each batch."""
+    futures = [
+        executor.submit(
+            _encode_tiles,
+            *_batch_arguments(batch, geometries, properties, ids),
+            options,
+        )
+        for batch in batches
+    ]
+    return (future.result() for future in futures)
+
+
+def _encode_forked_batch(
+    batch: typing.List[Bucket],
+    tolerance: float,
+    options: typing.Tuple[int, str, int, int],
+) -> typing.List[Tile]:
+    """Encodes a batch with the features inherited from the parent process, see
+    ``parallel.forked_executor``. Only the features of the tiles of the batch are
+    simplified."""
+    batch, geometries, properties, ids = _batch_arguments(
+        batch, *parallel.forked_state()
+    )
+    if tolerance:
+        geometries = shapely.simplify(geometries, tolerance)
+    return _encode_tiles(batch, geometries, properties, ids, options)
+
+
+__all__ = [
+    "DEFAULT_TILES_PER_BATCH",
+    "TilePyramid",
+    "bucket_features",
+]
@@ -0,0 +1,430 @@
+"""
+Compact pickling and shared-memory transport of feature models.
+
+The feature models, GeoJSON models and feature collections of this package are pickled
+with a compact protocol (see ``__reduce_ex__`` of the models):
+
+- the geometry of a ``FeatureBaseModel`` is encoded as WKB;
+- the values of the other fields are stored as a tuple, in the order of the fields,
+  instead of a dictionary. The set of fields which were set explicitly is stored as
+  a bit mask;
+- the models are restored without validation, like ``model_construct``.
+
+The dynamically created GeoJSON feature models (``FeatureBaseModel.GeoJsonDataModel``)
+and the parametrized feature collections cannot be looked up by their name. They are
+pickled as a reference to the feature model (or generic class) they were derived from.
+
+For passing many features to worker processes, ``SharedFeatures`` stores the features
+in a single block of shared memory. Only a small handle is pickled for each worker,
+which reads the WKB and the field values of its share of the features directly from
+the shared memory:
+
+.. code-block:: python
+
+    from concurrent.futures import ProcessPoolExecutor
+    from pydantic_shapely.transport import SharedFeatures
+
+    def work(chunk: SharedFeatures) -> float:
+        return sum(feature.geometry.area for feature in chunk.to_feature_models())
+
+    with SharedFeatures.create(features) as shared:
+        with ProcessPoolExecutor() as executor:
+            total = sum(executor.map(work, shared.chunks(10_000)))
+"""
+
+import functools
+import os
+import pickle
+import sys
+import threading
+import typing
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import shapely
+
+# The kinds of references to classes which cannot be looked up by their name.
+_GENERIC = "generic"
+_GEOJSON = "geojson"
+_UNION = "union"
+
+_ATTACH_LOCK = threading.Lock()
+
+# Pickle protocol 5 supports out-of-band buffers and is available from Python 3.8.
+PROTOCOL = 5
+
+
+def _is_importable(cls: typing.Any) -> bool:
+    """Returns whether the class can be looked up by its module and qualified name."""
+    module = sys.modules.get(getattr(cls, "__module__", ""))
+    if module is None:
+        return False
+    value: typing.Any = module
+    for name in getattr(cls, "__qualname__", "<locals>").split("."):
+        value = getattr(value, name, None)
+        if value is None:
+            return False
+    return value is cls
+
+
+@functools.lru_cache(maxsize=None)
+def class_reference(cls: typing.Any) -> typing.Any:
+    """
+    Returns a picklable reference to a model class, see ``resolve_class``.
+
+    Args:
+        cls: The class, e.g. a feature model, the GeoJSON model of a feature model or
+            a parametrized feature collection.
+
+    Returns:
+        The class itself when it can be looked up by its name, otherwise a tuple
+        describing how the class is derived.
+    """
+    if _is_importable(cls):
+        return cls
+    if typing.get_origin(cls) is typing.Union:
+        return (_UNION, tuple(class_reference(arg) for arg in typing.get_args(cls)))
+    metadata = getattr(cls, "__pydantic_generic_metadata__", None)
+    if metadata and metadata["origin"] is not None:
+        return (
+            _GENERIC,
+            class_reference(metadata["origin"]),
+            tuple(class_reference(arg) for arg in metadata["args"]),
+        )
+    parent = getattr(cls, "ParentDataModel", None)
+    if parent is not None and parent.GeoJsonDataModel is cls:
+        return (_GEOJSON, class_reference(parent))
+    # Let pickle report the class which cannot be pickled.
+    return cls
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_class(reference: typing.Any) -> typing.Any:
+    """Returns the class for a reference created by ``class_reference``."""
+    if not isinstance(reference, tuple):
+        return reference
+    if reference[0] == _UNION:
+        return typing.Union[tuple(resolve_class(arg) for arg in reference[1])]
+    if reference[0] == _GENERIC:
+        args = tuple(resolve_class(arg) for arg in reference[2])
+        return resolve_class(reference[1])[args if len(args) > 1 else args[0]]
+    return resolve_class(reference[1]).GeoJsonDataModel
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(
+    cls: typing.Any, exclude: typing.Optional[str]
+) -> typing.Tuple[typing.Tuple[str, ...], typing.Tuple[str, ...]]:
+    """Returns the names of all fields of a model class, and the names of the fields
+    which are part of the compact state."""
+    names = tuple(cls.model_fields)
+    return names, tuple(name for name in names if name != exclude)
+
+
+@functools.lru_cache(maxsize=1024)
+def _fields_set(names: typing.Tuple[str, ...], mask: int) -> typing.FrozenSet[str]:
+    """Returns the names of the fields in the bit mask."""
+    return frozenset(name for bit, name in enumerate(names) if mask >> bit & 1)
+
+
+def model_state(
+    model: typing.Any, exclude: typing.Optional[str] = None
+) -> typing.Optional[typing.Tuple[typing.Tuple[typing.Any, ...], int]]:
+    """
+    Returns the compact state of a Pydantic model: the values of its fields as a tuple
+    and the fields which were set explicitly as a bit mask, both in the order of the
+    fields. The bit mask covers all fields, including the excluded field.
+
+    Args:
+        model: The model.
+        exclude: The name of a field which is not part of the state.
+
+    Returns:
+        The state, or None when the model has extra fields or private attributes,
+        which are not supported by the compact state.
+    """
+    if model.__pydantic_extra__ or model.__pydantic_private__:
+        return None
+    values = model.__dict__
+    fields_set = model.__pydantic_fields_set__
+    names, state_names = _field_names(type(model), exclude)
+    mask = 0
+    for bit, name in enumerate(names):
+        if name in fields_set:
+            mask |= 1 << bit
+    return tuple(values[name] for name in state_names), mask
+
+
+def construct(
+    cls: typing.Any,
+    values: typing.Sequence[typing.Any],
+    mask: int,
+    exclude: typing.Optional[str] = None,
+    excluded_value: typing.Any = None,
+) -> typing.Any:
+    """
+    Creates a model from its compact state, see ``model_state``, without validation.
+
+    Args:
+        cls: The model class.
+        values: The values of the fields, in the order of the fields.
+        mask: The bit mask of the fields which were set explicitly.
+        exclude: The name of the field which is not part of the state.
+        excluded_value: The value of the excluded field.
+
+    Returns:
+        The model.
+    """
+    names, state_names = _field_names(cls, exclude)
+    if exclude is not None:
+        # Insert the value of the excluded field, so the fields stay in order.
+        position = names.index(exclude)
+        values = (*values[:position], excluded_value, *values[position:])
+    state = dict(zip(names, values))
+    fields_set = set(_fields_set(names, mask))
+    model = object.__new__(cls)
+    object.__setattr__(model, "__dict__", state)
+    object.__setattr__(model, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
+
+
+def restore_model(
+    reference: typing.Any, values: typing.Sequence[typing.Any], mask: int
+) -> typing.Any:
+    """Restores a pickled model from its class reference and compact state."""
+    return construct(resolve_class(reference), values, mask)
+
+
+def reduce_model(model: typing.Any) -> typing.Optional[typing.Tuple[typing.Any, ...]]:
+    """Returns the compact pickled form of a Pydantic model (the result of
+    ``__reduce_ex__``), or None when the compact state is not supported."""
+    state = model_state(model)
+    if state is None:
+        return None
+    return (restore_model, (class_reference(type(model)), *state))
+
+
+def restore_feature(
+    reference: typing.Any, wkb: bytes, values: typing.Sequence[typing.Any], mask: int
+) -> typing.Any:
+    """Restores a pickled feature model from its class reference, the WKB of its
+    geometry and the compact state of the other fields."""
+    cls = resolve_class(reference)
+    return construct(cls, values, mask, cls.__geometry_field__, shapely.from_wkb(wkb))
+
+
+def restore_geojson_feature(
+    reference: typing.Any,
+    values: typing.Sequence[typing.Any],
+    mask: int,
+    properties: typing.Sequence[typing.Any],
+    properties_mask: int,
+) -> typing.Any:
+    """Restores a pickled GeoJSON feature from its class reference, the compact state
+    of its fields and the compact state of its properties. The model of the properties
+    is created together with the GeoJSON feature model, and is therefore looked up by
+    the annotation of the properties field."""
+    cls = resolve_class(reference)
+    model = cls.model_fields["properties"].annotation
+    return construct(
+        cls, values, mask, "properties", construct(model, properties, properties_mask)
+    )
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    """Attaches to an existing block of shared memory. The block is owned by the
+    process which created it, so it is not tracked in the attaching process."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(  # pylint: disable=unexpected-keyword-arg
+            name=name, track=False
+        )
+    # NOTE: Before Python 3.13 the block is always registered with the resource tracker
+    # of the process. The workers of a process pool share the tracker of the owner, in
+    # which the block is registered already, so registering it again has no effect,
+    # whereas unregistering it would drop the registration of the owner. A process
+    # without a tracker starts its own, which would remove the block when the process
+    # exits, so the block is unregistered from that tracker after attaching.
+    with _ATTACH_LOCK:
+        # pylint: disable-next=protected-access
+        started = resource_tracker._resource_tracker._fd is None
+        shm = shared_memory.SharedMemory(name=name)
+        if started and os.name == "posix":
+            # pylint: disable-next=protected-access
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+    return shm
+
+
+class SharedFeatures:
+    """
+    Feature models in a single block of shared memory.
+
+    The block contains, for each feature, the index of its class, the WKB of its
+    geometry and the pickled compact state of the other fields. A ``SharedFeatures``
+    object is pickled as a small handle with the name of the block, so it can be passed
+    to worker processes cheaply. The process which created the block owns it, and
+    removes it when the object is used as a context manager or with ``unlink``.
+
+    Use ``create`` to store features, and ``chunks`` to divide the features between
+    workers.
+    """
+
+    # The number of int64 values in the header per feature: the class index, and the
+    # end offsets of the WKB and of the state.
+    _HEADER = 3
+
+    def __init__(
+        self,
+        name: str,
+        count: int,
+        classes: typing.Sequence[typing.Any],
+        start: int = 0,
+        stop: typing.Optional[int] = None,
+        shm: typing.Optional[shared_memory.SharedMemory] = None,
+    ) -> None:
+        self.name = name
+        self.count = count
+        self.classes = tuple(classes)
+        self.start = start
+        self.stop = count if stop is None else stop
+        self._shm = shm
+
+    @classmethod
+    def create(cls, features: typing.Sequence[typing.Any]) -> "SharedFeatures":
+        """
+        Stores the feature models in a new block of shared memory.
+
+        Args:
+            features: The feature models, instances of sub-classes of
+                ``FeatureBaseModel``. Convert a GeoJSON feature collection first with
+                ``to_feature_models``.
+
+        Returns:
+            The shared features, which own the block of shared memory.
+        """
+        classes: typing.Dict[type, int] = {}
+        indices = np.empty(len(features), dtype=np.int64)
+        geometries = np.empty(len(features), dtype=object)
+        states = []
+        for position, feature in enumerate(features):
+            model = type(feature)
+            indices[position] = classes.setdefault(model, len(classes))
+            geometries[position] = getattr(feature, model.__geometry_field__)
+            state = model_state(feature, model.__geometry_field__)
+            if state is None:
+                raise ValueError(
+                    f"The feature at index {position} has extra fields or private "
+                    "attributes, which cannot be stored in shared memory."
+                )
+            states.append(pickle.dumps(state, protocol=PROTOCOL))
+        wkb = shapely.to_wkb(geometries, include_srid=True) if len(features) else []
+        header = np.empty((len(features), cls._HEADER), dtype=np.int64)
+        header[:, 0] = indices
+        header[:, 1] = np.cumsum([len(value) for value in wkb], dtype=np.int64)
+        header[:, 2] = np.cumsum([len(value) for value in states], dtype=np.int64)
+        blobs = (b"".join(wkb), b"".join(states))
+        size = header.nbytes + len(blobs[0]) + len(blobs[1])
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        position = header.nbytes
+        shm.buf[:position] = header.tobytes()
+        for blob in blobs:
+            shm.buf[position : position + len(blob)] = blob
+            position += len(blob)
+        return cls(
+            shm.name,
+            len(features),
+            [class_reference(model) for model in classes],
+            shm=shm,
+        )
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return (
+            SharedFeatures,
+            (self.name, self.count, self.classes, self.start, self.stop),
+        )
+
+    def __enter__(self) -> "SharedFeatures":
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.close()
+        self.unlink()
+
+    def chunks(self, size: int) -> typing.List["SharedFeatures"]:
+        """Divides the features in chunks of at most ``size`` features, e.g. one for
+        each task of a pool of workers."""
+        if size < 1:
+            raise ValueError("The chunk size must be at least 1.")
+        return [
+            SharedFeatures(
+                self.name, self.count, self.classes, start, min(start + size, self.stop)
+            )
+            for start in range(self.start, self.stop, size)
+        ]
+
+    def to_feature_models(self) -> typing.List[typing.Any]:
+        """Restores the feature models of this (chunk of the) shared features."""
+        shm = self._shm if self._shm is not None else _open(self.name)
+        try:
+            return self._read(shm.buf)
+        finally:
+            if shm is not self._shm:
+                shm.close()
+
+    def _read(self, buffer: memoryview) -> typing.List[typing.Any]:
+        header_size = self.count * self._HEADER * 8
+        header = np.frombuffer(
+            buffer, dtype=np.int64, count=self.count * self._HEADER
+        ).reshape(-1, self._HEADER)
+        # The start offsets of the features, followed by the end offset of the last.
+        wkb_ends = np.concatenate([[0], header[:, 1]])
+        state_ends = np.concatenate([[0], header[:, 2]])
+        indices = header[self.start : self.stop, 0].tolist()
+        del header
+        state_base = header_size + int(wkb_ends[-1])
+        wkb_offsets = (wkb_ends[self.start : self.stop + 1] + header_size).tolist()
+        state_offsets = (state_ends[self.start : self.stop + 1] + state_base).tolist()
+        geometries = shapely.from_wkb(
+            [bytes(buffer[a:b]) for a, b in zip(wkb_offsets, wkb_offsets[1:])]
+        )
+        classes = [resolve_class(reference) for reference in self.classes]
+        result = []
+        for index, geometry, a, b in zip(
+            indices, geometries, state_offsets, state_offsets[1:]
+        ):
+            cls = classes[index]
+            values, mask = pickle.loads(buffer[a:b])
+            result.append(
+                construct(cls, values, mask, cls.__geometry_field__, geometry)
+            )
+        return result
+
+    def close(self) -> None:
+        """Closes the access to the block of shared memory in this process."""
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """Removes the block of shared memory. Only the owner can remove the block,
+        after which the workers can no longer attach to it."""
+        if self._shm is not None:
+            self._shm.unlink()
+            self._shm = None
+
+
+__all__ = [
+    "PROTOCOL",
+    "SharedFeatures",
+    "class_reference",
+    "construct",
+    "model_state",
+    "reduce_model",
+    "resolve_class",
+    "restore_feature",
+    "restore_geojson_feature",
+    "restore_model",
+]
@@ -0,0 +1,96 @@
+"""
+Construction of models from trusted data, without validation.
+
+Data which has already been validated, e.g. rows loaded from your own database, does
+not have to be validated again when it is converted between feature models, GeoJSON
+models and feature collections. The trusted conversions create the models like
+``model_construct`` and convert the geometries with the vectorized functions of
+Shapely:
+
+- ``FeatureBaseModel.to_geojson_model(trusted=True)`` and
+  ``FeatureBaseModel.construct_geojson_models``;
+- ``GeoJsonFeatureCollectionBaseModel.from_feature_models(features, trusted=True)``;
+- ``GeoJsonFeatureCollectionBaseModel.to_feature_models(trusted=True)``.
+
+The trusted models share the values of their fields with the models they are converted
+from, and the feature models of a collection are not checked against the feature models
+of the collection. Invalid data results in invalid models, which may fail to serialize.
+
+To find invalid data during development and testing, set a sample rate. A sample of
+the models created by each trusted conversion is then validated, which raises a
+``ValueError`` for the first invalid model:
+
+.. code-block:: python
+
+    from pydantic_shapely import trusted
+
+    trusted.set_sample_rate(0.01)  # validate 1% of the trusted models
+    collection = Collection.from_feature_models(rows, trusted=True)
+"""
+
+import random
+import typing
+
+from pydantic import BaseModel, ValidationError
+
+_SAMPLE_RATE = 0.0
+_RANDOM = random.Random()
+
+
+def get_sample_rate() -> float:
+    """Returns the fraction of the trusted models which is validated."""
+    return _SAMPLE_RATE
+
+
+def set_sample_rate(rate: float, seed: typing.Optional[int] = None) -> None:
+    """
+    Sets the fraction of the trusted models which is validated, for the process.
+
+    Args:
+        rate: The fraction between 0 (no validation, the default) and 1 (validate all
+            trusted models).
+        seed: The seed of the random selection of the validated models, to make the
+            selection reproducible.
+
+    Raises:
+        ValueError: If the rate is not between 0 and 1.
+    """
+    global _SAMPLE_RATE  # pylint: disable=global-statement
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(f"The sample rate must be between 0 and 1, not {rate}.")
+    _SAMPLE_RATE = float(rate)
+    if seed is not None:
+        _RANDOM.seed(seed)
+
+
+def verify(models: typing.Sequence[BaseModel]) -> None:
+    """
+    Validates a sample of the models created by a trusted conversion, see
+    ``set_sample_rate``. Does nothing when the sample rate is 0.
+
+    Args:
+        models: The models created without validation.
+
+    Raises:
+        ValueError: If one of the sampled models is not valid. The message contains
+        the index of the model.
+    """
+    rate = _SAMPLE_RATE
+    if not rate or not models:
+        return
+    if rate >= 1.0:
+        indices: typing.Iterable[int] = range(len(models))
+    else:
+        count = max(1, round(len(models) * rate))
+        indices = sorted(_RANDOM.sample(range(len(models)), count))
+    for index in indices:
+        model = models[index]
+        try:
+            type(model).model_validate(model.model_dump(warnings=False))
+        except ValidationError as ex:
+            raise ValueError(
+                f"The trusted {type(model).__name__} at index {index} is not valid."
+            ) from ex
+
+
+__all__ = ["get_sample_rate", "set_sample_rate", "verify"]
@@ -68,3 +68,72 @@ def test_create_featuremodel_union():
         create_geojson_datamodel(TestModel, "geometry").model_json_schema()
         == TestModelGeoJsonFeature.model_json_schema()
     )
+
+
+def test_geojson_datamodel_created_lazily():
+
+    class TestModel(FeatureBaseModel):
+        geometry: Annotated[Point, GeometryField()]
+        a: int
+
+    assert "__geojson_datamodel__" not in TestModel.__dict__
+    datamodel = TestModel.GeoJsonDataModel
+    assert TestModel.__dict__["__geojson_datamodel__"] is datamodel
+    # Subsequent access, also from an instance, returns the cached model
+    assert TestModel.GeoJsonDataModel is datamodel
+    assert TestModel(geometry=Point(0, 0), a=1).GeoJsonDataModel is datamodel
+    assert datamodel.ParentDataModel is TestModel
+
+
+def test_geojson_datamodel_not_shared_with_subclass():
+
+    class TestModel(FeatureBaseModel):
+        geometry: Annotated[Point, GeometryField()]
+        a: int
+
+    class TestSubModel(TestModel):
+        b: str
+
+    parent_model = TestModel.GeoJsonDataModel
+    child_model = TestSubModel.GeoJsonDataModel
+    assert parent_model is not child_model
+    assert child_model.ParentDataModel is TestSubModel
+    assert "b" in child_model.model_fields["properties"].annotation.model_fields
+
+
+def test_geojson_feature_base_shared():
+
+    class TestModelA(FeatureBaseModel):
+        geometry: Annotated[Point, GeometryField()]
+        a: int
+
+    class TestModelB(FeatureBaseModel):
+        geometry: Annotated[Point, GeometryField()]
+        b: str
+
+    assert (
+        TestModelA.GeoJsonDataModel.__bases__ == TestModelB.GeoJsonDataModel.__bases__
+    )
+
+
+def test_geojson_datamodel_base_class():
+
+    with pytest.raises(AttributeError):
+        FeatureBaseModel.GeoJsonDataModel
+
+
+def test_geometry_collection_feature_roundtrip():
+
+    class TestModel(FeatureBaseModel):
+        geometry: Annotated[GeometryCollection, GeometryField()]
+        a: int
+
+    feature = TestModel(
+        geometry=GeometryCollection(
+            [Point(0, 0), MultiPolygon([Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])])]
+        ),
+        a=1,
+    )
+    geojson_model = feature.to_geojson_model()
+    assert geojson_model.geometry.type == "GeometryCollection"
+    assert geojson_model.to_feature_model() == feature
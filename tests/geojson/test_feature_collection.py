@@ -1,12 +1,16 @@
+import concurrent.futures
+import typing
+
 try:
     from typing import Annotated
 except ImportError:
     from typing_extensions import Annotated
 
+import pytest
 from pydantic import Field
 from shapely.geometry import Point
 
-from pydantic_shapely import FeatureBaseModel, GeometryField
+from pydantic_shapely import FeatureBaseModel, GeometryField, parallel
 from pydantic_shapely.geojson.feature_collection import (
     GeoJsonFeatureCollectionBaseModel,
 )
@@ -67,3 +71,70 @@ def test_create_feature_collection_roundtrip():
         FeatureModel(point=Point(0, 0)),
         FeatureModel(point=Point(1, 1)),
     ]
+
+
+def test_to_feature_models_validates_geometries_once(monkeypatch):
+    features = [FeatureModel(point=Point(i, i)) for i in range(3)]
+    test = GeoJsonFeatureCollectionBaseModel[
+        FeatureModel.GeoJsonDataModel
+    ].from_feature_models(features)
+    calls = []
+    validate = GeometryField._validate
+    monkeypatch.setattr(
+        GeometryField, "_validate", lambda *args: calls.append(1) or validate(*args)
+    )
+    assert test.to_feature_models() == features
+    assert calls == []
+
+
+class AnnotatedCollection(
+    GeoJsonFeatureCollectionBaseModel[FeatureModel.GeoJsonDataModel]
+):
+    # A field after the features, which has to be kept after the spliced features.
+    bbox: typing.List[float] = [0.0, 0.0, 1.0, 1.0]
+    note: str = '"features":[]'
+
+
+@pytest.fixture
+def large_collection():
+    return AnnotatedCollection.from_feature_models(
+        [FeatureModel(point=Point(i, i), name=f"\u00e9 {i}") for i in range(23)]
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 23, 100])
+def test_model_dump_json_parallel(large_collection, chunk_size):
+    expected = large_collection.model_dump_json().encode("utf-8")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        assert (
+            large_collection.model_dump_json_parallel(executor, chunk_size) == expected
+        )
+
+
+def test_model_dump_json_parallel_processes(large_collection, monkeypatch):
+    collection = GeoJsonFeatureCollectionBaseModel[FeatureModel.GeoJsonDataModel](
+        features=large_collection.features
+    )
+    expected = collection.model_dump_json().encode("utf-8")
+    # The chunks are pickled to the processes of the executor.
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        assert collection.model_dump_json_parallel(executor, 4) == expected
+    # The chunks are serialized by forked processes (or the shared process pool) when
+    # asked to.
+    monkeypatch.setattr(parallel, "default_workers", lambda: 2)
+    try:
+        assert collection.model_dump_json_parallel("fork", chunk_size=4) == expected
+    finally:
+        parallel.shutdown()
+    with pytest.raises(ValueError):
+        collection.model_dump_json_parallel(chunk_size=0)
+    with pytest.raises(ValueError, match="not an executor"):
+        collection.model_dump_json_parallel("spawn", chunk_size=4)
+
+
+def test_model_dump_json_parallel_does_not_fork(large_collection, monkeypatch):
+    monkeypatch.setattr(parallel, "default_workers", lambda: 2)
+    monkeypatch.setattr(parallel, "forked_executor", pytest.fail)
+    monkeypatch.setattr(parallel, "get_process_executor", pytest.fail)
+    expected = large_collection.model_dump_json().encode("utf-8")
+    assert large_collection.model_dump_json_parallel(chunk_size=4) == expected
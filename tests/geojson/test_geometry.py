@@ -1,4 +1,7 @@
+import json
+
 import pytest
+from pydantic import ValidationError
 from shapely import (
     GeometryCollection,
     LineString,
@@ -7,8 +10,13 @@ from shapely import (
     MultiPolygon,
     Point,
     Polygon,
+    from_geojson,
+    get_parts,
+    has_z,
+    to_geojson,
 )
 
+from pydantic_shapely.geojson import geometry
 from pydantic_shapely.geojson.geometry import convert_shapely_to_geojson_object
 
 EXAMPLES_OBJ = {
@@ -56,3 +64,82 @@ def test_geometry(shape_type):
     shape = EXAMPLES_OBJ[shape_type]
     # assert convert_shapely_to_geojson_object(shape).model_dump() == {"type": "Point", "coordinates": (0, 0)}
     assert convert_shapely_to_geojson_object(shape).to_shapely() == shape
+
+
+EXAMPLES_COLLECTIONS = {
+    "multi-part members": GeometryCollection(
+        [
+            MultiPoint([(0, 0), (1, 1)]),
+            MultiLineString([[(0, 0), (1, 1)], [(2, 2), (3, 3)]]),
+            EXAMPLES_OBJ[MultiPolygon],
+        ]
+    ),
+    "nested collection": GeometryCollection(
+        [
+            Point(0, 0),
+            GeometryCollection([Point(1, 1), LineString([(0, 0), (1, 1)])]),
+        ]
+    ),
+    "many points": GeometryCollection([Point(i, -i) for i in range(100)]),
+    "many lines": GeometryCollection(
+        [LineString([(i, 0), (i, 1), (i + 1, 1)]) for i in range(100)]
+    ),
+    "3D": GeometryCollection(
+        [Point(0, 0, 1), LineString([(0, 0, 1), (1, 1, 2)]), MultiPoint([(0, 0, 1)])]
+    ),
+    "mixed 2D and 3D": GeometryCollection(
+        [Point(1, 2), Point(1, 2, 3), LineString([(0, 0), (1, 1)])]
+    ),
+    "nested mixed 2D and 3D": GeometryCollection(
+        [Point(1, 2, 3), GeometryCollection([Point(1, 2), Point(1, 2, 3)])]
+    ),
+    "empty": GeometryCollection(),
+}
+
+
+@pytest.mark.parametrize(
+    "shape", EXAMPLES_COLLECTIONS.values(), ids=EXAMPLES_COLLECTIONS.keys()
+)
+def test_geometry_collection(shape):
+    converted = convert_shapely_to_geojson_object(shape)
+    assert converted.to_shapely() == shape
+    # The model follows RFC 7946 and equals the output of Shapely
+    assert json.loads(converted.model_dump_json()) == json.loads(to_geojson(shape))
+
+
+def test_geometry_collection_mixed_z_values():
+    shape = EXAMPLES_COLLECTIONS["mixed 2D and 3D"]
+    converted = convert_shapely_to_geojson_object(shape)
+    assert isinstance(converted, geometry.GeometryCollection)
+    assert [member.model_dump()["coordinates"] for member in converted.geometries] == [
+        (1.0, 2.0),
+        (1.0, 2.0, 3.0),
+        [(0.0, 0.0), (1.0, 1.0)],
+    ]
+    assert list(has_z(get_parts(converted.to_shapely()))) == [False, True, False]
+
+
+def test_geometry_collection_validation():
+    data = {
+        "type": "GeometryCollection",
+        "geometries": [
+            {"type": "Point", "coordinates": [0, 0]},
+            {"type": "MultiPoint", "coordinates": [[0, 0], [1, 1]]},
+            {
+                "type": "GeometryCollection",
+                "geometries": [{"type": "LineString", "coordinates": [[0, 0], [1, 1]]}],
+            },
+        ],
+    }
+    collection = geometry.GeometryCollection2D.model_validate(data)
+    assert isinstance(collection.geometries[1], geometry.MultiPoint2D)
+    assert isinstance(collection.geometries[2], geometry.GeometryCollection2D)
+    assert collection.to_shapely() == from_geojson(json.dumps(data))
+
+    data["geometries"][0]["type"] = "Unknown"
+    with pytest.raises(ValidationError):
+        geometry.GeometryCollection2D.model_validate(data)
+    data["geometries"][0]["type"] = "Point"
+    data["geometries"][0]["coordinates"] = [0, 0, 0]
+    with pytest.raises(ValidationError):
+        geometry.GeometryCollection2D.model_validate(data)
@@ -0,0 +1,130 @@
+import json
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from shapely import LineString, Point, Polygon
+
+from pydantic_shapely import FeatureBaseModel, GeometryField
+from pydantic_shapely.geojson.feature_collection import (
+    GeoJsonFeatureCollectionBaseModel,
+)
+from pydantic_shapely.geojson.limits import PayloadLimits, PayloadTooLargeError
+
+
+class LineModel(FeatureBaseModel):
+    geometry: Annotated[LineString, GeometryField()]
+    tags: list = []
+    name: str = "Hello World"
+
+
+LIMITS = PayloadLimits(max_features=3, max_coordinates=20, max_depth=6, max_vertices=8)
+
+
+class Upload(
+    GeoJsonFeatureCollectionBaseModel[LineModel.GeoJsonDataModel],
+    payload_limits=LIMITS,
+):
+    pass
+
+
+class Unlimited(GeoJsonFeatureCollectionBaseModel[LineModel.GeoJsonDataModel]):
+    pass
+
+
+def payload(features=1, vertices=4, indent=None, **properties):
+    line = LineString([(i, i) for i in range(vertices)])
+    feature = LineModel(geometry=line, **properties)
+    return Unlimited.from_feature_models([feature] * features).model_dump_json(
+        indent=indent
+    )
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_payload_within_limits(indent):
+    data = payload(features=3, vertices=6, indent=indent, tags=[1, 2, 3, 4, 5, 6])
+    result = Upload.model_validate_json(data)
+    assert len(result.features) == 3
+    assert len(Upload.model_validate(json.loads(data)).features) == 3
+
+
+@pytest.mark.parametrize(
+    "kwargs, limit",
+    [
+        ({"features": 4}, "features"),
+        ({"features": 3, "vertices": 7}, "coordinates"),
+        ({"vertices": 9}, "vertices"),
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_payload_too_large(kwargs, limit, indent):
+    data = payload(indent=indent, **kwargs)
+    with pytest.raises(PayloadTooLargeError) as exc_info:
+        Upload.model_validate_json(data)
+    assert exc_info.value.limit == limit
+    with pytest.raises(PayloadTooLargeError) as exc_info:
+        Upload.model_validate(json.loads(data))
+    assert exc_info.value.limit == limit
+    # Without limits the payload is accepted.
+    Unlimited.model_validate_json(data)
+
+
+def test_payload_depth():
+    data = json.loads(payload())
+    data["features"][0]["properties"]["tags"] = [[[["deep"]]]]
+    with pytest.raises(PayloadTooLargeError, match="depth"):
+        Upload.model_validate_json(json.dumps(data))
+    with pytest.raises(PayloadTooLargeError, match="depth"):
+        Upload.model_validate(data)
+
+
+def test_payload_strings_are_ignored():
+    # Brackets, quotes and member names within strings are not part of the structure.
+    name = 'a "coordinates": [[1, 2], [3, 4]] {"type": "Feature"} \\'
+    data = payload(features=3, name=name)
+    assert Upload.model_validate_json(data).features[0].properties.name == name
+
+
+def test_payload_properties_are_not_coordinates():
+    data = payload(features=3, vertices=6, tags=[[1, 2]] * 10)
+    LIMITS.check_json(data)
+    assert len(Upload.model_validate_json(data).features) == 3
+
+
+def test_payload_limits_of_nested_collection():
+    class Request(BaseModel):
+        upload: Upload
+
+    data = json.loads(payload(features=4))
+    with pytest.raises(PayloadTooLargeError):
+        Request.model_validate({"upload": data})
+    with pytest.raises(PayloadTooLargeError):
+        Request.model_validate_json(json.dumps({"upload": data}))
+
+
+def test_payload_too_large_is_not_a_validation_error():
+    assert not issubclass(PayloadTooLargeError, ValueError)
+    with pytest.raises(ValidationError):
+        Upload.model_validate_json('{"type": "FeatureCollection"}')
+
+
+def test_check_json_geometry_collection():
+    limits = PayloadLimits(max_vertices=5)
+    polygon = json.loads(
+        json.dumps(Polygon([(0, 0), (0, 1), (1, 1)]).__geo_interface__)
+    )
+    collection = {
+        "type": "GeometryCollection",
+        "geometries": [polygon, Point(0, 0).__geo_interface__],
+    }
+    # The vertices are counted per part of the collection.
+    limits.check_json(json.dumps(collection))
+    limits.check_object(collection)
+    with pytest.raises(PayloadTooLargeError):
+        PayloadLimits(max_coordinates=4).check_json(json.dumps(collection))
+    with pytest.raises(PayloadTooLargeError):
+        PayloadLimits(max_coordinates=4).check_object(collection)
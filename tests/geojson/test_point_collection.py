@@ -0,0 +1,153 @@
+import json
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from shapely import LineString, Point
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel, PointCollection
+
+
+class Sensor(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+    name: str
+    count: int
+    reading: typing.Optional[float] = None
+    tags: typing.List[str] = []
+
+
+class Station(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField(z_values="required")]
+    name: str
+
+
+Sensors = GeoJsonFeatureCollectionBaseModel[Sensor.GeoJsonDataModel]
+
+
+def make_sensors(count: int = 5) -> typing.List[Sensor]:
+    return [
+        Sensor(
+            geometry=Point(index / 3, -index),
+            name=f"sensor {index}",
+            count=index,
+            reading=None if index % 2 else index * 1.5,
+            tags=["a"] * index,
+        )
+        for index in range(count)
+    ]
+
+
+def test_point_collection_from_feature_models():
+    features = make_sensors()
+    points = PointCollection.from_feature_models(Sensor, features)
+    assert len(points) == 5
+    assert points.coordinates.dtype == np.float64
+    np.testing.assert_array_equal(
+        points.coordinates, [(f.geometry.x, f.geometry.y) for f in features]
+    )
+    assert list(points.properties) == ["name", "count", "reading", "tags"]
+    assert points.properties["count"].dtype == np.int64
+    assert list(points.geometries) == [f.geometry for f in features]
+    assert points.to_feature_models() == features
+    assert points.to_feature_models(trusted=True) == features
+
+
+def test_point_collection_geojson():
+    features = make_sensors()
+    points = PointCollection.from_feature_models(Sensor, features)
+    data = points.model_dump_geojson()
+    assert json.loads(data) == json.loads(Sensors.dump_feature_models(features))
+    restored = PointCollection.model_validate_geojson(Sensor, data)
+    np.testing.assert_array_equal(restored.coordinates, points.coordinates)
+    assert restored.to_feature_models() == features
+    empty = PointCollection.from_feature_models(Sensor, [])
+    assert empty.coordinates.shape == (0, 2)
+    assert json.loads(empty.model_dump_geojson()) == {
+        "type": "FeatureCollection",
+        "features": [],
+    }
+
+
+def test_point_collection_z_values():
+    points = PointCollection.from_feature_models(
+        Station, [Station(geometry=Point(1, 2, 3), name="a")]
+    )
+    assert points.coordinates.shape == (1, 3)
+    data = points.model_dump_geojson()
+    assert json.loads(data)["features"][0]["geometry"]["coordinates"] == [1, 2, 3]
+    geojson_2d = data.replace(b"[1.0,2.0,3.0]", b"[1.0,2.0]")
+    with pytest.raises(ValueError, match="indices 0 have no z-values"):
+        PointCollection.model_validate_geojson(Station, geojson_2d)
+
+
+def test_point_collection_from_columns():
+    columns = Sensor.to_columns(make_sensors())
+    points = PointCollection.from_columns(Sensor, columns)
+    assert points.to_feature_models() == make_sensors()
+    # The columns of fields with a default may be left out.
+    points = PointCollection.from_columns(
+        Sensor, {"geometry": ["POINT (1 2)"], "name": ["a"], "count": ["3"]}
+    )
+    assert points.properties["count"].tolist() == [3]
+    assert np.isnan(points.properties["reading"][0])
+    assert points.properties["tags"].tolist() == [[]]
+    with pytest.raises(ValidationError):
+        PointCollection.from_columns(
+            Sensor, {"geometry": [Point(1, 2)], "name": ["a"], "count": ["many"]}
+        )
+    with pytest.raises(ValueError, match="unexpected type"):
+        PointCollection.from_columns(
+            Sensor,
+            {"geometry": [LineString([(0, 0), (1, 1)])], "name": ["a"], "count": [1]},
+        )
+
+
+@pytest.mark.parametrize(
+    "coordinates, properties, match",
+    [
+        (np.zeros((2, 4)), {"name": ["a", "b"], "count": [1, 2]}, "shape"),
+        (np.zeros((2, 2)), {"name": ["a", "b"]}, "no column 'count'"),
+        (np.zeros((2, 2)), {"name": ["a"], "count": [1, 2]}, "1 values for 2"),
+        (np.zeros((1, 2)), {"name": ["a"], "count": [1], "x": [1]}, "x are not"),
+    ],
+)
+def test_point_collection_invalid(coordinates, properties, match):
+    with pytest.raises(ValueError, match=match):
+        PointCollection(Sensor, coordinates, properties)
+
+
+def test_point_collection_invalid_geometries():
+    class Shape(FeatureBaseModel):
+        geometry: Annotated[typing.Union[Point, LineString], GeometryField()]
+
+    with pytest.raises(TypeError, match="not annotated with Point"):
+        PointCollection(Shape, np.zeros((0, 2)), {})
+    with pytest.raises(ValueError, match="indices 1 are empty"):
+        PointCollection.from_feature_models(
+            Sensor,
+            [
+                Sensor(geometry=Point(1, 2), name="a", count=1),
+                Sensor.model_construct(geometry=Point(), name="b", count=2),
+            ],
+        )
+    data = Sensors.dump_feature_models(make_sensors(3))
+    line = json.loads(data)
+    line["features"][2]["geometry"] = {"type": "LineString", "coordinates": [[0, 0]]}
+    with pytest.raises(ValueError, match="indices 2 are not"):
+        PointCollection.model_validate_geojson(Sensor, json.dumps(line))
+
+
+def test_point_collection_is_instrumented():
+    with instrumentation.collect() as aggregator:
+        points = PointCollection.from_feature_models(Sensor, make_sensors())
+        PointCollection.model_validate_geojson(Sensor, points.model_dump_geojson())
+    assert aggregator.operations["points.from_feature_models"].items == 5
+    assert aggregator.operations["points.model_dump_geojson"].items == 5
+    assert aggregator.operations["points.model_validate_geojson"].items == 5
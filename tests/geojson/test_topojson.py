@@ -0,0 +1,168 @@
+import json
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from shapely import (
+    GeometryCollection,
+    LineString,
+    MultiLineString,
+    MultiPoint,
+    MultiPolygon,
+    Point,
+    Polygon,
+    box,
+)
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+
+class Parcel(FeatureBaseModel):
+    geometry: Annotated[typing.Union[Polygon, MultiPolygon], GeometryField()]
+    name: str
+
+
+class AnyFeature(FeatureBaseModel):
+    geometry: Annotated[
+        typing.Union[
+            Point,
+            MultiPoint,
+            LineString,
+            MultiLineString,
+            Polygon,
+            MultiPolygon,
+            GeometryCollection,
+        ],
+        GeometryField(),
+    ]
+    answer: int = 42
+
+
+Parcels = GeoJsonFeatureCollectionBaseModel[Parcel.GeoJsonDataModel]
+AnyFeatures = GeoJsonFeatureCollectionBaseModel[AnyFeature.GeoJsonDataModel]
+
+
+def test_topojson_shared_arcs():
+    # A grid of 3 x 3 parcels with 24 edges, of which 12 are shared.
+    features = [
+        Parcel(geometry=box(x, y, x + 1, y + 1), name=f"{x}-{y}")
+        for x in range(3)
+        for y in range(3)
+    ]
+    collection = Parcels.from_feature_models(features)
+    # With 4 grid positions along each axis the coordinates are quantized exactly.
+    topology = json.loads(collection.model_dump_topojson(quantization=4))
+    assert topology["type"] == "Topology"
+    assert topology["bbox"] == [0, 0, 3, 3]
+    assert topology["transform"] == {"scale": [1, 1], "translate": [0, 0]}
+    arcs = topology["arcs"]
+    # Each edge is stored once; the first position is absolute, the others are deltas.
+    assert sum(len(arc) - 1 for arc in arcs) == 24
+    assert all(abs(dx) + abs(dy) == 1 for arc in arcs for dx, dy in arc[1:])
+    geometries = topology["objects"]["features"]["geometries"]
+    assert [g["properties"] for g in geometries] == [{"name": f.name} for f in features]
+    # Each shared edge is used once in reverse.
+    used = [i for g in geometries for ring in g["arcs"] for i in ring]
+    assert len([i for i in used if i < 0]) == len(used) - len(arcs)
+
+    restored = Parcels.model_validate_topojson(json.dumps(topology))
+    for original, result in zip(features, restored.to_feature_models()):
+        assert result.name == original.name
+        assert result.geometry.equals(original.geometry)
+
+
+def test_topojson_geometry_types():
+    geometries = [
+        Point(1, 2),
+        MultiPoint([(0, 0), (10, 10)]),
+        LineString([(0, 0), (5, 5), (10, 0)]),
+        MultiLineString([[(0, 0), (5, 5)], [(5, 5), (10, 10)]]),
+        Polygon(
+            [(0, 0), (10, 0), (10, 10), (0, 10)], [[(2, 2), (2, 4), (4, 4), (4, 2)]]
+        ),
+        # The polygon fills the hole of the previous polygon.
+        MultiPolygon([box(2, 2, 4, 4), box(6, 6, 8, 8)]),
+        GeometryCollection([Point(3, 3), LineString([(0, 10), (10, 10)])]),
+    ]
+    features = [AnyFeature(geometry=g, answer=i) for i, g in enumerate(geometries)]
+    data = AnyFeatures.from_feature_models(features).model_dump_topojson(
+        object_name="things", quantization=11
+    )
+    topology = json.loads(data)
+    types = [g["type"] for g in topology["objects"]["things"]["geometries"]]
+    assert types == [g.geom_type for g in geometries]
+    restored = AnyFeatures.model_validate_topojson(data).to_feature_models()
+    for original, result in zip(features, restored):
+        assert result.answer == original.answer
+        assert result.geometry.geom_type == original.geometry.geom_type
+        assert result.geometry.equals(original.geometry)
+    # The hole and the polygon which fills it share a single arc.
+    polygon, multipolygon = topology["objects"]["things"]["geometries"][4:6]
+    assert polygon["arcs"][1] == [~multipolygon["arcs"][0][0][0]]
+
+
+def test_topojson_quantization():
+    features = [Parcel(geometry=box(0.123456, 0.1, 1.987654, 1.3), name="a")]
+    data = Parcels.from_feature_models(features).model_dump_topojson(quantization=100)
+    (result,) = Parcels.model_validate_topojson(data).to_feature_models()
+    # The ring starts at another vertex, the vertices moved less than a grid cell.
+    assert result.geometry.hausdorff_distance(features[0].geometry) < 0.01
+    with pytest.raises(ValueError, match="at least 2"):
+        Parcels.from_feature_models(features).model_dump_topojson(quantization=1)
+
+
+@pytest.mark.parametrize(
+    "data, match",
+    [
+        ({"type": "FeatureCollection"}, "not a TopoJSON topology"),
+        ({"type": "Topology", "objects": {"a": {}, "b": {}}}, "has 2 objects"),
+        ({"type": "Topology", "objects": {}, "arcs": []}, "has 0 objects"),
+        (
+            {
+                "type": "Topology",
+                "objects": {"a": {"type": "LineString", "arcs": [3]}},
+                "arcs": [[[0, 0], [1, 1]]],
+            },
+            "arc 3 does not exist",
+        ),
+        (
+            {"type": "Topology", "objects": {"a": {"type": None}}, "arcs": []},
+            "index 0 has no type",
+        ),
+    ],
+)
+def test_topojson_invalid(data, match):
+    with pytest.raises(ValueError, match=match):
+        AnyFeatures.model_validate_topojson(json.dumps(data))
+
+
+def test_topojson_object_name():
+    topology = {
+        "type": "Topology",
+        "objects": {
+            "lines": {"type": "LineString", "arcs": [0], "properties": {"answer": 1}},
+            "other": {"type": "Point", "coordinates": [0, 0]},
+        },
+        "arcs": [[[0, 0], [1, 1], [2, 0]]],
+    }
+    collection = AnyFeatures.model_validate_topojson(json.dumps(topology), "lines")
+    (feature,) = collection.to_feature_models()
+    assert feature.geometry.equals(LineString([(0, 0), (1, 1), (2, 0)]))
+    assert feature.answer == 1
+    with pytest.raises(ValueError, match="no object 'missing'"):
+        AnyFeatures.model_validate_topojson(json.dumps(topology), "missing")
+
+
+def test_topojson_is_instrumented():
+    collection = Parcels.from_feature_models(
+        [Parcel(geometry=box(0, 0, 1, 1), name="a")]
+    )
+    with instrumentation.collect() as aggregator:
+        Parcels.model_validate_topojson(collection.model_dump_topojson())
+    assert aggregator.operations["collection.model_dump_topojson"].items == 1
+    assert aggregator.operations["collection.model_validate_topojson"].items == 1
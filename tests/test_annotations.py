@@ -1,3 +1,6 @@
+import concurrent.futures
+import dataclasses
+import threading
 import typing
 
 try:
@@ -5,8 +8,9 @@ try:
 except ImportError:
     from typing_extensions import Annotated
 
+import numpy as np
 import pytest
-from pydantic import create_model
+from pydantic import ValidationError, create_model
 from shapely import (
     GeometryCollection,
     LinearRing,
@@ -16,10 +20,12 @@ from shapely import (
     MultiPolygon,
     Point,
     Polygon,
+    is_prepared,
     wkt,
 )
+from shapely.geometry.base import BaseGeometry
 
-from pydantic_shapely.annotations import GeometryField
+from pydantic_shapely.annotations import GeometryField, enforce_z_values
 
 EXAMPLES_WKT = {
     Point: "POINT(10 20)",
@@ -327,3 +333,436 @@ def test_z_values_strip(geom_type, geom, expected):
 
     test = model(geometry=geom)
     assert test.geometry == expected
+
+
+def test_z_values_forbidden():
+    model = create_model(
+        "NoGeomTypeTestModel",
+        geometry=(Annotated[Point, GeometryField(z_values="forbidden")], ...),
+    )
+
+    with pytest.raises(ValueError):
+        model(geometry=Point(0, 0, 0))
+
+
+def test_z_values_required_with_default():
+    model = create_model(
+        "NoGeomTypeTestModel",
+        geometry=(
+            Annotated[Point, GeometryField(z_values="required", z_default=5.0)],
+            ...,
+        ),
+    )
+
+    assert model(geometry=Point(0, 0)).geometry == Point(0, 0, 5)
+    assert model(geometry=Point(0, 0, 1)).geometry == Point(0, 0, 1)
+
+
+def test_enforce_z_values_strip():
+    geometries = [Point(0, 0, 1), Point(1, 1), LineString([(0, 0, 1), (1, 1, 1)])]
+    result = enforce_z_values(geometries, "strip")
+    assert list(result) == [Point(0, 0), Point(1, 1), LineString([(0, 0), (1, 1)])]
+    # Geometries without z-values are returned as is
+    assert result[1] is geometries[1]
+
+
+@pytest.mark.parametrize("z_values", ["forbid", "forbidden"])
+def test_enforce_z_values_forbidden(z_values):
+    geometries = [Point(0, 0), Point(0, 0, 1), Point(1, 1), Point(1, 1, 1)]
+    with pytest.raises(ValueError, match="indices 1, 3 "):
+        enforce_z_values(geometries, z_values)
+    with pytest.raises(ValueError, match="indices 11, 13 "):
+        enforce_z_values(geometries, z_values, indices=[10, 11, 12, 13])
+
+
+def test_enforce_z_values_required():
+    geometries = [Point(0, 0), Point(0, 0, 1)]
+    with pytest.raises(ValueError, match="indices 0 "):
+        enforce_z_values(geometries, "required")
+    result = enforce_z_values(geometries, "required", z_default=2.0)
+    assert list(result) == [Point(0, 0, 2), Point(0, 0, 1)]
+
+
+def test_validate_many():
+    field = GeometryField(z_values="strip")
+
+    result = field.validate_many(
+        ["POINT (0 0 1)", Point(1, 1).wkb, bytearray(Point(2, 2).wkb), Point(3, 3)],
+        Point,
+    )
+    assert list(result) == [Point(0, 0), Point(1, 1), Point(2, 2), Point(3, 3)]
+
+    with pytest.raises(ValueError, match="indices 1 are not valid WKT"):
+        field.validate_many(["POINT (0 0)", "NOT A WKT"], Point)
+    with pytest.raises(ValueError, match="indices 1 are of an unexpected type"):
+        field.validate_many([Point(0, 0), "LINESTRING (0 0, 1 1)"], Point)
+    # Without a geometry type, any geometry is accepted
+    assert len(field.validate_many([Point(0, 0), "LINESTRING (0 0, 1 1)"])) == 2
+
+
+class GeoInterface:
+    def __init__(self, mapping):
+        self.__geo_interface__ = mapping
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+        GeoInterface({"type": "LineString", "coordinates": [[0, 0], [1, 1]]}),
+        GeoInterface(
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+                "properties": {},
+            }
+        ),
+        np.array([[0.0, 0.0], [1.0, 1.0]]),
+        [(0, 0), (1, 1)],
+    ],
+    ids=["mapping", "geo_interface", "feature", "array", "sequence"],
+)
+def test_fast_paths(value):
+    model = create_model(
+        "FastPathTestModel",
+        geometry=(Annotated[typing.Union[Point, LineString], GeometryField()], ...),
+    )
+    assert model(geometry=value).geometry == LineString([(0, 0), (1, 1)])
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (np.array([1.0, 2.0, 3.0]), Point(1, 2, 3)),
+        (np.array([[0, 0], [0, 1], [1, 1], [0, 0]]), Polygon([(0, 0), (0, 1), (1, 1)])),
+        (
+            [[(0, 0), (1, 1)], [(2, 2), (3, 3)]],
+            MultiLineString([[(0, 0), (1, 1)], [(2, 2), (3, 3)]]),
+        ),
+    ],
+)
+def test_fast_paths_type_lookup(value, expected):
+    model = create_model(
+        "FastPathTestModel",
+        geometry=(
+            Annotated[typing.Union[Point, MultiLineString, Polygon], GeometryField()],
+            ...,
+        ),
+    )
+    assert model(geometry=value).geometry == expected
+
+
+@pytest.mark.parametrize(
+    "geometry_type, expected",
+    [
+        (LineString, LineString([(1, 2), (3, 4), (5, 6)])),
+        (LinearRing, LinearRing([(1, 2), (3, 4), (5, 6)])),
+        (MultiPoint, MultiPoint([(1, 2), (3, 4), (5, 6)])),
+        (typing.Union[Polygon, LineString], LineString([(1, 2), (3, 4), (5, 6)])),
+    ],
+)
+def test_sequence_of_points(geometry_type, expected):
+    model = create_model(
+        "SequenceTestModel", geometry=(Annotated[geometry_type, GeometryField()], ...)
+    )
+    value = [Point(1, 2), Point(3, 4), Point(5, 6)]
+    assert model(geometry=value).geometry == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [{"type": "Unknown"}, np.zeros((2, 2, 2)), np.array([[0.0, 0.0]] * 3), [("a",)]],
+)
+def test_fast_paths_invalid(value):
+    model = create_model(
+        "FastPathTestModel", geometry=(Annotated[Point, GeometryField()], ...)
+    )
+    with pytest.raises(ValueError):
+        model(geometry=value)
+
+
+def test_shared_field_instance():
+    field = GeometryField()
+    model = create_model(
+        "SharedFieldTestModel",
+        point=(Annotated[Point, field], ...),
+        line=(Annotated[LineString, field], ...),
+    )
+    instance = model(point="POINT (0 0)", line="LINESTRING (0 0, 1 1)")
+    assert isinstance(instance.point, Point)
+    with pytest.raises(ValueError):
+        model(point="LINESTRING (0 0, 1 1)", line="LINESTRING (0 0, 1 1)")
+    with pytest.raises(ValueError):
+        model(point="POINT (0 0)", line="POINT (0 0)")
+    properties = model.model_json_schema()["properties"]
+    assert properties["point"]["examples"] == [EXAMPLES_WKT[Point]]
+    assert properties["line"]["examples"] == [EXAMPLES_WKT[LineString]]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        field.z_values = "strip"
+
+
+def test_concurrent_schema_building_and_validation():
+    field = GeometryField()
+    geometry_types = [Point, LineString, Polygon, MultiPoint] * 4
+    barrier = threading.Barrier(len(geometry_types))
+
+    def build_and_validate(geometry_type):
+        barrier.wait()
+        model = create_model(
+            f"Concurrent{geometry_type.__name__}Model",
+            geometry=(Annotated[geometry_type, field], ...),
+        )
+        for _ in range(50):
+            value = model(geometry=EXAMPLES_WKT[geometry_type]).geometry
+            assert isinstance(value, geometry_type)
+        return model
+
+    with concurrent.futures.ThreadPoolExecutor(len(geometry_types)) as executor:
+        models = list(executor.map(build_and_validate, geometry_types))
+    for model, geometry_type in zip(models, geometry_types):
+        other = Point if geometry_type is not Point else LineString
+        with pytest.raises(ValueError):
+            model(geometry=EXAMPLES_WKT[other])
+
+
+REGION = Polygon([(0, 0), (0, 100), (100, 100), (100, 0)])
+BOWTIE = "POLYGON ((0 0, 2 2, 2 0, 0 2, 0 0))"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "LINESTRING (0 0, 1 1, 2 2, 3 3, 4 4)",
+        LineString([(i, i) for i in range(5)]).wkb,
+        {"type": "LineString", "coordinates": [[i, i] for i in range(5)]},
+        [(i, i) for i in range(5)],
+        np.zeros((5, 2)),
+    ],
+)
+def test_max_vertices(value):
+    field = GeometryField(max_vertices=4)
+    assert field.validate("LINESTRING (0 0, 1 1, 2 2, 3 3)").equals(
+        wkt.loads("LINESTRING (0 0, 1 1, 2 2, 3 3)")
+    )
+    with pytest.raises(ValueError, match="vertices"):
+        field.validate(value)
+
+
+def test_max_vertices_rejects_before_parsing(monkeypatch):
+    def parse(*_, **__):
+        raise AssertionError("The WKT-string should not be parsed.")
+
+    monkeypatch.setattr("pydantic_shapely.annotations.shapely.from_wkt", parse)
+    field = GeometryField(max_vertices=10)
+    coordinates = ", ".join(f"{i} {i}" for i in range(1000))
+    with pytest.raises(ValueError, match="at least 1000 vertices"):
+        field.validate(f"LINESTRING ({coordinates})")
+    with pytest.raises(ValueError, match="index 1"):
+        field.validate_many(["POINT (0 0)", f"LINESTRING ({coordinates})"])
+
+
+def test_max_vertices_multipart_wkt():
+    # The separators between the parts are not counted as vertices.
+    field = GeometryField(max_vertices=4)
+    value = field.validate("MULTIPOINT ((0 0), (1 1), (2 2), (3 3))")
+    assert isinstance(value, MultiPoint)
+
+
+def test_region():
+    field = GeometryField(region=REGION)
+    assert field.validate("POINT (50 50)").equals(Point(50, 50))
+    assert field.validate("LINESTRING (0 0, 100 100)").equals(
+        LineString([(0, 0), (100, 100)])
+    )
+    assert field.validate("POINT EMPTY").is_empty
+    with pytest.raises(ValueError, match="allowed region"):
+        field.validate("LINESTRING (50 50, 150 50)")
+    with pytest.raises(ValueError, match="indices 1, 3 are not within"):
+        field.validate_many(
+            ["POINT (1 1)", "POINT (-1 1)", "POINT (2 2)", "POINT (200 200)"]
+        )
+
+
+def test_region_is_prepared():
+    region = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
+    GeometryField(region=region)
+    assert is_prepared(region)
+    with pytest.raises(TypeError):
+        GeometryField(region="POLYGON ((0 0, 0 1, 1 1, 1 0, 0 0))")
+
+
+def test_max_bbox_size():
+    field = GeometryField(max_bbox_size=10)
+    assert field.validate("LINESTRING (0 0, 10 5)").equals(
+        LineString([(0, 0), (10, 5)])
+    )
+    with pytest.raises(ValueError, match="bounding box"):
+        field.validate("LINESTRING (0 0, 5 11)")
+    with pytest.raises(ValueError, match="indices 0"):
+        field.validate_many(["LINESTRING (0 0, 11 0)", "POINT (100 100)"])
+
+
+def test_invalid_constraint_options():
+    with pytest.raises(ValueError):
+        GeometryField(max_vertices=0)
+    with pytest.raises(ValueError):
+        GeometryField(max_bbox_size=-1)
+
+
+def test_validity_allow():
+    assert not GeometryField().validate(BOWTIE).is_valid
+
+
+def test_validity_require():
+    field = GeometryField(validity="require")
+    with pytest.raises(ValueError, match="Self-intersection"):
+        field.validate(BOWTIE)
+    with pytest.raises(ValueError, match="indices 1 are not valid"):
+        field.validate_many(["POINT (0 0)", BOWTIE])
+
+
+def test_validity_make_valid():
+    field = GeometryField(validity="make_valid")
+    value = field.validate(BOWTIE)
+    assert isinstance(value, MultiPolygon)
+    assert value.is_valid
+    _, repaired = field.validate_many(
+        ["POINT (0 0)", BOWTIE], typing.Union[MultiPolygon, Point]
+    )
+    assert repaired.is_valid
+    # The repaired geometry must still be of the annotated type.
+    with pytest.raises(ValueError, match="MultiPolygon"):
+        field.validate(BOWTIE, Polygon)
+
+
+def test_constraints_in_model():
+    model = create_model(
+        "ConstrainedModel",
+        geometry=(
+            Annotated[Polygon, GeometryField(region=REGION, validity="require")],
+            ...,
+        ),
+    )
+    assert model(geometry="POLYGON ((1 1, 1 2, 2 2, 1 1))").geometry.is_valid
+    with pytest.raises(ValueError, match="allowed region"):
+        model(geometry="POLYGON ((1 1, 1 200, 2 2, 1 1))")
+    with pytest.raises(ValueError, match="not valid"):
+        model(geometry=BOWTIE)
+
+
+def test_serialization_polyline():
+    model = create_model(
+        "PolylineTestModel",
+        geometry=(
+            Annotated[
+                typing.Union[Point, LineString, MultiPolygon],
+                GeometryField(serialization="polyline", polyline_precision=6),
+            ],
+            ...,
+        ),
+    )
+    track = LineString([(4.9, 52.37), (4.91, 52.38), (4.95, 52.4)])
+    data = model(geometry=track).model_dump()
+    assert data == {"geometry": "_dl{bB_iajH_pR_pR_af@_cmA"}
+    assert model(**data).geometry.equals(track)
+    # A single vertex is a Point, a polyline with the type id 6 a MultiPolygon.
+    assert model(geometry="_dl{bB_iajH").geometry == Point(4.9, 52.37)
+    multipolygon = MultiPolygon([Polygon([(0, 0), (1, 0), (1, 1)])] * 2)
+    data = model(geometry=multipolygon).model_dump_json()
+    assert model.model_validate_json(data).geometry.equals(multipolygon)
+    # WKT-strings are still accepted.
+    assert model(geometry="POINT (1 2)").geometry == Point(1, 2)
+    with pytest.raises(ValueError, match="cannot be converted"):
+        model(geometry="6_dl{bB_iajH_pR_pR,_dl{bB_iajH_pR_pR")
+    schema = model.model_json_schema()["properties"]["geometry"]
+    assert all("(" not in example for example in schema["examples"])
+
+
+def test_serialization_polyline_z_values():
+    field = GeometryField(serialization="polyline", z_values="required", z_default=0.0)
+    value = field.serialize_polyline(Point(1, 2, 3))
+    assert field.validate(value, Point) == Point(1, 2, 3)
+    # Without required z-values, the z-values are not serialized.
+    assert GeometryField(serialization="polyline").serialize_polyline(
+        Point(1, 2, 3)
+    ) == GeometryField().serialize_polyline(Point(1, 2))
+    with pytest.raises(ValueError, match="precision"):
+        GeometryField(polyline_precision=-1)
+
+
+def test_serialization_polyline_validate_many():
+    field = GeometryField(serialization="polyline", max_vertices=2)
+    result = field.validate_many(["_seK_ibE", "POINT (3 4)"], Point)
+    assert list(result) == [Point(1, 2), Point(3, 4)]
+    with pytest.raises(ValueError, match="at least 3 vertices"):
+        field.validate_many(["_seK_ibE_seK_seK_seK_seK"], LineString)
+    # Polylines are only parsed when the field serializes to polylines.
+    with pytest.raises(ValueError, match="not valid WKT"):
+        GeometryField().validate_many(["_seK_ibE"], Point)
+
+
+@pytest.mark.parametrize(
+    "geometry_type, value, match",
+    [
+        (LineString, "_p~iF~ps|U", "cannot be converted"),
+        (typing.Union[Point, LineString], "", "not a valid WKT"),
+        (MultiLineString, "5_p~iF~ps|U,_p~iF~ps|U_ulLnnqC", "cannot be converted"),
+    ],
+)
+def test_serialization_polyline_invalid(geometry_type, value, match):
+    model = create_model(
+        "PolylineInvalidModel",
+        geometry=(
+            Annotated[geometry_type, GeometryField(serialization="polyline")],
+            ...,
+        ),
+    )
+    with pytest.raises(ValidationError, match=match):
+        model(geometry=value)
+
+
+@pytest.mark.parametrize("geometry", [Point(), LineString()])
+def test_serialization_polyline_empty(geometry):
+    model = create_model(
+        "PolylineEmptyModel",
+        geometry=(
+            Annotated[type(geometry), GeometryField(serialization="polyline")],
+            ...,
+        ),
+    )
+    data = model(geometry=geometry).model_dump()
+    assert data == {"geometry": geometry.wkt}
+    assert model(**data).geometry.is_empty
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "MULTIPOINT ((1 2))",
+        "MULTIPOINT ((1 2), (3 4))",
+        "MULTILINESTRING ((0 0, 1 1))",
+        "MULTILINESTRING ((0 0, 1 1), (2 2, 3 3))",
+        "POLYGON ((0 0, 1 0, 1 1, 0 0))",
+        "MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)))",
+        "MULTIPOLYGON (((0 0, 9 0, 9 9, 0 9, 0 0), (2 2, 2 4, 4 4, 2 2)))",
+    ],
+)
+def test_serialization_polyline_roundtrip(value):
+    geometry = wkt.loads(value)
+    union = (
+        typing.Union[Polygon, MultiPolygon]
+        if geometry.geom_type.endswith("Polygon")
+        else typing.Union[Point, LineString, MultiPoint, MultiLineString]
+    )
+    for geometry_type in (type(geometry), union, BaseGeometry):
+        model = create_model(
+            "PolylineRoundtripModel",
+            geometry=(
+                Annotated[geometry_type, GeometryField(serialization="polyline")],
+                ...,
+            ),
+        )
+        data = model(geometry=geometry).model_dump_json()
+        result = model.model_validate_json(data).geometry
+        assert result.geom_type == geometry.geom_type
+        assert result.equals(geometry)
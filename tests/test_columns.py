@@ -0,0 +1,151 @@
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from shapely import LineString, Point
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+from pydantic_shapely.columns import column_dtype
+
+
+class Sensor(FeatureBaseModel):
+    geometry: Annotated[typing.Union[Point, LineString], GeometryField()]
+    name: str
+    count: int
+    value: float
+    active: bool = True
+    reading: typing.Optional[float] = None
+    level: typing.Optional[int] = None
+    tags: typing.List[str] = []
+
+
+def make_sensors(count: int = 5) -> typing.List[Sensor]:
+    return [
+        Sensor(
+            geometry=Point(index, -index),
+            name=f"sensor {index}",
+            count=index,
+            value=index / 4,
+            active=bool(index % 2),
+            reading=None if index % 3 == 0 else index * 1.5,
+            level=None if index == 1 else index,
+            tags=["a"] * index,
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "annotation, dtype",
+    [
+        (int, np.int64),
+        (float, np.float64),
+        (bool, np.bool_),
+        (typing.Optional[float], np.float64),
+        (typing.Optional[int], object),
+        (str, object),
+        (typing.List[int], object),
+    ],
+)
+def test_column_dtype(annotation, dtype):
+    assert column_dtype(annotation) == np.dtype(dtype)
+
+
+def test_to_columns():
+    sensors = make_sensors()
+    columns = Sensor.to_columns(sensors)
+    assert list(columns) == list(Sensor.model_fields)
+    assert columns["geometry"].dtype == object
+    assert list(columns["geometry"]) == [sensor.geometry for sensor in sensors]
+    assert columns["count"].dtype == np.int64
+    assert columns["count"].tolist() == [0, 1, 2, 3, 4]
+    assert columns["active"].dtype == np.bool_
+    # None is stored as NaN in the columns of optional floats.
+    np.testing.assert_array_equal(columns["reading"], [np.nan, 1.5, 3.0, np.nan, 6.0])
+    assert columns["level"].tolist() == [0, None, 2, 3, 4]
+    # The values of list fields are not turned into a dimension of the array.
+    assert columns["tags"].shape == (5,)
+    assert columns["tags"][2] == ["a", "a"]
+    empty = Sensor.to_columns([])
+    assert all(len(column) == 0 for column in empty.values())
+    assert empty["value"].dtype == np.float64
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_from_columns_roundtrip(trusted):
+    sensors = make_sensors()
+    result = Sensor.from_columns(Sensor.to_columns(sensors), trusted=trusted)
+    assert result == sensors
+    assert result[0].reading is None
+    assert type(result[1].count) is int
+    # Columns of fields with a default may be left out.
+    columns = {
+        "geometry": [Point(0, 0), Point(1, 1)],
+        "name": np.array(["a", "b"], dtype=object),
+        "count": np.array([1, 2]),
+        "value": np.array([0.5, 1.5]),
+    }
+    result = Sensor.from_columns(columns, trusted=trusted)
+    assert [sensor.value for sensor in result] == [0.5, 1.5]
+    assert result[0].tags == [] and result[0].tags is not result[1].tags
+    assert result[0].model_fields_set == set(columns)
+
+
+def test_from_columns_validates():
+    columns = {
+        "geometry": ["POINT (0 0)", "LINESTRING (0 0, 1 1)"],
+        "name": ["a", "b"],
+        "count": ["1", 2],
+        "value": [1, 2],
+    }
+    result = Sensor.from_columns(columns)
+    assert result[1].geometry == LineString([(0, 0), (1, 1)])
+    assert result[0].count == 1
+    with pytest.raises(ValueError, match="indices 1 are of an unexpected type"):
+        Sensor.from_columns({**columns, "geometry": ["POINT (0 0)", "POLYGON EMPTY"]})
+    with pytest.raises(ValidationError):
+        Sensor.from_columns({**columns, "count": ["one", 2]})
+    with pytest.raises(ValidationError):
+        Sensor.from_columns({**columns, "count": ["1", 2]}, strict=True)
+
+
+def test_from_columns_validates_geometries_once(monkeypatch):
+    sensors = make_sensors()
+    columns = Sensor.to_columns(sensors)
+    calls = []
+    validate = GeometryField._validate
+    monkeypatch.setattr(
+        GeometryField, "_validate", lambda *args: calls.append(1) or validate(*args)
+    )
+    assert Sensor.from_columns(columns) == sensors
+    assert calls == []
+
+
+def test_from_columns_invalid():
+    columns = {"geometry": [Point(0, 0)], "name": ["a"], "count": [1], "value": [1.0]}
+    with pytest.raises(ValueError, match="unknown are not fields"):
+        Sensor.from_columns({**columns, "unknown": [1]})
+    with pytest.raises(ValueError, match="no geometry column"):
+        Sensor.from_columns({"name": ["a"]})
+    with pytest.raises(
+        ValueError, match=r"differ in length: geometry \(1\), name \(2\)"
+    ):
+        Sensor.from_columns({**columns, "name": ["a", "b"]})
+    with pytest.raises(ValueError, match="no column 'count'"):
+        Sensor.from_columns(
+            {"geometry": [Point(0, 0)], "name": ["a"], "value": [1.0]}, trusted=True
+        )
+
+
+def test_columns_are_instrumented():
+    sensors = make_sensors()
+    with instrumentation.collect() as aggregator:
+        Sensor.from_columns(Sensor.to_columns(sensors))
+    assert aggregator.operations["feature.to_columns"].items == 5
+    assert aggregator.operations["feature.from_columns"].items == 5
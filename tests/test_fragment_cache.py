@@ -0,0 +1,115 @@
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import numpy as np
+import pytest
+import shapely
+from shapely import LineString, Polygon
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, fragment_cache
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+SQUARE = Polygon([(0, 0), (0, 1), (1, 1), (1, 0), (0, 0)])
+
+
+def make_line(offset: float, vertices: int = 50) -> LineString:
+    return LineString(
+        np.column_stack([np.arange(vertices) + offset, np.zeros(vertices)])
+    )
+
+
+class CachedModel(FeatureBaseModel):
+    geometry: Annotated[typing.Union[LineString, Polygon], GeometryField()]
+    name: str = "Hello World"
+
+
+@pytest.fixture
+def cache():
+    cache = fragment_cache.enable(min_coordinates=0)
+    yield cache
+    fragment_cache.disable()
+
+
+def test_disabled_by_default():
+    assert fragment_cache.get_cache() is None
+
+
+def test_hits_and_misses():
+    cache = fragment_cache.FragmentCache(min_coordinates=0)
+    line = make_line(0)
+    assert cache.geojson(line) == shapely.to_geojson(line).encode("utf-8")
+    assert cache.geojson(make_line(0)) == shapely.to_geojson(line).encode("utf-8")
+    assert cache.wkt(line) == shapely.to_wkt(line)
+    stats = cache.statistics()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+    assert stats.hit_ratio == pytest.approx(1 / 3)
+
+
+def test_get_many():
+    cache = fragment_cache.FragmentCache()
+    geometries = [make_line(0), SQUARE, make_line(1), make_line(0)]
+    expected = [shapely.to_geojson(g).encode("utf-8") for g in geometries]
+    assert cache.get_many(geometries) == expected
+    assert cache.get_many(geometries) == expected
+    stats = cache.statistics()
+    # The square has less than min_coordinates coordinates and is not cached.
+    # The second occurrence of the first line in the batch is counted as a hit.
+    assert (stats.hits, stats.misses, stats.entries) == (4, 2, 2)
+    with pytest.raises(ValueError):
+        cache.get_many(geometries, "unknown")
+
+
+def test_normalize():
+    reversed_square = shapely.reverse(SQUARE)
+    cache = fragment_cache.FragmentCache(min_coordinates=0, normalize=True)
+    assert cache.wkt(SQUARE) == cache.wkt(reversed_square)
+    assert cache.statistics().hits == 1
+
+    cache = fragment_cache.FragmentCache(min_coordinates=0)
+    assert cache.wkt(SQUARE) != cache.wkt(reversed_square)
+
+
+def test_lru_eviction():
+    # The WKT of all lines has the same length
+    size = len(shapely.to_wkt(make_line(10))) + fragment_cache.ENTRY_OVERHEAD
+    cache = fragment_cache.FragmentCache(
+        max_bytes=3 * size, max_entry_bytes=size, min_coordinates=0
+    )
+    for offset in (10, 11, 12):
+        cache.wkt(make_line(offset))
+    cache.wkt(make_line(10))  # Mark the first line as recently used
+    cache.wkt(make_line(13))
+    stats = cache.statistics()
+    assert (stats.entries, stats.evictions) == (3, 1)
+    assert stats.bytes == stats.max_bytes
+    cache.wkt(make_line(10))
+    assert cache.statistics().hits == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_max_entry_bytes():
+    cache = fragment_cache.FragmentCache(max_entry_bytes=10, min_coordinates=0)
+    cache.wkt(make_line(0))
+    assert cache.statistics().rejected == 1
+    assert len(cache) == 0
+
+
+def test_serializers_use_cache(cache):
+    collection = GeoJsonFeatureCollectionBaseModel[CachedModel.GeoJsonDataModel]
+    features = [CachedModel(geometry=make_line(0)) for _ in range(3)]
+    expected = collection.from_feature_models(features).model_dump_json()
+    assert collection.dump_feature_models(features).decode("utf-8") == expected
+    assert (
+        features[0].model_dump_geojson()
+        == features[0].to_geojson_model().model_dump_json()
+    )
+    assert features[0].model_dump_json() == (
+        f'{{"geometry":"{shapely.to_wkt(make_line(0))}","name":"Hello World"}}'
+    )
+    stats = cache.statistics()
+    assert (stats.hits, stats.misses, stats.entries) == (3, 2, 2)
@@ -0,0 +1,101 @@
+import threading
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from shapely import LineString, Point
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+
+class FeatureModel(FeatureBaseModel):
+    geometry: Annotated[LineString, GeometryField()]
+    name: str = "Hello World"
+
+
+def test_disabled_by_default():
+    assert instrumentation.ENABLED is False
+    assert instrumentation.start() is None
+
+
+def test_collect_feature_conversions():
+    feature = FeatureModel(geometry=LineString([(0, 0), (1, 1), (2, 2)]))
+    with instrumentation.collect() as aggregator:
+        assert instrumentation.ENABLED
+        feature.to_geojson_model().to_feature_model()
+    assert not instrumentation.ENABLED
+
+    stats = aggregator.operations["feature.to_geojson_model"]
+    assert stats.count == 1
+    assert stats.vertices == 3
+    assert stats.total_duration > 0
+    assert aggregator.operations["feature.to_feature_model"].count == 1
+    assert ("feature.to_feature_model", "FeatureModel") in aggregator.models
+    assert "feature.to_geojson_model" in aggregator.summary()
+
+
+def test_collect_geometry_field():
+    with instrumentation.collect() as aggregator:
+        feature = FeatureModel(geometry="LINESTRING (0 0, 1 1)")
+        FeatureModel(geometry=feature.geometry.wkb)
+        feature.model_dump_json()
+    assert aggregator.operations["geometry_field.parse_wkt"].vertices == 2
+    assert aggregator.operations["geometry_field.parse_wkb"].count == 1
+    assert aggregator.operations["geometry_field.write_wkt"].count == 1
+
+
+def test_collect_collection_and_cache():
+    collection_model = GeoJsonFeatureCollectionBaseModel[FeatureModel.GeoJsonDataModel]
+    features = [FeatureModel(geometry=LineString([(0, 0), (i, i)])) for i in range(3)]
+    with instrumentation.collect() as aggregator:
+        collection_model.from_feature_models(features).to_feature_models()
+    assert aggregator.operations["collection.from_feature_models"].items == 3
+    assert aggregator.operations["collection.to_feature_models"].items == 3
+    assert aggregator.operations["cache.geojson_datamodel.hit"].count >= 3
+    assert aggregator.operations["cache.geojson_datamodel.hit"].total_duration == 0
+
+
+def test_hook():
+    measurements = []
+    instrumentation.add_hook(measurements.append)
+    try:
+        FeatureModel(geometry=LineString([(0, 0), (1, 1)])).to_geojson_model()
+    finally:
+        instrumentation.remove_hook(measurements.append)
+    assert not instrumentation.ENABLED
+    measurement = [m for m in measurements if m.name == "feature.to_geojson_model"][0]
+    assert measurement.geometry_type == "LineString"
+    assert measurement.vertex_count == 2
+    assert measurement.model is FeatureModel
+
+
+def test_scopes_are_bound_to_context():
+    other_aggregator = instrumentation.Aggregator()
+    ready, done = threading.Event(), threading.Event()
+
+    def other_thread():
+        with instrumentation.collect(other_aggregator):
+            ready.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    ready.wait(5)
+    try:
+        # Instrumentation is enabled by the other thread, but this thread has no
+        # active scope.
+        assert instrumentation.ENABLED
+        FeatureModel(geometry=Point(0, 0).buffer(1).exterior).to_geojson_model()
+    finally:
+        done.set()
+        thread.join()
+    assert other_aggregator.operations == {}
+
+
+def test_geometry_field_wkb_invalid():
+    with pytest.raises(ValueError):
+        FeatureModel(geometry=b"not a wkb")
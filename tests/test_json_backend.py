@@ -0,0 +1,95 @@
+import json
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from shapely import LineString, Point
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, json_backend
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+
+class JsonTestModel(FeatureBaseModel):
+    geometry: Annotated[typing.Union[Point, LineString], GeometryField()]
+    name: str = "Hällo Wörld"
+    answer: typing.Optional[int] = 42
+
+
+@pytest.fixture(params=json_backend.available_backends())
+def backend(request):
+    previous = json_backend.get_backend()
+    yield json_backend.set_backend(request.param)
+    json_backend.set_backend(previous)
+
+
+def test_available_backends():
+    backends = json_backend.available_backends()
+    assert backends[-1] == "json"
+    assert json_backend.get_backend().name == backends[0]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        json_backend.set_backend("unknown")
+
+
+def test_backend_roundtrip(backend):
+    data = {"type": "Point", "coordinates": [1.5, 2.0], "name": "Hällo"}
+    encoded = backend.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+    assert backend.loads(encoded) == data
+    assert backend.loads(encoded.decode("utf-8")) == data
+
+
+@pytest.mark.parametrize(
+    "geometry", [Point(1.5, 2), Point(1, 2, 3), LineString([(0, 0.1), (1e20, 1)])]
+)
+def test_model_dump_geojson(backend, geometry):
+    model = JsonTestModel(geometry=geometry, answer=None)
+    assert model.model_dump_geojson() == model.to_geojson_model().model_dump_json()
+
+
+def test_dump_feature_models(backend):
+    collection = GeoJsonFeatureCollectionBaseModel[JsonTestModel.GeoJsonDataModel]
+    features = [JsonTestModel(geometry=Point(i, i), answer=i) for i in range(3)]
+    assert collection.dump_feature_models(features) == collection.from_feature_models(
+        features
+    ).model_dump_json().encode("utf-8")
+    assert (
+        collection.dump_feature_models([])
+        == b'{"type":"FeatureCollection","features":[]}'
+    )
+
+
+def test_model_validate_geojson_large_integers(backend):
+    # Valid JSON which the faster backends cannot encode again, e.g. orjson only
+    # encodes 64-bit integers.
+    data = (
+        '{"type":"Feature","geometry":{"type":"Point",'
+        '"coordinates":[1,99999999999999999999999]},"properties":{}}'
+    )
+    expected = JsonTestModel.GeoJsonDataModel.model_validate_json(data)
+    model = JsonTestModel.model_validate_geojson(data)
+    assert model.geometry == expected.to_feature_model().geometry
+    assert JsonTestModel.model_validate_geojson_many(f"[{data}]") == [model]
+
+
+def test_custom_backend():
+    previous = json_backend.get_backend()
+    calls = []
+
+    def loads(value):
+        calls.append(value)
+        return json.loads(value)
+
+    try:
+        json_backend.set_backend(json_backend.JsonBackend("custom", json.dumps, loads))
+        JsonTestModel(geometry=Point(0, 0)).to_geojson_model()
+    finally:
+        json_backend.set_backend(previous)
+    assert calls == ['{"type":"Point","coordinates":[0.0,0.0]}']
@@ -0,0 +1,94 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def run_python(code: str) -> str:
+    """Runs the code in a fresh interpreter, so the state of the modules imported by
+    the other tests does not affect the result."""
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+def test_import_does_not_load_geojson():
+    code = (
+        "import sys; import pydantic_shapely; "
+        "print('pydantic_shapely.geojson' in sys.modules)"
+    )
+    assert run_python(code) == "False"
+
+
+def test_define_feature_model_does_not_load_geojson():
+    code = """
+import sys
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+from shapely import Point
+from pydantic_shapely import FeatureBaseModel, GeometryField
+
+class Model(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+
+print('pydantic_shapely.geojson' in sys.modules)
+"""
+    assert run_python(code) == "False"
+
+
+def test_only_used_geometry_modules_are_loaded():
+    code = """
+import sys
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+from shapely import Point
+from pydantic_shapely import FeatureBaseModel, GeometryField
+
+class Model(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+
+Model(geometry=Point(0, 0)).to_geojson_model().model_dump_json()
+print(sorted(
+    name.rsplit('.', 1)[-1] for name in sys.modules
+    if name.startswith('pydantic_shapely.geojson.geometry.')
+))
+"""
+    assert run_python(code) == "['_base', 'point']"
+
+
+def test_lazy_attributes():
+    import pydantic_shapely
+    from pydantic_shapely.geojson import geometry
+
+    assert pydantic_shapely.geojson.geometry is geometry
+    assert geometry.Polygon2D.__name__ == "Polygon2D"
+    assert geometry.MAPPING_2D[__import__("shapely").Polygon] is geometry.Polygon2D
+    assert "MultiPolygon3D" in dir(geometry)
+    with pytest.raises(AttributeError):
+        geometry.DoesNotExist
+    with pytest.raises(AttributeError):
+        pydantic_shapely.does_not_exist
+
+
+def test_unparametrized_models_validate_geometry_models():
+    from pydantic_shapely.geojson import (
+        GeoJsonFeatureBaseModel,
+        GeoJsonFeatureCollectionBaseModel,
+    )
+
+    feature = {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [1, 2]},
+        "properties": {},
+    }
+    result = GeoJsonFeatureBaseModel.model_validate(feature)
+    assert type(result.geometry).__name__ == "Point2D"
+    feature["geometry"] = {"type": "Point", "coordinates": [1, 2, 3]}
+    collection = GeoJsonFeatureCollectionBaseModel.model_validate(
+        {"type": "FeatureCollection", "features": [feature]}
+    )
+    assert type(collection.features[0].geometry).__name__ == "Point3D"
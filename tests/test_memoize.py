@@ -0,0 +1,98 @@
+import pickle
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from pydantic import ConfigDict, ValidationError
+from shapely import Point
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+
+
+class MemoizedModel(FeatureBaseModel, memoize_geojson=True):
+    model_config = ConfigDict(validate_assignment=True)
+
+    geometry: Annotated[Point, GeometryField()]
+    name: str = "Hello World"
+    tags: typing.List[str] = []
+
+
+class NotMemoizedModel(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+    name: str = "Hello World"
+
+
+def test_memoization_is_opt_in():
+    assert MemoizedModel.__memoize_geojson__
+    assert not NotMemoizedModel.__memoize_geojson__
+    model = NotMemoizedModel(geometry=Point(0, 0))
+    assert model.to_geojson_model() is not model.to_geojson_model()
+
+
+def test_assignment_without_memoization(monkeypatch):
+    monkeypatch.setattr(FeatureBaseModel, "clear_geojson_memo", pytest.fail)
+    model = NotMemoizedModel(geometry=Point(0, 0))
+    model.name = "Other"
+    del model.name
+    assert "name" not in model.__dict__
+
+
+def test_memoized_representations():
+    model = MemoizedModel(geometry=Point(0, 0))
+    with instrumentation.collect() as aggregator:
+        geojson_model = model.to_geojson_model()
+        assert model.to_geojson_model() is geojson_model
+        dumped = model.model_dump_geojson()
+        assert model.model_dump_geojson() == dumped
+    assert dumped == geojson_model.model_dump_json()
+    summary = aggregator.summary()
+    assert summary["cache.feature_geojson.hit"]["count"] == 2
+    assert summary["cache.feature_geojson.miss"]["count"] == 2
+
+
+@pytest.mark.parametrize(
+    "name, value, expected",
+    [("name", "Changed", "Changed"), ("geometry", "POINT (1 1)", (1.0, 1.0))],
+)
+def test_assignment_invalidates(name, value, expected):
+    model = MemoizedModel(geometry=Point(0, 0))
+    geojson_model = model.to_geojson_model()
+    model.model_dump_geojson()
+    setattr(model, name, value)
+    assert model.to_geojson_model() is not geojson_model
+    assert expected in (
+        model.to_geojson_model().properties.name,
+        model.to_geojson_model().geometry.coordinates,
+    )
+    assert model.model_dump_geojson() == model.to_geojson_model().model_dump_json()
+
+
+def test_failed_assignment_keeps_memo():
+    model = MemoizedModel(geometry=Point(0, 0))
+    geojson_model = model.to_geojson_model()
+    with pytest.raises(ValidationError):
+        model.geometry = "NOT A WKT"
+    assert model.to_geojson_model() is geojson_model
+
+
+def test_clear_memo():
+    model = MemoizedModel(geometry=Point(0, 0))
+    dumped = model.model_dump_geojson()
+    model.tags.append("new")
+    assert model.model_dump_geojson() == dumped
+    model.clear_geojson_memo()
+    assert '"tags":["new"]' in model.model_dump_geojson()
+
+
+def test_memo_is_not_part_of_state():
+    model = MemoizedModel(geometry=Point(0, 0))
+    model.to_geojson_model()
+    assert model == MemoizedModel(geometry=Point(0, 0))
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored == model
+    assert not hasattr(restored, "__geojson_memo__")
+    assert not hasattr(model.model_copy(), "__geojson_memo__")
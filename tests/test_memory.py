@@ -0,0 +1,89 @@
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import numpy as np
+import pytest
+from shapely import Point, Polygon
+
+from pydantic_shapely import FeatureBaseModel, GeometryField
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel, PointCollection
+from pydantic_shapely.memory import memory_usage, trace_peak
+
+
+class FeatureModel(FeatureBaseModel):
+    geometry: Annotated[Polygon, GeometryField()]
+    name: str = "Hello World"
+
+
+def make_polygon(vertices: int) -> Polygon:
+    return Polygon([(i, i * i) for i in range(vertices - 1)] + [(0, 0)])
+
+
+def test_memory_usage_feature_model():
+    small = memory_usage(FeatureModel(geometry=make_polygon(4)))
+    large = memory_usage(FeatureModel(geometry=make_polygon(1004)))
+    assert small.features == 1
+    assert small.geometries > 0 and small.properties > 0 and small.pydantic > 0
+    assert small.coordinates == 0
+    # GEOS stores 2 doubles per (2D) coordinate
+    assert large.geometries - small.geometries == 1000 * 2 * 8
+    assert large.properties == small.properties
+    assert small.total == (
+        small.geometries + small.coordinates + small.properties + small.pydantic
+    )
+
+
+def test_memory_usage_collection():
+    collection_model = GeoJsonFeatureCollectionBaseModel[FeatureModel.GeoJsonDataModel]
+    features = [
+        FeatureModel(geometry=make_polygon(100), name=str(i)) for i in range(10)
+    ]
+    collection = collection_model.from_feature_models(features)
+
+    report = memory_usage(collection)
+    assert report.features == 10
+    assert report.geometries == 0
+    # At least 100 float objects per feature
+    assert report.coordinates > 10 * 100 * 24
+    assert report.per_feature == report.total / 10
+
+    single = memory_usage(collection.features[0])
+    assert single.features == 1
+    assert single.coordinates < report.coordinates
+
+    features_report = memory_usage(features)
+    assert features_report.features == 10
+    # The coordinate lists of the GeoJSON models are larger than the GEOS storage
+    assert features_report.geometries < report.coordinates
+
+
+class PointModel(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+    name: str = "Hello World"
+
+
+def test_memory_usage_point_collection():
+    features = [PointModel(geometry=Point(i, i), name=str(i)) for i in range(100)]
+    points = PointCollection.from_feature_models(PointModel, features)
+    report = memory_usage(points)
+    assert report.features == 100
+    assert report.geometries == 0
+    # The coordinates are stored in a single array of 2 doubles per point
+    assert 100 * 2 * 8 <= report.coordinates < 100 * 2 * 8 + 1000
+    assert report.properties > 100 * np.dtype(object).itemsize
+    assert report.total < memory_usage(features).total
+    assert memory_usage([points, points]).features == 200
+
+
+def test_memory_usage_unsupported():
+    with pytest.raises(TypeError):
+        memory_usage({"geometry": make_polygon(4)})
+
+
+def test_trace_peak():
+    with trace_peak() as trace:
+        data = [list(range(100)) for _ in range(100)]
+    assert trace.peak >= trace.retained > 100 * 100 * 8
+    del data
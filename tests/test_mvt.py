@@ -0,0 +1,289 @@
+import struct
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from shapely import (
+    GeometryCollection,
+    LineString,
+    MultiPoint,
+    MultiPolygon,
+    Point,
+    Polygon,
+    box,
+)
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+from pydantic_shapely.mvt import encode_tile, tile_bounds, to_web_mercator
+
+# Tile 1/1/0 covers the north-east quadrant of the world, in Web Mercator.
+Z, X, Y = 1, 1, 0
+MINX, MINY, MAXX, MAXY = tile_bounds(Z, X, Y)
+SIZE = MAXX - MINX
+
+
+def tile_point(x: float, y: float) -> typing.Tuple[float, float]:
+    """Returns the Web Mercator coordinates of a point in tile units (extent 4096)."""
+    return (MINX + x / 4096 * SIZE, MAXY - y / 4096 * SIZE)
+
+
+class Feature(FeatureBaseModel):
+    geometry: Annotated[
+        typing.Union[
+            Point, MultiPoint, LineString, Polygon, MultiPolygon, GeometryCollection
+        ],
+        GeometryField(),
+    ]
+    name: typing.Optional[str] = None
+    rank: int = 0
+    score: float = 0.5
+    visible: bool = True
+    tags: typing.List[str] = []
+
+
+def read_varint(data: bytes, position: int) -> typing.Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, position
+
+
+def read_message(data: bytes) -> typing.List[typing.Tuple[int, typing.Any]]:
+    """Decodes the fields of a protobuf message."""
+    fields = []
+    position = 0
+    while position < len(data):
+        key, position = read_varint(data, position)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, position = read_varint(data, position)
+        elif wire_type == 1:
+            value = struct.unpack("<d", data[position : position + 8])[0]
+            position += 8
+        else:
+            assert wire_type == 2
+            length, position = read_varint(data, position)
+            value = data[position : position + length]
+            position += length
+        fields.append((field, value))
+    return fields
+
+
+def read_packed(data: bytes) -> typing.List[int]:
+    values = []
+    position = 0
+    while position < len(data):
+        value, position = read_varint(data, position)
+        values.append(value)
+    return values
+
+
+def decode_value(data: bytes) -> typing.Any:
+    ((field, value),) = read_message(data)
+    if field == 1:
+        return value.decode("utf-8")
+    if field == 6:
+        return (value >> 1) ^ -(value & 1)
+    if field == 7:
+        return bool(value)
+    return value
+
+
+def decode_geometry(commands: typing.List[int]) -> typing.List[typing.Any]:
+    """Decodes the geometry commands in (command, [points]) pairs, in tile units."""
+    result = []
+    x = y = position = 0
+    while position < len(commands):
+        command, count = commands[position] & 0x7, commands[position] >> 3
+        position += 1
+        if command == 7:
+            result.append(("ClosePath", []))
+            continue
+        points = []
+        for _ in range(count):
+            dx, dy = commands[position], commands[position + 1]
+            x += (dx >> 1) ^ -(dx & 1)
+            y += (dy >> 1) ^ -(dy & 1)
+            points.append((x, y))
+            position += 2
+        result.append(("MoveTo" if command == 1 else "LineTo", points))
+    return result
+
+
+def decode_tile(data: bytes) -> typing.Dict[str, typing.Any]:
+    layers = {}
+    for field, layer_data in read_message(data):
+        assert field == 3
+        layer = {"features": [], "keys": [], "values": []}
+        for number, value in read_message(layer_data):
+            if number == 1:
+                layer["name"] = value.decode("utf-8")
+            elif number == 2:
+                layer["features"].append(dict(read_message(value)))
+            elif number == 3:
+                layer["keys"].append(value.decode("utf-8"))
+            elif number == 4:
+                layer["values"].append(decode_value(value))
+            elif number == 5:
+                layer["extent"] = value
+            elif number == 15:
+                layer["version"] = value
+        for feature in layer["features"]:
+            tags = read_packed(feature.get(2, b""))
+            feature["properties"] = {
+                layer["keys"][k]: layer["values"][v]
+                for k, v in zip(tags[::2], tags[1::2])
+            }
+            feature["geometry"] = decode_geometry(read_packed(feature[4]))
+        layers[layer["name"]] = layer
+    return layers
+
+
+def test_tile_bounds():
+    assert tile_bounds(0, 0, 0) == pytest.approx(
+        (-20037508.34, -20037508.34, 20037508.34, 20037508.34)
+    )
+    assert tile_bounds(1, 1, 0) == pytest.approx((0, 0, 20037508.34, 20037508.34))
+    with pytest.raises(ValueError, match="does not exist"):
+        tile_bounds(1, 2, 0)
+    (point,) = to_web_mercator([Point(180, 85.0511287798066)])
+    assert (point.x, point.y) == pytest.approx((20037508.34, 20037508.34))
+
+
+def test_encode_tile():
+    features = [
+        Feature(geometry=Point(tile_point(10.2, 20.7)), name="a", rank=-3),
+        Feature(
+            geometry=LineString([tile_point(0, 0), tile_point(100, 0)]),
+            rank=7,
+            tags=["x", "y"],
+        ),
+        Feature(geometry=Point(tile_point(-1000, 10)), name="outside"),
+    ]
+    tile = encode_tile(features, Z, X, Y, layer="test", crs="EPSG:3857")
+    layer = decode_tile(tile)["test"]
+    assert layer["version"] == 2
+    assert layer["extent"] == 4096
+    assert len(layer["features"]) == 2
+    point, line = layer["features"]
+    assert point[3] == 1
+    assert point["geometry"] == [("MoveTo", [(10, 21)])]
+    assert point["properties"] == {
+        "name": "a",
+        "rank": -3,
+        "score": 0.5,
+        "visible": True,
+        "tags": "[]",
+    }
+    assert line[3] == 2
+    assert line["geometry"] == [("MoveTo", [(0, 0)]), ("LineTo", [(100, 0)])]
+    assert line["properties"]["tags"] == '["x","y"]'
+    # The values are shared between the features.
+    assert layer["values"].count(0.5) == 1
+
+
+def test_encode_tile_polygons():
+    # A polygon with a hole, drawn counter-clockwise in Web Mercator, and a polygon
+    # which is clipped to the buffer of the tile.
+    outer = [
+        tile_point(0, 0),
+        tile_point(0, 100),
+        tile_point(100, 100),
+        tile_point(100, 0),
+    ]
+    inner = [
+        tile_point(20, 20),
+        tile_point(40, 20),
+        tile_point(40, 40),
+        tile_point(20, 40),
+    ]
+    features = [
+        Feature(geometry=Polygon(outer, [inner])),
+        Feature(
+            geometry=Polygon(
+                [tile_point(*p) for p in box(-500, 10, 50, 60).exterior.coords]
+            )
+        ),
+    ]
+    layer = decode_tile(encode_tile(features, Z, X, Y, crs="EPSG:3857"))["features"]
+    with_hole, clipped = layer["features"]
+    assert with_hole[3] == 3
+    commands = with_hole["geometry"]
+    assert [c for c, _ in commands] == ["MoveTo", "LineTo", "ClosePath"] * 2
+
+    def is_ccw(command: int) -> bool:
+        ring = commands[command][1] + commands[command + 1][1]
+        return Polygon(ring).exterior.is_ccw
+
+    # In tile coordinates (y-axis down) the exterior ring is clockwise, which has a
+    # positive area in the y-up coordinates of Shapely, i.e. counter-clockwise.
+    assert is_ccw(0)
+    assert not is_ccw(3)
+    ring = clipped["geometry"][0][1] + clipped["geometry"][1][1]
+    assert min(x for x, _ in ring) == -64
+
+
+def test_encode_tile_collections():
+    collection = GeoJsonFeatureCollectionBaseModel[Feature.GeoJsonDataModel]
+    features = [
+        Feature(geometry=Point(45, 45), rank=1, name=None),
+        Feature(
+            geometry=GeometryCollection(
+                [
+                    Point(10, 10),
+                    GeometryCollection([LineString([(10, 10), (20, 20)])]),
+                ]
+            ),
+            rank=2,
+        ),
+        Feature(geometry=Point(-45, 45), rank=3),
+    ]
+    tile = encode_tile(
+        collection.from_feature_models(features), Z, X, Y, id_field="rank"
+    )
+    assert tile == encode_tile(features, Z, X, Y, id_field="rank")
+    layer = decode_tile(tile)["features"]
+    assert [f[1] for f in layer["features"]] == [1, 2, 2]
+    assert [f[3] for f in layer["features"]] == [1, 1, 2]
+    assert "rank" not in layer["keys"]
+    assert "name" not in layer["features"][0]["properties"]
+    # Tiles of several layers are concatenated.
+    tile += encode_tile(features, Z, X, Y, layer="other")
+    assert set(decode_tile(tile)) == {"features", "other"}
+    assert encode_tile(features, 3, 0, 7) == b""
+
+
+def test_encode_tile_invalid():
+    features = [Feature(geometry=Point(10, 10), name="a")]
+    with pytest.raises(ValueError, match="not supported"):
+        encode_tile(features, 0, 0, 0, crs="EPSG:28992")
+    with pytest.raises(ValueError, match="index 0 must be a non-negative integer"):
+        encode_tile(features, 0, 0, 0, id_field="name")
+
+
+def test_encode_tile_is_instrumented():
+    with instrumentation.collect() as aggregator:
+        encode_tile([Feature(geometry=Point(10, 10))] * 3, 0, 0, 0)
+    assert aggregator.operations["mvt.encode_tile"].items == 3
+
+
+def test_encode_tile_collapsed_polygons():
+    # Beyond 85.05 degrees the polygons collapse to a line in Web Mercator. The first
+    # one, which crosses the buffer of the tile, cannot be clipped with clip_by_rect.
+    features = [
+        Feature(
+            geometry=Polygon([(-1.3, -88), (-1.8, -88.1), (-1.5, -88.2), (-3, -88.3)])
+        ),
+        Feature(geometry=Polygon([(1, -80), (10, -80), (10, -89), (1, -89)])),
+    ]
+    layer = decode_tile(encode_tile(features, 2, 2, 3))["features"]
+    assert [f[3] for f in layer["features"]] == [3]
@@ -0,0 +1,103 @@
+import concurrent.futures
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import shapely
+
+from pydantic_shapely import parallel
+
+
+@pytest.fixture
+def geometries():
+    points = shapely.points(np.arange(100.0), np.arange(100.0))
+    lines = shapely.linestrings(
+        np.arange(300.0).reshape(-1, 3), np.zeros(300).reshape(-1, 3)
+    )
+    return np.concatenate([points, lines])
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_roundtrips(geometries, chunk_size):
+    wkt = parallel.to_wkt(geometries, chunk_size=chunk_size)
+    assert list(wkt) == list(shapely.to_wkt(geometries))
+    assert all(parallel.from_wkt(wkt, chunk_size=chunk_size) == geometries)
+
+    wkb = parallel.to_wkb(geometries, chunk_size=chunk_size)
+    assert all(parallel.from_wkb(wkb, chunk_size=chunk_size) == geometries)
+
+    geojson = parallel.to_geojson(geometries, chunk_size=chunk_size)
+    assert list(geojson) == list(shapely.to_geojson(geometries))
+    assert all(parallel.from_geojson(geojson, chunk_size=chunk_size) == geometries)
+
+
+def test_simplify(geometries):
+    expected = shapely.simplify(geometries, 0.5, preserve_topology=False)
+    result = parallel.simplify(geometries, 0.5, chunk_size=10, preserve_topology=False)
+    assert all(result == expected)
+
+
+def test_custom_executor(geometries):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        result = parallel.to_wkt(list(geometries), executor=executor, chunk_size=16)
+    assert len(result) == len(geometries)
+
+
+def test_map_chunks_arguments():
+    assert len(parallel.map_chunks(shapely.to_wkt, [])) == 0
+    with pytest.raises(ValueError):
+        parallel.map_chunks(shapely.to_wkt, [shapely.Point(0, 0)], chunk_size=0)
+    with pytest.raises(ValueError):
+        parallel.map_chunks(shapely.to_wkt, [[shapely.Point(0, 0)]])
+
+
+def test_shutdown():
+    executor = parallel.get_executor()
+    assert parallel.get_executor() is executor
+    parallel.shutdown()
+    assert parallel.get_executor() is not executor
+
+
+def _forked_item(index: int) -> str:
+    return parallel.forked_state()[index]
+
+
+def test_forked_executor():
+    with parallel.forked_executor(["a", "b", "c"], 2) as executor:
+        if executor is None:
+            pytest.skip("The start method of multiprocessing is not fork.")
+        assert list(executor.map(_forked_item, range(3))) == ["a", "b", "c"]
+
+
+def test_start_method_is_not_set():
+    # The pools of this package do not fix the start method of the application.
+    code = """
+import multiprocessing
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+from shapely import Point
+from pydantic_shapely import FeatureBaseModel, GeometryField, parallel
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+class Model(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+
+parallel.default_workers = lambda: 2
+collection = GeoJsonFeatureCollectionBaseModel[Model.GeoJsonDataModel](
+    features=[Model(geometry=Point(i, i)).to_geojson_model() for i in range(10)]
+)
+assert collection.model_dump_json_parallel("fork", chunk_size=3) == (
+    collection.model_dump_json().encode()
+)
+parallel.get_process_executor()
+parallel.shutdown()
+multiprocessing.set_start_method("spawn")
+print(multiprocessing.get_start_method())
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    assert result.stdout.strip() == "spawn"
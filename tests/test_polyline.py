@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from shapely import (
+    GeometryCollection,
+    LinearRing,
+    LineString,
+    MultiLineString,
+    MultiPoint,
+    MultiPolygon,
+    Point,
+    Polygon,
+    box,
+)
+
+from pydantic_shapely import polyline
+
+GEOMETRIES = [
+    Point(4.9, 52.37),
+    LineString([(4.9, 52.37), (4.91, 52.38), (4.95, 52.4)]),
+    LinearRing([(0, 0), (1, 0), (1, 1), (0, 0)]),
+    MultiPoint([(0, 0), (-10.5, 20.25)]),
+    Polygon(box(0, 0, 10, 10).exterior, [box(2, 2, 4, 4).exterior]),
+    MultiLineString([[(0, 0), (1, 1)], [(2, 2), (3, 3), (4, 2)]]),
+    MultiPolygon(
+        [
+            Polygon(box(0, 0, 10, 10).exterior, [box(2, 2, 4, 4).exterior]),
+            box(20, 20, 21, 21),
+        ]
+    ),
+]
+
+
+def test_encode_reference():
+    # The example of the documentation of the format, in latitude, longitude order.
+    line = LineString([(-120.2, 38.5), (-120.95, 40.7), (-126.453, 43.252)])
+    assert polyline.encode(line) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    coordinates, offsets = polyline.decode("_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+    assert offsets == ()
+    np.testing.assert_allclose(coordinates, line.coords)
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES, ids=lambda g: g.geom_type)
+@pytest.mark.parametrize("include_z", [False, True])
+def test_roundtrip(geometry, include_z):
+    value = polyline.encode(geometry, include_z=include_z)
+    assert polyline.is_polyline(value)
+    coordinates, offsets = polyline.decode(value, include_z=include_z)
+    assert type(geometry) in polyline.candidates(value)
+    result = polyline.to_geometry(coordinates, offsets, type(geometry))
+    assert result.has_z == include_z
+    assert result.equals(geometry)
+
+
+def test_parts():
+    multipolygon = GEOMETRIES[-1]
+    value = polyline.encode(multipolygon)
+    assert value.startswith("6")
+    assert value.count(";") == 1
+    assert value.count(",") == 1
+    # The differences restart at each part, so a part is a plain polyline.
+    second = value.split(";")[1]
+    coordinates, _ = polyline.decode(second)
+    np.testing.assert_allclose(coordinates, multipolygon.geoms[1].exterior.coords)
+    # Points and LineStrings have no type id.
+    assert polyline.candidates(polyline.encode(GEOMETRIES[1])) == (
+        Point,
+        LineString,
+        LinearRing,
+    )
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        MultiPoint([(1, 2)]),
+        MultiLineString([[(0, 0), (1, 1)]]),
+        MultiPolygon([box(0, 0, 1, 1)]),
+        # A single polygon with a hole, which is not a MultiPolygon of two polygons.
+        MultiPolygon([GEOMETRIES[4]]),
+        Polygon(box(0, 0, 1, 1).exterior),
+    ],
+    ids=lambda g: g.wkt,
+)
+def test_single_part(geometry):
+    value = polyline.encode(geometry)
+    coordinates, offsets = polyline.decode(value)
+    (geometry_type,) = polyline.candidates(value)
+    result = polyline.to_geometry(coordinates, offsets, geometry_type)
+    assert result.geom_type == geometry.geom_type
+    assert result.equals(geometry)
+
+
+def test_precision_and_z():
+    line = LineString([(1.23456789, 2.5, 10.25), (1.3, 2.4, 11.0)])
+    coordinates, _ = polyline.decode(polyline.encode(line, precision=2), precision=2)
+    np.testing.assert_allclose(coordinates, [(1.23, 2.5), (1.3, 2.4)])
+    value = polyline.encode(line, precision=7, include_z=True)
+    coordinates, _ = polyline.decode(value, precision=7, include_z=True)
+    np.testing.assert_allclose(coordinates, line.coords, atol=1e-7)
+    with pytest.raises(ValueError, match="between 0 and 10"):
+        polyline.encode(line, precision=11)
+    with pytest.raises(ValueError, match="too large"):
+        polyline.encode(Point(1e10, 0), precision=10)
+
+
+def test_empty():
+    assert polyline.encode(LineString()) == ""
+    assert polyline.encode(MultiPolygon()) == "6"
+    for geometry_type in (LineString, Polygon, MultiPolygon):
+        value = polyline.encode(geometry_type())
+        coordinates, offsets = polyline.decode(value)
+        result = polyline.to_geometry(coordinates, offsets, geometry_type)
+        assert result.is_empty
+        assert type(result) is geometry_type
+
+
+@pytest.mark.parametrize(
+    "value, match",
+    [
+        ("POINT (1 2)", "not a valid polyline"),
+        ("_p~iF~ps|U_", "incomplete part"),
+        ("5_p~iF~ps|U,", "empty or incomplete part"),
+        ("5,_p~iF~ps|U", "empty or incomplete part"),
+        ("5_p~iF~ps|U,,_p~iF~ps|U", "empty or incomplete part"),
+        ("_p~iF", "incomplete vertex"),
+        ("~" * 14 + "?", "too large"),
+        ("_p~iF~ps|U,_p~iF~ps|U", "more levels of parts"),
+        ("3_p~iF~ps|U;_p~iF~ps|U", "more levels of parts"),
+        ("7_p~iF~ps|U", "not a valid polyline"),
+    ],
+)
+def test_decode_invalid(value, match):
+    with pytest.raises(ValueError, match=match):
+        polyline.decode(value)
+
+
+def test_invalid_geometries():
+    with pytest.raises(ValueError, match="GeometryCollection"):
+        polyline.encode(GeometryCollection([Point(0, 0)]))
+    coordinates, offsets = polyline.decode(polyline.encode(GEOMETRIES[1]))
+    with pytest.raises(ValueError, match="single vertex"):
+        polyline.to_geometry(coordinates, offsets, Point)
+    with pytest.raises(ValueError, match="is not a MultiLineString"):
+        polyline.to_geometry(coordinates, offsets, MultiLineString)
+    coordinates, offsets = polyline.decode(polyline.encode(GEOMETRIES[5]))
+    with pytest.raises(ValueError, match="not a valid Polygon"):
+        polyline.to_geometry(coordinates, offsets, Polygon)
+    coordinates, offsets = polyline.decode(polyline.encode(Point(1, 2)))
+    with pytest.raises(ValueError, match="not a valid LineString"):
+        polyline.to_geometry(coordinates, offsets, LineString)
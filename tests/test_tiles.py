@@ -0,0 +1,182 @@
+import concurrent.futures
+import gzip
+import json
+import sqlite3
+import subprocess
+import sys
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import numpy as np
+import pytest
+import shapely
+from shapely import LineString, Point, Polygon
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, parallel
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+from pydantic_shapely.mvt import encode_tile, to_web_mercator
+from pydantic_shapely.tiles import TilePyramid, bucket_features
+
+
+class Feature(FeatureBaseModel):
+    geometry: Annotated[typing.Union[Point, LineString, Polygon], GeometryField()]
+    number: int
+    name: typing.Optional[str] = None
+
+
+def make_features(count: int = 60) -> typing.List[Feature]:
+    rng = np.random.default_rng(1)
+    features = []
+    for number in range(count):
+        x, y = rng.uniform(-20, 20, 2)
+        if number % 3 == 0:
+            geometry = Point(x, y)
+        elif number % 3 == 1:
+            geometry = LineString(np.cumsum(rng.normal(0, 2, (10, 2)), axis=0) + (x, y))
+        else:
+            geometry = shapely.box(x, y, x + rng.uniform(0, 15), y + 1)
+        features.append(Feature(geometry=geometry, number=number, name=f"f{number}"))
+    return features
+
+
+def test_bucket_features():
+    geometries = to_web_mercator(
+        [Point(10, 10), shapely.box(-100, -10, 100, 10), None, Point(-179, 80)]
+    )
+    buckets = bucket_features(shapely.bounds(geometries), 1)
+    assert [(x, y, list(i)) for x, y, i in buckets] == [
+        (0, 0, [1, 3]),
+        (0, 1, [1]),
+        (1, 0, [0, 1]),
+        (1, 1, [1]),
+    ]
+    # The buffer extends the bounds of the point to the neighbouring tile.
+    (point,) = to_web_mercator([Point(-0.01, 45)])
+    buckets = bucket_features(shapely.bounds([point]), 1, margin=1 / 64)
+    assert [(x, y) for x, y, _ in buckets] == [(0, 0), (1, 0)]
+
+
+def test_generate_equals_encode_tile():
+    features = make_features()
+    pyramid = TilePyramid(features, id_field="number", tolerance=0)
+    tiles = list(pyramid.generate(0, 4))
+    assert tiles == sorted(tiles)
+    assert {z for z, _, _, _ in tiles} == {0, 1, 2, 3, 4}
+    for z in range(5):
+        count = 1 << z
+        expected = [
+            (z, x, y, encode_tile(features, z, x, y, id_field="number"))
+            for x in range(count)
+            for y in range(count)
+        ]
+        assert [t for t in tiles if t[0] == z] == [t for t in expected if t[3]]
+
+
+def test_generate_simplifies():
+    features = [
+        Feature(
+            # The line zigzags less than a unit of the extent at zoom level 0.
+            geometry=LineString([(i / 2, (i % 2) / 20) for i in range(100)]),
+            number=1,
+        )
+    ]
+    simplified = dict(
+        ((z, x, y), data) for z, x, y, data in TilePyramid(features).generate(0, 0)
+    )
+    exact = dict(
+        ((z, x, y), data)
+        for z, x, y, data in TilePyramid(features, tolerance=0).generate(0, 0)
+    )
+    assert len(simplified[(0, 0, 0)]) < len(exact[(0, 0, 0)])
+    with pytest.raises(ValueError, match="must not be negative"):
+        TilePyramid(features, tolerance=-1)
+    with pytest.raises(ValueError, match="Invalid range of zoom levels"):
+        list(TilePyramid(features).generate(3, 2))
+
+
+@pytest.mark.parametrize("executor", ["threads", "processes", "default"])
+def test_generate_parallel(executor, monkeypatch):
+    collection = GeoJsonFeatureCollectionBaseModel[Feature.GeoJsonDataModel]
+    pyramid = TilePyramid(collection.from_feature_models(make_features()))
+    expected = list(pyramid.generate(0, 3))
+    if executor == "default":
+        monkeypatch.setattr(parallel, "default_workers", lambda: 2)
+        try:
+            assert list(pyramid.generate(0, 3, batch_size=2)) == expected
+        finally:
+            parallel.shutdown()
+        return
+    pool = (
+        concurrent.futures.ThreadPoolExecutor(2)
+        if executor == "threads"
+        else concurrent.futures.ProcessPoolExecutor(2)
+    )
+    with pool:
+        assert list(pyramid.generate(0, 3, pool, batch_size=2)) == expected
+
+
+def test_generate_does_not_set_start_method():
+    code = """
+import multiprocessing
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+from shapely import Point
+from pydantic_shapely import FeatureBaseModel, GeometryField, parallel
+from pydantic_shapely.tiles import TilePyramid
+
+class Model(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+
+parallel.default_workers = lambda: 2
+pyramid = TilePyramid([Model(geometry=Point(i * 8, i * 4)) for i in range(20)])
+assert len(list(pyramid.generate(0, 4, batch_size=1))) > 5
+multiprocessing.set_start_method("spawn")
+print(multiprocessing.get_start_method())
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    assert result.stdout.strip() == "spawn"
+
+
+def test_write_directory(tmp_path):
+    pyramid = TilePyramid(make_features(), layer="test")
+    count = pyramid.write_directory(tmp_path, 0, 2)
+    files = sorted(tmp_path.glob("*/*/*.mvt"))
+    assert len(files) == count
+    z, x, y, data = next(pyramid.generate(2, 2))
+    assert (tmp_path / str(z) / str(x) / f"{y}.mvt").read_bytes() == data
+
+
+def test_write_mbtiles(tmp_path):
+    pyramid = TilePyramid(make_features(), layer="test")
+    path = tmp_path / "test.mbtiles"
+    count = pyramid.write_mbtiles(path, 0, 2, metadata={"attribution": "Test"})
+    with pytest.raises(FileExistsError):
+        pyramid.write_mbtiles(path, 0, 2)
+    connection = sqlite3.connect(path)
+    try:
+        metadata = dict(connection.execute("SELECT name, value FROM metadata"))
+        rows = connection.execute(
+            "SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles"
+        ).fetchall()
+    finally:
+        connection.close()
+    assert metadata["name"] == "test"
+    assert metadata["format"] == "pbf"
+    assert (metadata["minzoom"], metadata["maxzoom"]) == ("0", "2")
+    assert metadata["attribution"] == "Test"
+    fields = json.loads(metadata["json"])["vector_layers"][0]["fields"]
+    assert fields == {"number": "Number", "name": "String"}
+    west, south, east, north = map(float, metadata["bounds"].split(","))
+    assert -30 < west < south < 0 < north < east < 50
+    assert len(rows) == count
+    # The rows are numbered from the south.
+    tiles = {(z, x, (1 << z) - 1 - y): gzip.decompress(d) for z, x, y, d in rows}
+    assert tiles == {(z, x, y): d for z, x, y, d in pyramid.generate(0, 2)}
@@ -0,0 +1,157 @@
+import concurrent.futures
+import os
+import pickle
+import subprocess
+import sys
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+import shapely
+from pydantic import ConfigDict
+from shapely import LineString, Point, Polygon
+
+from pydantic_shapely import FeatureBaseModel, GeometryField
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+from pydantic_shapely.transport import SharedFeatures, class_reference, resolve_class
+
+
+class PointModel(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField()]
+    name: str = "Hello World"
+    tags: typing.List[str] = []
+
+
+class AreaModel(FeatureBaseModel, geometry_field="area"):
+    area: Annotated[typing.Union[Polygon, LineString], GeometryField()]
+    answer: int = 42
+
+
+class ExtraModel(FeatureBaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    geometry: Annotated[Point, GeometryField()]
+
+
+FEATURES = [
+    PointModel(geometry=Point(0, 0, 1), tags=["a"]),
+    AreaModel(area=Polygon([(0, 0), (0, 1), (1, 1)]), answer=1),
+    PointModel(geometry=Point(1, 1), name="Other"),
+    AreaModel(area=LineString([(0, 0), (2, 2)])),
+]
+
+
+@pytest.mark.parametrize("feature", FEATURES)
+def test_pickle_feature(feature):
+    restored = pickle.loads(pickle.dumps(feature))
+    assert restored == feature
+    assert restored.model_fields_set == feature.model_fields_set
+    assert restored.model_dump_geojson() == feature.model_dump_geojson()
+
+
+def test_pickle_feature_keeps_srid():
+    feature = PointModel(geometry=shapely.set_srid(Point(1, 2), 4326))
+    assert shapely.get_srid(pickle.loads(pickle.dumps(feature)).geometry) == 4326
+    with SharedFeatures.create([feature]) as shared:
+        (restored,) = pickle.loads(pickle.dumps(shared)).to_feature_models()
+    assert shapely.get_srid(restored.geometry) == 4326
+
+
+def test_pickle_feature_is_compact():
+    feature = FEATURES[0]
+    data = pickle.dumps(feature)
+    assert b"geometry" not in data
+    assert b"__pydantic_fields_set__" not in data
+
+
+def test_pickle_feature_with_extra_fields():
+    feature = ExtraModel(geometry=Point(0, 0), extra="value")
+    restored = pickle.loads(pickle.dumps(feature))
+    assert restored == feature
+    assert restored.extra == "value"
+
+
+def test_pickle_geojson_models():
+    feature = FEATURES[1].to_geojson_model()
+    restored = pickle.loads(pickle.dumps(feature))
+    assert type(restored) is type(feature)
+    assert restored == feature
+    collection_cls = GeoJsonFeatureCollectionBaseModel[AreaModel.GeoJsonDataModel]
+    collection = collection_cls.from_feature_models(FEATURES[1::2])
+    restored = pickle.loads(pickle.dumps(collection))
+    assert type(restored) is collection_cls
+    assert restored == collection
+    assert restored.to_feature_models() == FEATURES[1::2]
+
+
+def test_class_reference():
+    cls = GeoJsonFeatureCollectionBaseModel[PointModel.GeoJsonDataModel]
+    reference = class_reference(cls)
+    assert reference is not cls
+    assert resolve_class(pickle.loads(pickle.dumps(reference))) is cls
+    assert class_reference(PointModel) is PointModel
+    union = typing.Union[PointModel.GeoJsonDataModel, AreaModel.GeoJsonDataModel]
+    assert resolve_class(pickle.loads(pickle.dumps(class_reference(union)))) == union
+
+
+def test_shared_features():
+    with SharedFeatures.create(FEATURES) as shared:
+        assert len(shared) == len(FEATURES)
+        assert shared.to_feature_models() == FEATURES
+        chunks = shared.chunks(3)
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+        # The chunks are pickled as a handle and attach to the shared memory.
+        handles = pickle.loads(pickle.dumps(chunks))
+        restored = [f for chunk in handles for f in chunk.to_feature_models()]
+        assert restored == FEATURES
+        assert [f.model_fields_set for f in restored] == [
+            f.model_fields_set for f in FEATURES
+        ]
+    with pytest.raises(FileNotFoundError):
+        handles[0].to_feature_models()
+
+
+def test_shared_features_invalid():
+    with pytest.raises(ValueError, match="index 0"):
+        SharedFeatures.create([ExtraModel(geometry=Point(0, 0), extra=1)])
+    with SharedFeatures.create([]) as shared:
+        assert shared.to_feature_models() == []
+        with pytest.raises(ValueError):
+            shared.chunks(0)
+
+
+def test_shared_features_outlive_attaching_process():
+    # A process which attaches to the block must not remove it when it exits.
+    with SharedFeatures.create(FEATURES) as shared:
+        code = (
+            "import pickle, sys; "
+            "print(len(pickle.loads(sys.stdin.buffer.read()).to_feature_models()))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            input=pickle.dumps(shared),
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        )
+        assert result.stdout.strip() == str(len(FEATURES)).encode()
+        assert shared.to_feature_models() == FEATURES
+        assert pickle.loads(pickle.dumps(shared)).to_feature_models() == FEATURES
+
+
+def _names(chunk: SharedFeatures) -> typing.List[str]:
+    return [type(feature).__name__ for feature in chunk.to_feature_models()]
+
+
+def test_shared_features_in_worker_processes():
+    features = FEATURES * 25
+    with SharedFeatures.create(features) as shared:
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            names = [
+                n for chunk in executor.map(_names, shared.chunks(30)) for n in chunk
+            ]
+    assert names == [type(feature).__name__ for feature in features]
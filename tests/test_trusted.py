@@ -0,0 +1,133 @@
+import typing
+import warnings
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from shapely import (
+    GeometryCollection,
+    LinearRing,
+    LineString,
+    MultiLineString,
+    MultiPoint,
+    MultiPolygon,
+    Point,
+    Polygon,
+)
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, trusted
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+from pydantic_shapely.geojson.geometry import (
+    MAPPING,
+    construct_geojson_geometries,
+    geojson_geometries_to_shapely,
+)
+
+GEOMETRIES = [
+    Point(1, 2),
+    Point(1, 2, 3),
+    LineString([(0, 0), (1, 1)]),
+    LinearRing([(0, 0), (0, 1), (1, 1)]),
+    Polygon([(0, 0), (0, 4), (4, 4)], [[(1, 1), (1, 2), (2, 2)]]),
+    MultiPoint([(0, 0, 1), (1, 1, 2)]),
+    MultiLineString([[(0, 0), (1, 1)], [(2, 2), (3, 3)]]),
+    MultiPolygon(
+        [Polygon([(0, 0), (0, 1), (1, 1)]), Polygon([(5, 5), (5, 6), (6, 6)])]
+    ),
+    GeometryCollection([Point(0, 0), LineString([(0, 0), (1, 1)])]),
+]
+
+
+class AnyModel(FeatureBaseModel):
+    geometry: Annotated[
+        typing.Union[
+            Point,
+            LineString,
+            Polygon,
+            MultiPoint,
+            MultiLineString,
+            MultiPolygon,
+            GeometryCollection,
+        ],
+        GeometryField(),
+    ]
+    name: str = "Hello World"
+    tags: typing.List[str] = []
+
+
+class FlatModel(FeatureBaseModel):
+    geometry: Annotated[Polygon, GeometryField(z_values="strip")]
+    answer: int = 42
+
+
+@pytest.fixture
+def sample_rate():
+    yield trusted.set_sample_rate
+    trusted.set_sample_rate(0.0)
+
+
+def test_construct_geojson_geometries():
+    constructed = construct_geojson_geometries(GEOMETRIES, MAPPING)
+    for geometry, model in zip(GEOMETRIES, constructed):
+        validated = AnyModel(geometry=geometry).to_geojson_model().geometry
+        assert model == validated
+        assert model.model_dump_json() == validated.model_dump_json()
+    restored = geojson_geometries_to_shapely(constructed)
+    assert [g.wkt for g in restored] == [
+        LineString(g).wkt if isinstance(g, LinearRing) else g.wkt for g in GEOMETRIES
+    ]
+
+
+def test_to_geojson_model_trusted():
+    features = [
+        AnyModel(geometry=g, tags=["a"])
+        for g in GEOMETRIES
+        if g.geom_type != "LinearRing"
+    ]
+    features.append(FlatModel(geometry=Polygon([(0, 0, 1), (0, 1, 1), (1, 1, 1)])))
+    for feature in features:
+        trusted_model = feature.to_geojson_model(trusted=True)
+        assert trusted_model == feature.to_geojson_model()
+        assert trusted_model.model_dump_json() == feature.model_dump_geojson()
+
+
+def test_collection_trusted():
+    collection = GeoJsonFeatureCollectionBaseModel[AnyModel.GeoJsonDataModel]
+    features = [
+        AnyModel(geometry=g, name=str(i))
+        for i, g in enumerate(GEOMETRIES)
+        if g.geom_type != "LinearRing"
+    ]
+    validated = collection.from_feature_models(features)
+    with warnings.catch_warnings():
+        # Serializing a model with unexpected values would issue a warning.
+        warnings.simplefilter("error")
+        result = collection.from_feature_models(features, trusted=True)
+        assert result.model_dump_json() == validated.model_dump_json()
+    assert type(result) is collection
+    assert result == validated
+    assert result.model_fields_set == validated.model_fields_set
+    restored = result.to_feature_models(trusted=True)
+    assert restored == validated.to_feature_models() == features
+    assert [f.model_fields_set for f in restored] == [
+        f.model_fields_set for f in validated.to_feature_models()
+    ]
+
+
+def test_trusted_sample_rate(sample_rate):
+    feature = FlatModel(geometry=Polygon([(0, 0), (0, 1), (1, 1)]))
+    # Trusted data is not validated by default.
+    feature.__dict__["answer"] = "not a number"
+    feature.to_geojson_model(trusted=True)
+    sample_rate(1.0)
+    with pytest.raises(ValueError, match="index 1 is not valid"):
+        FlatModel.construct_geojson_models(
+            [FlatModel(geometry=Polygon([(0, 0), (0, 1), (1, 1)])), feature]
+        )
+    with pytest.raises(ValueError):
+        sample_rate(2.0)
+    sample_rate(0.5, seed=1)
+    assert trusted.get_sample_rate() == 0.5
@@ -0,0 +1,148 @@
+import datetime
+import json
+import typing
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from pydantic import ValidationError
+from shapely import LineString, MultiPolygon, Point, Polygon
+
+from pydantic_shapely import FeatureBaseModel, GeometryField, instrumentation
+from pydantic_shapely.geojson import GeoJsonFeatureCollectionBaseModel
+
+
+class PointModel(FeatureBaseModel):
+    geometry: Annotated[Point, GeometryField(z_values="required", z_default=0)]
+    name: str = "Hello World"
+    created: typing.Optional[datetime.date] = None
+
+
+class AreaModel(FeatureBaseModel, geometry_field="area"):
+    area: Annotated[
+        typing.Union[Polygon, MultiPolygon, LineString],
+        GeometryField(validity="make_valid"),
+    ]
+    answer: int = 42
+
+
+def feature(geometry, **properties) -> typing.Dict[str, typing.Any]:
+    return {
+        "type": "Feature",
+        "geometry": geometry.__geo_interface__,
+        "properties": properties,
+    }
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        PointModel(
+            geometry=Point(1, 2, 3), name="A", created=datetime.date(2024, 1, 2)
+        ),
+        AreaModel(area=Polygon([(0, 0), (0, 1), (1, 1)]), answer=1),
+        AreaModel(area=LineString([(0, 0), (2, 2)])),
+    ],
+)
+def test_model_validate_geojson(model):
+    data = model.model_dump_geojson()
+    expected = type(model).GeoJsonDataModel.model_validate_json(data).to_feature_model()
+    result = type(model).model_validate_geojson(data)
+    assert result == expected == model
+    assert type(model).model_validate_geojson(data.encode("utf-8")) == model
+
+
+def test_model_validate_geojson_applies_the_geometry_field():
+    result = PointModel.model_validate_geojson(json.dumps(feature(Point(1, 2))))
+    assert result.geometry.has_z
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1)])
+    result = AreaModel.model_validate_geojson(json.dumps(feature(bowtie)))
+    assert result.area.is_valid
+    with pytest.raises(ValidationError, match="is not one of the expected types"):
+        AreaModel.model_validate_geojson(json.dumps(feature(Point(0, 0))))
+
+
+def test_model_validate_geojson_properties():
+    data = feature(Point(0, 0, 0), name="B")
+    data["properties"] = None
+    assert PointModel.model_validate_geojson(json.dumps(data)).name == "Hello World"
+    data["properties"] = {"created": "not a date"}
+    with pytest.raises(ValidationError, match="created"):
+        PointModel.model_validate_geojson(json.dumps(data))
+    data["properties"] = {"created": "2024-01-02"}
+    with pytest.raises(ValidationError):
+        PointModel.model_validate_geojson(json.dumps(data), strict=True)
+
+
+@pytest.mark.parametrize(
+    "data, match",
+    [
+        ("{", "EOF"),
+        ('{"type": "FeatureCollection"}', "not a GeoJSON feature"),
+        ('{"type": "Feature", "geometry": null}', "has no geometry"),
+        (
+            '{"type": "Feature", "geometry": {"type": "Point"}, "properties": []}',
+            "are not an object",
+        ),
+        (
+            '{"type": "Feature", "geometry": {"type": "Point"}}',
+            "not a valid GeoJSON geometry",
+        ),
+    ],
+)
+def test_model_validate_geojson_invalid(data, match):
+    with pytest.raises(ValueError, match=match):
+        PointModel.model_validate_geojson(data)
+
+
+def test_model_validate_geojson_many():
+    models = [
+        AreaModel(area=Polygon([(0, 0), (0, 1), (1, 1)]), answer=1),
+        AreaModel(area=LineString([(0, 0), (2, 2)])),
+    ]
+    collection = GeoJsonFeatureCollectionBaseModel[AreaModel.GeoJsonDataModel]
+    data = collection.dump_feature_models(models)
+    assert AreaModel.model_validate_geojson_many(data) == models
+    features = json.loads(data)["features"]
+    assert AreaModel.model_validate_geojson_many(json.dumps(features)) == models
+    assert AreaModel.model_validate_geojson_many("[]") == []
+
+
+def test_model_validate_geojson_many_validates_geometries_once(monkeypatch):
+    models = [AreaModel(area=Polygon([(0, 0), (0, 1), (1, 1)]))] * 3
+    collection = GeoJsonFeatureCollectionBaseModel[AreaModel.GeoJsonDataModel]
+    data = collection.dump_feature_models(models)
+    calls = []
+    validate = GeometryField._validate
+    monkeypatch.setattr(
+        GeometryField, "_validate", lambda *args: calls.append(1) or validate(*args)
+    )
+    assert AreaModel.model_validate_geojson_many(data) == models
+    assert calls == []
+
+
+def test_model_validate_geojson_many_invalid():
+    features = [feature(Point(0, 0)), feature(Point(1, 1), answer="many")]
+    with pytest.raises(ValueError, match="indices 0, 1 .* unexpected type"):
+        AreaModel.model_validate_geojson_many(json.dumps(features))
+    features = [feature(LineString([(0, 0), (1, 1)])), {"type": "Point"}]
+    with pytest.raises(ValueError, match="index 1: .* not a GeoJSON feature"):
+        AreaModel.model_validate_geojson_many(json.dumps(features))
+    features[1] = feature(LineString([(0, 0), (1, 1)]))
+    features[1]["geometry"] = {"type": "LineString"}
+    with pytest.raises(ValueError, match="indices 1 are not valid GeoJSON"):
+        AreaModel.model_validate_geojson_many(json.dumps(features))
+    with pytest.raises(ValueError, match="not a GeoJSON feature collection"):
+        AreaModel.model_validate_geojson_many('{"type": "Feature"}')
+
+
+def test_model_validate_geojson_is_instrumented():
+    data = PointModel(geometry=Point(1, 2, 3)).model_dump_geojson()
+    with instrumentation.collect() as aggregator:
+        PointModel.model_validate_geojson(data)
+        PointModel.model_validate_geojson_many(f"[{data}, {data}]")
+    assert aggregator.operations["feature.model_validate_geojson"].count == 1
+    assert aggregator.operations["feature.model_validate_geojson_many"].items == 2